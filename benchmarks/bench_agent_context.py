@@ -0,0 +1,83 @@
+"""
+Benchmark: lazy agent contexts in DummyAgent and (stubbed) SimpleLLMAgent games.
+
+Plays seeded games with an unrecorded event emitter and reports, per agent type:
+  - ms/game
+  - contexts built, and prompts built per context (phase handlers capture the
+    prompt an LLM agent sees before the agent builds it again; with prompts
+    memoized on the context this is 1.0)
+  - actions of the action log indexed into the public history (0 for dummy
+    games, whose agents never read it)
+
+The LLM is replaced by a deterministic stand-in, so the time is the engine's and
+the prompt builder's, not the API's.
+
+Run with: python -m benchmarks.bench_agent_context [games]
+"""
+
+import contextlib
+import io
+import sys
+import time
+import zlib
+from unittest.mock import patch
+
+from main import MafiaGame
+from src.agents import BaseAgent, SimpleLLMAgent
+from src.config.game_config import GameConfig
+from src.web import EventEmitter, RunRecorder
+
+
+GAMES = 200
+
+
+def fake_call_llm(self, prompt, max_tokens=None, temperature=None):
+    """Deterministic stand-in for an LLM call: nominates a player picked from the prompt hash."""
+    return f"I nominate player number {zlib.crc32(prompt.encode()) % 10 + 1}. PASS"
+
+
+def play(agent_type: str, games: int) -> dict:
+    """Play a batch and return its timing and counters."""
+    counts = {"contexts": 0, "prompts": 0, "indexed_actions": 0, "logged_actions": 0}
+    build_context = BaseAgent.build_context
+    build_prompt = SimpleLLMAgent._build_strategic_prompt
+
+    def counting_build_context(self, game_state):
+        counts["contexts"] += 1
+        return build_context(self, game_state)
+
+    def counting_build_prompt(self, context, action_type):
+        counts["prompts"] += 1
+        return build_prompt(self, context, action_type)
+
+    emitter = EventEmitter(RunRecorder())
+    elapsed = 0.0
+    with patch.object(SimpleLLMAgent, "_call_llm", fake_call_llm), \
+            patch.object(BaseAgent, "build_context", counting_build_context), \
+            patch.object(SimpleLLMAgent, "_build_strategic_prompt", counting_build_prompt), \
+            contextlib.redirect_stdout(io.StringIO()):
+        for seed in range(games):
+            config = GameConfig(agent_type=agent_type, random_seed=seed, max_rounds=6, headless=True)
+            start = time.perf_counter()
+            game = MafiaGame(config=config, event_emitter=emitter)
+            game.run_game()
+            elapsed += time.perf_counter() - start
+            counts["indexed_actions"] += game.game_state.public_history._observed
+            counts["logged_actions"] += game.game_state.version
+    counts["ms_per_game"] = elapsed / games * 1000
+    return counts
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else GAMES
+    print(f"{'agents':<18} {'ms/game':>8} {'contexts':>9} {'prompts/context':>16} {'indexed/logged actions':>24}")
+    for agent_type in ("dummy_agent", "simple_llm_agent"):
+        counts = play(agent_type, games)
+        prompts_per_context = counts["prompts"] / counts["contexts"]
+        indexed = f"{counts['indexed_actions']}/{counts['logged_actions']}"
+        print(f"{agent_type:<18} {counts['ms_per_game']:>8.2f} {counts['contexts']:>9} "
+              f"{prompts_per_context:>16.2f} {indexed:>24}")
+
+
+if __name__ == "__main__":
+    main()
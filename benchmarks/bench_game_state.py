@@ -0,0 +1,57 @@
+"""
+Benchmark: a 10k-game DummyAgent batch, with a profile of GameState player queries.
+
+Plays the games inline (one process, reused agents, no run recording) the way
+tournament.py workers do, then reprofiles a slice of the batch with cProfile and
+lists the functions with the most own time plus the call counts of the GameState
+player lookups (get_player, get_alive_players, get_mafia_players,
+get_civilian_players) that the Judge and phase handlers call many times per phase.
+
+Run with: python -m benchmarks.bench_game_state [games]
+"""
+
+import cProfile
+import pstats
+import sys
+import time
+
+from tournament import run_tournament
+
+
+DUMMY_CONFIG = "configs/dummy_agent.yaml"
+GAMES = 10000
+PROFILED_GAMES = 1000
+LOOKUPS = ("get_player", "get_alive_players", "get_mafia_players", "get_civilian_players")
+
+
+def play(games: int) -> float:
+    """Play a batch and return its wall time in seconds."""
+    start = time.perf_counter()
+    for _ in run_tournament(DUMMY_CONFIG, range(games), workers=1):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else GAMES
+    elapsed = play(games)
+    print(f"{games} games in {elapsed:.2f}s ({elapsed / games * 1000:.3f} ms/game)")
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    play(min(games, PROFILED_GAMES))
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+
+    print(f"\nPlayer lookups per game ({min(games, PROFILED_GAMES)} games profiled):")
+    for (filename, _, function), (_, calls, own_time, cumulative_time, _) in stats.stats.items():
+        if function in LOOKUPS and filename.endswith("game_engine.py"):
+            print(f"  {function:<22} {calls / PROFILED_GAMES:>8.0f} calls  "
+                  f"{cumulative_time / PROFILED_GAMES * 1000:>7.3f} ms cumulative")
+
+    print("\nTop functions by own time:")
+    stats.sort_stats("tottime").print_stats(12)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: a DummyAgent batch with console output, at log_level WARNING, and headless.
+
+Plays the games inline with the same reused agents and unrecorded event emitter
+as tournament.py workers, once per output mode:
+  - console: log_level INFO with stdout captured in memory (what tournaments did
+    before they ran headless: every announcement and speech formatted and printed)
+  - warning: log_level WARNING, so INFO records are dropped before formatting
+  - headless: GameConfig.headless, no records and no announcement log
+
+Run with: python -m benchmarks.bench_headless [games]
+"""
+
+import contextlib
+import dataclasses
+import io
+import sys
+import time
+
+import tournament
+from main import MafiaGame
+from src.config import load_config
+
+
+DUMMY_CONFIG = "configs/dummy_agent.yaml"
+GAMES = 2000
+MODES = {
+    "console": {"log_level": "INFO", "headless": False},
+    "warning": {"log_level": "WARNING", "headless": False},
+    "headless": {"log_level": "INFO", "headless": True},
+}
+
+
+def play(games: int, **overrides) -> tuple:
+    """Play a batch with config overrides and return (wall time in seconds, winners)."""
+    tournament._init_worker_state(DUMMY_CONFIG, None)
+    config = dataclasses.replace(tournament._worker_config, **overrides)
+    agents = {}
+    winners = []
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for seed in range(games):
+            game_config = dataclasses.replace(config, random_seed=seed)
+            game = MafiaGame(config=game_config, event_emitter=tournament._worker_emitter, agents=agents)
+            winners.append(game.run_game())
+            agents = game.agents
+    return time.perf_counter() - start, winners
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else GAMES
+    load_config(DUMMY_CONFIG)  # Fail early on a missing config
+
+    results = {mode: play(games, **overrides) for mode, overrides in MODES.items()}
+    baseline = results["console"][0]
+    for mode, (elapsed, _) in results.items():
+        print(f"{mode:<9} {games} games in {elapsed:.2f}s ({elapsed / games * 1000:.3f} ms/game, "
+              f"{baseline / elapsed:.2f}x)")
+
+    # Output settings must never change game outcomes
+    outcomes = {mode: winners for mode, (_, winners) in results.items()}
+    print(f"\nIdentical outcomes across modes: {len({tuple(w) for w in outcomes.values()}) == 1}")
+
+
+if __name__ == "__main__":
+    main()
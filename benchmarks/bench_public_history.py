@@ -0,0 +1,80 @@
+"""
+Benchmark: per-call cost of BaseAgent.build_context and the XML game history from day 1 to day 10.
+
+Builds a synthetic 10-day game (every player speaks each day, two nominations and
+a full vote round per day) through the normal GameState/Judge APIs, then times
+build_context at the end of each day. With the incremental public-history index
+the per-call cost should stay flat as the game grows. The XML history is timed
+both through the per-game fragment cache (as agents use it) and rendered from
+scratch, which is what every prompt used to pay.
+
+Run with: python -m benchmarks.bench_public_history
+"""
+
+import time
+
+from src.core import GameState, GamePhase, Judge
+from src.agents import DummyAgent
+from src.agents.xml_formatter import format_game_history_xml
+from src.config.game_config import GameConfig
+
+
+CALLS_PER_DAY = 2000
+XML_CALLS_PER_DAY = 200
+
+
+def play_synthetic_day(game_state: GameState, judge: Judge) -> None:
+    """Record one day of public history: speeches, two nominations and a vote round."""
+    alive = [p.player_number for p in game_state.get_alive_players()]
+    for speaker in alive:
+        game_state.record_speech(speaker, f"Player {speaker} speaking on day {game_state.day_number}. PASS")
+    judge.process_nomination(alive[0], f"I nominate player number {alive[1]}", announce=False)
+    judge.process_nomination(alive[1], f"I nominate player number {alive[2]}", announce=False)
+
+    game_state.start_voting()
+    for voter in alive:
+        judge.process_vote(voter, alive[1] if voter % 2 else alive[2])
+    day = game_state.day_number
+    game_state._log_action("vote_round", {"day": day, "round": 1, "votes": dict(game_state.votes[day])})
+
+
+def main():
+    config = GameConfig(use_judge_announcements=False)
+    game_state = GameState(random_seed=0, max_rounds=None)
+    judge = Judge(game_state, config)
+    agent = DummyAgent(game_state.get_player(1), config)
+
+    print(f"{'day':>4} {'history events':>15} {'build_context (us/call)':>25} "
+          f"{'xml cached (us)':>16} {'xml uncached (us)':>18}")
+    baseline = None
+    for day in range(1, 11):
+        if day > 1:
+            game_state.start_night()
+            game_state.start_day()
+        play_synthetic_day(game_state, judge)
+        game_state.phase = GamePhase.DAY
+
+        start = time.perf_counter()
+        for _ in range(CALLS_PER_DAY):
+            context = agent.build_context(game_state)
+        per_call_us = (time.perf_counter() - start) / CALLS_PER_DAY * 1e6
+        baseline = baseline or per_call_us
+
+        start = time.perf_counter()
+        for _ in range(XML_CALLS_PER_DAY):
+            format_game_history_xml(context)
+        cached_us = (time.perf_counter() - start) / XML_CALLS_PER_DAY * 1e6
+
+        # A plain list bypasses the per-game cache
+        uncached_context = agent.build_context(game_state)
+        uncached_context.public_history = list(uncached_context.public_history)
+        start = time.perf_counter()
+        for _ in range(XML_CALLS_PER_DAY):
+            format_game_history_xml(uncached_context)
+        uncached_us = (time.perf_counter() - start) / XML_CALLS_PER_DAY * 1e6
+
+        print(f"{day:>4} {len(context.public_history):>15} {per_call_us:>18.2f} ({per_call_us / baseline:.2f}x) "
+              f"{cached_us:>16.1f} {uncached_us:>18.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,12 @@ Main game loop for Mafia simulation.
 """
 
 import argparse
+import asyncio
+import contextlib
+import dataclasses
 import random
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, Iterator, Optional
 
 # Try to load from .env file if it exists
 try:
@@ -14,27 +18,47 @@ except ImportError:
     pass  # python-dotenv not installed, that's okay
 
 from src.core import GameState, GamePhase, Judge, Player
+from src.core.checkpoint import GameCheckpoint, load_checkpoint
+from src.core.game_log import GameLog, INFO
+from src.core.profiler import GameProfiler
 from src.agents import BaseAgent, SimpleLLMAgent, DummyAgent
 from src.agents.exceptions import LLMEmptyResponseError
 from src.phases import DayPhaseHandler, VotingHandler, NightPhaseHandler
+from src.phases.day_phase import SpeculationStats
 from src.config.game_config import default_config
 from src.config.config_loader import load_config
 from src.web import EventEmitter, RunRecorder
+from src.web.run_catalog import summarize_run
 
 
 class MafiaGame:
     """Main game controller."""
     
-    def __init__(self, config=None, event_emitter: EventEmitter = None, run_name: Optional[str] = None):
+    def __init__(self, config=None, event_emitter: EventEmitter = None, run_name: Optional[str] = None,
+                 agents: Optional[Dict[int, BaseAgent]] = None, checkpoint: Optional[GameCheckpoint] = None):
+        """
+        Args:
+            config: Game configuration (default config if None)
+            event_emitter: Event emitter to record to (a new run is created if None)
+            run_name: Custom name for the run directory
+            agents: Optional agents from a previous game to reuse; an agent is reset and
+                rebound to the new player when its type matches the configured agent type
+            checkpoint: Checkpoint to continue from instead of setting up a new game (see resume())
+        """
         self.config = config or default_config
+        self.log = GameLog.from_config(self.config)
         
         # Create run recorder and event emitter
         if event_emitter is None:
-            run_recorder = RunRecorder()
+            run_recorder = RunRecorder(
+                buffered=self.config.buffered_events,
+                flush_every=self.config.event_flush_count,
+                flush_interval=self.config.event_flush_interval
+            )
             run_name = run_recorder.create_run(run_name)
             self.event_emitter = EventEmitter(run_recorder)
             self.run_recorder = run_recorder
-            print(f"Recording game to: runs/{run_name}/")
+            self.log.info("game", "Recording game to: runs/%s/", run_name)
         else:
             self.event_emitter = event_emitter
             self.run_recorder = event_emitter.run_recorder if hasattr(event_emitter, 'run_recorder') else None
@@ -43,13 +67,16 @@ class MafiaGame:
         if self.config.random_seed is None:
             self.config.random_seed = random.randint(0, 2**31 - 1)
         
-        # Pass random seed to game state for reproducible role assignment
-        self.game_state = GameState(
-            max_rounds=self.config.max_rounds,
-            random_seed=self.config.random_seed,
-            event_emitter=self.event_emitter
-        )
-        self.judge = Judge(self.game_state, self.config, event_emitter=self.event_emitter)
+        if checkpoint is not None:
+            self.game_state = GameState.from_checkpoint_state(checkpoint.game_state, event_emitter=self.event_emitter)
+        else:
+            # Pass random seed to game state for reproducible role assignment
+            self.game_state = GameState(
+                max_rounds=self.config.max_rounds,
+                random_seed=self.config.random_seed,
+                event_emitter=self.event_emitter
+            )
+        self.judge = Judge(self.game_state, self.config, event_emitter=self.event_emitter, log=self.log)
         self.agents: Dict[int, BaseAgent] = {}
         
         # Phase handlers (pass event emitter if available)
@@ -58,9 +85,103 @@ class MafiaGame:
         self.night_handler = NightPhaseHandler(self.game_state, self.judge, event_emitter=self.event_emitter)
         
         # Initialize agents
-        self._initialize_agents()
+        self._initialize_agents(agents or {})
+        
+        # Phase profile written to the run's metadata (recorded runs only; see core.profiler)
+        self.profiler = None
+        if self.config.profile_phases and self.run_recorder and self.run_recorder.recording:
+            self.profiler = GameProfiler()
+        
+        # Checkpoint this game was resumed from, and events of the interrupted phase that were dropped
+        self.resumed_from = checkpoint
+        self.discarded_events = 0
+        if checkpoint is not None:
+            self._restore_checkpoint(checkpoint)
+    
+    @classmethod
+    def resume(cls, run_name: str, runs_dir: str = "runs", model: Optional[str] = None) -> "MafiaGame":
+        """
+        Restore a recorded game from its latest checkpoint; run_game() then continues it.
+        
+        The game keeps its original configuration and recording: events recorded
+        after the checkpoint (the interrupted phase) are dropped from the run, and
+        the phase is played again.
+        
+        Args:
+            run_name: Name of the run directory
+            runs_dir: Directory that holds run directories
+            model: Optional LLM model override (e.g. to switch away from a failing model)
+            
+        Returns:
+            Game ready to continue
+            
+        Raises:
+            FileNotFoundError: If the run or its checkpoint doesn't exist
+            ValueError: If the run has already finished or can't be resumed
+        """
+        run_dir = Path(runs_dir) / run_name
+        checkpoint = load_checkpoint(run_dir)
+        summary = summarize_run(run_dir)
+        if summary.finished and not summary.failed:
+            raise ValueError(f"Run {run_name} has already finished ({summary.outcome})")
+        
+        config = checkpoint.game_config()
+        if model is not None:
+            config.llm_model = model
+        run_recorder = RunRecorder(
+            runs_dir,
+            buffered=config.buffered_events,
+            flush_every=config.event_flush_count,
+            flush_interval=config.event_flush_interval
+        )
+        discarded_events = run_recorder.resume_run(run_name, checkpoint.event_count)
+        game = cls(config=config, event_emitter=EventEmitter(run_recorder), checkpoint=checkpoint)
+        game.discarded_events = discarded_events
+        return game
+    
+    def _restore_checkpoint(self, checkpoint: GameCheckpoint) -> None:
+        """Restore the judge, agent and phase handler state of a checkpoint (the game state is already restored)."""
+        self.judge.restore_checkpoint_state(checkpoint.judge)
+        for player_number, state in checkpoint.agents.items():
+            if player_number in self.agents:
+                self.agents[player_number].restore_checkpoint_state(state)
+        speculation_stats = checkpoint.handlers.get("speculation_stats")
+        if speculation_stats:
+            self.day_handler.speculation_stats = SpeculationStats(**speculation_stats)
+        profile = checkpoint.handlers.get("profile")
+        if profile and self.profiler is not None:
+            self.profiler.restore_checkpoint_state(profile)
     
-    def _initialize_agents(self):
+    def _save_checkpoint(self) -> None:
+        """Checkpoint the game before a phase starts (recorded runs only; see core.checkpoint)."""
+        run_recorder = self.run_recorder
+        if not (self.config.checkpoint_phases and run_recorder and run_recorder.recording):
+            return
+        handlers = {"speculation_stats": dataclasses.asdict(self.day_handler.speculation_stats)}
+        if self.profiler is not None:
+            handlers["profile"] = self.profiler.checkpoint_state()
+        run_recorder.save_checkpoint(GameCheckpoint(
+            config=dataclasses.asdict(self.config),
+            game_state=self.game_state.checkpoint_state(),
+            judge=self.judge.checkpoint_state(),
+            agents={number: agent.checkpoint_state() for number, agent in self.agents.items()},
+            handlers=handlers,
+            event_count=run_recorder.event_count,
+        ))
+    
+    @contextlib.contextmanager
+    def _profile_phase(self, name: str) -> Iterator[None]:
+        """Profile a phase, then write the profile so far to the run's metadata (see core.profiler)."""
+        if self.profiler is None:
+            yield
+            return
+        try:
+            with self.profiler.phase(name, self.game_state.day_number, self.game_state.night_number):
+                yield
+        finally:
+            self.event_emitter.update_metadata({"profile": self.profiler.to_dict()})
+    
+    def _initialize_agents(self, reusable_agents: Dict[int, BaseAgent]):
         """Initialize agents for all players based on config."""
         # Check if per-player agent types are specified
         if self.config.agent_types:
@@ -70,17 +191,25 @@ class MafiaGame:
                     player.player_number, 
                     self.config.agent_type
                 ).lower()
-                agent = self._create_agent(player, player_agent_type)
+                agent = self._create_agent(player, player_agent_type, reusable_agents.get(player.player_number))
                 self.agents[player.player_number] = agent
         else:
             # Use single agent type for all players
             agent_type = self.config.agent_type.lower()
             for player in self.game_state.players:
-                agent = self._create_agent(player, agent_type)
+                agent = self._create_agent(player, agent_type, reusable_agents.get(player.player_number))
                 self.agents[player.player_number] = agent
         
-    def _create_agent(self, player: Player, agent_type: str) -> BaseAgent:
-        """Create an agent of the specified type for a player."""
+    def _create_agent(self, player: Player, agent_type: str, reusable: Optional[BaseAgent] = None) -> BaseAgent:
+        """Create an agent of the specified type for a player, reusing `reusable` if it matches."""
+        if agent_type == "dummy_agent" and isinstance(reusable, DummyAgent):
+            reusable.reset(player, self.config)
+            return reusable
+        elif agent_type == "simple_llm_agent" and isinstance(reusable, SimpleLLMAgent):
+            reusable.reset(player, self.config)
+            reusable.event_emitter = self.event_emitter
+            return reusable
+        
         if agent_type == "dummy_agent":
             return DummyAgent(player, self.config)
         elif agent_type == "simple_llm_agent":
@@ -93,15 +222,33 @@ class MafiaGame:
     
     def run_game(self) -> str:
         """
-        Run the complete game until win condition.
+        Run the complete game until win condition, on a new event loop.
+        Returns winning team name.
+        """
+        return asyncio.run(self.run_game_async())
+    
+    async def run_game_async(self) -> str:
+        """
+        Run the complete game until win condition, on the running event loop.
+        
+        Agents are asked through their async methods, so while one game waits for
+        an LLM the loop runs others: any number of games can be played concurrently
+        in one process, e.g. with asyncio.gather(*(game.run_game_async() for game in games)).
         Returns winning team name.
         """
         players = [p.player_number for p in self.game_state.players]
         mafia = [p.player_number for p in self.game_state.get_mafia_players()]
         sheriff = [p.player_number for p in self.game_state.players if p.role.role_type.value == 'sheriff'][0]
         
-        # Emit game start event
-        if self.event_emitter:
+        # Emit game start event (a resumed game has recorded it already)
+        if self.event_emitter and self.resumed_from is not None:
+            self.event_emitter.emit_game_resumed(
+                self.resumed_from.phase,
+                self.resumed_from.day_number,
+                self.resumed_from.night_number,
+                self.discarded_events
+            )
+        elif self.event_emitter:
             agent_types = {}
             if self.config.agent_types:
                 for p, a in self.agents.items():
@@ -129,26 +276,39 @@ class MafiaGame:
                         "max_rounds": self.config.max_rounds,
                         "random_seed": self.config.random_seed,
                         "use_judge_announcements": self.config.use_judge_announcements,
-                        "log_level": self.config.log_level
+                        "log_level": self.config.log_level,
+                        "headless": self.config.headless,
+                        "llm_cache": self.config.llm_cache,
+                        "stream_speeches": self.config.stream_speeches,
+                        "prompt_layout": self.config.prompt_layout,
+                        "buffered_events": self.config.buffered_events,
+                        "checkpoint_phases": self.config.checkpoint_phases,
+                        "profile_phases": self.config.profile_phases,
+                        "concurrent_night_actions": self.config.concurrent_night_actions,
+                        "speculative_speeches": self.config.speculative_speeches
                     }
                 })
         
-        print("=" * 60)
-        print("MAFIA GAME - Starting")
-        print("=" * 60)
-        print(f"Players: {players}")
-        print(f"Mafia: {mafia}")
-        print(f"Sheriff: {sheriff}")
+        log = self.log
+        log.info("game", "=" * 60)
+        log.info("game", "MAFIA GAME - Starting")
+        log.info("game", "=" * 60)
+        log.info("game", "Players: %s", players)
+        log.info("game", "Mafia: %s", mafia)
+        log.info("game", "Sheriff: %s", sheriff)
         
         # Show agent types if mixed
-        if self.config.agent_types:
+        if self.config.agent_types and log.enabled_for(INFO):
             llm_players = [p for p, a in self.agents.items() if isinstance(a, SimpleLLMAgent)]
             dummy_players = [p for p, a in self.agents.items() if isinstance(a, DummyAgent)]
-            print(f"LLM Agents: {llm_players}")
-            print(f"Dummy Agents: {dummy_players}")
+            log.info("game", "LLM Agents: %s", llm_players)
+            log.info("game", "Dummy Agents: %s", dummy_players)
         
-        print("=" * 60)
-        print()
+        if self.resumed_from is not None:
+            log.info("game", "Resuming from checkpoint: %s (Day %s, Night %s)", self.resumed_from.phase.upper(),
+                     self.resumed_from.day_number, self.resumed_from.night_number)
+        log.info("game", "=" * 60)
+        log.info("game", "")
         
         # Game loop
         try:
@@ -156,7 +316,8 @@ class MafiaGame:
                 
                 # Day Phase
                 if self.game_state.phase == GamePhase.DAY:
-                    print(f"\n--- DAY {self.game_state.day_number} ---")
+                    self._save_checkpoint()
+                    log.info("phase", "\n--- DAY %s ---", self.game_state.day_number)
                     if self.event_emitter:
                         self.event_emitter.emit_phase_change(
                             "day", 
@@ -164,11 +325,13 @@ class MafiaGame:
                             self.game_state.night_number
                         )
                         self.game_state._emit_game_state_update()
-                    self.day_handler.run_day_phase(self.agents)
+                    with self._profile_phase("day"):
+                        await self.day_handler.run_day_phase_async(self.agents)
                 
                 # Voting Phase
                 if self.game_state.phase == GamePhase.VOTING:
-                    print(f"\n--- VOTING (Day {self.game_state.day_number}) ---")
+                    self._save_checkpoint()
+                    log.info("phase", "\n--- VOTING (Day %s) ---", self.game_state.day_number)
                     if self.event_emitter:
                         self.event_emitter.emit_phase_change(
                             "voting", 
@@ -176,7 +339,8 @@ class MafiaGame:
                             self.game_state.night_number
                         )
                         self.game_state._emit_game_state_update()
-                    self.voting_handler.run_voting_phase(self.agents)
+                    with self._profile_phase("voting"):
+                        await self.voting_handler.run_voting_phase_async(self.agents)
                     
                     if self.game_state.phase == GamePhase.GAME_OVER or self.game_state.phase == GamePhase.FAILED:
                         break
@@ -186,7 +350,8 @@ class MafiaGame:
                 
                 # Night Phase (happens after day/voting)
                 if self.game_state.phase == GamePhase.NIGHT:
-                    print(f"\n--- NIGHT {self.game_state.night_number} ---")
+                    self._save_checkpoint()
+                    log.info("phase", "\n--- NIGHT %s ---", self.game_state.night_number)
                     if self.event_emitter:
                         self.event_emitter.emit_phase_change(
                             "night", 
@@ -194,7 +359,8 @@ class MafiaGame:
                             self.game_state.night_number
                         )
                         self.game_state._emit_game_state_update()
-                    self.night_handler.run_night_phase(self.agents)
+                    with self._profile_phase("night"):
+                        await self.night_handler.run_night_phase_async(self.agents)
                     
                     if self.game_state.phase == GamePhase.GAME_OVER or self.game_state.phase == GamePhase.FAILED:
                         break
@@ -219,9 +385,9 @@ class MafiaGame:
                     break
         except LLMEmptyResponseError as e:
             # Fatal error: LLM returned empty response
-            print(f"\n❌ FATAL ERROR: {e.message}")
-            print(f"   Player: {e.player_number}")
-            print(f"   Action: {e.action_type}")
+            log.error("game", "\n❌ FATAL ERROR: %s", e.message)
+            log.error("game", "   Player: %s", e.player_number)
+            log.error("game", "   Action: %s", e.action_type)
             
             # Emit fatal error event (use the full error message from exception)
             if self.event_emitter:
@@ -243,9 +409,9 @@ class MafiaGame:
                     self.game_state.day_number, 
                     self.game_state.night_number
                 )
-            print("\n" + "=" * 60)
-            print("GAME FAILED - Fatal Error")
-            print("=" * 60)
+            log.error("game", "\n" + "=" * 60)
+            log.error("game", "GAME FAILED - Fatal Error")
+            log.error("game", "=" * 60)
             self._print_game_summary()
             return "Failed"
         
@@ -263,62 +429,65 @@ class MafiaGame:
                     self.game_state.day_number, 
                     self.game_state.night_number
                 )
-            print("\n" + "=" * 60)
-            print(f"GAME OVER - {winner_name} WIN!")
+            log.info("game", "\n" + "=" * 60)
+            log.info("game", "GAME OVER - %s WIN!", winner_name)
             
             # Check if game ended due to max rounds
             if (self.game_state.max_rounds is not None and 
                 self.game_state.day_number >= self.game_state.max_rounds):
-                print(f"(Game ended at max rounds limit: {self.game_state.max_rounds})")
+                log.info("game", "(Game ended at max rounds limit: %s)", self.game_state.max_rounds)
             
-            print("=" * 60)
+            log.info("game", "=" * 60)
             self._print_game_summary()
             return winner_name
         else:
-            print("\nGame ended without clear winner")
+            log.info("game", "\nGame ended without clear winner")
             return "Draw"
     
     def _print_game_summary(self) -> None:
         """Print a nicely formatted game summary."""
+        if not self.log.enabled_for(INFO):
+            return
+        log = self.log
         alive_players = self.game_state.get_alive_players()
         mafia_players = self.game_state.get_mafia_players()
         civilian_players = self.game_state.get_civilian_players()
         
-        print("\n📊 GAME SUMMARY")
-        print("-" * 60)
+        log.info("game", "\n📊 GAME SUMMARY")
+        log.info("game", "-" * 60)
         
         # Winner
         if self.game_state.winner:
             winner_display = "Civilians (Red Team)" if self.game_state.winner.value == "red" else "Mafia (Black Team)"
-            print(f"Winner: {winner_display}")
+            log.info("game", "Winner: %s", winner_display)
         else:
-            print("Winner: None (Draw)")
+            log.info("game", "Winner: None (Draw)")
         
         # Game stats
-        print(f"Total Days: {self.game_state.day_number}")
-        print(f"Total Nights: {self.game_state.night_number}")
+        log.info("game", "Total Days: %s", self.game_state.day_number)
+        log.info("game", "Total Nights: %s", self.game_state.night_number)
         
         # Random seed (always shown, was generated if not provided)
-        print(f"Random Seed: {self.config.random_seed}")
+        log.info("game", "Random Seed: %s", self.config.random_seed)
         
         # Player counts
-        print(f"\nFinal Player Count:")
-        print(f"  • Alive: {len(alive_players)}")
-        print(f"  • Mafia: {len(mafia_players)}")
-        print(f"  • Civilians: {len(civilian_players)}")
+        log.info("game", "\nFinal Player Count:")
+        log.info("game", "  • Alive: %s", len(alive_players))
+        log.info("game", "  • Mafia: %s", len(mafia_players))
+        log.info("game", "  • Civilians: %s", len(civilian_players))
         
         # Alive players breakdown
         if alive_players:
-            print(f"\nAlive Players:")
+            log.info("game", "\nAlive Players:")
             for player in sorted(alive_players, key=lambda p: p.player_number):
                 role_name = player.role.role_type.value.title()
                 team = "Red" if player.role.team.value == "red" else "Black"
-                print(f"  • Player {player.player_number}: {role_name} ({team})")
+                log.info("game", "  • Player %s: %s (%s)", player.player_number, role_name, team)
         
         # Eliminated players
         eliminated = [p for p in self.game_state.players if not p.is_alive]
         if eliminated:
-            print(f"\nEliminated Players ({len(eliminated)}):")
+            log.info("game", "\nEliminated Players (%s):", len(eliminated))
             for player in sorted(eliminated, key=lambda p: p.player_number):
                 role_name = player.role.role_type.value.title()
                 team = "Red" if player.role.team.value == "red" else "Black"
@@ -347,9 +516,9 @@ class MafiaGame:
                     else:
                         details = reason
                     
-                    print(f"  • Player {player.player_number}: {role_name} ({team}) - {details}")
+                    log.info("game", "  • Player %s: %s (%s) - %s", player.player_number, role_name, team, details)
                 else:
-                    print(f"  • Player {player.player_number}: {role_name} ({team})")
+                    log.info("game", "  • Player %s: %s (%s)", player.player_number, role_name, team)
     
     def get_game_summary(self) -> Dict:
         """Get final game summary as dictionary."""
@@ -374,6 +543,7 @@ Examples:
   python main.py --config configs/simple_llm_agent.yaml   # Use simple LLM agent
   python main.py --config configs/simple_llm_agent.yaml --model gpt-5-nano  # Override model
   python main.py --model gpt-4o-mini                # Override model with default config
+  python main.py --resume run_20241126_011430       # Continue a failed run from its last phase
         """
     )
     parser.add_argument(
@@ -397,6 +567,13 @@ Examples:
         default=None,
         help="LLM model to use (e.g., 'gpt-5-mini', 'gpt-4o-mini', 'gpt-5-nano'). Overrides config file setting."
     )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="RUN",
+        help="Continue a recorded run (e.g. one that failed) from its last checkpoint, with its original config"
+    )
     parser.add_argument(
         "--run-name",
         "-r",
@@ -431,13 +608,22 @@ Examples:
         print(f"Model override: {args.model}")
     print("=" * 60)
     
-    game = MafiaGame(config=config, run_name=args.run_name)
+    if args.resume:
+        print(f"Resuming run: {args.resume}")
+        try:
+            game = MafiaGame.resume(args.resume, model=args.model)
+        except (FileNotFoundError, ValueError) as e:
+            parser.error(str(e))
+    else:
+        game = MafiaGame(config=config, run_name=args.run_name)
     winner = game.run_game()
     
     # Summary already printed in run_game()
     # Additional detailed summary available via game.get_game_summary()
     
     if game.run_recorder:
+        # Write out anything still buffered before reporting the run
+        game.run_recorder.close()
         run_path = game.run_recorder.get_run_path()
         if run_path:
             print(f"\nGame events saved to: {run_path}")
@@ -0,0 +1,275 @@
+"""
+Replay recorded runs through the current engine and report where they diverge.
+
+Each run is played again with a ReplayAgent per player, which answers from the
+run's recorded outputs instead of calling an LLM, under the run's recorded config
+(seed, max rounds, ...). The events the replay emits are compared one by one with
+the recorded events; the first mismatch is reported as the divergence. A change
+to the judge, the phase handlers or the event formatting can thus be checked
+against every recorded game, paid or not, in a few milliseconds per game.
+
+Compared are the event types and data, except LLM prompts and reasoning
+("context"), LLM usage and streaming events, and resume markers. Runs that never
+finished are compared up to where their recording ends.
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from main import MafiaGame
+from src.agents import RecordedRun, ReplayAgent
+from src.config.game_config import GameConfig
+from src.web import EventEmitter, RunRecorder
+from src.web.run_archive import RunArchive, is_archived
+
+
+# Events that don't describe the game itself
+IGNORED_EVENTS = ("llm_metadata", "speech_delta", "game_resumed")
+# Event data that depends on the agents rather than the engine
+IGNORED_FIELDS = {"context": None, "game_start": ("agent_types",)}
+
+
+@dataclasses.dataclass
+class Divergence:
+    """First point where a replay differs from its recording."""
+    index: int  # Position among compared events
+    recorded: Optional[Dict[str, Any]]  # Recorded event (None if the replay emitted more events)
+    replayed: Optional[Dict[str, Any]]  # Replayed event (None if the replay stopped early)
+
+    def describe(self) -> str:
+        """One-line description of the divergence."""
+        def show(event: Optional[Dict[str, Any]]) -> str:
+            if event is None:
+                return "nothing"
+            return f"{event['event_type']} {json.dumps(event['data'], sort_keys=True)}"
+        position = ""
+        if self.recorded is not None and "sequence" in self.recorded:
+            position = f" (recorded event #{self.recorded['sequence']})"
+        return f"event {self.index}{position}: recorded {show(self.recorded)}, replayed {show(self.replayed)}"
+
+
+@dataclasses.dataclass
+class ReplayResult:
+    """Outcome of replaying one run."""
+    run: str
+    events_compared: int
+    divergence: Optional[Divergence] = None
+    missing_outputs: List[str] = dataclasses.field(default_factory=list)  # Stood in for (see ReplayAgent)
+    recording_finished: bool = True  # The recording reaches game over
+    duration_ms: float = 0.0
+
+    @property
+    def matches(self) -> bool:
+        """Whether the replay reproduces the recording."""
+        return self.divergence is None
+
+
+def load_recording(run_dir: Path) -> RecordedRun:
+    """
+    Read a run's events (plain or archived) and metadata.
+
+    Raises:
+        FileNotFoundError: If the run has no events
+    """
+    metadata = {}
+    metadata_file = run_dir / "metadata.json"
+    if metadata_file.exists():
+        with open(metadata_file, 'r') as f:
+            metadata = json.load(f)
+
+    events_file = run_dir / "events.jsonl"
+    if events_file.exists():
+        with open(events_file, 'r') as f:
+            events = [json.loads(line) for line in f if line.strip()]
+    elif is_archived(run_dir):
+        # Prompts aren't compared, so they are never decoded
+        events = list(RunArchive(run_dir).iter_events(with_prompts=False))
+    else:
+        raise FileNotFoundError(f"No events in {run_dir}")
+    return RecordedRun(events, metadata)
+
+
+def replay_config(metadata: Dict[str, Any]) -> GameConfig:
+    """
+    Rebuild a run's game config from its metadata.
+
+    Raises:
+        ValueError: If the metadata has no random seed (roles can't be reproduced)
+    """
+    recorded = metadata.get("config") or {}
+    if recorded.get("random_seed") is None:
+        raise ValueError("Run metadata has no random_seed")
+    known = {f.name for f in dataclasses.fields(GameConfig)}
+    config = GameConfig(**{key: value for key, value in recorded.items() if key in known})
+    if config.agent_types:
+        config.agent_types = {int(player): agent_type for player, agent_type in config.agent_types.items()}
+    config.headless = True
+    config.llm_cache = False
+    return config
+
+
+def comparable_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Normalize events for comparison: drop ignored events and fields, and JSON-round-trip the data."""
+    comparable = []
+    for event in events:
+        event_type = event["event_type"]
+        if event_type in IGNORED_EVENTS:
+            continue
+        data = {key: value for key, value in (event.get("data") or {}).items()
+                if key != "context" and key not in (IGNORED_FIELDS.get(event_type) or ())}
+        normalized = {"event_type": event_type, "data": json.loads(json.dumps(data))}
+        if "sequence" in event:
+            normalized["sequence"] = event["sequence"]
+        comparable.append(normalized)
+    return comparable
+
+
+def find_divergence(recorded: List[Dict[str, Any]], replayed: List[Dict[str, Any]],
+                    recording_finished: bool = True) -> Optional[Divergence]:
+    """
+    Find the first mismatch between comparable recorded and replayed events.
+
+    Args:
+        recorded: Comparable recorded events
+        replayed: Comparable replayed events
+        recording_finished: Whether the recording is complete; if not, replayed events
+            past its end are not compared
+
+    Returns:
+        The first divergence, or None if the events match
+    """
+    for index, recorded_event in enumerate(recorded):
+        if index >= len(replayed):
+            return Divergence(index, recorded_event, None)
+        replayed_event = replayed[index]
+        if (recorded_event["event_type"], recorded_event["data"]) != (replayed_event["event_type"], replayed_event["data"]):
+            return Divergence(index, recorded_event, replayed_event)
+    if recording_finished and len(replayed) > len(recorded):
+        return Divergence(len(recorded), None, replayed[len(recorded)])
+    return None
+
+
+def replay_run(run_dir: Path) -> ReplayResult:
+    """
+    Replay a recorded run through the current engine.
+
+    Args:
+        run_dir: Run directory
+
+    Returns:
+        Replay result with the first divergence, if any
+
+    Raises:
+        FileNotFoundError: If the run has no events
+        ValueError: If the run can't be replayed (no random seed in its metadata)
+    """
+    recording = load_recording(run_dir)
+    config = replay_config(recording.metadata)
+    start_time = time.perf_counter()
+
+    # A recorder without a created run records nothing; events are captured instead
+    event_emitter = EventEmitter(RunRecorder(str(run_dir.parent)))
+    # Agents are set up as dummies, then swapped for replay agents bound to the same players
+    setup_config = dataclasses.replace(config, agent_type="dummy_agent", agent_types=None)
+    game = MafiaGame(config=setup_config, event_emitter=event_emitter)
+    game.config = config
+    game.agents = {
+        number: ReplayAgent(agent.player, recording, config)
+        for number, agent in game.agents.items()
+    }
+
+    with event_emitter.capture_events() as captured, contextlib.redirect_stdout(io.StringIO()):
+        game.run_game()
+    duration_ms = (time.perf_counter() - start_time) * 1000
+
+    recorded = comparable_events(recording.events)
+    replayed = comparable_events([{"event_type": event_type, "data": data} for event_type, data in captured])
+    return ReplayResult(
+        run=run_dir.name,
+        events_compared=min(len(recorded), len(replayed)),
+        divergence=find_divergence(recorded, replayed, recording.finished or recording.fatal_error is not None),
+        missing_outputs=list(recording.missing),
+        recording_finished=recording.finished,
+        duration_ms=round(duration_ms, 3),
+    )
+
+
+def iter_run_dirs(runs_dir: Path, names: List[str]) -> Iterator[Path]:
+    """Run directories to replay: the named runs, or every run in runs_dir."""
+    if names:
+        for name in names:
+            path = Path(name)
+            yield path if path.is_dir() else runs_dir / name
+    else:
+        yield from sorted(d for d in runs_dir.iterdir() if d.is_dir())
+
+
+def main():
+    """Entry point for replaying runs."""
+    parser = argparse.ArgumentParser(
+        description="Replay recorded runs through the current engine and report divergences",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python replay.py                                  # Replay every run in runs/
+  python replay.py run_20241126_011430              # Replay one run
+  python replay.py runs/run_20241126_011430 --verbose
+        """
+    )
+    parser.add_argument(
+        "runs",
+        nargs="*",
+        help="Run names or directories (default: every run in --runs-dir)"
+    )
+    parser.add_argument(
+        "--runs-dir",
+        type=str,
+        default="runs",
+        help="Directory that holds run directories (default: runs)"
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="List agent outputs that were missing from each recording"
+    )
+
+    args = parser.parse_args()
+
+    runs_dir = Path(args.runs_dir)
+    if not args.runs and not runs_dir.is_dir():
+        parser.error(f"Runs directory not found: {runs_dir}")
+
+    replayed = diverged = skipped = 0
+    total_ms = 0.0
+    for run_dir in iter_run_dirs(runs_dir, args.runs):
+        try:
+            result = replay_run(run_dir)
+        except (FileNotFoundError, ValueError) as e:
+            skipped += 1
+            print(f"SKIP     {run_dir.name}: {e}")
+            continue
+        replayed += 1
+        total_ms += result.duration_ms
+        status = "OK" if result.matches else "DIVERGED"
+        note = "" if result.recording_finished else " (recording unfinished)"
+        print(f"{status:<8} {result.run}: {result.events_compared} events in {result.duration_ms:.1f} ms{note}")
+        if not result.matches:
+            diverged += 1
+            print(f"         first divergence at {result.divergence.describe()}")
+        if args.verbose and result.missing_outputs:
+            print(f"         not recorded: {'; '.join(result.missing_outputs)}")
+
+    print(f"\n{replayed} runs replayed ({total_ms:.0f} ms), {diverged} diverged, {skipped} skipped")
+    sys.exit(1 if diverged else 0)
+
+
+if __name__ == "__main__":
+    main()
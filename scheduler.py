@@ -0,0 +1,613 @@
+"""
+Game scheduler: plays a queue of (config, seed) jobs as concurrent games on one event loop.
+
+tournament.py spreads games over processes, which suits CPU-bound dummy games;
+LLM games spend nearly all their time waiting for the API, so a single process
+can keep many of them in flight. GameScheduler keeps up to max_games games
+running, starts the next job as soon as one finishes, and records every game to
+its own run with a RunRecorder, as main.py does.
+
+The games' async LLM requests share one RequestGate (src/agents/llm_clients.py)
+that caps the requests in flight across all of them; the process-wide rate
+limiter still applies the per-minute budgets. At the cap, a freed slot goes to
+the waiting request of the game closest to its end (see game_progress()): a game
+that fails late wastes everything spent on it, so games about to finish are
+served before games that have just started, and less is spent on the games a
+failure (quota exhaustion, an outage) cuts short.
+
+Throughput (games/hour, requests/s, tokens/s) is available at any time from
+stats(), and reported every report_interval seconds to on_progress.
+
+For overnight evaluations, run_batch_tournament() plays all games at once with a
+BatchSession (src/agents/llm_batch.py) instead: the games advance in lockstep and
+each step's requests go to the provider's Batch API as one job. Its state
+directory holds the batch jobs and results.jsonl, and games are recorded under
+names derived from their seeds, so running it again on the same directory
+resumes every unfinished or failed game from its last phase checkpoint.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Try to load from .env file if it exists
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass  # python-dotenv not installed, that's okay
+
+from main import MafiaGame
+from src.agents.llm_batch import BatchSession, bind_batch_session, unbind_batch_session
+from src.agents.llm_clients import RequestGate, bind_request_gate, unbind_request_gate
+from src.config.game_config import GameConfig
+from src.config.config_loader import load_config
+from src.core import GameState
+from src.core.checkpoint import CHECKPOINT_FILE
+from src.web import EventEmitter, RunRecorder
+from src.web.run_archive import RunArchive, is_archived
+from src.web.run_catalog import RunSummary, summarize_run
+from tournament import game_result, parse_seed_range, summarize_results
+
+
+# What run_game() returns for each winner
+_WINNER_NAMES = {"red": "Civilians (Red Team)", "black": "Mafia (Black Team)"}
+
+@dataclasses.dataclass
+class GameJob:
+    """A game to play: its configuration and seed."""
+    config: GameConfig
+    seed: int
+    run_name: Optional[str] = None  # Run directory name (default: timestamp-based)
+    resume: bool = False  # Continue run_name from its checkpoint (with the run's own config)
+
+
+@dataclasses.dataclass
+class SchedulerStats:
+    """Throughput snapshot of a GameScheduler."""
+    elapsed_s: float
+    games_finished: int
+    games_failed: int
+    games_in_flight: int
+    requests: int  # LLM requests sent (cache hits aren't requests)
+    requests_in_flight: int
+    requests_waiting: int  # Requests queued for a slot
+    tokens: int  # Tokens reported by finished requests
+
+    def _rate(self, count: float) -> float:
+        return count / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def games_per_hour(self) -> float:
+        return self._rate(self.games_finished) * 3600
+
+    @property
+    def requests_per_second(self) -> float:
+        return self._rate(self.requests)
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self._rate(self.tokens)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fields and rates as a JSON-serializable dictionary."""
+        stats = dataclasses.asdict(self)
+        stats.update(games_per_hour=self.games_per_hour, requests_per_second=self.requests_per_second,
+                     tokens_per_second=self.tokens_per_second)
+        return stats
+
+    def __str__(self) -> str:
+        return (f"[{self.elapsed_s:7.1f}s] {self.games_finished} games ({self.games_failed} failed, "
+                f"{self.games_in_flight} in flight) | {self.games_per_hour:.1f} games/h | "
+                f"{self.requests_per_second:.2f} req/s ({self.requests_in_flight} in flight, "
+                f"{self.requests_waiting} waiting) | {self.tokens_per_second:.0f} tok/s")
+
+
+def game_progress(game_state: GameState) -> float:
+    """
+    How far a game is towards its end, from 0 (just started) to 1.
+
+    The larger of the share of players eliminated (every elimination brings a
+    team win closer) and the share of the max_rounds limit played.
+
+    Args:
+        game_state: State of the game
+
+    Returns:
+        Progress between 0 and 1
+    """
+    eliminated = 1 - sum(game_state.count_alive()) / len(game_state.players)
+    rounds = game_state.day_number / game_state.max_rounds if game_state.max_rounds else 0.0
+    return min(1.0, max(eliminated, rounds))
+
+
+class GameScheduler:
+    """Plays game jobs concurrently under a global cap on in-flight LLM requests."""
+
+    def __init__(self, max_games: int = 8, max_llm_requests: Optional[int] = None,
+                 runs_dir: Optional[str] = "runs",
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 on_progress: Optional[Callable[[SchedulerStats], None]] = None,
+                 report_interval: float = 10.0, batch: Optional[BatchSession] = None):
+        """
+        Args:
+            max_games: Games in flight at once
+            max_llm_requests: LLM requests in flight at once across all games (unlimited if None)
+            runs_dir: Directory to record each game's run in (games aren't recorded if None)
+            on_result: Called with each game's result dictionary as the game finishes
+            on_progress: Called with a stats() snapshot every report_interval seconds and at the end
+            report_interval: Seconds between on_progress reports
+            batch: Send the games' LLM requests as batch jobs through this session instead
+                (offline mode, see run_batch_tournament())
+        """
+        if max_games < 1:
+            raise ValueError(f"max_games must be at least 1, got {max_games}")
+        if max_llm_requests is not None and max_llm_requests < 1:
+            raise ValueError(f"max_llm_requests must be at least 1, got {max_llm_requests}")
+        self.max_games = max_games
+        self.gate = RequestGate(max_llm_requests)
+        self.runs_dir = runs_dir
+        self.on_result = on_result
+        self.on_progress = on_progress
+        self.report_interval = report_interval
+        self.batch = batch
+        self.games_finished = 0
+        self.games_failed = 0
+        self.games_in_flight = 0
+        self._start: Optional[float] = None
+
+    def stats(self) -> SchedulerStats:
+        """Throughput so far (rates are over the time since run_async() started)."""
+        elapsed = time.perf_counter() - self._start if self._start is not None else 0.0
+        return SchedulerStats(
+            elapsed_s=elapsed,
+            games_finished=self.games_finished,
+            games_failed=self.games_failed,
+            games_in_flight=self.games_in_flight,
+            requests=self.gate.requests + (self.batch.requests if self.batch else 0),
+            requests_in_flight=self.gate.in_flight,
+            requests_waiting=self.gate.waiting,
+            tokens=self.gate.tokens + (self.batch.tokens if self.batch else 0),
+        )
+
+    def run(self, jobs: Iterable[Union[GameJob, Tuple[GameConfig, int]]]) -> List[Dict[str, Any]]:
+        """Play the jobs on a new event loop (see run_async())."""
+        return asyncio.run(self.run_async(jobs))
+
+    async def run_async(self, jobs: Iterable[Union[GameJob, Tuple[GameConfig, int]]]) -> List[Dict[str, Any]]:
+        """
+        Play every job, keeping up to max_games games in flight.
+
+        Jobs are taken from the iterable lazily, as slots free up, so it may be a
+        generator that produces them on demand. An exception other than a failed
+        game (a game that fails ends with phase "failed" and is counted) cancels
+        the other games and is raised.
+
+        Args:
+            jobs: GameJobs or (config, seed) pairs
+
+        Returns:
+            Per-game result dictionaries (those of tournament.py plus "run_name"), in completion order
+        """
+        self._start = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        pending = iter(jobs)
+        workers = [asyncio.ensure_future(self._work(pending, results)) for _ in range(self.max_games)]
+        helpers = [asyncio.ensure_future(self._report())] if self.on_progress else []
+        if self.batch is not None:
+            helpers.append(asyncio.ensure_future(self.batch.serve()))
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers + helpers:
+                task.cancel()
+        if self.on_progress:
+            self.on_progress(self.stats())
+        return results
+
+    async def _work(self, pending: Iterator[Union[GameJob, Tuple[GameConfig, int]]],
+                    results: List[Dict[str, Any]]) -> None:
+        """Play jobs one after another until there are none left."""
+        for job in pending:
+            if not isinstance(job, GameJob):
+                job = GameJob(*job)
+            result = await self.play(job)
+            results.append(result)
+            if self.on_result:
+                self.on_result(result)
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.on_progress(self.stats())
+
+    async def play(self, job: GameJob) -> Dict[str, Any]:
+        """
+        Play one job through the scheduler's request gate (or batch session).
+
+        Args:
+            job: Game to play
+
+        Returns:
+            Result dictionary of the game
+        """
+        try:
+            game = self._create_game(job)
+        except Exception as e:
+            # A job that can't be set up fails on its own instead of stopping the other games
+            self.games_finished += 1
+            self.games_failed += 1
+            return setup_failed_result(job, e)
+        run_recorder = game.run_recorder
+        run_path = run_recorder.get_run_path()
+
+        self.games_in_flight += 1
+        start_time = time.perf_counter()
+        try:
+            # Requests queued behind the cap are admitted in order of their game's progress
+            gate_token = bind_request_gate(self.gate, lambda: game_progress(game.game_state))
+            batch_token = bind_batch_session(self.batch) if self.batch is not None else None
+            try:
+                result = await game.run_game_async()
+            finally:
+                if batch_token is not None:
+                    unbind_batch_session(batch_token)
+                unbind_request_gate(gate_token)
+        finally:
+            self.games_in_flight -= 1
+            run_recorder.close()
+        duration_ms = (time.perf_counter() - start_time) * 1000
+
+        result = game_result(game, job.seed, result, duration_ms)
+        result["run_name"] = run_path.name if run_path else None
+        self.games_finished += 1
+        if result["phase"] == "failed":
+            self.games_failed += 1
+        return result
+
+    def _create_game(self, job: GameJob) -> MafiaGame:
+        """Set up a job's game, recording it to a new run (or continuing its run if it resumes)."""
+        if job.resume:
+            return MafiaGame.resume(job.run_name, runs_dir=self.runs_dir)
+        # Copy so the seed never mutates a config shared between jobs
+        config = dataclasses.replace(job.config, random_seed=job.seed)
+        if self.runs_dir is not None:
+            run_recorder = RunRecorder(
+                self.runs_dir,
+                buffered=config.buffered_events,
+                flush_every=config.event_flush_count,
+                flush_interval=config.event_flush_interval
+            )
+            run_recorder.create_run(job.run_name)
+        else:
+            # A recorder without a created run discards events
+            run_recorder = RunRecorder()
+        return MafiaGame(config=config, event_emitter=EventEmitter(run_recorder))
+
+
+def setup_failed_result(job: GameJob, error: Exception) -> Dict[str, Any]:
+    """
+    Result dictionary of a job whose game couldn't be set up.
+
+    Args:
+        job: Job that failed
+        error: Error raised while setting it up
+
+    Returns:
+        Failed result in the format of game_result(), with the error message
+    """
+    return {
+        "seed": job.seed,
+        "result": "Failed",
+        "winner": None,
+        "phase": "failed",
+        "days": 0,
+        "nights": 0,
+        "eliminations": [],
+        "mafia": [],
+        "duration_ms": 0.0,
+        "run_name": job.run_name,
+        "error": f"{type(error).__name__}: {error}",
+    }
+
+
+def recorded_result(run_dir: Path, seed: int, summary: RunSummary) -> Dict[str, Any]:
+    """
+    Result dictionary of a finished game, rebuilt from its run's events.
+
+    Args:
+        run_dir: Run directory of the game (plain or archived)
+        seed: Seed it was played with
+        summary: Summary of the run (see summarize_run())
+
+    Returns:
+        Result in the format of game_result(), with the game's run_name
+    """
+    if is_archived(run_dir):
+        events = RunArchive(run_dir).iter_events(with_prompts=False)
+    else:
+        with open(run_dir / "events.jsonl", 'r') as f:
+            events = [json.loads(line) for line in f if line.strip()]
+
+    roles: Dict[int, str] = {}
+    mafia: List[int] = []
+    eliminations = []
+    nights = 0
+    for event in events:
+        event_type = event.get("event_type")
+        data = event.get("data") or {}
+        if event_type == "game_start":
+            mafia = list(data.get("mafia") or [])
+        elif event_type == "game_state_update":
+            for player in (data.get("game_state") or {}).get("players", []):
+                roles[player["number"]] = player["role"].lower()
+        elif event_type == "elimination":
+            eliminations.append({
+                "player": data["player_number"],
+                "role": roles.get(data["player_number"]),
+                "reason": data["reason"],
+                "day_number": data.get("day_number"),
+                "night_number": data.get("night_number"),
+            })
+        elif event_type == "game_over":
+            nights = data.get("night_number") or 0
+
+    return {
+        "seed": seed,
+        "result": _WINNER_NAMES.get(summary.winner, "Draw"),
+        "winner": summary.winner,
+        "phase": "game_over",
+        "days": summary.days,
+        "nights": nights,
+        "eliminations": eliminations,
+        "mafia": mafia,
+        "duration_ms": round(summary.to_row()["duration_ms"] or 0.0, 3),
+        "run_name": run_dir.name,
+    }
+
+
+def batch_tournament_jobs(config: GameConfig, seeds: Iterable[int], state_dir: str,
+                          runs_dir: str = "runs") -> Tuple[List[GameJob], List[Dict[str, Any]]]:
+    """
+    Jobs of a batch tournament that are left to play, and the results of those already finished.
+
+    Each game is recorded as <state dir name>_seed<seed>. A seed whose latest result in
+    results.jsonl finished is done, and so is one whose run finished without its result
+    being written (the session was interrupted just after the game ended). One that
+    failed, or has an unfinished run with a checkpoint, resumes from its checkpoint.
+
+    Args:
+        config: Game configuration
+        seeds: Seeds to play
+        state_dir: Batch state directory
+        runs_dir: Directory runs are recorded in
+
+    Returns:
+        Tuple of (jobs to play, results of finished games)
+    """
+    latest: Dict[int, Dict[str, Any]] = {}
+    results_file = Path(state_dir) / "results.jsonl"
+    if results_file.exists():
+        with open(results_file) as f:
+            for line in f:
+                result = json.loads(line)
+                latest[result["seed"]] = result
+
+    jobs, finished = [], []
+    for seed in seeds:
+        result = latest.get(seed)
+        if result is not None and result["phase"] != "failed":
+            finished.append(result)
+            continue
+        run_name = result["run_name"] if result is not None else f"{Path(state_dir).name}_seed{seed}"
+        run_dir = Path(runs_dir) / run_name
+        if run_dir.is_dir():
+            summary = summarize_run(run_dir)
+            if summary.finished and not summary.failed:
+                finished.append(recorded_result(run_dir, seed, summary))
+                continue
+        resume = (run_dir / CHECKPOINT_FILE).exists()
+        jobs.append(GameJob(config, seed, run_name=run_name, resume=resume))
+    return jobs, finished
+
+
+def run_batch_tournament(config: GameConfig, seeds: Iterable[int], state_dir: str, runs_dir: str = "runs",
+                         client: Any = None, poll_interval: float = 30.0,
+                         on_progress: Optional[Callable[[SchedulerStats], None]] = None,
+                         report_interval: float = 60.0) -> Tuple[List[Dict[str, Any]], GameScheduler]:
+    """
+    Play a tournament offline: all games in lockstep, each step's LLM requests as one batch job.
+
+    Running it again with the same state directory resumes the tournament (see
+    batch_tournament_jobs() and src/agents/llm_batch.py).
+
+    Args:
+        config: Game configuration
+        seeds: Seeds to play
+        state_dir: Directory for batch jobs, results and results.jsonl
+        runs_dir: Directory to record the games in
+        client: AsyncOpenAI client or LocalBatchServer (default: an AsyncOpenAI client for OPENAI_API_KEY)
+        poll_interval: Seconds between status checks of a submitted batch job
+        on_progress: Called with a throughput snapshot every report_interval seconds and at the end
+        report_interval: Seconds between on_progress reports
+
+    Returns:
+        Tuple of (results of every seed, in finishing order, scheduler that played this session's games)
+    """
+    jobs, results = batch_tournament_jobs(config, seeds, state_dir, runs_dir)
+    session = BatchSession(str(Path(state_dir) / "batches"), client=client, poll_interval=poll_interval)
+    with open(Path(state_dir) / "results.jsonl", "a") as f:
+        def write_result(result: Dict[str, Any]) -> None:
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+
+        scheduler = GameScheduler(max_games=max(1, len(jobs)), runs_dir=runs_dir, on_result=write_result,
+                                  on_progress=on_progress, report_interval=report_interval, batch=session)
+        results += scheduler.run(jobs)
+    return results, scheduler
+
+
+def print_summary(results: List[Dict[str, Any]], scheduler: GameScheduler) -> None:
+    """Print the throughput of a scheduler run and the win rates of its results."""
+    stats = scheduler.stats()
+    summary = summarize_results(results)
+    print("=" * 60)
+    print(f"Games played: {summary['games']} in {stats.elapsed_s:.1f}s ({stats.games_per_hour:.0f} games/hour)")
+    print(f"LLM requests: {stats.requests} ({stats.requests_per_second:.2f}/s, "
+          f"peak {scheduler.gate.peak_in_flight} in flight, {scheduler.gate.waited_seconds:.1f}s queued)")
+    print(f"Tokens: {stats.tokens} ({stats.tokens_per_second:.0f}/s)")
+    print(f"Civilians (Red) wins: {summary['red_wins']} ({summary['red_win_rate']:.1%})")
+    print(f"Mafia (Black) wins: {summary['black_wins']} ({summary['black_win_rate']:.1%})")
+    print(f"Failed: {summary['failed']}")
+    print(f"Average days: {summary['avg_days']:.2f}")
+    print("=" * 60)
+
+
+def main():
+    """Entry point for running scheduled games."""
+    parser = argparse.ArgumentParser(
+        description="Play many Mafia games concurrently on one event loop under a global LLM request cap",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scheduler.py --config configs/simple_llm_agent.yaml --seeds 0:50 --games 16 --max-requests 48
+  python scheduler.py --config configs/simple_llm_agent.yaml --seeds 100 --games 32 --no-record
+  python scheduler.py --config configs/dummy_agent.yaml --seeds 0:200 --games 8 --report-interval 1
+  python scheduler.py --config configs/simple_llm_agent.yaml --seeds 0:200 --batch tournaments/overnight
+        """
+    )
+    parser.add_argument(
+        "--config",
+        "-c",
+        type=str,
+        default=None,
+        help="Path to YAML configuration file (default: use default config)"
+    )
+    parser.add_argument(
+        "--seeds",
+        "-s",
+        type=parse_seed_range,
+        default=parse_seed_range("100"),
+        help="Seed range 'START:END' (END exclusive) or a game count 'N' for seeds 0..N-1 (default: 100)"
+    )
+    parser.add_argument(
+        "--games",
+        "-g",
+        type=int,
+        default=8,
+        help="Games in flight at once (default: 8)"
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=None,
+        help="LLM requests in flight at once across all games (default: unlimited)"
+    )
+    parser.add_argument(
+        "--model",
+        "-m",
+        type=str,
+        default=None,
+        help="LLM model to use. Overrides config file setting."
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="Aggregate results file (JSON Lines, default: tournaments/scheduled_<timestamp>.jsonl)"
+    )
+    parser.add_argument(
+        "--runs-dir",
+        type=str,
+        default="runs",
+        help="Directory to record each game's run in (default: runs)"
+    )
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="Don't record runs; only write the aggregate results file"
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between throughput reports (default: 10)"
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Offline mode: play all games in lockstep and send each step's LLM requests as one Batch API "
+             "job, keeping state and results.jsonl in DIR (run again with the same DIR to resume)"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30.0,
+        help="Batch mode: seconds between status checks of a submitted batch job (default: 30)"
+    )
+
+    args = parser.parse_args()
+    if args.batch and args.no_record:
+        parser.error("--batch resumes games from their recorded runs, so it can't be used with --no-record")
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.max_requests is not None and args.max_requests < 1:
+        parser.error("--max-requests must be at least 1")
+
+    config = load_config(args.config) if args.config else GameConfig()
+    if args.model is not None:
+        config.llm_model = args.model
+    # Interleaved console output of concurrent games is unreadable; runs record everything
+    config.headless = True
+    seeds: range = args.seeds
+
+    if args.batch:
+        print(f"Batch tournament: {len(seeds)} games (seeds {seeds.start}..{seeds.stop - 1}), state in {args.batch}")
+        results, scheduler = run_batch_tournament(config, seeds, args.batch, runs_dir=args.runs_dir,
+                                                  poll_interval=args.poll_interval, on_progress=print,
+                                                  report_interval=args.report_interval)
+        print_summary(results, scheduler)
+        print(f"Batch steps: {scheduler.batch.steps}, requests answered from earlier steps: {scheduler.batch.reused}")
+        return
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = Path("tournaments") / f"scheduled_{timestamp}.jsonl"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    cap = args.max_requests if args.max_requests is not None else "unlimited"
+    print(f"Scheduler: {len(seeds)} games (seeds {seeds.start}..{seeds.stop - 1}), "
+          f"{args.games} in flight, LLM requests in flight: {cap}")
+    if args.config:
+        print(f"Using config: {args.config}")
+    print(f"Writing results to: {output_path}")
+
+    with open(output_path, "w") as f:
+        def write_result(result: Dict[str, Any]) -> None:
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+
+        scheduler = GameScheduler(
+            max_games=args.games,
+            max_llm_requests=args.max_requests,
+            runs_dir=None if args.no_record else args.runs_dir,
+            on_result=write_result,
+            on_progress=print,
+            report_interval=args.report_interval,
+        )
+        results = scheduler.run(GameJob(config, seed) for seed in seeds)
+    print_summary(results, scheduler)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Agent implementations for Mafia game players.
 from .base_agent import BaseAgent, AgentContext
 from .llm_agent import SimpleLLMAgent
 from .dummy_agent import DummyAgent
+from .replay_agent import ReplayAgent, RecordedRun
 from .exceptions import LLMEmptyResponseError
 
-__all__ = ['BaseAgent', 'AgentContext', 'SimpleLLMAgent', 'DummyAgent', 'LLMEmptyResponseError']
+__all__ = ['BaseAgent', 'AgentContext', 'SimpleLLMAgent', 'DummyAgent', 'ReplayAgent', 'RecordedRun', 'LLMEmptyResponseError']
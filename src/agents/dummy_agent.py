@@ -21,18 +21,41 @@ class DummyAgent(BaseAgent):
     
     def __init__(self, player: Player, config: GameConfig = default_config):
         super().__init__(player, config)
+        self._init_game_state()
+
+    def _init_game_state(self) -> None:
+        """Seed the RNG and clear per-game tracking for the current player/config."""
         # Use seed from config if provided, otherwise use None (non-deterministic)
-        seed = config.random_seed
+        seed = self.config.random_seed
         if seed is not None:
             # Combine seed with player number to ensure each player has different but reproducible randomness
-            self.random = random.Random(seed + player.player_number)
+            self.random = random.Random(seed + self.player.player_number)
         else:
             self.random = random.Random()
         # Track which players have been checked (for sheriff and don)
         self.checked_players: set[int] = set()
         # Track nominated player for current day (to vote for them later)
         self.current_day_nomination: Dict[int, int] = {}  # {day_number: nominated_player}
-    
+
+    def reset(self, player: Player, config: GameConfig = default_config) -> None:
+        """Rebind to a new game, reseeding the RNG exactly as a fresh agent would."""
+        super().reset(player, config)
+        self._init_game_state()
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """Checked players, nominations and the RNG state (so a resumed game makes the same choices)."""
+        return {
+            "random": self.random.getstate(),
+            "checked_players": set(self.checked_players),
+            "current_day_nomination": dict(self.current_day_nomination),
+        }
+
+    def restore_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        """Restore state saved with checkpoint_state()."""
+        self.random.setstate(state["random"])
+        self.checked_players = set(state["checked_players"])
+        self.current_day_nomination = dict(state["current_day_nomination"])
+
     def get_day_speech(self, context: AgentContext) -> str:
         """
         Generate day speech - nominate a random alive player.
@@ -108,7 +131,7 @@ class DummyAgent(BaseAgent):
         # Night numbers are sequential (1, 2, 3...), player numbers are scattered (1-10)
         # If ALL keys are in alive players (or empty dict), it's likely current kill claims
         # If keys are sequential starting from 1, it's likely night numbers
-        alive_player_numbers = {p.player_number for p in context.game_state.get_alive_players()}
+        alive_player_numbers = set(context.game_state.get_alive_numbers())
         if isinstance(kill_claims, dict):
             keys = list(kill_claims.keys())
             if len(keys) == 0:
@@ -127,8 +150,7 @@ class DummyAgent(BaseAgent):
         # If Don is eliminated and we're being asked to make a decision
         if is_kill_decision_call and self.player.is_mafia and self.player.role.role_type != RoleType.DON:
             # Check if Don is still alive
-            don = next((p for p in context.game_state.get_mafia_players() 
-                       if p.role.role_type == RoleType.DON and p.is_alive), None)
+            don = context.game_state.get_alive_player_by_role(RoleType.DON)
             
             # If Don is eliminated, this mafia player makes the decision
             if not don and "decide_kill" in context.available_actions:
@@ -170,7 +192,7 @@ class DummyAgent(BaseAgent):
             # Night numbers are sequential (1, 2, 3...), player numbers are scattered (1-10)
             # If ALL keys are in alive players, it's likely current kill claims
             # If keys are sequential starting from 1, it's likely night numbers
-            alive_player_numbers = {p.player_number for p in context.game_state.get_alive_players()}
+            alive_player_numbers = set(context.game_state.get_alive_numbers())
             if is_kill_decision_context:
                 # Explicitly marked as kill decision call by process_mafia_kill
                 is_kill_decision_call = True
@@ -3,10 +3,11 @@ Strategic LLM Agent implementation using OpenAI API.
 Implements strategic decision-making based on game analysis learnings.
 """
 
+import contextlib
 import os
 import re
 import time
-from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from typing import Dict, Any, Iterator, List, Optional, Tuple, TYPE_CHECKING
 
 try:
     from openai import AsyncOpenAI
@@ -17,8 +18,15 @@ except ImportError:
 
 from .base_agent import BaseAgent, AgentContext
 from .exceptions import LLMEmptyResponseError
+from .response_cache import CachedResponse, get_response_cache
+from .llm_clients import get_client, get_async_client, get_rate_limiter, record_request_tokens, request_slot
+from .llm_batch import BatchSession, active_batch_session
+from .prompt_segments import SegmentedPrompt, build_segments
+from .retry import get_retry_policy
+from .streaming import SpeechStream
 from .xml_formatter import format_game_history_xml
 from ..core import Player, GamePhase, RoleType
+from ..core.profiler import profiled
 from ..config.game_config import GameConfig, default_config
 
 if TYPE_CHECKING:
@@ -28,6 +36,7 @@ if TYPE_CHECKING:
 SYSTEM_MESSAGE = "You are a strategic player in a Mafia game. Make decisions based on the information provided."
 SPEECH_ENDINGS = ("PASS", "THANK YOU")
 NIGHT_EVENT_OFFSET = 1000  # Used to sort night events after day events
+PROMPT_CACHE_KEY = "mafia-game"  # Provider prompt-cache routing key for the cache_friendly layout
 
 
 class SimpleLLMAgent(BaseAgent):
@@ -52,6 +61,7 @@ class SimpleLLMAgent(BaseAgent):
         self.temperature = config.llm_temperature
         self.reasoning_effort = config.reasoning_effort
         self.event_emitter = event_emitter
+        self.response_cache = get_response_cache(config)
         
         # Initialize OpenAI client if available
         if OpenAI is None:
@@ -69,17 +79,60 @@ class SimpleLLMAgent(BaseAgent):
                 raise ValueError("OPENAI_API_KEY environment variable not set")
             # In test environment, set clients to None (methods will be mocked anyway)
             self.client = None
-            self.async_client = None
         else:
-            self.client = OpenAI(api_key=api_key)
-            self.async_client = AsyncOpenAI(api_key=api_key) if AsyncOpenAI else None
+            # One pooled client per model is shared by every agent (see llm_clients)
+            self.client = get_client(self.model, api_key)
+        self._api_key = api_key
+        self._async_client = None  # Explicit override; otherwise resolved per event loop
+        self.rate_limiter = get_rate_limiter(config)
+        self.retry_policy = get_retry_policy(config, self.model)
         
         # Track strategic information
         self.checked_players: set[int] = set()  # For sheriff/don
         
         # Store last reasoning from LLM calls (for event emission)
         self.last_reasoning: Optional[str] = None
+
+    def reset(self, player: Player, config: GameConfig = default_config) -> None:
+        """Rebind to a new game, keeping the OpenAI clients but clearing per-game state."""
+        super().reset(player, config)
+        self.model = config.llm_model or "gpt-5-mini"
+        self.temperature = config.llm_temperature
+        self.reasoning_effort = config.reasoning_effort
+        self.response_cache = get_response_cache(config)
+        self.rate_limiter = get_rate_limiter(config)
+        self.retry_policy = get_retry_policy(config, self.model)
+        if self._api_key:
+            self.client = get_client(self.model, self._api_key)
+        self.checked_players = set()
+        self.last_reasoning = None
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """Checked players (everything else the agent knows is in the game state)."""
+        return {"checked_players": set(self.checked_players)}
+
+    def restore_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        """Restore state saved with checkpoint_state()."""
+        self.checked_players = set(state["checked_players"])
+    
+    @property
+    def async_client(self) -> Optional['AsyncOpenAI']:
+        """
+        Async client for the running event loop.
+        
+        Shared by all agents using this model on the loop; None in test environments
+        without an API key unless one was assigned explicitly.
+        """
+        if self._async_client is not None:
+            return self._async_client
+        if not self._api_key:
+            return None
+        return get_async_client(self.model, self._api_key)
     
+    @async_client.setter
+    def async_client(self, client: Optional['AsyncOpenAI']) -> None:
+        self._async_client = client
+
     def _build_api_params(self, prompt: str, max_tokens: Optional[int], temperature: Optional[float]) -> Dict[str, Any]:
         """
         Build API parameters for OpenAI Responses API calls.
@@ -138,22 +191,47 @@ class SimpleLLMAgent(BaseAgent):
         if max_tokens is not None:
             api_params["max_output_tokens"] = max_tokens
         
+        # Route every agent's requests to the same prompt cache so the shared prefix is reused
+        if self.config.prompt_layout == "cache_friendly":
+            api_params["prompt_cache_key"] = PROMPT_CACHE_KEY
+        
         # gpt-5 models only support default temperature (1), don't set custom temperature
         if "gpt-5" in self.model and "temperature" in api_params:
             del api_params["temperature"]
         
         return api_params
     
-    def _process_llm_response(self, response: Any, max_tokens: Optional[int], latency_ms: float) -> str:
+    def _process_llm_response(self, response: Any, max_tokens: Optional[int], latency_ms: float,
+                              time_to_first_token_ms: Optional[float] = None) -> str:
         """
-        Process Responses API response and extract content and reasoning from structured JSON output.
-        The model is instructed to return JSON with "response" and "reasoning" fields.
-        Stores reasoning in self.last_reasoning for later use.
+        Process Responses API response: extract content and reasoning, then emit usage metadata.
         
         Args:
             response: OpenAI Responses API response object
             max_tokens: Maximum tokens requested
             latency_ms: Request latency in milliseconds
+            time_to_first_token_ms: Delay until the first output text (streamed calls only)
+            
+        Returns:
+            Extracted content string (from structured output's "response" field)
+            
+        Raises:
+            LLMEmptyResponseError: If response is empty or invalid
+        """
+        content = self._extract_llm_response(response)
+        # Emit metadata (Responses API uses input_tokens/output_tokens)
+        self._emit_usage(self._get_usage(response), latency_ms,
+                         time_to_first_token_ms=time_to_first_token_ms)
+        return content
+    
+    def _extract_llm_response(self, response: Any) -> str:
+        """
+        Extract content and reasoning from a Responses API response's structured JSON output.
+        The model is instructed to return JSON with "response" and "reasoning" fields.
+        Stores reasoning in self.last_reasoning for later use.
+        
+        Args:
+            response: OpenAI Responses API response object
             
         Returns:
             Extracted content string (from structured output's "response" field)
@@ -258,68 +336,235 @@ class SimpleLLMAgent(BaseAgent):
         else:
             self.last_reasoning = None
         
-        # Emit metadata (Responses API uses input_tokens/output_tokens)
-        if self.event_emitter and hasattr(response, 'usage') and response.usage:
-            usage = response.usage
-            # Responses API uses input_tokens and output_tokens
-            prompt_tokens = getattr(usage, 'input_tokens', None) or getattr(usage, 'prompt_tokens', 0) or 0
-            completion_tokens = getattr(usage, 'output_tokens', None) or getattr(usage, 'completion_tokens', 0) or 0
-            total_tokens = getattr(usage, 'total_tokens', 0) or 0
-            
-            # Extract reasoning tokens if available (for reasoning models like gpt-5.2)
-            reasoning_tokens = getattr(usage, 'reasoning_tokens', None) or 0
-            
-            # Get reasoning effort level that was used in the API call
-            reasoning_effort_used = None
-            if "gpt-5" in self.model and self.reasoning_effort:
-                reasoning_effort_used = self.reasoning_effort.lower()
+        return content
+    
+    def _get_usage(self, response: Any) -> Optional[Dict[str, Any]]:
+        """
+        Extract token usage from a Responses API response.
+        
+        Args:
+            response: OpenAI Responses API response object
             
-            # If total_tokens is not available, try to calculate it
-            if total_tokens == 0 and (prompt_tokens > 0 or completion_tokens > 0):
-                total_tokens = prompt_tokens + completion_tokens
+        Returns:
+            Dictionary with prompt/completion/total/reasoning/cached token counts, or
+            None if the response has no usage
+        """
+        if not hasattr(response, 'usage') or not response.usage:
+            return None
+        usage = response.usage
+        # Responses API uses input_tokens and output_tokens
+        prompt_tokens = getattr(usage, 'input_tokens', None) or getattr(usage, 'prompt_tokens', 0) or 0
+        completion_tokens = getattr(usage, 'output_tokens', None) or getattr(usage, 'completion_tokens', 0) or 0
+        total_tokens = getattr(usage, 'total_tokens', 0) or 0
+        
+        # Extract reasoning tokens if available (for reasoning models like gpt-5.2)
+        reasoning_tokens = getattr(usage, 'reasoning_tokens', None) or 0
+        
+        # Input tokens served from the provider's prompt cache (billed at a discount)
+        input_details = getattr(usage, 'input_tokens_details', None) or getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(input_details, 'cached_tokens', None) or 0
+        
+        # If total_tokens is not available, try to calculate it
+        if total_tokens == 0 and (prompt_tokens > 0 or completion_tokens > 0):
+            total_tokens = prompt_tokens + completion_tokens
+        
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+            "reasoning_tokens": reasoning_tokens,
+            "cached_tokens": cached_tokens
+        }
+    
+    def _emit_usage(self, usage: Optional[Dict[str, Any]], latency_ms: float, cache_hit: Optional[bool] = None,
+                    time_to_first_token_ms: Optional[float] = None) -> None:
+        """
+        Emit LLM call metadata for a response (fresh or served from the cache).
+        
+        Args:
+            usage: Token counts from _get_usage (nothing is emitted if None)
+            latency_ms: Request latency in milliseconds
+            cache_hit: True/False when the response cache is enabled, None otherwise
+            time_to_first_token_ms: Delay until the first output text (streamed calls only)
+        """
+        if not self.event_emitter or usage is None:
+            return
+        
+        # Get reasoning effort level that was used in the API call
+        reasoning_effort_used = None
+        if "gpt-5" in self.model and self.reasoning_effort:
+            reasoning_effort_used = self.reasoning_effort.lower()
+        
+        cache_stats = self.response_cache.stats() if self.response_cache is not None else None
+        self.event_emitter.emit_llm_metadata(
+            self.player.player_number,
+            "llm_api_call",
+            usage["prompt_tokens"],
+            usage["completion_tokens"],
+            usage["total_tokens"],
+            latency_ms,
+            self.model,
+            reasoning_tokens=usage["reasoning_tokens"],
+            reasoning_effort=reasoning_effort_used,
+            cached_tokens=usage.get("cached_tokens", 0),
+            cache_hit=cache_hit,
+            cache_hits=cache_stats["hits"] if cache_stats else None,
+            cache_misses=cache_stats["misses"] if cache_stats else None,
+            time_to_first_token_ms=time_to_first_token_ms
+        )
+    
+    def _get_cached_response(self, api_params: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look a request up in the response cache.
+        
+        On a hit the cached reasoning is restored and the original usage is emitted
+        again (marked as a cache hit), exactly as if the API had been called.
+        
+        Args:
+            api_params: Parameters that would be sent to the Responses API
             
-            self.event_emitter.emit_llm_metadata(
+        Returns:
+            Tuple of (cache key, cached content); both None if caching is disabled,
+            content None on a miss
+        """
+        if self.response_cache is None:
+            return None, None
+        start_time = time.time()
+        key = self.response_cache.make_key(api_params)
+        cached = self.response_cache.get(key)
+        if cached is None:
+            return key, None
+        self.last_reasoning = cached.reasoning
+        self._emit_usage(cached.usage, (time.time() - start_time) * 1000, cache_hit=True)
+        return key, cached.content
+    
+    @contextlib.contextmanager
+    def _wrap_api_errors(self, request: str = "LLM API call") -> Iterator[None]:
+        """
+        Turn any error of an LLM request into LLMEmptyResponseError (which passes through as is).
+        
+        Permanent API errors, and transient ones that outlived the retries, are fatal
+        to the game.
+        
+        Args:
+            request: What was sent, for the error message
+        """
+        try:
+            yield
+        except LLMEmptyResponseError:
+            raise
+        except Exception as e:
+            raise LLMEmptyResponseError(
                 self.player.player_number,
                 "llm_api_call",
-                prompt_tokens,
-                completion_tokens,
-                total_tokens,
-                latency_ms,
-                self.model,
-                reasoning_tokens=reasoning_tokens,
-                reasoning_effort=reasoning_effort_used
+                f"{request} failed for Player {self.player.player_number}: {e}"
             )
+    
+    def _complete_response(self, response: Any, max_tokens: Optional[int], latency_ms: float,
+                           cache_key: Optional[str], time_to_first_token_ms: Optional[float] = None) -> str:
+        """
+        Process a fresh API response and store it in the response cache.
         
+        Args:
+            response: OpenAI Responses API response object
+            max_tokens: Maximum tokens requested
+            latency_ms: Request latency in milliseconds
+            cache_key: Key from _get_cached_response (None if caching is disabled)
+            time_to_first_token_ms: Delay until the first output text (streamed calls only)
+            
+        Returns:
+            Extracted content string
+        """
+        if cache_key is None:
+            return self._process_llm_response(response, max_tokens, latency_ms, time_to_first_token_ms)
+        
+        content = self._extract_llm_response(response)
+        usage = self._get_usage(response)
+        # Empty responses are errors for the caller, so never replay them
+        if content:
+            self.response_cache.put(cache_key, CachedResponse(content, self.last_reasoning, usage or {}))
+        self._emit_usage(usage, latency_ms, cache_hit=False, time_to_first_token_ms=time_to_first_token_ms)
         return content
     
+    def _settle_rate_limit(self, estimated_tokens: Optional[int], response: Any) -> None:
+        """
+        Correct the rate limiter's token reservation with the usage the API reported.
+        
+        The usage is also counted by the request gate bound to the game, if any.
+        
+        Args:
+            estimated_tokens: Tokens reserved before the call (None if not rate limited)
+            response: OpenAI Responses API response object
+        """
+        usage = self._get_usage(response)
+        used_tokens = usage["total_tokens"] if usage else None
+        record_request_tokens(used_tokens)
+        if estimated_tokens is None:
+            return
+        self.rate_limiter.settle(estimated_tokens, used_tokens)
+    
     async def _call_llm_async(self, prompt: str, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> str:
         """
         Async version of _call_llm for parallel execution.
         """
+        # Byte-identical requests (seeded replays) are served from the cache without a client
+        api_params = self._build_api_params(prompt, max_tokens, temperature)
+        cache_key, cached = self._get_cached_response(api_params)
+        if cached is not None:
+            return cached
+        
+        # Offline batch mode: the request is answered by the next batch job (see llm_batch)
+        batch = active_batch_session()
+        if batch is not None:
+            return await self._call_llm_batched(batch, api_params, max_tokens, cache_key)
+        
         # If async_client is None (test environment), return empty string (methods will be mocked)
         if self.async_client is None:
             return ""
         
-        try:
-            api_params = self._build_api_params(prompt, max_tokens, temperature)
-            
-            # Track latency
-            start_time = time.time()
-            # Use Responses API (required for gpt-5.2-pro)
-            response = await self.async_client.responses.create(**api_params)
-            latency_ms = (time.time() - start_time) * 1000
+        async def send() -> Tuple[Any, float]:
+            # Hold one of the game's in-flight request slots (if a scheduler caps them) while
+            # queueing under the shared request/token budgets (not counted as latency)
+            async with request_slot():
+                estimated_tokens = None
+                if self.rate_limiter is not None:
+                    estimated_tokens = self.rate_limiter.estimate_tokens(api_params)
+                    await self.rate_limiter.acquire_async(estimated_tokens)
+                
+                # Track latency
+                start_time = time.time()
+                # Use Responses API (required for gpt-5.2-pro)
+                response = await self.async_client.responses.create(**api_params)
+                latency_ms = (time.time() - start_time) * 1000
+                self._settle_rate_limit(estimated_tokens, response)
+                return response, latency_ms
+        
+        with self._wrap_api_errors():
+            # Transient errors are retried with backoff; slow attempts may be hedged
+            response, latency_ms = await self.retry_policy.call_async(send)
+            return self._complete_response(response, max_tokens, latency_ms, cache_key)
+    
+    async def _call_llm_batched(self, batch: BatchSession, api_params: Dict[str, Any], max_tokens: Optional[int],
+                                cache_key: Optional[str]) -> str:
+        """
+        Have a batch session send a request with its next batch job.
+        
+        The latency recorded in llm_metadata is the time until the job's results came back.
+        
+        Args:
+            batch: Session bound to the game
+            api_params: Parameters from _build_api_params
+            max_tokens: Maximum tokens requested
+            cache_key: Key from _get_cached_response (None if caching is disabled)
             
-            return self._process_llm_response(response, max_tokens, latency_ms)
-        except LLMEmptyResponseError:
-            # Re-raise LLM empty response errors
-            raise
-        except Exception as e:
-            # Other API errors are also fatal
-            raise LLMEmptyResponseError(
-                self.player.player_number,
-                "llm_api_call",
-                f"LLM API call failed for Player {self.player.player_number}: {e}"
-            )
+        Returns:
+            LLM response text
+        """
+        start_time = time.time()
+        with self._wrap_api_errors("LLM batch request"):
+            response = await batch.request(api_params)
+        latency_ms = (time.time() - start_time) * 1000
+        return self._complete_response(response, max_tokens, latency_ms, cache_key)
     
     def _call_llm(self, prompt: str, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> str:
         """
@@ -333,30 +578,148 @@ class SimpleLLMAgent(BaseAgent):
         Returns:
             LLM response text
         """
+        # Byte-identical requests (seeded replays) are served from the cache without a client
+        api_params = self._build_api_params(prompt, max_tokens, temperature)
+        cache_key, cached = self._get_cached_response(api_params)
+        if cached is not None:
+            return cached
+        
         # If client is None (test environment), return empty string (methods will be mocked)
         if self.client is None:
             return ""
         
-        try:
-            api_params = self._build_api_params(prompt, max_tokens, temperature)
+        def send() -> Tuple[Any, float]:
+            # Queue under the shared request/token budgets (not counted as latency); the
+            # scheduler's in-flight cap only applies to async calls (see request_slot)
+            estimated_tokens = None
+            if self.rate_limiter is not None:
+                estimated_tokens = self.rate_limiter.estimate_tokens(api_params)
+                self.rate_limiter.acquire(estimated_tokens)
             
             # Track latency
             start_time = time.time()
             # Use Responses API (required for gpt-5.2-pro)
             response = self.client.responses.create(**api_params)
             latency_ms = (time.time() - start_time) * 1000
+            self._settle_rate_limit(estimated_tokens, response)
+            return response, latency_ms
+        
+        with self._wrap_api_errors():
+            # Transient errors are retried with backoff; slow attempts may be hedged
+            response, latency_ms = self.retry_policy.call(send)
+            return self._complete_response(response, max_tokens, latency_ms, cache_key)
+    
+    def _call_llm_for_speech(self, prompt: str, context: AgentContext, is_final: bool = False) -> str:
+        """
+        Call the LLM for a speech, streaming it to the viewer if stream_speeches is enabled.
+        
+        Args:
+            prompt: The prompt to send
+            context: Current game context
+            is_final: Whether this is a final speech after elimination
             
-            return self._process_llm_response(response, max_tokens, latency_ms)
-        except LLMEmptyResponseError:
-            # Re-raise LLM empty response errors
-            raise
-        except Exception as e:
-            # Other API errors are also fatal
-            raise LLMEmptyResponseError(
-                self.player.player_number,
-                "llm_api_call",
-                f"LLM API call failed for Player {self.player.player_number}: {e}"
-            )
+        Returns:
+            LLM response text
+        """
+        if not self.config.stream_speeches:
+            return self._call_llm(prompt)
+        return self._call_llm_streaming(prompt, context.game_state.day_number, is_final)
+    
+    async def _call_llm_for_speech_async(self, prompt: str, context: AgentContext, is_final: bool = False) -> str:
+        """Async version of _call_llm_for_speech (batch jobs aren't streamed)."""
+        if not self.config.stream_speeches or active_batch_session() is not None:
+            return await self._call_llm_async(prompt)
+        return await self._call_llm_streaming_async(prompt, context.game_state.day_number, is_final)
+    
+    def _call_llm_streaming(self, prompt: str, day_number: int, is_final: bool = False,
+                            max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> str:
+        """
+        Call the Responses API in streaming mode, emitting speech_delta events as text arrives.
+        
+        Returns the same content as _call_llm once the stream completes, and records
+        time-to-first-token alongside latency_ms in llm_metadata.
+        
+        Args:
+            prompt: The prompt to send
+            day_number: Current day (for the delta events)
+            is_final: Whether this is a final speech after elimination
+            max_tokens: Maximum tokens in response
+            temperature: Temperature for generation (uses config default if None)
+            
+        Returns:
+            LLM response text
+        """
+        api_params = self._build_api_params(prompt, max_tokens, temperature)
+        cache_key, cached = self._get_cached_response(api_params)
+        if cached is not None:
+            return cached
+        
+        # If client is None (test environment), return empty string (methods will be mocked)
+        if self.client is None:
+            return ""
+        
+        speech_stream = SpeechStream(self.event_emitter, self.player.player_number, day_number, is_final)
+        
+        def send() -> Tuple[Any, float, Optional[float]]:
+            speech_stream.start()
+            estimated_tokens = None
+            if self.rate_limiter is not None:
+                estimated_tokens = self.rate_limiter.estimate_tokens(api_params)
+                self.rate_limiter.acquire(estimated_tokens)
+            
+            start_time = time.time()
+            response = None
+            for event in self.client.responses.create(stream=True, **api_params):
+                response = speech_stream.handle(event) or response
+            if response is None:
+                raise ConnectionError("Response stream ended before completion")
+            latency_ms = (time.time() - start_time) * 1000
+            self._settle_rate_limit(estimated_tokens, response)
+            return response, latency_ms, speech_stream.first_token_ms
+        
+        with self._wrap_api_errors():
+            # Hedging would stream two copies of the speech, so only retry
+            response, latency_ms, first_token_ms = self.retry_policy.call(send, hedge=False)
+            return self._complete_response(response, max_tokens, latency_ms, cache_key, first_token_ms)
+    
+    async def _call_llm_streaming_async(self, prompt: str, day_number: int, is_final: bool = False,
+                                        max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> str:
+        """
+        Async version of _call_llm_streaming.
+        """
+        api_params = self._build_api_params(prompt, max_tokens, temperature)
+        cache_key, cached = self._get_cached_response(api_params)
+        if cached is not None:
+            return cached
+        
+        # If async_client is None (test environment), return empty string (methods will be mocked)
+        if self.async_client is None:
+            return ""
+        
+        speech_stream = SpeechStream(self.event_emitter, self.player.player_number, day_number, is_final)
+        
+        async def send() -> Tuple[Any, float, Optional[float]]:
+            speech_stream.start()
+            async with request_slot():
+                estimated_tokens = None
+                if self.rate_limiter is not None:
+                    estimated_tokens = self.rate_limiter.estimate_tokens(api_params)
+                    await self.rate_limiter.acquire_async(estimated_tokens)
+                
+                start_time = time.time()
+                response = None
+                async for event in await self.async_client.responses.create(stream=True, **api_params):
+                    response = speech_stream.handle(event) or response
+                if response is None:
+                    raise ConnectionError("Response stream ended before completion")
+                latency_ms = (time.time() - start_time) * 1000
+                self._settle_rate_limit(estimated_tokens, response)
+                return response, latency_ms, speech_stream.first_token_ms
+        
+        with self._wrap_api_errors():
+            # Hedging would stream two copies of the speech, so only retry
+            response, latency_ms, first_token_ms = await self.retry_policy.call_async(send, hedge=False)
+            return self._complete_response(response, max_tokens, latency_ms, cache_key, first_token_ms)
     
     def _extract_player_number(self, text: str, context: AgentContext) -> Optional[int]:
         """
@@ -710,9 +1073,40 @@ class SimpleLLMAgent(BaseAgent):
         return formatted
     
     def build_strategic_prompt(self, context: AgentContext, action_type: str) -> str:
+        """
+        Get the strategic prompt for an action, built once per context.
+        
+        Phase handlers capture the prompt an agent sees and the agent then acts
+        on the same context, so the prompt is memoized on the context.
+        
+        Args:
+            context: Current game context
+            action_type: Type of action needed (see _build_strategic_prompt)
+            
+        Returns:
+            Formatted prompt string (its segments are in prompt.segments)
+        """
+        prompt = context.prompts.get(action_type)
+        if prompt is None:
+            prompt = self._build_strategic_prompt(context, action_type)
+            context.prompts[action_type] = prompt
+        return prompt
+    
+    @profiled("build_prompt")
+    def _build_strategic_prompt(self, context: AgentContext, action_type: str) -> SegmentedPrompt:
         """
         Build a strategic prompt based on game analysis learnings.
         
+        The prompt is joined from named segments (see agents.prompt_segments), so
+        recorded runs can store the static rules and guides once.
+        
+        With the "classic" prompt layout, the prompt opens with the player's identity
+        and role. With the "cache_friendly" layout, the same sections are ordered from
+        most to least shared, so provider-side prompt caching can reuse the longest
+        prefix across all agents and successive calls:
+        static rules and response format, then the public history and game state,
+        then role-private information, then the action instruction.
+        
         Args:
             context: Current game context
             action_type: Type of action needed ("speech", "vote", "sheriff_check", "don_check", "kill_claim", "kill_decision")
@@ -720,12 +1114,45 @@ class SimpleLLMAgent(BaseAgent):
         Returns:
             Formatted prompt string
         """
+        if self.config.prompt_layout == "cache_friendly":
+            sections = [
+                ("rules", self._rules_section()),
+                ("response_format", self._response_format_section() + [""]),
+                ("history", self._history_section(context)),
+                ("alive_players", self._alive_players_section(context)),
+                ("game_state", self._game_state_section(context)),
+                ("day_guide", self._day_guide_section(context)),
+                ("identity", self._identity_section() + [""]),
+                ("team", self._team_section()),
+                ("role_guide", self._role_section()),
+                ("check_results", self._check_results_section()),
+                ("action", self._action_section(context, action_type)),
+            ]
+        else:
+            sections = [
+                ("identity", self._identity_section() + [""]),
+                ("rules", self._rules_section()),
+                ("team", self._team_section()),
+                ("role_guide", self._role_section()),
+                ("game_state", self._game_state_section(context)),
+                ("day_guide", self._day_guide_section(context)),
+                ("history", self._history_section(context)),
+                ("alive_players", self._alive_players_section(context)),
+                ("check_results", self._check_results_section()),
+                ("action", self._action_section(context, action_type) + [""]),
+                ("response_format", self._response_format_section()),
+            ]
+        return SegmentedPrompt(build_segments(sections))
+    
+    def _identity_section(self) -> List[str]:
+        """Prompt lines naming the player, role and team."""
         role = self.player.role.role_type.value
         team = self.player.role.team.value
-        
-        prompt_parts = [
-            f"You are Player {self.player.player_number}, a {role} on the {team} team.",
-            "",
+        return [f"You are Player {self.player.player_number}, a {role} on the {team} team."]
+    
+    def _rules_section(self) -> List[str]:
+        """Game rules (identical for every player and call)."""
+        return [
             "GAME RULES:",
             "- Red Team (Civilians) wins when all Mafia are eliminated",
             "- Black Team (Mafia) wins when numbers are equal or Mafia outnumber Civilians",
@@ -737,11 +1164,18 @@ class SimpleLLMAgent(BaseAgent):
             "- IMPORTANT: Once a nomination is made, it cannot be withdrawn",
             "",
         ]
-        
-        # Add role-specific strategic information
+    
+    def _team_section(self) -> List[str]:
+        """The mafia a mafia player knows (private to the player)."""
+        if self.player.is_mafia:
+            return [f"MAFIA TEAM: You know these players are mafia: {self.player.known_mafia}"]
+        return []
+    
+    def _role_section(self) -> List[str]:
+        """Role-specific abilities and strategy (the same for every player with the role)."""
+        prompt_parts: List[str] = []
         if self.player.is_mafia:
             prompt_parts.extend([
-                f"MAFIA TEAM: You know these players are mafia: {self.player.known_mafia}",
                 "STRATEGY:",
                 "- Target active players who might be sheriff or leading civilians",
                 "- Coordinate with your team (you know who they are)",
@@ -772,18 +1206,21 @@ class SimpleLLMAgent(BaseAgent):
                 "- Don't check randomly - use information from voting patterns",
                 "",
             ])
-        
-        # Add game state
+        return prompt_parts
+    
+    def _game_state_section(self, context: AgentContext) -> List[str]:
+        """Current phase, day and alive count (public)."""
         alive_players = context.game_state.get_alive_players()
-        
-        prompt_parts.extend([
+        return [
             f"CURRENT PHASE: {context.current_phase.value}",
             f"DAY: {context.game_state.day_number}, NIGHT: {context.game_state.night_number}",
             f"ALIVE: {len(alive_players)} players",
             "",
-        ])
-        
-        # Add game structure context based on day number
+        ]
+    
+    def _day_guide_section(self, context: AgentContext) -> List[str]:
+        """Guidance for the current day (the same in every game)."""
+        prompt_parts: List[str] = []
         day_num = context.game_state.day_number
         if day_num == 1:
             prompt_parts.extend([
@@ -823,34 +1260,35 @@ class SimpleLLMAgent(BaseAgent):
                 "- The game could end at any moment - be decisive",
                 "",
             ])
-        
-        # Add game history - structured XML format with publicly available information
+        return prompt_parts
+    
+    def _history_section(self, context: AgentContext) -> List[str]:
+        """Public game history in structured XML (the same for every player)."""
         game_history_xml = format_game_history_xml(context, include_current_day=True)
         # Check if game history has actual content (not just empty root tags)
         has_content = game_history_xml.strip() and (
             '<day' in game_history_xml or '<night' in game_history_xml
         )
+        prompt_parts = ["GAME HISTORY (structured format):"]
         if has_content:
-            prompt_parts.append("GAME HISTORY (structured format):")
             # Split XML into lines and indent each line
-            xml_lines = game_history_xml.strip().split('\n')
-            for line in xml_lines:
-                prompt_parts.append(line)
-            prompt_parts.append("")
+            prompt_parts.extend(game_history_xml.strip().split('\n'))
         else:
-            prompt_parts.append("GAME HISTORY (structured format):")
             prompt_parts.append("Game history is empty - no events have occurred yet.")
-            prompt_parts.append("")
-        
-        # Add alive players at the end
-        prompt_parts.extend([
-            "ALIVE PLAYERS:",
-        ])
-        for player in alive_players:
+        prompt_parts.append("")
+        return prompt_parts
+    
+    def _alive_players_section(self, context: AgentContext) -> List[str]:
+        """List of alive players (public)."""
+        prompt_parts = ["ALIVE PLAYERS:"]
+        for player in context.game_state.get_alive_players():
             prompt_parts.append(f"  Player {player.player_number}")
         prompt_parts.append("")
-        
-        # Add check results at the end
+        return prompt_parts
+    
+    def _check_results_section(self) -> List[str]:
+        """The player's own sheriff or don check results (private)."""
+        prompt_parts: List[str] = []
         if self.player.role.role_type == RoleType.SHERIFF and self.player.sheriff_checks:
             prompt_parts.append("YOUR CHECK RESULTS:")
             prompt_parts.extend(self._format_check_results(self.player.sheriff_checks, "sheriff"))
@@ -860,8 +1298,21 @@ class SimpleLLMAgent(BaseAgent):
             prompt_parts.append("YOUR CHECK RESULTS:")
             prompt_parts.extend(self._format_check_results(self.player.don_checks, "don"))
             prompt_parts.append("")
-        
-        # Add phase-specific instructions
+        return prompt_parts
+    
+    def _response_format_section(self) -> List[str]:
+        """JSON response format instructions (identical for every player and call)."""
+        return [
+            "IMPORTANT: You must respond with valid JSON in the following format:",
+            '{"reasoning": "explanation of your decision", "response": "your actual response here"}',
+            "- The 'reasoning' field should contain an explanation of why you made this decision (target length: 50-150 words)",
+            "- The 'response' field should contain your actual answer (speech, player number, etc.)",
+            "- Both fields are required",
+        ]
+    
+    def _action_section(self, context: AgentContext, action_type: str) -> List[str]:
+        """Instructions for the requested action."""
+        prompt_parts: List[str] = []
         if action_type == "final_speech":
             prompt_parts.extend([
                 "FINAL SPEECH:",
@@ -967,18 +1418,7 @@ class SimpleLLMAgent(BaseAgent):
                     "- Choose target to kill",
                     "- Return ONLY player number (e.g., '5')",
                 ])
-        
-        # Add JSON format instruction at the end of all prompts
-        prompt_parts.extend([
-            "",
-            "IMPORTANT: You must respond with valid JSON in the following format:",
-            '{"reasoning": "explanation of your decision", "response": "your actual response here"}',
-            "- The 'reasoning' field should contain an explanation of why you made this decision (target length: 50-150 words)",
-            "- The 'response' field should contain your actual answer (speech, player number, etc.)",
-            "- Both fields are required",
-        ])
-        
-        return "\n".join(prompt_parts)
+        return prompt_parts
     
     def get_day_speech(self, context: AgentContext) -> str:
         """
@@ -991,7 +1431,23 @@ class SimpleLLMAgent(BaseAgent):
             The speech text
         """
         prompt = self.build_strategic_prompt(context, "speech")
-        response = self._call_llm(prompt)
+        response = self._call_llm_for_speech(prompt, context)
+        return self._normalize_speech_ending(response)
+    
+    async def get_day_speech_async(self, context: AgentContext) -> str:
+        """
+        Async version of get_day_speech for speculative/parallel generation.
+        
+        Args:
+            context: Current game context
+            
+        Returns:
+            The speech text
+        """
+        if self._sync_overridden("get_day_speech"):
+            return self.get_day_speech(context)
+        prompt = self.build_strategic_prompt(context, "speech")
+        response = await self._call_llm_for_speech_async(prompt, context)
         return self._normalize_speech_ending(response)
     
     def get_final_speech(self, context: AgentContext) -> str:
@@ -1005,7 +1461,23 @@ class SimpleLLMAgent(BaseAgent):
             The final speech text
         """
         prompt = self.build_strategic_prompt(context, "final_speech")
-        response = self._call_llm(prompt)
+        response = self._call_llm_for_speech(prompt, context, is_final=True)
+        return self._normalize_speech_ending(response)
+    
+    async def get_final_speech_async(self, context: AgentContext) -> str:
+        """
+        Async version of get_final_speech.
+        
+        Args:
+            context: Current game context
+            
+        Returns:
+            The final speech text
+        """
+        if self._sync_overridden("get_final_speech"):
+            return self.get_final_speech(context)
+        prompt = self.build_strategic_prompt(context, "final_speech")
+        response = await self._call_llm_for_speech_async(prompt, context, is_final=True)
         return self._normalize_speech_ending(response)
     
     def _handle_sheriff_check(self, context: AgentContext) -> Dict[str, Any]:
@@ -1018,10 +1490,22 @@ class SimpleLLMAgent(BaseAgent):
         Returns:
             Dictionary containing action type and target
         """
-        action = {}
         prompt = self.build_strategic_prompt(context, "sheriff_check")
         response = self._call_llm(prompt)
+        return self._process_sheriff_check(response, context)
+    
+    def _process_sheriff_check(self, response: str, context: AgentContext) -> Dict[str, Any]:
+        """
+        Turn a sheriff check response into an action.
         
+        Args:
+            response: LLM response text
+            context: Current game context
+            
+        Returns:
+            Dictionary containing action type and target
+        """
+        action = {}
         target = self._extract_player_number(response, context)
         if target and target != self.player.player_number:
             action["type"] = "sheriff_check"
@@ -1052,10 +1536,22 @@ class SimpleLLMAgent(BaseAgent):
         Returns:
             Dictionary containing action type and target
         """
-        action = {}
         prompt = self.build_strategic_prompt(context, "kill_claim")
         response = self._call_llm(prompt)
+        return self._process_kill_claim(response, context)
+    
+    def _process_kill_claim(self, response: str, context: AgentContext) -> Dict[str, Any]:
+        """
+        Turn a kill claim response into an action.
         
+        Args:
+            response: LLM response text
+            context: Current game context
+            
+        Returns:
+            Dictionary containing action type and target
+        """
+        action = {}
         target = self._extract_player_number(response, context)
         if not target:
             target = self._get_kill_claim_fallback(context)
@@ -1077,10 +1573,24 @@ class SimpleLLMAgent(BaseAgent):
         Returns:
             Dictionary containing action type and target
         """
-        action = {}
         prompt = self.build_strategic_prompt(context, "kill_decision")
         response = self._call_llm(prompt)
+        return self._process_kill_decision(response, context, kill_claims)
+    
+    def _process_kill_decision(self, response: str, context: AgentContext,
+                               kill_claims: Dict[int, int]) -> Dict[str, Any]:
+        """
+        Turn a kill decision response (Don's, or a mafia player's when the Don is eliminated) into an action.
         
+        Args:
+            response: LLM response text
+            context: Current game context
+            kill_claims: Dictionary of kill claims from mafia team
+            
+        Returns:
+            Dictionary containing action type and target
+        """
+        action = {}
         target = self._extract_player_number(response, context)
         if not target:
             target = self._get_kill_decision_fallback(context, kill_claims)
@@ -1101,10 +1611,22 @@ class SimpleLLMAgent(BaseAgent):
         Returns:
             Dictionary containing action type and target
         """
-        action = {}
         prompt = self.build_strategic_prompt(context, "don_check")
         response = self._call_llm(prompt)
+        return self._process_don_check(response, context)
+    
+    def _process_don_check(self, response: str, context: AgentContext) -> Dict[str, Any]:
+        """
+        Turn a Don check response into an action.
         
+        Args:
+            response: LLM response text
+            context: Current game context
+            
+        Returns:
+            Dictionary containing action type and target
+        """
+        action = {}
         target = self._extract_player_number(response, context)
         if not target:
             # Fallback: check active players
@@ -1139,19 +1661,9 @@ class SimpleLLMAgent(BaseAgent):
         Returns:
             Dictionary containing action type and target
         """
-        action = {}
         prompt = self.build_strategic_prompt(context, "kill_decision")
         response = self._call_llm(prompt)
-        
-        target = self._extract_player_number(response, context)
-        if not target:
-            target = self._get_kill_decision_fallback(context, kill_claims)
-        
-        if target:
-            action["kill_decision"] = target
-            action["type"] = "kill_decision"
-        
-        return action
+        return self._process_kill_decision(response, context, kill_claims)
     
     def _is_kill_decision_call(self, context: AgentContext) -> bool:
         """
@@ -1208,8 +1720,7 @@ class SimpleLLMAgent(BaseAgent):
         if self.player.is_mafia and self.player.role.role_type != RoleType.DON:
             if is_kill_decision_call:
                 # Check if Don is eliminated and we need to make decision
-                don = next((p for p in context.game_state.get_mafia_players() 
-                           if p.role.role_type == RoleType.DON and p.is_alive), None)
+                don = context.game_state.get_alive_player_by_role(RoleType.DON)
                 
                 if not don and "decide_kill" in context.available_actions:
                     action.update(self._handle_mafia_kill_decision(context, kill_claims))
@@ -1237,6 +1748,58 @@ class SimpleLLMAgent(BaseAgent):
         
         return action
     
+    async def get_night_action_async(self, context: AgentContext) -> Dict[str, Any]:
+        """
+        Async version of get_night_action for parallel execution.
+        
+        Follows exactly the same dispatch as get_night_action, so a night played
+        concurrently makes the same decisions as one played sequentially.
+        
+        Args:
+            context: Current game context
+            
+        Returns:
+            Dictionary containing action type and target
+        """
+        if self._sync_overridden("get_night_action"):
+            return self.get_night_action(context)
+        action = {}
+        is_kill_decision_call = self._is_kill_decision_call(context)
+        kill_claims = context.private_info.get("mafia_kill_claims", {})
+        
+        async def ask(action_type: str) -> str:
+            return await self._call_llm_async(self.build_strategic_prompt(context, action_type))
+        
+        # Sheriff: Strategic check
+        if self.player.role.role_type == RoleType.SHERIFF and not is_kill_decision_call:
+            action.update(self._process_sheriff_check(await ask("sheriff_check"), context))
+        
+        # Mafia: Kill claim or decision (but NOT Don - Don is handled separately below)
+        if self.player.is_mafia and self.player.role.role_type != RoleType.DON:
+            if is_kill_decision_call:
+                don = context.game_state.get_alive_player_by_role(RoleType.DON)
+                
+                if not don and "decide_kill" in context.available_actions:
+                    action.update(self._process_kill_decision(await ask("kill_decision"), context, kill_claims))
+            else:
+                action.update(self._process_kill_claim(await ask("kill_claim"), context))
+        
+        # Don: Check and kill decision (same priorities as get_night_action)
+        if self.player.role.role_type == RoleType.DON:
+            if (not is_kill_decision_call and 
+                "don_check" in context.available_actions and
+                context.game_state.night_number not in self.player.don_checks):
+                action.update(self._process_don_check(await ask("don_check"), context))
+            
+            if is_kill_decision_call and "decide_kill" in context.available_actions:
+                action.update(self._process_kill_decision(await ask("kill_decision"), context, kill_claims))
+            
+            if (not is_kill_decision_call and 
+                action.get("type") not in ["don_check", "kill_decision"]):
+                action.update(self._process_kill_claim(await ask("kill_claim"), context))
+        
+        return action
+    
     def _process_vote_choice(self, response: str, context: AgentContext) -> int:
         """
         Process vote choice response and return valid target.
@@ -1284,6 +1847,8 @@ class SimpleLLMAgent(BaseAgent):
         Returns:
             Player number to vote against
         """
+        if self._sync_overridden("get_vote_choice"):
+            return self.get_vote_choice(context)
         prompt = self.build_strategic_prompt(context, "vote")
         response = await self._call_llm_async(prompt)
         return self._process_vote_choice(response, context)
@@ -0,0 +1,420 @@
+"""
+Offline execution of LLM requests through a provider Batch API.
+
+Overnight tournaments don't need answers quickly, and batch jobs cost a fraction
+of interactive requests. In batch mode the games of a tournament share one event
+loop (see scheduler.py) and a BatchSession: SimpleLLMAgent hands the request it
+built with _build_api_params to the session instead of sending it, and awaits
+the answer. Once every game is waiting, the session writes all pending requests
+(every vote of 200 games, for example) to one batch job file, submits it, polls
+until the job is done and resumes each game with its response. Games therefore
+advance in lockstep: a step runs every game up to its next LLM requests.
+
+Byte-identical requests share one batch line. Failed lines are submitted again
+with the next step, up to MAX_ATTEMPTS times.
+
+Everything a step produces is kept in the session's state directory: the job
+files (step_<n>_<part>.jsonl), the successful results (step_<n>_<part>.results.jsonl)
+and state.json, which lists the jobs that were submitted but not yet collected.
+A new session on the same directory first collects those jobs, then answers any
+request already in a results file without submitting it again. Together with the
+phase checkpoints of recorded runs (MafiaGame.resume) an interrupted tournament
+continues where it stopped, without paying twice for a request.
+
+The session talks to the files and batches resources of an AsyncOpenAI client.
+LocalBatchServer implements the same calls in memory, for tests and dry runs.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+from contextvars import ContextVar, Token
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from openai import AsyncOpenAI
+except ImportError:
+    AsyncOpenAI = None
+
+from .response_cache import ResponseCache
+
+
+# Endpoint of the requests in a batch job (bodies are Responses API parameters)
+BATCH_ENDPOINT = "/v1/responses"
+# Provider limit on the requests in one batch job; larger steps are split
+MAX_BATCH_REQUESTS = 50000
+# Times a request is submitted before its game is failed
+MAX_ATTEMPTS = 3
+# Loop iterations without a new request after which all games are taken to be waiting
+IDLE_YIELDS = 20
+# Batch job statuses after which the job's results don't change
+FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+def response_from_body(body: Dict[str, Any]) -> Any:
+    """
+    Turn a Responses API body from a batch result into a response object.
+
+    Gives attribute access to the body, as the SDK's response objects do, with
+    each message item's text as its content and the whole text as output_text
+    (what SimpleLLMAgent._extract_llm_response reads).
+
+    Args:
+        body: JSON body of a successful batch result line
+
+    Returns:
+        Response object for SimpleLLMAgent._complete_response
+    """
+    def convert(value: Any) -> Any:
+        if isinstance(value, dict):
+            return SimpleNamespace(**{key: convert(item) for key, item in value.items()})
+        if isinstance(value, list):
+            return [convert(item) for item in value]
+        return value
+
+    output = []
+    texts = []
+    for item in body.get("output") or []:
+        item = dict(item)
+        if item.get("type") == "message" and isinstance(item.get("content"), list):
+            text = "".join(part.get("text", "") for part in item["content"] if part.get("type") == "output_text")
+            item["content"] = text
+            texts.append(text)
+        output.append(item)
+    response = convert(dict(body, output=output))
+    response.output_text = "".join(texts)
+    return response
+
+
+class BatchSession:
+    """Collects the LLM requests of games on one event loop and sends them as batch jobs, step by step."""
+
+    def __init__(self, state_dir: str, client: Any = None, poll_interval: float = 30.0,
+                 completion_window: str = "24h", max_batch_requests: int = MAX_BATCH_REQUESTS):
+        """
+        Args:
+            state_dir: Directory for job files, results and state (created if missing; an
+                existing one is resumed)
+            client: AsyncOpenAI client or LocalBatchServer (default: an AsyncOpenAI client
+                for OPENAI_API_KEY, created on first use)
+            poll_interval: Seconds between status checks of a submitted job
+            completion_window: Completion window requested for each job
+            max_batch_requests: Requests per job file; larger steps are split into several jobs
+        """
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.client = client
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+        self.max_batch_requests = max_batch_requests
+        self.steps = 0  # Steps submitted, including those of earlier sessions on this directory
+        self.requests = 0  # Request lines submitted by this session
+        self.tokens = 0  # Tokens reported for them
+        self.reused = 0  # Requests answered from the results of earlier steps
+        self._results: Dict[str, Dict[str, Any]] = {}  # {request key: response body}
+        self._waiting: Dict[str, Tuple[Dict[str, Any], List[asyncio.Future]]] = {}
+        self._attempts: Dict[str, int] = {}
+        self._uncollected: List[Dict[str, Any]] = []  # Submitted jobs whose results aren't stored yet
+        self._wake: Optional[asyncio.Event] = None
+        self._load()
+
+    def _load(self) -> None:
+        """Read the state and the stored results of earlier sessions."""
+        state_file = self.state_dir / "state.json"
+        if state_file.exists():
+            state = json.loads(state_file.read_text())
+            self.steps = state["steps"]
+            self._uncollected = state["uncollected"]
+        for results_file in sorted(self.state_dir.glob("step_*.results.jsonl")):
+            with open(results_file) as f:
+                for line in f:
+                    result = json.loads(line)
+                    self._results[result["key"]] = result["body"]
+
+    def _save_state(self) -> None:
+        state_file = self.state_dir / "state.json"
+        temp_file = state_file.with_suffix(".tmp")
+        temp_file.write_text(json.dumps({"steps": self.steps, "uncollected": self._uncollected}, indent=2))
+        os.replace(temp_file, state_file)
+
+    def _get_client(self) -> Any:
+        if self.client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if AsyncOpenAI is None or not api_key:
+                raise RuntimeError("Batch mode needs the openai package and OPENAI_API_KEY")
+            self.client = AsyncOpenAI(api_key=api_key)
+        return self.client
+
+    async def request(self, api_params: Dict[str, Any]) -> Any:
+        """
+        Answer a request from the next batch job (or from an earlier step's results).
+
+        Args:
+            api_params: Responses API parameters (from SimpleLLMAgent._build_api_params)
+
+        Returns:
+            Response object (see response_from_body())
+
+        Raises:
+            RuntimeError: If the request failed MAX_ATTEMPTS times
+        """
+        key = ResponseCache.make_key(api_params)
+        body = self._results.get(key)
+        if body is not None:
+            self.reused += 1
+            return response_from_body(body)
+        future = asyncio.get_running_loop().create_future()
+        # Identical requests from several games share one line
+        self._waiting.setdefault(key, (api_params, []))[1].append(future)
+        if self._wake is not None:
+            self._wake.set()
+        return response_from_body(await future)
+
+    async def serve(self) -> None:
+        """
+        Submit the waiting requests as a batch step whenever every game is waiting; runs until cancelled.
+
+        Jobs an earlier session submitted but didn't collect are collected first.
+        """
+        self._wake = asyncio.Event()
+        for job in list(self._uncollected):
+            try:
+                await self._collect(job)
+            except Exception:
+                # Left in the state for the next session; these requests are submitted again
+                pass
+        while True:
+            if not self._waiting:
+                await self._wake.wait()
+                self._wake.clear()
+            await self._until_idle()
+            await self._step()
+
+    async def _until_idle(self) -> None:
+        """Yield to the event loop until the games stop adding requests, i.e. all of them are waiting."""
+        while True:
+            count = len(self._waiting)
+            for _ in range(IDLE_YIELDS):
+                await asyncio.sleep(0)
+            if len(self._waiting) == count:
+                return
+
+    async def _step(self) -> None:
+        """Submit every waiting request as one step and resolve the requests with its results."""
+        waiting, self._waiting = self._waiting, {}
+        # Results collected from an earlier session's jobs may already answer some requests
+        for key in [key for key in waiting if key in self._results]:
+            for future in waiting.pop(key)[1]:
+                self.reused += 1
+                self._resolve(future, self._results[key])
+        if not waiting:
+            return
+
+        step = self.steps
+        self.steps += 1
+        keys = list(waiting)
+        chunks = [keys[i:i + self.max_batch_requests] for i in range(0, len(keys), self.max_batch_requests)]
+        outcomes = await asyncio.gather(
+            *(self._run_job(step, part, {key: waiting[key][0] for key in chunk})
+              for part, chunk in enumerate(chunks)),
+            return_exceptions=True
+        )
+
+        for chunk, outcome in zip(chunks, outcomes):
+            for key in chunk:
+                api_params, futures = waiting[key]
+                if isinstance(outcome, BaseException):
+                    error = str(outcome)
+                else:
+                    body, error = outcome.get(key, (None, "no result returned"))
+                    if body is not None:
+                        for future in futures:
+                            self._resolve(future, body)
+                        continue
+                self._attempts[key] = self._attempts.get(key, 0) + 1
+                if self._attempts[key] < MAX_ATTEMPTS:
+                    # Submitted again with the next step
+                    self._waiting.setdefault(key, (api_params, []))[1].extend(futures)
+                    continue
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(RuntimeError(
+                            f"Batch request failed {MAX_ATTEMPTS} times: {error}"
+                        ))
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, body: Dict[str, Any]) -> None:
+        if not future.done():
+            future.set_result(body)
+
+    async def _run_job(self, step: int, part: int,
+                       requests: Dict[str, Dict[str, Any]]) -> Dict[str, Tuple[Optional[Dict[str, Any]], str]]:
+        """
+        Write, submit and collect one batch job.
+
+        Returns:
+            {request key: (response body or None, error message)}
+        """
+        client = self._get_client()
+        name = f"step_{step:05d}_{part}"
+        job_file = self.state_dir / f"{name}.jsonl"
+        lines = [{"custom_id": f"{name}_{index}", "method": "POST", "url": BATCH_ENDPOINT, "body": api_params}
+                 for index, api_params in enumerate(requests.values())]
+        job_file.write_text("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines))
+
+        input_file = await client.files.create(file=(job_file.name, job_file.read_bytes()), purpose="batch")
+        batch = await client.batches.create(input_file_id=input_file.id, endpoint=BATCH_ENDPOINT,
+                                            completion_window=self.completion_window)
+        self.requests += len(lines)
+        job = {"name": name, "batch_id": batch.id}
+        self._uncollected.append(job)
+        self._save_state()
+        return await self._collect(job)
+
+    async def _collect(self, job: Dict[str, Any]) -> Dict[str, Tuple[Optional[Dict[str, Any]], str]]:
+        """
+        Wait for a submitted job, store its successful results and drop it from the state.
+
+        Returns:
+            {request key: (response body or None, error message)}
+        """
+        client = self._get_client()
+        batch = await client.batches.retrieve(job["batch_id"])
+        while batch.status not in FINAL_STATUSES:
+            await asyncio.sleep(self.poll_interval)
+            batch = await client.batches.retrieve(job["batch_id"])
+
+        # Job lines map custom ids back to requests
+        keys = {}
+        with open(self.state_dir / f"{job['name']}.jsonl") as f:
+            for line in f:
+                line = json.loads(line)
+                keys[line["custom_id"]] = ResponseCache.make_key(line["body"])
+
+        outcome: Dict[str, Tuple[Optional[Dict[str, Any]], str]] = {}
+        stored = []
+        for file_id in (getattr(batch, "output_file_id", None), getattr(batch, "error_file_id", None)):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                key = keys.get(result.get("custom_id"))
+                if key is None:
+                    continue
+                response = result.get("response") or {}
+                if response.get("status_code") == 200 and not result.get("error"):
+                    body = response["body"]
+                    outcome[key] = (body, "")
+                    stored.append({"key": key, "body": body})
+                    self._results[key] = body
+                    self.tokens += (body.get("usage") or {}).get("total_tokens") or 0
+                else:
+                    error = result.get("error") or (response.get("body") or {}).get("error") or {}
+                    outcome[key] = (None, error.get("message") or f"status {response.get('status_code')}")
+        if not outcome and batch.status != "completed":
+            outcome = {key: (None, f"batch job {batch.status}") for key in keys.values()}
+
+        with open(self.state_dir / f"{job['name']}.results.jsonl", "w") as f:
+            for result in stored:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._uncollected = [j for j in self._uncollected if j["batch_id"] != job["batch_id"]]
+        self._save_state()
+        return outcome
+
+
+# Batch session of the game running in this context (see bind_batch_session)
+_batch_session: ContextVar[Optional[BatchSession]] = ContextVar("batch_session", default=None)
+
+
+def bind_batch_session(session: BatchSession) -> Token:
+    """
+    Send the async LLM requests made in this context (and the tasks it starts) through a batch session.
+
+    Args:
+        session: Session to hand requests to
+
+    Returns:
+        Token for unbind_batch_session()
+    """
+    return _batch_session.set(session)
+
+
+def unbind_batch_session(token: Token) -> None:
+    """Restore the session bound before bind_batch_session() returned this token."""
+    _batch_session.reset(token)
+
+
+def active_batch_session() -> Optional[BatchSession]:
+    """The batch session bound in this context, if any."""
+    return _batch_session.get()
+
+
+class LocalBatchServer:
+    """
+    In-memory stand-in for the files and batches resources of the OpenAI client.
+
+    Answers each job line with respond(body), which returns a Responses API body
+    or raises to fail the line. A job completes after a given number of status
+    checks.
+    """
+
+    def __init__(self, respond: Callable[[Dict[str, Any]], Dict[str, Any]], polls_to_complete: int = 1):
+        """
+        Args:
+            respond: Produces the response body for a request body
+            polls_to_complete: batches.retrieve() calls before a job reports "completed"
+        """
+        self.respond = respond
+        self.polls_to_complete = polls_to_complete
+        self.jobs: List[SimpleNamespace] = []  # Submitted jobs, in order
+        self._files: Dict[str, str] = {}
+        self._ids = itertools.count(1)
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve_batch)
+
+    async def _create_file(self, file: Any, purpose: str) -> SimpleNamespace:
+        content = file[1] if isinstance(file, tuple) else file.read()
+        file_id = f"file-{next(self._ids)}"
+        self._files[file_id] = content.decode("utf-8") if isinstance(content, bytes) else content
+        return SimpleNamespace(id=file_id, purpose=purpose)
+
+    async def _file_content(self, file_id: str) -> SimpleNamespace:
+        text = self._files[file_id]
+        return SimpleNamespace(text=text, content=text.encode("utf-8"))
+
+    async def _create_batch(self, input_file_id: str, endpoint: str, completion_window: str,
+                            **kwargs: Any) -> SimpleNamespace:
+        lines = [json.loads(line) for line in self._files[input_file_id].splitlines() if line.strip()]
+        job = SimpleNamespace(id=f"batch-{next(self._ids)}", status="in_progress", endpoint=endpoint,
+                              input_file_id=input_file_id, output_file_id=None, error_file_id=None,
+                              request_count=len(lines), polls=0, lines=lines)
+        self.jobs.append(job)
+        return job
+
+    async def _retrieve_batch(self, batch_id: str) -> SimpleNamespace:
+        job = next(job for job in self.jobs if job.id == batch_id)
+        job.polls += 1
+        if job.status == "in_progress" and job.polls >= self.polls_to_complete:
+            outputs, errors = [], []
+            for line in job.lines:
+                try:
+                    body = self.respond(line["body"])
+                except Exception as e:
+                    errors.append({"id": f"req-{next(self._ids)}", "custom_id": line["custom_id"], "response": None,
+                                   "error": {"code": "server_error", "message": str(e)}})
+                    continue
+                outputs.append({"id": f"req-{next(self._ids)}", "custom_id": line["custom_id"],
+                                "response": {"status_code": 200, "body": body}, "error": None})
+            for results, attribute in ((outputs, "output_file_id"), (errors, "error_file_id")):
+                if results:
+                    file_id = f"file-{next(self._ids)}"
+                    self._files[file_id] = "".join(json.dumps(result) + "\n" for result in results)
+                    setattr(job, attribute, file_id)
+            job.status = "completed"
+        return job
@@ -0,0 +1,369 @@
+"""
+Shared OpenAI clients and request/token rate limiting.
+
+Every SimpleLLMAgent used to construct its own OpenAI and AsyncOpenAI client, so a
+10-player game held 20 connection pools and parallel games multiplied that. The
+registry here hands out one client per model: a single sync client per process and
+a single async client per event loop (async connection pools can't be shared across
+loops, and every MafiaGame.run_game() starts a new one).
+
+Calls to a model also share a RateLimiter with two token buckets, one for requests
+per minute and one for tokens per minute. Callers reserve an estimate before the
+request and settle it against the reported usage afterwards, so many concurrent
+games queue just under the provider quota instead of failing with rate-limit errors.
+
+A RequestGate caps the requests in flight at once across the games sharing an
+event loop (see scheduler.py). Requests over the cap wait for a free slot, and
+freed slots go to the waiting request with the highest priority rather than
+the oldest one. The gate is bound per game with bind_request_gate() and applies
+to the async calls made in that context; unbound calls don't wait.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import threading
+import time
+import weakref
+from contextvars import ContextVar, Token
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+try:
+    from openai import AsyncOpenAI
+    from openai import OpenAI
+except ImportError:
+    AsyncOpenAI = None
+    OpenAI = None
+
+from ..config.game_config import GameConfig
+
+
+# Rough prompt size estimate used for token reservations (settled against real usage)
+CHARS_PER_TOKEN = 4
+# Output allowance reserved when a call sets no max_output_tokens
+DEFAULT_OUTPUT_TOKENS = 1000
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate, holding up to one minute of budget."""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            per_minute: Budget per minute (also the bucket capacity)
+            clock: Monotonic time source in seconds
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def refill(self) -> None:
+        """Add the budget accrued since the last refill."""
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until amount is available (0 if it is available now).
+
+        Requests larger than the capacity only wait for a full bucket, so they
+        can't block forever.
+        """
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+class RateLimiter:
+    """Request and token budgets for one model, shared by every agent in the process."""
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            requests_per_minute: Request budget (unlimited if None)
+            tokens_per_minute: Token budget, prompt plus output (unlimited if None)
+            clock: Monotonic time source in seconds
+        """
+        self.requests = TokenBucket(requests_per_minute, clock) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, clock) if tokens_per_minute else None
+        self.waited_seconds = 0.0  # Total time callers spent queued
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def estimate_tokens(api_params: Dict[str, Any]) -> int:
+        """
+        Estimate the tokens a request will use before it is sent.
+
+        Args:
+            api_params: Parameters passed to the Responses API
+
+        Returns:
+            Estimated prompt tokens plus the output allowance
+        """
+        prompt_chars = sum(len(message.get("content", "")) for message in api_params.get("input", []))
+        output_tokens = api_params.get("max_output_tokens") or DEFAULT_OUTPUT_TOKENS
+        return prompt_chars // CHARS_PER_TOKEN + output_tokens
+
+    def try_acquire(self, tokens: int) -> float:
+        """
+        Reserve one request and an estimated number of tokens if both budgets allow it.
+
+        Args:
+            tokens: Estimated tokens for the request
+
+        Returns:
+            0 if the reservation was made, otherwise seconds to wait before retrying
+        """
+        with self._lock:
+            wait = 0.0
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                if bucket is not None:
+                    bucket.refill()
+                    wait = max(wait, bucket.wait_time(amount))
+            if wait > 0:
+                return wait
+            if self.requests is not None:
+                self.requests.level -= 1
+            if self.tokens is not None:
+                self.tokens.level -= min(tokens, self.tokens.capacity)
+            return 0.0
+
+    def acquire(self, tokens: int) -> None:
+        """Block the calling thread until a request with this many tokens fits the budgets."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return
+            self.waited_seconds += wait
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int) -> None:
+        """Wait (without blocking the event loop) until a request with this many tokens fits the budgets."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return
+            self.waited_seconds += wait
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated_tokens: int, used_tokens: Optional[int]) -> None:
+        """
+        Correct a reservation once the real usage is known.
+
+        Overestimates are refunded; underestimates put the bucket into debt so
+        later requests wait for it.
+
+        Args:
+            estimated_tokens: Tokens reserved by acquire()
+            used_tokens: Total tokens reported by the API (None keeps the estimate)
+        """
+        if self.tokens is None or used_tokens is None:
+            return
+        with self._lock:
+            reserved = min(estimated_tokens, self.tokens.capacity)
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + reserved - used_tokens)
+
+
+class RequestGate:
+    """
+    Cap on the LLM requests in flight across the games on one event loop, admitting waiters by priority.
+
+    Only async requests take a slot (see request_slot).
+    """
+
+    def __init__(self, max_in_flight: Optional[int] = None):
+        """
+        Args:
+            max_in_flight: Requests allowed in flight at once (unlimited if None)
+        """
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0  # Requests admitted
+        self.tokens = 0  # Total tokens reported for them
+        self.waited_seconds = 0.0  # Total time requests spent queued
+        self._waiters: List[Tuple[float, int, asyncio.Future]] = []  # Heap of (-priority, arrival, future)
+        self._arrivals = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        """Requests queued for a slot."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: float = 0.0) -> None:
+        """
+        Wait for a request slot.
+
+        Args:
+            priority: Waiters with a higher priority are admitted first (ties in arrival order)
+        """
+        if self.max_in_flight is None or (self.in_flight < self.max_in_flight and not self.waiting):
+            self._admit()
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._arrivals), future))
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A slot handed over just before the cancellation goes to the next waiter
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            self.waited_seconds += time.monotonic() - start
+        self.requests += 1
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.requests += 1
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the highest-priority waiter if there is one."""
+        self.in_flight -= 1
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                future.set_result(None)
+                return
+
+
+# Gate and priority of the game running in this context (see bind_request_gate)
+_request_gate: ContextVar[Optional[Tuple[RequestGate, Callable[[], float]]]] = ContextVar(
+    "request_gate", default=None
+)
+
+
+def bind_request_gate(gate: RequestGate, priority: Callable[[], float] = lambda: 0.0) -> Token:
+    """
+    Route the async LLM requests made in this context (and the tasks it starts) through a gate.
+
+    Args:
+        gate: Gate to acquire a slot from for every request
+        priority: Called when a request queues; higher values are admitted first
+
+    Returns:
+        Token for unbind_request_gate()
+    """
+    return _request_gate.set((gate, priority))
+
+
+def unbind_request_gate(token: Token) -> None:
+    """Restore the gate bound before bind_request_gate() returned this token."""
+    _request_gate.reset(token)
+
+
+@contextlib.asynccontextmanager
+async def request_slot() -> AsyncIterator[None]:
+    """
+    Hold a slot of the bound request gate for the duration of a request (no-op if none is bound).
+
+    The cap covers async requests only: the gate's waiters are futures on the
+    scheduler's event loop, which a blocking call can't wait on without stalling
+    every game. The sync call paths (SimpleLLMAgent._call_llm and
+    _call_llm_streaming) bypass it; games played by the scheduler use the async
+    paths throughout.
+    """
+    bound = _request_gate.get()
+    if bound is None:
+        yield
+        return
+    gate, priority = bound
+    await gate.acquire(priority())
+    try:
+        yield
+    finally:
+        gate.release()
+
+
+def record_request_tokens(tokens: Optional[int]) -> None:
+    """Add a completed request's reported token usage to the bound request gate, if any."""
+    bound = _request_gate.get()
+    if bound is not None and tokens:
+        bound[0].tokens += tokens
+
+
+# Process-wide registries
+_lock = threading.Lock()
+_sync_clients: Dict[Tuple[str, str], Any] = {}  # {(model, api_key): OpenAI}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_rate_limiters: Dict[Tuple[str, Optional[float], Optional[float]], RateLimiter] = {}
+
+
+def get_client(model: str, api_key: str) -> Any:
+    """
+    Get the shared sync OpenAI client for a model.
+
+    Args:
+        model: Model name
+        api_key: OpenAI API key
+
+    Returns:
+        OpenAI client shared by all agents using this model
+    """
+    key = (model, api_key)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            # Retries are handled by RetryPolicy (see retry.py), not the SDK
+            client = OpenAI(api_key=api_key, max_retries=0)
+            _sync_clients[key] = client
+        return client
+
+
+def get_async_client(model: str, api_key: str) -> Any:
+    """
+    Get the shared async OpenAI client for a model on the running event loop.
+
+    Must be called from a coroutine. Clients are dropped with their loop.
+
+    Args:
+        model: Model name
+        api_key: OpenAI API key
+
+    Returns:
+        AsyncOpenAI client shared by all agents using this model on this loop
+    """
+    if AsyncOpenAI is None:
+        return None
+    loop = asyncio.get_running_loop()
+    key = (model, api_key)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(api_key=api_key, max_retries=0)
+            clients[key] = client
+        return client
+
+
+def get_rate_limiter(config: GameConfig) -> Optional[RateLimiter]:
+    """
+    Get the process-wide rate limiter for the configured model and budgets.
+
+    Args:
+        config: Game configuration
+
+    Returns:
+        Shared RateLimiter, or None if neither budget is set
+    """
+    if not config.llm_requests_per_minute and not config.llm_tokens_per_minute:
+        return None
+    key = (config.llm_model or "gpt-5-mini", config.llm_requests_per_minute, config.llm_tokens_per_minute)
+    with _lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(config.llm_requests_per_minute, config.llm_tokens_per_minute)
+            _rate_limiters[key] = limiter
+        return limiter
@@ -0,0 +1,101 @@
+"""
+Named, versioned prompt segments.
+
+A strategic prompt is built from segments: the rules, the role guide, the guide
+for the current day, the public history, the action instruction and a few
+smaller ones. Static segments don't depend on how the game has gone, so every
+game that puts the same role on the same day sends them again; a tournament
+could serve their tokens from a prompt cache. Dynamic segments (history,
+action, ...) depend on the game so far.
+
+Each segment has a key hashing its name, version and text, so a run recording
+can store every distinct segment once and have events reference the keys (see
+web.segment_table). Bump a segment's version when its template changes.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .llm_clients import CHARS_PER_TOKEN
+
+
+SEGMENT_VERSIONS: Dict[str, int] = {
+    "identity": 1,
+    "rules": 1,
+    "response_format": 1,
+    "team": 1,
+    "role_guide": 1,
+    "game_state": 1,
+    "day_guide": 1,
+    "history": 1,
+    "alive_players": 1,
+    "check_results": 1,
+    "action": 1,
+}
+
+# Segments whose text is the same in every game (for a given role and day)
+STATIC_SEGMENTS = frozenset({"rules", "response_format", "role_guide", "day_guide"})
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (the estimate the rate limiter uses)."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+@dataclass(frozen=True)
+class PromptSegment:
+    """A named part of a prompt."""
+    name: str
+    text: str
+    version: int = 0  # Default: the current version in SEGMENT_VERSIONS
+
+    def __post_init__(self):
+        if not self.version:
+            object.__setattr__(self, "version", SEGMENT_VERSIONS[self.name])
+
+    @property
+    def static(self) -> bool:
+        """Whether the segment is the same in every game."""
+        return self.name in STATIC_SEGMENTS
+
+    @cached_property
+    def key(self) -> str:
+        """Content key: equal segments have equal keys, in any run."""
+        digest = hashlib.sha256(f"{self.name}/{self.version}\n{self.text}".encode())
+        return digest.hexdigest()[:20]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Row of a run's segment table."""
+        return {"key": self.key, "name": self.name, "version": self.version,
+                "static": self.static, "text": self.text}
+
+
+class SegmentedPrompt(str):
+    """
+    Prompt text that remembers the segments it was joined from.
+
+    Behaves as the plain prompt string everywhere (API parameters, cache keys,
+    events), while the run recorder can store its segments instead of the text.
+    """
+
+    segments: Tuple[PromptSegment, ...]
+
+    def __new__(cls, segments: Sequence[PromptSegment]) -> 'SegmentedPrompt':
+        prompt = super().__new__(cls, "\n".join(segment.text for segment in segments))
+        prompt.segments = tuple(segments)
+        return prompt
+
+    def __reduce__(self):
+        return (SegmentedPrompt, (self.segments,))
+
+
+def build_segments(sections: Sequence[Tuple[str, List[str]]]) -> List[PromptSegment]:
+    """
+    Turn (name, lines) sections into segments, dropping sections without lines.
+
+    Joining the segments' texts with newlines gives the same prompt as joining
+    all sections' lines.
+    """
+    return [PromptSegment(name, "\n".join(lines)) for name, lines in sections if lines]
@@ -0,0 +1,275 @@
+"""
+Replay agent that answers from a recorded run instead of deciding.
+
+A run's events.jsonl already holds every agent output the engine acted on: day
+and final speeches, votes per voting round, kill claims, kill decisions and
+Sheriff/Don checks. RecordedRun indexes those outputs, and a ReplayAgent per
+player hands them back when the engine asks, so a recorded game can be played
+again through the current engine in milliseconds and without any LLM calls
+(see replay.py, which also compares the replayed events with the recorded ones).
+
+Outputs the engine never recorded are reconstructed where the recording pins
+them down (eliminate-all votes, from the tie-break eliminations) and otherwise
+replaced with a bare "PASS" speech and listed in RecordedRun.missing: runs
+recorded before tie-break speeches were emitted don't have them, and neither do
+they have the final speeches of non-LLM agents eliminated by a plain vote. Outputs the engine rejected (an invalid vote or
+night target) were not recorded either, and are replayed as no action.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .base_agent import BaseAgent, AgentContext
+from .exceptions import LLMEmptyResponseError
+from ..core import GamePhase, Player, RoleType
+from ..config.game_config import GameConfig, default_config
+
+
+# Speech used where the recording has none
+PLACEHOLDER_SPEECH = "PASS"
+
+
+class RecordedRun:
+    """Agent outputs recorded in a run's events, indexed for replay."""
+
+    def __init__(self, events: Iterable[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            events: The run's events in order, as written to events.jsonl
+            metadata: The run's metadata.json (players, roles, config)
+        """
+        self.events: List[Dict[str, Any]] = list(events)
+        self.metadata = metadata or {}
+        self.day_speeches: Dict[Tuple[int, int], str] = {}  # {(player, day): speech}
+        self.tie_break_speeches: Dict[Tuple[int, int], List[str]] = {}  # {(player, day): speeches in order}
+        self.final_speeches: Dict[int, str] = {}  # {player: speech}
+        self.vote_rounds: Dict[int, List[Dict[int, int]]] = {}  # {day: [{voter: target} per voting round]}
+        self.eliminate_all_voters: Dict[int, List[int]] = {}  # {day: voters for eliminating all tied players}
+        self.eliminate_all_splits: set = set()  # Days the eliminate-all vote split evenly
+        self.sheriff_checks: Dict[int, int] = {}  # {night: target}
+        self.don_checks: Dict[int, int] = {}  # {night: target}
+        self.kill_claims: Dict[Tuple[int, int], int] = {}  # {(player, night): target}
+        self.kill_decisions: Dict[Tuple[int, int], int] = {}  # {(player, night): target}
+        self.fatal_error: Optional[Dict[str, Any]] = None  # fatal_error data plus day/night it happened on
+        self.finished = False  # The recording reaches game_over
+        # Outputs requested during replay that the recording doesn't have
+        self.missing: List[str] = []
+        self._split_votes_given: Dict[int, int] = {}
+        self._index()
+
+    def _index(self) -> None:
+        """Index agent outputs by who produced them and when."""
+        day, night = 0, 0
+        eliminated = set()
+        in_tie_break = False  # Between a tie and its revote, tied players speak again
+        tie_break_eliminations: Dict[int, List[Dict[str, Any]]] = {}
+
+        for event in self.events:
+            event_type = event.get("event_type")
+            data = event.get("data") or {}
+
+            if event_type == "phase_change":
+                day, night = data["day_number"], data["night_number"]
+            elif event_type == "tie":
+                in_tie_break = True
+            elif event_type == "speech":
+                player = data["player_number"]
+                if in_tie_break:
+                    self.tie_break_speeches.setdefault((player, data["day_number"]), []).append(data["speech"])
+                elif player in eliminated:
+                    # Eliminated players only speak once more
+                    self.final_speeches[player] = data["speech"]
+                else:
+                    self.day_speeches[(player, data["day_number"])] = data["speech"]
+            elif event_type == "voting_start":
+                in_tie_break = False
+                self.vote_rounds.setdefault(data["day_number"], []).append({})
+            elif event_type == "vote":
+                rounds = self.vote_rounds.setdefault(data["day_number"], [])
+                if not rounds:
+                    rounds.append({})
+                rounds[-1][data["voter"]] = data["target"]
+            elif event_type == "elimination":
+                eliminated.add(data["player_number"])
+                if data.get("reason") == "tie-break vote":
+                    tie_break_eliminations.setdefault(data.get("day_number"), []).append(data)
+            elif event_type == "announcement":
+                if data.get("message", "").startswith("Vote splits evenly"):
+                    self.eliminate_all_splits.add(day)
+            elif event_type == "sheriff_check":
+                self.sheriff_checks[data["night_number"]] = data["target"]
+            elif event_type == "don_check":
+                self.don_checks[data["night_number"]] = data["target"]
+            elif event_type == "night_kill_claim":
+                self.kill_claims[(data["player_number"], data["night_number"])] = data["target"]
+            elif event_type == "night_kill_decision":
+                self.kill_decisions[(data["decision_maker"], data["night_number"])] = data["target"]
+            elif event_type == "fatal_error":
+                self.fatal_error = dict(data, day_number=day, night_number=night)
+            elif event_type == "game_over":
+                self.finished = True
+
+        # Several players leaving on one tie-break means the eliminate-all vote passed
+        for elimination_day, eliminations in tie_break_eliminations.items():
+            if len(eliminations) > 1:
+                self.eliminate_all_voters[elimination_day] = list(eliminations[0].get("voters") or [])
+
+    def check_fatal_error(self, player_number: int, context: AgentContext) -> None:
+        """
+        Fail the way the recorded game failed, if it did so on this player's turn.
+
+        Raises:
+            LLMEmptyResponseError: If the recording ended with this player's fatal error now
+        """
+        fatal = self.fatal_error
+        game_state = context.game_state
+        if (fatal and fatal.get("player_number") == player_number
+                and (fatal["day_number"], fatal["night_number"]) == (game_state.day_number, game_state.night_number)):
+            raise LLMEmptyResponseError(player_number, fatal.get("action_type") or "unknown", fatal.get("error_message", ""))
+
+    def eliminate_all_vote(self, player_number: int, context: AgentContext) -> bool:
+        """
+        Decide a vote on eliminating all tied players, which the recording only shows through its outcome.
+
+        Returns:
+            True to vote for eliminating all tied players
+        """
+        day = context.game_state.day_number
+        if day in self.eliminate_all_voters:
+            return player_number in self.eliminate_all_voters[day]
+        if day in self.eliminate_all_splits:
+            # Any half of the voters reproduces the split
+            given = self._split_votes_given.get(day, 0)
+            if given < len(context.game_state.get_alive_numbers()) // 2:
+                self._split_votes_given[day] = given + 1
+                return True
+        return False
+
+
+class ReplayAgent(BaseAgent):
+    """Agent that plays back a player's recorded outputs (see RecordedRun)."""
+
+    def __init__(self, player: Player, recording: RecordedRun, config: GameConfig = default_config):
+        """
+        Args:
+            player: The player this agent represents
+            recording: Recorded run shared by all replay agents of the game
+            config: Game configuration
+        """
+        super().__init__(player, config)
+        self.recording = recording
+        self._init_game_state()
+
+    def _init_game_state(self) -> None:
+        """Clear per-game request counters."""
+        self.vote_requests: Dict[int, int] = {}  # {day: votes asked for so far}
+        self.night_requests: Dict[int, int] = {}  # {night: night actions (other than kill decisions) asked for so far}
+        self.tie_break_requests: Dict[int, int] = {}  # {day: tie-break speeches asked for so far}
+
+    def reset(self, player: Player, config: GameConfig = default_config) -> None:
+        """Rebind to a new game and clear request counters."""
+        super().reset(player, config)
+        self._init_game_state()
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """Request counters (they decide which recorded round or night action comes next)."""
+        return {"vote_requests": dict(self.vote_requests), "night_requests": dict(self.night_requests),
+                "tie_break_requests": dict(self.tie_break_requests)}
+
+    def restore_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        """Restore state saved with checkpoint_state()."""
+        self.vote_requests = dict(state["vote_requests"])
+        self.night_requests = dict(state["night_requests"])
+        self.tie_break_requests = dict(state.get("tie_break_requests", {}))
+
+    def _missing_speech(self, kind: str, context: AgentContext) -> str:
+        """Note a speech the recording doesn't have and stand in for it."""
+        self.recording.check_fatal_error(self.player.player_number, context)
+        self.recording.missing.append(
+            f"{kind} of Player {self.player.player_number} on day {context.game_state.day_number}")
+        return PLACEHOLDER_SPEECH
+
+    def get_day_speech(self, context: AgentContext) -> str:
+        """Recorded day speech, or the next recorded tie-break speech of the day during voting."""
+        game_state = context.game_state
+        day = game_state.day_number
+        if game_state.phase == GamePhase.DAY:
+            speech = self.recording.day_speeches.get((self.player.player_number, day))
+            if speech is not None:
+                return speech
+            return self._missing_speech("day speech", context)
+        speeches = self.recording.tie_break_speeches.get((self.player.player_number, day), [])
+        index = self.tie_break_requests.get(day, 0)
+        self.tie_break_requests[day] = index + 1
+        if index < len(speeches):
+            return speeches[index]
+        return self._missing_speech("tie-break speech", context)
+
+    def get_final_speech(self, context: AgentContext) -> str:
+        """Recorded final speech."""
+        speech = self.recording.final_speeches.get(self.player.player_number)
+        if speech is not None:
+            return speech
+        return self._missing_speech("final speech", context)
+
+    def get_vote_choice(self, context: AgentContext) -> int:
+        """
+        Recorded vote for the current voting round of the day.
+
+        Rounds are replayed in order; a request beyond the recorded rounds is the
+        vote on eliminating all tied players. Returns 0 (no valid vote) where the
+        recorded round has no vote from this player.
+        """
+        day = context.game_state.day_number
+        request = self.vote_requests.get(day, 0)
+        self.vote_requests[day] = request + 1
+
+        rounds = self.recording.vote_rounds.get(day, [])
+        if request < len(rounds):
+            target = rounds[request].get(self.player.player_number)
+            if target is None:
+                self.recording.check_fatal_error(self.player.player_number, context)
+                return 0
+            return target
+
+        tied_players = context.game_state.nominations.get(day) or []
+        if tied_players and self.recording.eliminate_all_vote(self.player.player_number, context):
+            return tied_players[0]
+        return 0
+
+    def get_night_action(self, context: AgentContext) -> Dict[str, Any]:
+        """
+        Recorded night action for this call.
+
+        Kill decisions are marked in the context by the night phase; otherwise the
+        Sheriff is asked for a check, mafia for a kill claim, and the Don first for a
+        kill claim and then for the Don check.
+        """
+        game_state = context.game_state
+        night = game_state.night_number
+        player_number = self.player.player_number
+        role_type = self.player.role.role_type
+        action: Dict[str, Any] = {}
+
+        if context.private_info.get("_kill_decision_context"):
+            target = self.recording.kill_decisions.get((player_number, night))
+            if target is not None:
+                action = {"type": "kill_decision", "target": target}
+        elif role_type is RoleType.SHERIFF:
+            target = self.recording.sheriff_checks.get(night)
+            if target is not None:
+                action = {"type": "sheriff_check", "target": target}
+        else:
+            request = self.night_requests.get(night, 0)
+            self.night_requests[night] = request + 1
+            if role_type is RoleType.DON and request > 0:
+                target = self.recording.don_checks.get(night)
+                if target is not None:
+                    action = {"type": "don_check", "target": target}
+            else:
+                target = self.recording.kill_claims.get((player_number, night))
+                if target is not None:
+                    action = {"type": "kill_claim", "target": target}
+
+        if not action:
+            self.recording.check_fatal_error(player_number, context)
+        return action
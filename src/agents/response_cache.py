@@ -0,0 +1,216 @@
+"""
+Response cache for LLM calls.
+
+Seeded replays produce byte-identical prompts, so a response can be reused whenever
+the full request (model, reasoning settings, prompt, sampling limits) is the same.
+The cache has two tiers: an in-memory LRU shared by every agent in the process and
+an optional SQLite file that persists across runs, capped in size and evicted least
+recently used first.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.game_config import GameConfig
+
+
+@dataclass
+class CachedResponse:
+    """A processed LLM response plus the usage it originally cost."""
+    content: str
+    reasoning: Optional[str] = None
+    usage: Dict[str, Any] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """
+    Two-tier (memory LRU + SQLite) cache of LLM responses.
+
+    Thread-safe: agents in concurrent phases and the speculative speech drafts
+    share one instance per cache file.
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_entries: int = 1024,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite file for the persistent tier (memory only if None)
+            memory_entries: Maximum number of responses kept in memory
+            max_disk_bytes: Size cap for stored responses on disk; least recently
+                used entries are evicted once it is exceeded
+        """
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self._clock = 0  # Monotonic access counter for disk LRU order
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._db.commit()
+            size, clock = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(accessed), 0) FROM responses"
+            ).fetchone()
+            self._disk_bytes = size
+            self._clock = clock
+
+    @staticmethod
+    def make_key(api_params: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a request.
+
+        The key is readable by model and reasoning effort, and hashes the whole
+        request (prompt, system message, token limit, temperature) so any change
+        to what is sent misses the cache.
+
+        Args:
+            api_params: Parameters passed to the Responses API
+
+        Returns:
+            Cache key string
+        """
+        effort = (api_params.get("reasoning") or {}).get("effort", "-")
+        digest = hashlib.sha256(
+            json.dumps(api_params, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        return f"{api_params['model']}:{effort}:{digest}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up a response, promoting disk hits into memory.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return cached
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._clock += 1
+                    self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (self._clock, key))
+                    self._db.commit()
+                    cached = CachedResponse(**json.loads(row[0]))
+                    self._remember(key, cached)
+                    self.hits += 1
+                    return cached
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Key from make_key()
+            response: Processed response to store
+        """
+        with self._lock:
+            self._remember(key, response)
+            if self._db is None:
+                return
+
+            value = json.dumps(asdict(response), ensure_ascii=False)
+            size = len(value.encode("utf-8"))
+            if size > self.max_disk_bytes:
+                return
+            self._clock += 1
+            previous = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, size, self._clock)
+            )
+            self._disk_bytes += size - (previous[0] if previous else 0)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counts and tier sizes."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def close(self) -> None:
+        """Close the SQLite connection (the memory tier stays usable)."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, response: CachedResponse) -> None:
+        """Insert into the memory tier, evicting the least recently used entry (lock held)."""
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Delete least recently used disk entries until under 90% of the cap (lock held)."""
+        target = int(self.max_disk_bytes * 0.9)
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._disk_bytes <= target:
+                break
+            evicted.append((key,))
+            self._disk_bytes -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+
+# One cache per (file, limits) in this process, shared by all agents
+_caches: Dict[Tuple[Optional[str], int, int], ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(config: GameConfig) -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache for a configuration.
+
+    Args:
+        config: Game configuration
+
+    Returns:
+        Shared ResponseCache, or None if caching is disabled
+    """
+    if not config.llm_cache:
+        return None
+    key = (config.llm_cache_path, config.llm_cache_memory_entries, int(config.llm_cache_max_mb * 1024 * 1024))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = ResponseCache(*key)
+            _caches[key] = cache
+        return cache
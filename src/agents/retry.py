@@ -0,0 +1,281 @@
+"""
+Retry and hedging policy for LLM API calls.
+
+A single failed request used to end the whole game. Calls now go through a
+RetryPolicy: transient errors (rate limits, 5xx, timeouts, dropped connections) are
+retried up to GameConfig.max_retries times with exponential backoff and full jitter,
+honoring Retry-After when the server sends it; anything else fails immediately.
+
+Optionally each attempt is hedged: if it hasn't finished by the configured latency
+percentile of recent calls to the same model, a duplicate request is sent and
+whichever answers first wins. This trades a few extra requests for a much shorter
+latency tail.
+"""
+
+import asyncio
+import concurrent.futures
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+try:
+    from openai import APIConnectionError
+except ImportError:
+    APIConnectionError = None
+
+from ..config.game_config import GameConfig
+
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeout, conflict, rate limit (5xx handled separately)
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+# Latency samples required before hedging kicks in
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Classify an API error as transient (worth retrying) or permanent.
+
+    Args:
+        error: Exception raised by the API call
+
+    Returns:
+        True for rate limits, server errors, timeouts and connection errors
+    """
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+    if APIConnectionError is not None and isinstance(error, APIConnectionError):
+        return True  # Includes APITimeoutError
+    return isinstance(error, (TimeoutError, ConnectionError))
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Get the server's Retry-After delay in seconds, if it sent one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies for one model."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add a completed call's latency."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Get a latency percentile.
+
+        Args:
+            percent: Percentile in (0, 100]
+
+        Returns:
+            Latency in seconds, or None until enough samples have been recorded
+        """
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, plus optional latency-percentile hedging."""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 20.0,
+                 hedge_percentile: Optional[float] = None, latency: Optional[LatencyTracker] = None,
+                 rng: Optional[random.Random] = None, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            base_delay: Backoff before the first retry, doubled for each further retry
+            max_delay: Cap on a single backoff
+            hedge_percentile: Send a duplicate request when an attempt runs longer than
+                this percentile of recent latencies (None disables hedging)
+            latency: Latency history used for hedging (a private one if None)
+            rng: Random source for jitter
+            sleep: Blocking sleep used by the sync path (injectable for tests)
+        """
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_percentile = hedge_percentile
+        self.latency = latency or LatencyTracker()
+        self.retries = 0  # Retries performed
+        self.hedges = 0  # Duplicate requests sent
+        self._rng = rng or random.Random()
+        self._sleep = sleep
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Delay before retry number attempt (0-based).
+
+        Full jitter: uniform in [0, min(max_delay, base_delay * 2**attempt)], but never
+        shorter than the server's Retry-After.
+        """
+        delay = self._rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = _retry_after(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _hedge_after(self) -> Optional[float]:
+        """Seconds after which an attempt is hedged (None if hedging is off or not calibrated)."""
+        if self.hedge_percentile is None:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    def call(self, request: Callable[[], T], hedge: bool = True) -> T:
+        """
+        Run a blocking request with retries (and hedging, if enabled).
+
+        Args:
+            request: Sends one request and returns its result
+            hedge: Allow hedging (off for requests with side effects, e.g. streamed output)
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            The last error once retries are exhausted, or the first permanent error
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._attempt(request, hedge)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                self._sleep(self.backoff(attempt, e))
+                self.retries += 1
+                attempt += 1
+
+    async def call_async(self, request: Callable[[], Awaitable[T]], hedge: bool = True) -> T:
+        """
+        Async version of call().
+
+        Args:
+            request: Coroutine function that sends one request
+            hedge: Allow hedging
+
+        Returns:
+            Result of the first successful attempt
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt_async(request, hedge)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                await asyncio.sleep(self.backoff(attempt, e))
+                self.retries += 1
+                attempt += 1
+
+    def _attempt(self, request: Callable[[], T], hedge: bool) -> T:
+        """One attempt, hedged with a second thread if it runs past the threshold."""
+        hedge_after = self._hedge_after() if hedge else None
+        start = time.monotonic()
+        if hedge_after is None:
+            result = request()
+            self.latency.record(time.monotonic() - start)
+            return result
+
+        # The losing request can't be cancelled mid-flight; its result is simply dropped
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        try:
+            futures = [pool.submit(request)]
+            done, _ = concurrent.futures.wait(futures, timeout=hedge_after)
+            if not done:
+                self.hedges += 1
+                futures.append(pool.submit(request))
+            return self._first_result(futures, start)
+        finally:
+            pool.shutdown(wait=False)
+
+    def _first_result(self, futures, start: float) -> Any:
+        """Return the first successful future's result, or raise if all failed."""
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self.latency.record(time.monotonic() - start)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    async def _attempt_async(self, request: Callable[[], Awaitable[T]], hedge: bool) -> T:
+        """One attempt, hedged with a second task if it runs past the threshold."""
+        hedge_after = self._hedge_after() if hedge else None
+        start = time.monotonic()
+        if hedge_after is None:
+            result = await request()
+            self.latency.record(time.monotonic() - start)
+            return result
+
+        tasks = [asyncio.ensure_future(request())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                self.hedges += 1
+                tasks.append(asyncio.ensure_future(request()))
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.latency.record(time.monotonic() - start)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+# Latency history per model, shared by every agent in the process
+_latency: Dict[str, LatencyTracker] = {}
+_latency_lock = threading.Lock()
+
+
+def get_retry_policy(config: GameConfig, model: str) -> RetryPolicy:
+    """
+    Build an agent's retry policy from the configuration.
+
+    Args:
+        config: Game configuration
+        model: Model the agent calls (hedging thresholds are per model)
+
+    Returns:
+        RetryPolicy sharing the model's latency history
+    """
+    with _latency_lock:
+        latency = _latency.setdefault(model, LatencyTracker())
+    return RetryPolicy(
+        max_retries=config.max_retries,
+        base_delay=config.llm_retry_base_delay,
+        max_delay=config.llm_retry_max_delay,
+        hedge_percentile=config.llm_hedge_percentile,
+        latency=latency
+    )
@@ -0,0 +1,148 @@
+"""
+Incremental speech output for streaming Responses API calls.
+
+Models answer with JSON ({"reasoning": ..., "response": ...}), so the raw text
+deltas aren't presentable as they arrive. SpeechStream decodes the "response"
+string from the partial JSON on every delta and emits only the newly decoded part
+as speech_delta events, coalesced so the event log doesn't get one line per token.
+"""
+
+import re
+import time
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..web.event_emitter import EventEmitter
+
+
+# Coalescing: emit once this many characters are pending or this much time has passed
+DELTA_MIN_CHARS = 40
+DELTA_MAX_DELAY = 0.25
+
+_RESPONSE_FIELD = re.compile(r'"response"\s*:\s*"')
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f'}
+
+
+def partial_response_text(text: str) -> Optional[str]:
+    """
+    Decode as much of the "response" field as has arrived.
+
+    Args:
+        text: Raw model output so far (possibly truncated mid-JSON)
+
+    Returns:
+        Decoded prefix of the response string, the text itself if the model isn't
+        answering in JSON, or None if the field hasn't started yet
+    """
+    if not text.lstrip().startswith("{"):
+        return text
+    match = _RESPONSE_FIELD.search(text)
+    if not match:
+        return None
+
+    decoded = []
+    i = match.end()
+    while i < len(text):
+        char = text[i]
+        if char == '"':
+            break
+        if char == '\\':
+            if i + 1 >= len(text):
+                break  # Escape split across deltas
+            escaped = text[i + 1]
+            if escaped == 'u':
+                if i + 6 > len(text):
+                    break
+                decoded.append(chr(int(text[i + 2:i + 6], 16)))
+                i += 6
+                continue
+            decoded.append(_ESCAPES.get(escaped, escaped))
+            i += 2
+            continue
+        decoded.append(char)
+        i += 1
+    return "".join(decoded)
+
+
+class SpeechStream:
+    """Turns Responses API stream events for one speech into speech_delta events."""
+
+    def __init__(self, event_emitter: Optional['EventEmitter'], player_number: int, day_number: int,
+                 is_final: bool = False, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            event_emitter: Emitter for speech_delta events (deltas are dropped if None)
+            player_number: Speaking player
+            day_number: Current day
+            is_final: Whether this is a final speech after elimination
+            clock: Monotonic time source in seconds
+        """
+        self.event_emitter = event_emitter
+        self.player_number = player_number
+        self.day_number = day_number
+        self.is_final = is_final
+        self._clock = clock
+        self._emitted_any = False
+        self.start()
+
+    def start(self) -> None:
+        """Begin an attempt; a retry after partial output tells viewers to clear it."""
+        if self._emitted_any:
+            self._emit("", reset=True)
+        self._raw = ""
+        self._decoded_length = 0  # Characters of decoded speech already emitted
+        self._pending = ""
+        self._last_emit = self._started = self._clock()
+        self.first_token_ms: Optional[float] = None
+
+    def handle(self, event: Any) -> Optional[Any]:
+        """
+        Process one stream event.
+
+        Args:
+            event: Responses API stream event
+
+        Returns:
+            The completed response object for the final event, otherwise None
+
+        Raises:
+            ConnectionError: If the stream reports a failure (retryable)
+        """
+        event_type = getattr(event, "type", None)
+        if event_type == "response.output_text.delta":
+            self._on_text(event.delta)
+        elif event_type == "response.completed":
+            self.finish()
+            return event.response
+        elif event_type in ("response.failed", "error"):
+            error = getattr(getattr(event, "response", None), "error", None) or getattr(event, "message", None)
+            raise ConnectionError(f"Response stream failed: {error}")
+        return None
+
+    def finish(self) -> None:
+        """Emit whatever is still pending."""
+        if self._pending:
+            self._emit(self._pending)
+            self._pending = ""
+
+    def _on_text(self, delta: str) -> None:
+        """Accumulate raw output and queue newly decoded speech text."""
+        if self.first_token_ms is None:
+            self.first_token_ms = (self._clock() - self._started) * 1000
+        self._raw += delta
+        decoded = partial_response_text(self._raw)
+        if decoded is None or len(decoded) <= self._decoded_length:
+            return
+        self._pending += decoded[self._decoded_length:]
+        self._decoded_length = len(decoded)
+        if len(self._pending) >= DELTA_MIN_CHARS or self._clock() - self._last_emit >= DELTA_MAX_DELAY:
+            self.finish()
+
+    def _emit(self, delta: str, reset: bool = False) -> None:
+        """Send one speech_delta event."""
+        self._last_emit = self._clock()
+        if self.event_emitter is None:
+            return
+        self._emitted_any = True
+        self.event_emitter.emit_speech_delta(self.player_number, delta, self.day_number,
+                                             is_final=self.is_final, reset=reset)
@@ -14,21 +14,44 @@ class GameConfig:
     llm_model: str = "gpt-4"
     llm_temperature: float = 0.7
     reasoning_effort: Optional[str] = None  # For reasoning-capable models: "low", "medium", or "high"
-    max_retries: int = 3
+    max_retries: int = 3  # Retries for transient API errors (rate limits, 5xx, timeouts)
+    llm_retry_base_delay: float = 0.5  # Backoff before the first retry in seconds, doubled per retry (full jitter)
+    llm_retry_max_delay: float = 20.0  # Cap on a single backoff in seconds
+    llm_hedge_percentile: Optional[float] = None  # Send a duplicate request past this latency percentile (e.g. 95)
+    stream_speeches: bool = False  # Stream day/final speeches and emit speech_delta events as text arrives
+    llm_cache: bool = False  # Reuse responses for byte-identical requests (e.g. seeded replays)
+    llm_cache_path: Optional[str] = None  # SQLite file for the persistent cache tier (memory only if None)
+    llm_cache_memory_entries: int = 1024  # In-memory LRU size
+    llm_cache_max_mb: float = 256.0  # Size cap for the on-disk tier
+    llm_requests_per_minute: Optional[int] = None  # Shared request budget per model in this process (unlimited if None)
+    llm_tokens_per_minute: Optional[int] = None  # Shared token budget per model in this process (unlimited if None)
+    prompt_layout: str = "classic"  # "classic" or "cache_friendly" (shared sections first, for provider prompt caching)
     
     # Game settings
     total_players: int = 10
-    log_level: str = "INFO"
+    log_level: str = "INFO"  # Console output threshold: "DEBUG", "INFO", "WARNING" or "ERROR"
+    headless: bool = False  # No console output or announcement log; text is only formatted for recorded runs
     max_rounds: int = 10  # Maximum number of day/night cycles before game ends
     
     # Judge announcements
     use_judge_announcements: bool = True
 
+    # Phase settings
+    concurrent_night_actions: bool = False  # Request Sheriff check and mafia kill claims in parallel
+    speculative_speeches: bool = False  # Draft the next LLM speaker's speech while the current one is generated
+
     # Agent settings
     agent_type: str = "simple_llm_agent"  # Options: "simple_llm_agent" or "dummy_agent" (used if agent_types not specified)
     agent_types: Optional[Dict[int, str]] = field(default=None)  # Per-player agent types: {player_number: "agent_type"}
     random_seed: Optional[int] = None  # Random seed for reproducible behavior (used by dummy_agent)
 
+    # Event recording
+    buffered_events: bool = False  # Write events.jsonl in batches from a background thread
+    event_flush_count: int = 64  # Buffered mode: write once this many events are pending
+    event_flush_interval: float = 0.5  # Buffered mode: max seconds before a pending event is written
+    checkpoint_phases: bool = True  # Save runs/<run>/checkpoint.json at every phase boundary (main.py --resume)
+    profile_phases: bool = True  # Write per-phase, per-player wall/CPU time and tokens to metadata.json ("profile")
+
 
 # Default configuration instance
 default_config = GameConfig()
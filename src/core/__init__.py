@@ -6,6 +6,7 @@ from .game_engine import GameState, GamePhase
 from .player import Player, PlayerStatus
 from .roles import Role, RoleType, Team, get_role_distribution, create_role
 from .judge import Judge, NominationResult
+from .public_history import PublicHistory, PublicHistoryView
 
 __all__ = [
     'GameState',
@@ -19,5 +20,7 @@ __all__ = [
     'create_role',
     'Judge',
     'NominationResult',
+    'PublicHistory',
+    'PublicHistoryView',
 ]
 
@@ -0,0 +1,162 @@
+"""
+Phase-boundary checkpoints for resuming a game.
+
+A game that dies mid-way (an API outage, a crash, a fatal LLM error) used to be
+lost together with all the LLM calls already paid for. MafiaGame now writes a
+checkpoint to runs/<run>/checkpoint.json whenever a phase is about to start: the
+full GameState, the Judge's bookkeeping, every agent's private state (checked
+players, DummyAgent RNG state, ...) and the number of events recorded so far.
+Only the latest checkpoint is kept.
+
+Resuming (main.py --resume <run>) restores that state, cuts events.jsonl back to
+the events recorded before the checkpoint and plays on from the start of the
+interrupted phase, so at most one phase is played twice.
+
+Checkpoints are JSON. Values that JSON can't represent exactly (dictionaries
+keyed by player number, tuples in RNG states, sets) are tagged so they round-trip
+unchanged: a resumed game must see the same state, and build the same prompts,
+as the original would have.
+"""
+
+import dataclasses
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from ..config.game_config import GameConfig
+
+
+CHECKPOINT_FILE = "checkpoint.json"
+CHECKPOINT_VERSION = 1
+
+# Tags for values JSON can't represent exactly
+_TUPLE = "__tuple__"
+_SET = "__set__"
+_ITEMS = "__items__"  # Dictionary with non-string keys, as [key, value] pairs
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Convert a value to JSON-compatible data that decode_value() turns back into an equal value.
+
+    Raises:
+        TypeError: If the value contains anything other than None, bools, numbers,
+            strings, lists, tuples, sets and dictionaries
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, tuple):
+        return {_TUPLE: [encode_value(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {_SET: [encode_value(item) for item in sorted(value)]}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and not (key.startswith("__") and key.endswith("__")) for key in value):
+            return {key: encode_value(item) for key, item in value.items()}
+        return {_ITEMS: [[encode_value(key), encode_value(item)] for key, item in value.items()]}
+    raise TypeError(f"Cannot checkpoint value of type {type(value).__name__}: {value!r}")
+
+
+def decode_value(data: Any) -> Any:
+    """Inverse of encode_value()."""
+    if isinstance(data, list):
+        return [decode_value(item) for item in data]
+    if isinstance(data, dict):
+        if len(data) == 1:
+            (tag, items), = data.items()
+            if tag == _TUPLE:
+                return tuple(decode_value(item) for item in items)
+            if tag == _SET:
+                return {decode_value(item) for item in items}
+            if tag == _ITEMS:
+                return {decode_value(key): decode_value(item) for key, item in items}
+        return {key: decode_value(item) for key, item in data.items()}
+    return data
+
+
+@dataclasses.dataclass
+class GameCheckpoint:
+    """Everything needed to restart a game at the beginning of a phase."""
+    config: Dict[str, Any]  # GameConfig fields
+    game_state: Dict[str, Any]  # GameState.checkpoint_state()
+    judge: Dict[str, Any]  # Judge.checkpoint_state()
+    agents: Dict[int, Dict[str, Any]]  # {player_number: agent.checkpoint_state()}
+    handlers: Dict[str, Any] = dataclasses.field(default_factory=dict)  # Phase handler counters
+    event_count: int = 0  # Events recorded before the checkpoint (events.jsonl is cut back to these)
+    created_at: Optional[str] = None
+    version: int = CHECKPOINT_VERSION
+
+    @property
+    def phase(self) -> str:
+        """The phase the game resumes at ("day", "voting" or "night")."""
+        return self.game_state["phase"]
+
+    @property
+    def day_number(self) -> int:
+        return self.game_state["day_number"]
+
+    @property
+    def night_number(self) -> int:
+        return self.game_state["night_number"]
+
+    def game_config(self) -> GameConfig:
+        """Rebuild the game's configuration (fields unknown to this version are ignored)."""
+        known = {f.name for f in dataclasses.fields(GameConfig)}
+        return GameConfig(**{key: value for key, value in self.config.items() if key in known})
+
+    def to_json(self) -> str:
+        """Serialize the checkpoint."""
+        return json.dumps(encode_value(dataclasses.asdict(self)))
+
+    @classmethod
+    def from_json(cls, text: str) -> "GameCheckpoint":
+        """
+        Deserialize a checkpoint.
+
+        Raises:
+            ValueError: If the text isn't a checkpoint of a supported version
+        """
+        data = decode_value(json.loads(text))
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {data.get('version') if isinstance(data, dict) else None}")
+        return cls(**data)
+
+
+def write_checkpoint(run_dir: Union[str, Path], checkpoint: GameCheckpoint) -> Path:
+    """
+    Write a run's checkpoint, replacing the previous one atomically.
+
+    Args:
+        run_dir: Run directory
+        checkpoint: Checkpoint to write (created_at is filled in if unset)
+
+    Returns:
+        Path of the checkpoint file
+    """
+    if checkpoint.created_at is None:
+        checkpoint.created_at = datetime.now().isoformat()
+    path = Path(run_dir) / CHECKPOINT_FILE
+    # A crash while writing must never leave a truncated checkpoint behind
+    temp_path = path.with_suffix(".json.tmp")
+    with open(temp_path, 'w') as f:
+        f.write(checkpoint.to_json())
+    os.replace(temp_path, path)
+    return path
+
+
+def load_checkpoint(run_dir: Union[str, Path]) -> GameCheckpoint:
+    """
+    Load a run's latest checkpoint.
+
+    Raises:
+        FileNotFoundError: If the run has no checkpoint
+        ValueError: If the checkpoint can't be read
+    """
+    path = Path(run_dir) / CHECKPOINT_FILE
+    if not path.exists():
+        raise FileNotFoundError(f"No checkpoint in {run_dir} (was the run recorded with checkpoint_phases?)")
+    with open(path, 'r') as f:
+        return GameCheckpoint.from_json(f.read())
@@ -4,11 +4,12 @@ Core game engine managing game state and phase transitions.
 
 import random
 from enum import Enum
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from typing import List, Optional, Dict, Any, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 
 from .roles import Role, RoleType, Team, get_role_distribution, create_role
 from .player import Player, PlayerStatus
+from .public_history import PublicHistory
 
 if TYPE_CHECKING:
     from ..web.event_emitter import EventEmitter
@@ -42,6 +43,7 @@ class GameState:
     
     # Game history
     action_log: List[Dict[str, Any]] = field(default_factory=list)
+    public_history: PublicHistory = field(init=False, repr=False, compare=False)  # Indexed from action_log on demand
     
     # Win condition
     winner: Optional[Team] = None
@@ -51,10 +53,26 @@ class GameState:
     # Event emitter for web interface (optional)
     event_emitter: Optional['EventEmitter'] = None
     
+    # Roster index (see _index_players): bit n of a mask stands for player n
+    _indexed_players: Optional[List[Player]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+    _players_by_number: Dict[int, Player] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _alive_mask: int = field(default=0, init=False, repr=False, compare=False)
+    _mafia_mask: int = field(default=0, init=False, repr=False, compare=False)
+    _civilian_mask: int = field(default=0, init=False, repr=False, compare=False)
+    _role_masks: Dict[RoleType, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _player_labels: List[Tuple[int, str, str]] = field(default_factory=list, init=False, repr=False, compare=False)
+    # Players and player numbers selected by a mask, in roster order
+    _selections: Dict[int, Tuple[Tuple[Player, ...], Tuple[int, ...]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Initialize game state."""
+        self.public_history = PublicHistory(self.action_log)
         if not self.players:
             self.setup_game()
+        else:
+            self._index_players()
     
     def setup_game(self) -> None:
         """Initialize game with 10 players and random role assignment."""
@@ -72,6 +90,7 @@ class GameState:
             role = create_role(role_type, player_num)
             player = Player(player_number=player_num, role=role)
             self.players.append(player)
+        self._index_players()
         
         # Provide mafia knowledge to mafia players
         self._provide_mafia_knowledge()
@@ -90,24 +109,115 @@ class GameState:
         for player in mafia_players:
             player.known_mafia = mafia_numbers.copy()
     
+    def _index_players(self) -> None:
+        """
+        Index the roster: players by number, and bitmasks of alive players, of each
+        team and of each role.
+        
+        The Judge and phase handlers query alive players, teams and single players
+        many times per phase; with the index those are mask operations and cached
+        selections instead of scans over the roster. Players report status changes
+        (see Player.status), so the alive mask stays current.
+        """
+        self._indexed_players = self.players
+        self._indexed_count = len(self.players)
+        self._players_by_number = {}
+        self._alive_mask = self._mafia_mask = self._civilian_mask = 0
+        self._role_masks = {}
+        self._selections = {}
+        # (number, role, team) as shown in game state updates
+        self._player_labels = [
+            (p.player_number, p.role.role_type.value.title(), "Red" if p.role.team == Team.RED else "Black")
+            for p in self.players
+        ]
+        for player in self.players:
+            bit = 1 << player.player_number
+            player._owner = self
+            self._players_by_number[player.player_number] = player
+            if player.is_alive:
+                self._alive_mask |= bit
+            if player.is_mafia:
+                self._mafia_mask |= bit
+            if player.is_civilian:
+                self._civilian_mask |= bit
+            role_type = player.role.role_type
+            self._role_masks[role_type] = self._role_masks.get(role_type, 0) | bit
+    
+    def _check_index(self) -> None:
+        """Re-index if the roster list was replaced or resized since it was indexed."""
+        if self.players is not self._indexed_players or len(self.players) != self._indexed_count:
+            self._index_players()
+    
+    def _player_status_changed(self, player: Player) -> None:
+        """Update the alive mask when a player's status changes."""
+        bit = 1 << player.player_number
+        if player.is_alive:
+            self._alive_mask |= bit
+        else:
+            self._alive_mask &= ~bit
+    
+    def _selection(self, mask: int) -> Tuple[Tuple[Player, ...], Tuple[int, ...]]:
+        """Players selected by a mask and their numbers, in roster order (cached per mask)."""
+        selection = self._selections.get(mask)
+        if selection is None:
+            players = tuple(p for p in self.players if mask >> p.player_number & 1)
+            selection = self._selections[mask] = (players, tuple(p.player_number for p in players))
+        return selection
+    
+    @property
+    def alive_mask(self) -> int:
+        """Bitmask of alive players (bit n set if player n is alive)."""
+        self._check_index()
+        return self._alive_mask
+
+    def role_mask(self, role_type: RoleType) -> int:
+        """Bitmask of the players (alive or not) with a role."""
+        self._check_index()
+        return self._role_masks.get(role_type, 0)
+
+    @property
+    def version(self) -> int:
+        """Number of actions logged so far; every public state change is logged, so it only grows."""
+        return len(self.action_log)
+
     def get_alive_players(self) -> List[Player]:
         """Get all alive players."""
-        return [p for p in self.players if p.is_alive]
+        self._check_index()
+        return list(self._selection(self._alive_mask)[0])
+    
+    def get_alive_numbers(self) -> List[int]:
+        """Get the numbers of all alive players."""
+        self._check_index()
+        return list(self._selection(self._alive_mask)[1])
     
     def get_player(self, player_number: int) -> Optional[Player]:
         """Get player by number."""
-        for player in self.players:
-            if player.player_number == player_number:
-                return player
-        return None
+        self._check_index()
+        return self._players_by_number.get(player_number)
     
     def get_mafia_players(self) -> List[Player]:
         """Get all alive mafia players."""
-        return [p for p in self.get_alive_players() if p.is_mafia]
+        self._check_index()
+        return list(self._selection(self._alive_mask & self._mafia_mask)[0])
     
     def get_civilian_players(self) -> List[Player]:
         """Get all alive civilian players."""
-        return [p for p in self.get_alive_players() if p.is_civilian]
+        self._check_index()
+        return list(self._selection(self._alive_mask & self._civilian_mask)[0])
+    
+    def get_alive_player_by_role(self, role_type: RoleType) -> Optional[Player]:
+        """Get the first alive player with a role (e.g. the Don or the Sheriff), or None."""
+        self._check_index()
+        mask = self._alive_mask & self._role_masks.get(role_type, 0)
+        if not mask:
+            return None
+        return self._players_by_number[(mask & -mask).bit_length() - 1]
+    
+    def count_alive(self) -> Tuple[int, int]:
+        """Get the numbers of alive mafia and alive civilians."""
+        self._check_index()
+        alive = self._alive_mask
+        return (alive & self._mafia_mask).bit_count(), (alive & self._civilian_mask).bit_count()
     
     def start_night(self) -> None:
         """Transition to night phase."""
@@ -129,6 +239,20 @@ class GameState:
         self.votes[self.day_number] = {}
         self._log_action("voting_start", {"day_number": self.day_number})
     
+    def record_speech(self, player_number: int, speech: str, is_final: bool = False) -> None:
+        """Add a speech to the player's history and log it as a public event."""
+        player = self.get_player(player_number)
+        if not player:
+            return
+        player.add_speech(speech)
+        self._log_action("speech", {
+            "player": player_number,
+            "speech": speech,
+            "index": len(player.speeches) - 1,
+            "day": self.day_number,
+            "is_final": is_final
+        })
+    
     def check_win_condition(self) -> Optional[Team]:
         """
         Check if game has ended and return winning team.
@@ -137,8 +261,7 @@ class GameState:
         # Check max rounds limit
         if self.max_rounds is not None and self.day_number >= self.max_rounds:
             # Game ends due to max rounds - determine winner by current state
-            alive_mafia = len(self.get_mafia_players())
-            alive_civilians = len(self.get_civilian_players())
+            alive_mafia, alive_civilians = self.count_alive()
             
             # If mafia has majority or equal, they win
             if alive_mafia >= alive_civilians:
@@ -146,8 +269,7 @@ class GameState:
             # Otherwise civilians win
             return Team.RED
         
-        alive_mafia = len(self.get_mafia_players())
-        alive_civilians = len(self.get_civilian_players())
+        alive_mafia, alive_civilians = self.count_alive()
         
         # Red team wins: all mafia eliminated
         if alive_mafia == 0:
@@ -207,54 +329,122 @@ class GameState:
             })
     
     def _log_action(self, action_type: str, data: Dict[str, Any]) -> None:
-        """Log a game action."""
-        self.action_log.append({
+        """Log a game action (public_history indexes it when next read)."""
+        action = {
             "type": action_type,
             "phase": self.phase.value,
             "day": self.day_number,
             "night": self.night_number,
             "data": data
-        })
+        }
+        self.action_log.append(action)
     
     def get_game_summary(self) -> Dict[str, Any]:
         """Get a summary of the current game state."""
-        alive_players = self.get_alive_players()
+        alive_mafia, alive_civilians = self.count_alive()
         return {
             "phase": self.phase.value,
             "day": self.day_number,
             "night": self.night_number,
-            "alive_players": len(alive_players),
-            "alive_mafia": len(self.get_mafia_players()),
-            "alive_civilians": len(self.get_civilian_players()),
+            "alive_players": self.alive_mask.bit_count(),
+            "alive_mafia": alive_mafia,
+            "alive_civilians": alive_civilians,
             "winner": self.winner.value if self.winner else None,
         }
     
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """
+        Get the game state as plain data for a checkpoint (see core.checkpoint).
+        
+        The public history isn't included: it is rebuilt from the action log.
+        """
+        return {
+            "phase": self.phase.value,
+            "day_number": self.day_number,
+            "night_number": self.night_number,
+            "players": [
+                {
+                    "player_number": p.player_number,
+                    "role": p.role.role_type.value,
+                    "status": p.status.value,
+                    "speeches": list(p.speeches),
+                    "nominations_made": list(p.nominations_made),
+                    "votes_cast": dict(p.votes_cast),
+                    "known_mafia": list(p.known_mafia),
+                    "sheriff_checks": {n: dict(check) for n, check in p.sheriff_checks.items()},
+                    "don_checks": {n: dict(check) for n, check in p.don_checks.items()},
+                    "mafia_kill_claims": dict(p.mafia_kill_claims),
+                    "mafia_kill_decisions": dict(p.mafia_kill_decisions),
+                }
+                for p in self.players
+            ],
+            "current_speaker": self.current_speaker,
+            "nominations": {day: list(targets) for day, targets in self.nominations.items()},
+            "votes": {day: dict(votes) for day, votes in self.votes.items()},
+            "night_kills": dict(self.night_kills),
+            "action_log": self.action_log,
+            "winner": self.winner.value if self.winner else None,
+            "max_rounds": self.max_rounds,
+            "random_seed": self.random_seed,
+        }
+    
+    @classmethod
+    def from_checkpoint_state(cls, state: Dict[str, Any],
+                              event_emitter: Optional['EventEmitter'] = None) -> "GameState":
+        """
+        Restore a game state saved with checkpoint_state().
+        
+        Args:
+            state: Checkpointed game state
+            event_emitter: Event emitter for the restored game
+            
+        Returns:
+            Game state equal to the checkpointed one
+        """
+        players = []
+        for data in state["players"]:
+            fields = dict(data)
+            fields["role"] = create_role(RoleType(fields["role"]), fields["player_number"])
+            fields["status"] = PlayerStatus(fields["status"])
+            players.append(Player(**fields))
+        
+        game_state = cls(
+            phase=GamePhase(state["phase"]),
+            day_number=state["day_number"],
+            night_number=state["night_number"],
+            players=players,
+            current_speaker=state["current_speaker"],
+            nominations=state["nominations"],
+            votes=state["votes"],
+            night_kills=state["night_kills"],
+            winner=Team(state["winner"]) if state["winner"] else None,
+            max_rounds=state["max_rounds"],
+            random_seed=state["random_seed"],
+            event_emitter=event_emitter,
+        )
+        game_state.action_log.extend(state["action_log"])
+        return game_state
+    
     def _emit_game_state_update(self) -> None:
         """Emit game state update event."""
-        if self.event_emitter:
-            alive_players = self.get_alive_players()
-            mafia_players = self.get_mafia_players()
-            civilian_players = self.get_civilian_players()
+        # Building the snapshot is wasted work when no run is being recorded
+        if self.event_emitter and self.event_emitter.recording:
+            mafia_count, civilian_count = self.count_alive()
             
             # Build player list with roles (always visible in viewer)
-            players_data = []
-            for player in self.players:
-                role_name = player.role.role_type.value.title()
-                team = "Red" if player.role.team.value == "red" else "Black"
-                players_data.append({
-                    "number": player.player_number,
-                    "role": role_name,
-                    "team": team,
-                    "is_alive": player.is_alive
-                })
+            alive = self.alive_mask
+            players_data = [
+                {"number": number, "role": role_name, "team": team, "is_alive": bool(alive >> number & 1)}
+                for number, role_name, team in self._player_labels
+            ]
             
             game_state = {
                 "phase": self.phase.value,
                 "day_number": self.day_number,
                 "night_number": self.night_number,
-                "alive_count": len(alive_players),
-                "mafia_count": len(mafia_players),
-                "civilian_count": len(civilian_players),
+                "alive_count": self.alive_mask.bit_count(),
+                "mafia_count": mafia_count,
+                "civilian_count": civilian_count,
                 "players": players_data,
                 "winner": self.winner.value if self.winner else None
             }
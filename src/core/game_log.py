@@ -0,0 +1,111 @@
+"""
+Structured, leveled output for the game engine.
+
+The Judge, the phase handlers and MafiaGame used to print() every announcement,
+speech and night action unconditionally, so batch simulations spent much of
+their time formatting strings for a discarded stdout. Output now goes through a
+GameLog: each record has a level, a category (judge, speech, phase, night, game)
+and a %-style message template with its arguments, and is handed to sinks. The
+console sink prints the formatted message, as print() did.
+
+Records below GameConfig.log_level are dropped before their message is
+formatted, and in headless mode (GameConfig.headless) every record is dropped.
+Call sites that build output from more than a template check enabled_for() first.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR, "CRITICAL": 50}
+
+
+def parse_level(level: Any) -> int:
+    """
+    Convert a level name ("INFO") or number to a level number.
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[str(level).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level!r} (expected one of {', '.join(LEVELS)})") from None
+
+
+@dataclass
+class LogRecord:
+    """One engine output record."""
+    level: int
+    category: str  # judge, speech, phase, night, game
+    template: str
+    args: Tuple[Any, ...] = ()
+    fields: Dict[str, Any] = field(default_factory=dict)  # Structured data, e.g. player numbers
+
+    @property
+    def message(self) -> str:
+        """The formatted message."""
+        return self.template % self.args if self.args else self.template
+
+
+def console_sink(record: LogRecord) -> None:
+    """Print a record's message to the current sys.stdout (so redirect_stdout still applies)."""
+    print(record.message, file=sys.stdout)
+
+
+class GameLog:
+    """Leveled sink dispatcher for engine output."""
+
+    def __init__(self, level: Any = "INFO", headless: bool = False,
+                 sinks: Optional[List[Callable[[LogRecord], None]]] = None):
+        """
+        Args:
+            level: Minimum level to output (name or number)
+            headless: Drop every record without formatting it
+            sinks: Callables receiving each record (default: the console)
+        """
+        self.level = parse_level(level)
+        self.headless = headless
+        self.sinks = [console_sink] if sinks is None else list(sinks)
+
+    @classmethod
+    def from_config(cls, config: Any) -> "GameLog":
+        """Create a console log at the configured level (GameConfig.log_level and headless)."""
+        return cls(config.log_level, headless=config.headless)
+
+    def enabled_for(self, level: int) -> bool:
+        """Whether a record at this level would reach any sink."""
+        return not self.headless and level >= self.level and bool(self.sinks)
+
+    def log(self, level: int, category: str, template: str, *args: Any, **fields: Any) -> None:
+        """
+        Output a record if its level is enabled.
+
+        Args:
+            level: Record level
+            category: Kind of output (judge, speech, phase, night, game)
+            template: Message, %-formatted with args only if a sink receives it
+            *args: Template arguments
+            **fields: Structured data for sinks that want more than the message
+        """
+        if self.headless or level < self.level or not self.sinks:
+            return
+        record = LogRecord(level, category, template, args, fields)
+        for sink in self.sinks:
+            sink(record)
+
+    def debug(self, category: str, template: str, *args: Any, **fields: Any) -> None:
+        self.log(DEBUG, category, template, *args, **fields)
+
+    def info(self, category: str, template: str, *args: Any, **fields: Any) -> None:
+        self.log(INFO, category, template, *args, **fields)
+
+    def warning(self, category: str, template: str, *args: Any, **fields: Any) -> None:
+        self.log(WARNING, category, template, *args, **fields)
+
+    def error(self, category: str, template: str, *args: Any, **fields: Any) -> None:
+        self.log(ERROR, category, template, *args, **fields)
@@ -3,10 +3,11 @@ Judge/Moderator system for rule enforcement and game management.
 """
 
 import re
-from typing import List, Optional, Dict, Tuple, TYPE_CHECKING
+from typing import Any, List, Optional, Dict, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 
 from .game_engine import GameState, GamePhase
+from .game_log import GameLog, INFO
 from .player import Player
 from ..config.game_config import GameConfig, default_config
 
@@ -26,44 +27,74 @@ class NominationResult:
 class Judge:
     """Judge/Moderator that enforces rules and manages game flow."""
     
-    def __init__(self, game_state: GameState, config: GameConfig = default_config, event_emitter: Optional['EventEmitter'] = None):
+    def __init__(self, game_state: GameState, config: GameConfig = default_config, event_emitter: Optional['EventEmitter'] = None,
+                 log: Optional[GameLog] = None):
         self.game_state = game_state
         self.config = config
         self.event_emitter = event_emitter
+        # Engine output for the game; phase handlers log through the Judge's
+        self.log = log or GameLog.from_config(config)
         self.announcements = []
         # Track who nominated each player: {day_number: {target: nominator}}
         self.nomination_sources: Dict[int, Dict[int, int]] = {}
     
-    def announce(self, message: str) -> None:
-        """Make a judge announcement."""
-        if self.config.use_judge_announcements:
+    def announce(self, message: str, *args) -> None:
+        """
+        Make a judge announcement.
+        
+        Args:
+            message: Announcement text, a %-template if args are given; it is only
+                formatted if the announcement is kept, printed or recorded
+            *args: Template arguments
+        """
+        if not self.config.use_judge_announcements:
+            return
+        keep = not self.config.headless
+        recording = self.event_emitter is not None and self.event_emitter.recording
+        if not (keep or recording or self.log.enabled_for(INFO)):
+            return
+        if args:
+            message = message % args
+        if keep:
             self.announcements.append(message)
-            print(f"[JUDGE] {message}")
-            # Emit announcement event
-            if self.event_emitter:
-                self.event_emitter.emit_announcement(
-                    message,
-                    self.game_state.phase.value,
-                    self.game_state.day_number,
-                    self.game_state.night_number
-                )
+        self.log.info("judge", "[JUDGE] %s", message)
+        # Emit announcement event
+        if recording:
+            self.event_emitter.emit_announcement(
+                message,
+                self.game_state.phase.value,
+                self.game_state.day_number,
+                self.game_state.night_number
+            )
     
     def player_speaks(self, player_number: int, speech: str) -> None:
         """Announce a player's speech."""
-        if self.config.use_judge_announcements:
+        if self.config.use_judge_announcements and not self.config.headless:
             self.announcements.append(f"Player {player_number}: {speech}")
-            print(f"[Player {player_number}] {speech}")
+            self.log.info("speech", "[Player %s] %s", player_number, speech, player=player_number)
     
     def start_night(self) -> None:
         """Announce night phase start."""
         self.game_state.start_night()
         self.announce("Night falls.")
     
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """Get the judge's bookkeeping for a checkpoint (see core.checkpoint)."""
+        return {
+            "announcements": list(self.announcements),
+            "nomination_sources": {day: dict(sources) for day, sources in self.nomination_sources.items()},
+        }
+    
+    def restore_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        """Restore bookkeeping saved with checkpoint_state()."""
+        self.announcements = list(state["announcements"])
+        self.nomination_sources = {day: dict(sources) for day, sources in state["nomination_sources"].items()}
+    
     def start_day(self) -> None:
         """Announce day phase start."""
         self.game_state.start_day()
-        alive_players = [p.player_number for p in self.game_state.get_alive_players()]
-        self.announce(f"Morning has come (in the city). Players alive: {alive_players}")
+        alive_players = self.game_state.get_alive_numbers()
+        self.announce("Morning has come (in the city). Players alive: %s", alive_players)
     
     def start_voting(self) -> None:
         """Announce voting phase start."""
@@ -180,12 +211,18 @@ class Judge:
                 if speaker:
                     speaker.nominate(result.target, day)
                 
+                self.game_state._log_action("nomination", {
+                    "day": day,
+                    "target": result.target,
+                    "nominator": speaker_number
+                })
+                
                 if announce:
-                    self.announce(f"Accepted. Player {result.target} has been nominated by Player {speaker_number}.")
+                    self.announce("Accepted. Player %s has been nominated by Player %s.", result.target, speaker_number)
         elif not result.success and result.target and result.first_nominator:
             # Already nominated - prepare rejection message
             if announce:
-                self.announce(f"Rejected. Player {result.target} is already nominated by Player {result.first_nominator}.")
+                self.announce("Rejected. Player %s is already nominated by Player %s.", result.target, result.first_nominator)
         
         return result
     
@@ -271,7 +308,7 @@ class Judge:
                 counts[target] += 1
         
         # Handle default votes (non-voters vote for last nominated)
-        alive_players = [p.player_number for p in self.game_state.get_alive_players()]
+        alive_players = self.game_state.get_alive_numbers()
         voters = set(votes.keys())
         non_voters = [p for p in alive_players if p not in voters]
         
@@ -2,11 +2,10 @@
 Player class representing a game participant.
 """
 
-from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
-from .roles import Role, Team
+from .roles import Role, RoleType, Team
 
 
 class PlayerStatus(Enum):
@@ -16,34 +15,85 @@ class PlayerStatus(Enum):
     DISQUALIFIED = "disqualified"
 
 
-@dataclass
 class Player:
-    """Represents a player in the game."""
-    player_number: int
-    role: Role
-    status: PlayerStatus = PlayerStatus.ALIVE
-    
-    # Game history
-    speeches: List[str] = field(default_factory=list)
-    nominations_made: List[int] = field(default_factory=list)  # Player numbers nominated
-    votes_cast: Dict[int, int] = field(default_factory=dict)  # {day_number: voted_player}
-    
-    # Private information (role-specific)
-    known_mafia: List[int] = field(default_factory=list)  # For mafia players
-    sheriff_checks: Dict[int, Dict[str, Any]] = field(default_factory=dict)  # {night_number: {"target": player_num, "result": "Red"/"Black"}}
-    don_checks: Dict[int, Dict[str, Any]] = field(default_factory=dict)  # {night_number: {"target": player_num, "result": "Sheriff"/"Not the Sheriff"}}
-    
-    # Night actions
-    mafia_kill_claims: Dict[int, int] = field(default_factory=dict)  # {night_number: target}
-    mafia_kill_decisions: Dict[int, int] = field(default_factory=dict)  # {night_number: target} (Don only)
-    
+    """
+    Represents a player in the game.
+
+    Players are slotted (no per-instance __dict__) and report status changes to the
+    GameState that owns them, which keeps its alive bitmask in sync however a
+    player is eliminated.
+    """
+
+    __slots__ = (
+        "player_number", "role", "_status", "_owner",
+        # Game history
+        "speeches",
+        "nominations_made",  # Player numbers nominated
+        "votes_cast",  # {day_number: voted_player}
+        # Private information (role-specific)
+        "known_mafia",  # For mafia players
+        "sheriff_checks",  # {night_number: {"target": player_num, "result": "Red"/"Black"}}
+        "don_checks",  # {night_number: {"target": player_num, "result": "Sheriff"/"Not the Sheriff"}}
+        # Night actions
+        "mafia_kill_claims",  # {night_number: target}
+        "mafia_kill_decisions",  # {night_number: target} (Don only)
+    )
+
+    # Compared and shown by __eq__ and __repr__, in constructor order
+    _FIELDS = (
+        "player_number", "role", "status", "speeches", "nominations_made", "votes_cast", "known_mafia",
+        "sheriff_checks", "don_checks", "mafia_kill_claims", "mafia_kill_decisions",
+    )
+
+    def __init__(self, player_number: int, role: Role, status: PlayerStatus = PlayerStatus.ALIVE,
+                 speeches: Optional[List[str]] = None, nominations_made: Optional[List[int]] = None,
+                 votes_cast: Optional[Dict[int, int]] = None, known_mafia: Optional[List[int]] = None,
+                 sheriff_checks: Optional[Dict[int, Dict[str, Any]]] = None,
+                 don_checks: Optional[Dict[int, Dict[str, Any]]] = None,
+                 mafia_kill_claims: Optional[Dict[int, int]] = None,
+                 mafia_kill_decisions: Optional[Dict[int, int]] = None):
+        self.player_number = player_number
+        self.role = role
+        self._status = status
+        self._owner = None  # GameState notified of status changes
+        self.speeches = speeches if speeches is not None else []
+        self.nominations_made = nominations_made if nominations_made is not None else []
+        self.votes_cast = votes_cast if votes_cast is not None else {}
+        self.known_mafia = known_mafia if known_mafia is not None else []
+        self.sheriff_checks = sheriff_checks if sheriff_checks is not None else {}
+        self.don_checks = don_checks if don_checks is not None else {}
+        self.mafia_kill_claims = mafia_kill_claims if mafia_kill_claims is not None else {}
+        self.mafia_kill_decisions = mafia_kill_decisions if mafia_kill_decisions is not None else {}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._FIELDS)
+        return f"Player({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._FIELDS)
+
+    __hash__ = None  # Mutable, like the dataclass it replaces
+
+    @property
+    def status(self) -> PlayerStatus:
+        """Player status (alive, eliminated, disqualified)."""
+        return self._status
+
+    @status.setter
+    def status(self, status: PlayerStatus) -> None:
+        self._status = status
+        if self._owner is not None:
+            self._owner._player_status_changed(self)
+
     def __str__(self) -> str:
         return f"Player {self.player_number} ({self.role.role_type.value})"
     
     @property
     def is_alive(self) -> bool:
         """Check if player is alive."""
-        return self.status == PlayerStatus.ALIVE
+        return self._status is PlayerStatus.ALIVE
     
     @property
     def is_mafia(self) -> bool:
@@ -104,11 +154,11 @@ class Player:
         if self.is_mafia:
             info["known_mafia"] = self.known_mafia
             info["mafia_kill_claims"] = self.mafia_kill_claims
-            if self.role.role_type.value == "don":
+            if self.role.role_type is RoleType.DON:
                 info["don_checks"] = self.don_checks
                 info["mafia_kill_decisions"] = self.mafia_kill_decisions
         
-        if self.role.role_type.value == "sheriff":
+        if self.role.role_type is RoleType.SHERIFF:
             info["sheriff_checks"] = self.sheriff_checks
         
         return info
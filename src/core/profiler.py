@@ -0,0 +1,253 @@
+"""
+Per-phase wall-clock, CPU and token profile of a game.
+
+llm_metadata events give tokens and latency per LLM call, but nothing said how a
+game's wall time splits between speeches, votes and night actions, or how much
+of it went to building contexts and formatting history XML rather than waiting
+for the API. A GameProfiler answers that for recorded runs: MafiaGame times
+every phase with phase(), and while a phase runs the profiler is active for it
+(and for the asyncio tasks it starts), so
+
+- functions decorated with @profiled(section) (BaseAgent.build_context,
+  SimpleLLMAgent._build_strategic_prompt, format_game_history_xml) are timed,
+  wall and CPU, and attributed to the player they run for, and
+- record_llm_call() (called for every llm_metadata event) adds the call's
+  latency and tokens to its player.
+
+The result is a per-phase, per-section and per-player breakdown plus a timeline
+of spans (phase > section > nested section) that the viewer draws as a flame
+chart; MafiaGame writes it to metadata.json under "profile" after every phase.
+
+With no active profiler (unrecorded games, tournaments) a decorated function
+costs one context variable lookup. CPU time is process time, so sections that
+overlap (concurrent night actions, speculative speeches) share it.
+"""
+
+import contextlib
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Timeline spans kept per game; sections keep being aggregated past the cap
+MAX_TIMELINE_SPANS = 5000
+# Section name of LLM calls (timed by their reported latency)
+LLM_CALL = "llm_call"
+
+_active_profiler: ContextVar[Optional["GameProfiler"]] = ContextVar("active_profiler", default=None)
+_depth: ContextVar[int] = ContextVar("profile_depth", default=0)
+
+
+def _new_totals() -> Dict[str, Any]:
+    return {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0}
+
+
+def _new_player_totals() -> Dict[str, Any]:
+    return {"wall_ms": 0.0, "cpu_ms": 0.0, "llm_calls": 0, "cache_hits": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "reasoning_tokens": 0}
+
+
+class GameProfiler:
+    """Collects phase, section and LLM call timings of one game."""
+
+    def __init__(self, max_timeline_spans: int = MAX_TIMELINE_SPANS):
+        """
+        Args:
+            max_timeline_spans: Spans kept for the timeline (later spans are only aggregated)
+        """
+        self.max_timeline_spans = max_timeline_spans
+        self.phases: List[Dict[str, Any]] = []  # Finished phases, in order
+        self.timeline: List[List[Any]] = []  # [section, player, start_ms, wall_ms, depth]
+        self.timeline_truncated = False
+        self._current: Optional[Dict[str, Any]] = None  # Phase being profiled
+        self._origin = time.perf_counter()  # Timeline time 0
+        self._offset_ms = 0.0  # Timeline time profiled before a resume
+
+    def _now_ms(self, now: Optional[float] = None) -> float:
+        """Timeline time of a perf_counter() reading."""
+        return self._offset_ms + ((time.perf_counter() if now is None else now) - self._origin) * 1000
+
+    def _add_span(self, section: str, player: Optional[int], start_ms: float, wall_ms: float, depth: int) -> None:
+        if len(self.timeline) < self.max_timeline_spans:
+            self.timeline.append([section, player, round(start_ms, 3), round(wall_ms, 3), depth])
+        else:
+            self.timeline_truncated = True
+
+    @contextlib.contextmanager
+    def phase(self, name: str, day_number: int, night_number: int) -> Iterator[Dict[str, Any]]:
+        """
+        Profile a phase; the profiler is active for the phase's code while it runs.
+
+        Args:
+            name: Phase name ("day", "voting" or "night")
+            day_number: Day number when the phase starts
+            night_number: Night number when the phase starts
+
+        Yields:
+            The phase's profile entry (complete once the phase is over)
+        """
+        entry = {"phase": name, "day_number": day_number, "night_number": night_number,
+                 "start_ms": round(self._now_ms(), 3), "wall_ms": 0.0, "cpu_ms": 0.0,
+                 "sections": {}, "players": {}}
+        previous = self._current
+        self._current = entry
+        profiler_token = _active_profiler.set(self)
+        depth_token = _depth.set(1)
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield entry
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            entry["wall_ms"] = round(wall_ms, 3)
+            entry["cpu_ms"] = round((time.process_time() - cpu_start) * 1000, 3)
+            _depth.reset(depth_token)
+            _active_profiler.reset(profiler_token)
+            self._current = previous
+            self._add_span(name, None, entry["start_ms"], wall_ms, 0)
+            self.phases.append(entry)
+
+    def record(self, section: str, player: Optional[int], start: float, wall_ms: float, cpu_ms: float,
+               depth: int) -> None:
+        """
+        Add a timed section to the current phase.
+
+        Args:
+            section: Section name
+            player: Player it ran for (None if not player-specific)
+            start: perf_counter() reading at its start
+            wall_ms: Wall time in milliseconds
+            cpu_ms: CPU time in milliseconds
+            depth: Nesting depth (1 directly inside the phase)
+        """
+        entry = self._current
+        if entry is None:
+            return
+        totals = entry["sections"].setdefault(section, _new_totals())
+        totals["calls"] += 1
+        totals["wall_ms"] += wall_ms
+        totals["cpu_ms"] += cpu_ms
+        # Nested sections are already counted in their parent's time
+        if player is not None and depth == 1:
+            player_totals = entry["players"].setdefault(player, _new_player_totals())
+            player_totals["wall_ms"] += wall_ms
+            player_totals["cpu_ms"] += cpu_ms
+        self._add_span(section, player, self._now_ms(start), wall_ms, depth)
+
+    def record_llm_call(self, player: int, latency_ms: float, prompt_tokens: int, completion_tokens: int,
+                        reasoning_tokens: int = 0, cache_hit: Optional[bool] = None) -> None:
+        """
+        Add an LLM call that just finished to the current phase.
+
+        Args:
+            player: Player the call was made for
+            latency_ms: Call latency (the span ends now)
+            prompt_tokens: Input tokens
+            completion_tokens: Output tokens
+            reasoning_tokens: Reasoning tokens (part of the output tokens)
+            cache_hit: True if the response came from the response cache (its tokens
+                weren't spent again and aren't counted)
+        """
+        entry = self._current
+        if entry is None:
+            return
+        now = time.perf_counter()
+        self.record(LLM_CALL, player, now - latency_ms / 1000, latency_ms, 0.0, _depth.get())
+        player_totals = entry["players"].setdefault(player, _new_player_totals())
+        player_totals["llm_calls"] += 1
+        if cache_hit:
+            player_totals["cache_hits"] += 1
+            return
+        player_totals["prompt_tokens"] += prompt_tokens or 0
+        player_totals["completion_tokens"] += completion_tokens or 0
+        player_totals["reasoning_tokens"] += reasoning_tokens or 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Profile for run metadata: phases, totals per section and player, and the timeline."""
+        sections: Dict[str, Dict[str, Any]] = {}
+        players: Dict[int, Dict[str, Any]] = {}
+        phases = []
+        for entry in self.phases:
+            for section, totals in entry["sections"].items():
+                merged = sections.setdefault(section, _new_totals())
+                for key, value in totals.items():
+                    merged[key] += value
+            for player, totals in entry["players"].items():
+                merged = players.setdefault(player, _new_player_totals())
+                for key, value in totals.items():
+                    merged[key] += value
+            phases.append(dict(entry, sections=_rounded(entry["sections"]), players=_rounded(entry["players"])))
+
+        tokens = {key: sum(totals[key] for totals in players.values())
+                  for key in ("prompt_tokens", "completion_tokens", "reasoning_tokens")}
+        return {
+            "wall_ms": round(sum(entry["wall_ms"] for entry in self.phases), 3),
+            "cpu_ms": round(sum(entry["cpu_ms"] for entry in self.phases), 3),
+            "tokens": tokens,
+            "sections": _rounded(sections),
+            "players": _rounded(players),
+            "phases": phases,
+            "timeline": list(self.timeline),
+            "timeline_truncated": self.timeline_truncated,
+        }
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """Profile of the finished phases, for resuming the game (see core.checkpoint)."""
+        return {"phases": self.phases, "timeline": self.timeline,
+                "timeline_truncated": self.timeline_truncated, "elapsed_ms": self._now_ms()}
+
+    def restore_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        """Continue a profile saved with checkpoint_state(); the timeline carries on after it."""
+        self.phases = list(state["phases"])
+        self.timeline = list(state["timeline"])
+        self.timeline_truncated = state["timeline_truncated"]
+        self._origin = time.perf_counter()
+        self._offset_ms = state["elapsed_ms"]
+
+
+def _rounded(totals: Dict[Any, Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+    """Copy of per-key totals with times rounded to microseconds."""
+    return {key: {name: round(value, 3) if isinstance(value, float) else value for name, value in values.items()}
+            for key, values in totals.items()}
+
+
+def active_profiler() -> Optional[GameProfiler]:
+    """The profiler of the phase running in this context, if any."""
+    return _active_profiler.get()
+
+
+def profiled(section: str) -> Callable[[F], F]:
+    """
+    Decorator: time calls as a section of the active profile.
+
+    The time is attributed to the player of the first argument, which must have
+    a .player (an agent or an AgentContext).
+    """
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            depth = _depth.get()
+            depth_token = _depth.set(depth + 1)
+            start, cpu_start = time.perf_counter(), time.process_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                wall_ms = (time.perf_counter() - start) * 1000
+                cpu_ms = (time.process_time() - cpu_start) * 1000
+                _depth.reset(depth_token)
+                profiler.record(section, args[0].player.player_number, start, wall_ms, cpu_ms, depth)
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+
+def record_llm_call(player: int, latency_ms: float, prompt_tokens: int, completion_tokens: int,
+                    reasoning_tokens: int = 0, cache_hit: Optional[bool] = None) -> None:
+    """Add an LLM call to the active profile, if any (see GameProfiler.record_llm_call)."""
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.record_llm_call(player, latency_ms, prompt_tokens, completion_tokens, reasoning_tokens, cache_hit)
@@ -0,0 +1,199 @@
+"""
+Append-only index of public game events.
+
+PublicHistory turns the public actions of a GameState's action log (speeches,
+nominations, vote rounds, eliminations) into history events, incrementally:
+agents take an O(1) snapshot instead of re-deriving history from the action log
+on every context build.
+
+Indexing is lazy. The history reads the action log only when a snapshot or its
+length is asked for, and then indexes just the actions logged since, so games
+whose agents never look at the history (dummy agents) never build it.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union, overload
+
+
+# Public event types (the "type" key of every history event)
+SPEECH = "speech"
+NOMINATION = "nomination"
+VOTES = "votes"
+ELIMINATION = "elimination"
+
+
+class PublicHistoryView(Sequence):
+    """
+    Read-only snapshot of the public history at a fixed length.
+
+    The underlying event list is append-only, so a view is just a reference plus a
+    length: taking one is O(1) and later events never show up in it.
+    """
+
+    __slots__ = ("_events", "_length")
+
+    def __init__(self, events: List[Dict[str, Any]], length: int):
+        self._events = events
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            return self._events[start:stop:step]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("public history index out of range")
+        return self._events[index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        events = self._events
+        for i in range(self._length):
+            yield events[i]
+
+    @property
+    def version(self) -> int:
+        """Number of events in this snapshot (monotonic across snapshots of one game)."""
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"PublicHistoryView(length={self._length})"
+
+
+class PublicHistory:
+    """Append-only, typed index of public game events, updated incrementally."""
+
+    def __init__(self, actions: Optional[List[Dict[str, Any]]] = None):
+        """
+        Args:
+            actions: Append-only action log to index on demand (if None, events are
+                only added through observe())
+        """
+        self._events: List[Dict[str, Any]] = []
+        self._regular_speech_counts: Dict[int, int] = {}  # {day: regular speeches so far}
+        self._actions = actions
+        self._observed = 0  # Actions of the log indexed so far
+        self._lengths: List[int] = []  # History length after each indexed action
+
+    def _catch_up(self, actions_count: Optional[int] = None) -> None:
+        """Index the actions logged since the last catch-up (up to actions_count)."""
+        actions = self._actions
+        if actions is None:
+            return
+        end = len(actions) if actions_count is None else actions_count
+        observed = self._observed
+        if observed >= end:
+            return
+        lengths = self._lengths
+        events = self._events
+        for index in range(observed, end):
+            self.observe(actions[index])
+            lengths.append(len(events))
+        self._observed = end
+
+    def __len__(self) -> int:
+        self._catch_up()
+        return len(self._events)
+
+    @property
+    def version(self) -> int:
+        """Number of events recorded so far."""
+        self._catch_up()
+        return len(self._events)
+
+    def snapshot(self) -> PublicHistoryView:
+        """Get an O(1) view of the history as it is now."""
+        self._catch_up()
+        return PublicHistoryView(self._events, len(self._events))
+
+    def snapshot_at(self, actions_count: int) -> PublicHistoryView:
+        """
+        Get a view of the history as it was when the action log had actions_count actions.
+
+        Args:
+            actions_count: Length of the action log (GameState.version) to view the history at
+        """
+        self._catch_up(actions_count)
+        if self._actions is None:
+            return PublicHistoryView(self._events, len(self._events))
+        length = self._lengths[actions_count - 1] if actions_count > 0 else 0
+        return PublicHistoryView(self._events, length)
+
+    def owns(self, view: PublicHistoryView) -> bool:
+        """Check whether a view is a snapshot of this history."""
+        return isinstance(view, PublicHistoryView) and view._events is self._events
+
+    def observe(self, action: Dict[str, Any]) -> None:
+        """
+        Index a logged game action if it is public.
+
+        Args:
+            action: Action log entry as written by GameState._log_action
+        """
+        action_type = action["type"]
+        data = action["data"]
+
+        if action_type == "speech":
+            day = data["day"]
+            event = {
+                "type": SPEECH,
+                "player": data["player"],
+                "speech": data["speech"],
+                "index": data["index"],
+                "day": day,
+                "is_final": data["is_final"],
+            }
+            if data["is_final"]:
+                event["timestamp"] = f"Day {day}, Final Speech"
+            else:
+                count = self._regular_speech_counts.get(day, 0) + 1
+                self._regular_speech_counts[day] = count
+                event["timestamp"] = f"Day {day}, Speech #{count}"
+            self._events.append(event)
+
+        elif action_type == "nomination":
+            self._events.append({
+                "type": NOMINATION,
+                "day": data["day"],
+                "target": data["target"],
+                "round": 1,
+                "is_tie_break": False,
+            })
+
+        elif action_type == "nomination_round" and data.get("is_tie_break"):
+            # Round 1 nominations are indexed individually as they are made
+            for target in data.get("nominations", []):
+                self._events.append({
+                    "type": NOMINATION,
+                    "day": data["day"],
+                    "target": target,
+                    "round": data.get("round", 2),
+                    "is_tie_break": True,
+                })
+
+        elif action_type == "vote_round":
+            self._events.append({
+                "type": VOTES,
+                "day": data["day"],
+                "votes": dict(data.get("votes", {})),
+                "round": data.get("round", 1),
+                "is_tie_break": data.get("is_tie_break", False),
+            })
+
+        elif action_type == "player_eliminated":
+            self._events.append({
+                "type": ELIMINATION,
+                "player": data["player"],
+                "reason": data["reason"],
+                "day": data.get("day_number"),
+                "night": data.get("night_number"),
+                "voters": data.get("voters") or [],
+            })
@@ -2,22 +2,62 @@
 Day phase handler for discussion and nominations.
 """
 
-from typing import List, Optional, Dict, TYPE_CHECKING
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Dict, Tuple, TYPE_CHECKING
 from ..core import GameState, GamePhase, Player, Judge
 from ..core.judge import NominationResult
-from ..agents import BaseAgent, SimpleLLMAgent
+from ..agents import AgentContext, BaseAgent, SimpleLLMAgent
 
 if TYPE_CHECKING:
     from ..web.event_emitter import EventEmitter
 
 
+@dataclass
+class SpeechDraft:
+    """A speech being generated, possibly ahead of the speaker's turn."""
+    player_number: int
+    task: Optional['asyncio.Task']  # Resolves to (speech, context_data, captured events)
+    started_at: float
+    finished_at: Optional[float] = None
+
+
+@dataclass
+class SpeculationStats:
+    """Per-game counters for speculative speech generation."""
+    drafts: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    latency_saved_ms: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for run metadata."""
+        return {
+            "drafts": self.drafts,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "acceptance_rate": self.accepted / self.drafts if self.drafts else 0.0,
+            "latency_saved_ms": round(self.latency_saved_ms, 1),
+        }
+
+
 class DayPhaseHandler:
-    """Handles day phase operations: speeches and nominations."""
+    """
+    Handles day phase operations: speeches and nominations.
+    
+    With GameConfig.speculative_speeches, the next LLM speaker's speech is drafted
+    on the current history while the current speaker is still being generated. The
+    draft is used if the current speech made no nomination and doesn't mention the
+    next speaker; otherwise it is thrown away and the speech is regenerated.
+    """
     
     def __init__(self, game_state: GameState, judge: Judge, event_emitter: Optional['EventEmitter'] = None):
         self.game_state = game_state
         self.judge = judge
         self.event_emitter = event_emitter
+        self.speculation_stats = SpeculationStats()
     
     def get_speaking_order(self) -> List[int]:
         """
@@ -25,7 +65,7 @@ class DayPhaseHandler:
         First day: starts with player 1
         Subsequent days: starts with next player after previous day's starter
         """
-        alive_players = [p.player_number for p in self.game_state.get_alive_players()]
+        alive_players = self.game_state.get_alive_numbers()
         
         if not alive_players:
             return []
@@ -49,29 +89,43 @@ class DayPhaseHandler:
         # Rotate list to start at start_index
         return alive_players[start_index:] + alive_players[:start_index]
     
-    def process_speech(self, player_number: int, agent: BaseAgent) -> tuple[str, Optional[NominationResult], Optional[Dict]]:
+    async def process_speech_async(self, player_number: int,
+                                   agent: BaseAgent) -> tuple[str, Optional[NominationResult], Optional[Dict]]:
         """
         Process a player's speech.
         Returns (speech_text, nomination_result, context_data)
         """
         context = agent.build_context(self.game_state)
+        context_data = self._capture_context_data(agent, context)
+        speech = await agent.get_day_speech_async(context)
+        context_data = self._add_reasoning(agent, context_data)
         
-        # Capture prompt/context for LLM agents before generating speech
-        context_data = None
+        speech, nomination_result = self._apply_speech(player_number, speech)
+        return speech, nomination_result, context_data
+    
+    def process_speech(self, player_number: int, agent: BaseAgent) -> tuple[str, Optional[NominationResult], Optional[Dict]]:
+        """
+        Process a player's speech (synchronous wrapper; not for use inside a running event loop).
+        Returns (speech_text, nomination_result, context_data)
+        """
+        return asyncio.run(self.process_speech_async(player_number, agent))
+    
+    def _capture_context_data(self, agent: BaseAgent, context: AgentContext) -> Optional[Dict[str, Any]]:
+        """Capture prompt/context for LLM agents before generating speech."""
         if hasattr(agent, 'build_strategic_prompt'):
             try:
                 prompt = agent.build_strategic_prompt(context, "speech")
-                context_data = {
+                return {
                     "prompt": prompt,
                     "player_role": agent.player.role.role_type.value,
                     "player_team": agent.player.role.team.value
                 }
             except:
                 pass
-        
-        speech = agent.get_day_speech(context)
-        
-        # Add reasoning to context_data (after LLM call)
+        return None
+    
+    def _add_reasoning(self, agent: BaseAgent, context_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Add reasoning to context_data (after LLM call)."""
         # Always create context_data for LLM agents to show reasoning section in UI
         if hasattr(agent, 'build_strategic_prompt'):
             if context_data is None:
@@ -81,7 +135,13 @@ class DayPhaseHandler:
                 context_data["reasoning"] = agent.last_reasoning
             elif "reasoning" not in context_data:
                 context_data["reasoning"] = None  # Explicitly set to None so UI knows to show message
-        
+        return context_data
+    
+    def _apply_speech(self, player_number: int, speech: str) -> Tuple[str, NominationResult]:
+        """
+        Validate a generated speech, record it and parse its nomination.
+        Returns (speech_text, nomination_result)
+        """
         # Validate speech ending
         if not self.judge.validate_speech_ending(speech):
             speech += " PASS"  # Auto-add if missing
@@ -93,17 +153,147 @@ class DayPhaseHandler:
             # Token limits are enforced by the LLM call itself
             pass
         
-        # Add to player history
-        player = self.game_state.get_player(player_number)
-        if player:
-            player.add_speech(speech)
+        # Add to player history and public history
+        self.game_state.record_speech(player_number, speech)
         
         # Check for nomination (but don't announce yet - we'll announce after speech is displayed)
         nomination_result = self.judge.process_nomination(player_number, speech, announce=False)
         
-        return speech, nomination_result, context_data
+        return speech, nomination_result
+    
+    def _announce_speech(self, player_number: int, speech: str, nomination_result: Optional[NominationResult],
+                         context_data: Optional[Dict]) -> None:
+        """Emit and display a speech, then announce its nomination result."""
+        # Emit speech event with context
+        if self.event_emitter:
+            self.event_emitter.emit_speech(player_number, speech, self.game_state.day_number, context_data)
+        
+        # Display speech first
+        self.judge.player_speaks(player_number, speech)
+        
+        # Then announce nomination result
+        if nomination_result and (nomination_result.success or nomination_result.target is not None):
+            # Emit nomination event (no context needed - nomination is parsed from speech which already has context)
+            if self.event_emitter and nomination_result.target:
+                self.event_emitter.emit_nomination(
+                    player_number,
+                    nomination_result.target,
+                    nomination_result.success,
+                    self.game_state.day_number
+                )
+            
+            # Announce the nomination result
+            if nomination_result.success and nomination_result.target:
+                self.judge.announce("Accepted. Player %s has been nominated by Player %s.", nomination_result.target, player_number)
+            elif nomination_result.target and nomination_result.first_nominator:
+                self.judge.announce("Rejected. Player %s is already nominated by Player %s.", nomination_result.target, nomination_result.first_nominator)
+    
+    def _start_speech(self, player_number: int, agent: BaseAgent) -> SpeechDraft:
+        """Start generating a speech on the current history without waiting for it."""
+        context = agent.build_context(self.game_state)
+        context_data = self._capture_context_data(agent, context)
+        draft = SpeechDraft(player_number=player_number, task=None, started_at=time.perf_counter())
+        
+        async def generate() -> Tuple[str, Optional[Dict], List]:
+            events = []
+            if self.event_emitter:
+                with self.event_emitter.capture_events() as events:
+                    speech = await agent.get_day_speech_async(context)
+            else:
+                speech = await agent.get_day_speech_async(context)
+            draft.finished_at = time.perf_counter()
+            return speech, self._add_reasoning(agent, context_data), events
+        
+        draft.task = asyncio.create_task(generate())
+        return draft
+    
+    async def _discard_draft(self, draft: SpeechDraft) -> None:
+        """
+        Throw away a draft, cancelling its request if it is still running.
+        
+        A draft that failed (e.g. LLMEmptyResponseError) is dropped with its events:
+        the speech would never be used, so its error must not end the game.
+        """
+        if not draft.task.done():
+            draft.task.cancel()
+        try:
+            _, _, events = await draft.task
+        except (asyncio.CancelledError, Exception):
+            return
+        # The request completed, so its usage still counts
+        if self.event_emitter:
+            self.event_emitter.replay(events)
+    
+    def _invalidates_draft(self, speech: str, nomination_result: Optional[NominationResult], next_player: int) -> bool:
+        """
+        Check whether a speech changes what the next speaker should say.
+        
+        Nominations (accepted or rejected) change the public state, and a speech that
+        names the next speaker ("Player 5", "player number 5", "player #5") is
+        something they would want to answer. Other numbers (days, vote counts) don't count.
+        """
+        if nomination_result is not None and nomination_result.target is not None:
+            return True
+        return re.search(rf"\bplayer\s*(?:number\s*)?#?{next_player}\b", speech, re.IGNORECASE) is not None
+    
+    async def run_speeches_speculative(self, speaking_order: List[int], agents: dict[int, BaseAgent]) -> None:
+        """
+        Run the day's speeches, drafting each LLM speaker's speech during the previous one.
+        
+        Args:
+            speaking_order: Players in speaking order
+            agents: Agents by player number
+        """
+        speakers = [
+            n for n in speaking_order
+            if n in agents and self.game_state.get_player(n) and self.game_state.get_player(n).is_alive
+        ]
+        stats = self.speculation_stats
+        draft: Optional[SpeechDraft] = None
+        
+        try:
+            for index, player_number in enumerate(speakers):
+                turn_started = time.perf_counter()
+                if draft is not None and draft.player_number == player_number:
+                    current = draft
+                    stats.accepted += 1
+                    finished = draft.finished_at if draft.finished_at is not None else turn_started
+                    stats.latency_saved_ms += (min(finished, turn_started) - draft.started_at) * 1000
+                else:
+                    current = self._start_speech(player_number, agents[player_number])
+                
+                # Draft the next LLM speaker while this speech is generated
+                draft = None
+                if index + 1 < len(speakers) and isinstance(agents[speakers[index + 1]], SimpleLLMAgent):
+                    draft = self._start_speech(speakers[index + 1], agents[speakers[index + 1]])
+                    stats.drafts += 1
+                
+                speech, context_data, events = await current.task
+                if self.event_emitter:
+                    self.event_emitter.replay(events)
+                speech, nomination_result = self._apply_speech(player_number, speech)
+                self._announce_speech(player_number, speech, nomination_result, context_data)
+                
+                if draft is not None and self._invalidates_draft(speech, nomination_result, draft.player_number):
+                    await self._discard_draft(draft)
+                    stats.rejected += 1
+                    draft = None
+        finally:
+            # A failed turn must not leave the next speaker's request running
+            if draft is not None:
+                await self._discard_draft(draft)
+        
+        if self.event_emitter:
+            self.event_emitter.update_metadata({"speculative_speeches": stats.to_dict()})
     
     def run_day_phase(self, agents: dict[int, BaseAgent]) -> None:
+        """
+        Run the complete day phase (synchronous wrapper; not for use inside a running event loop).
+        Each alive player gets a turn to speak.
+        """
+        asyncio.run(self.run_day_phase_async(agents))
+    
+    async def run_day_phase_async(self, agents: dict[int, BaseAgent]) -> None:
         """
         Run the complete day phase.
         Each alive player gets a turn to speak.
@@ -114,8 +304,8 @@ class DayPhaseHandler:
             self.judge.start_day()
         else:
             # Already in DAY phase, just announce (don't increment day_number)
-            alive_players = [p.player_number for p in self.game_state.get_alive_players()]
-            self.judge.announce(f"Morning has come (in the city). Players alive: {alive_players}")
+            alive_players = self.game_state.get_alive_numbers()
+            self.judge.announce("Morning has come (in the city). Players alive: %s", alive_players)
         
         speaking_order = self.get_speaking_order()
         
@@ -126,41 +316,21 @@ class DayPhaseHandler:
         self.game_state.last_day_starter = speaking_order[0]
         
         # Process each player's speech
-        for player_number in speaking_order:
-            if player_number not in agents:
-                continue
-            
-            agent = agents[player_number]
-            player = self.game_state.get_player(player_number)
-            
-            if not player or not player.is_alive:
-                continue
-            
-            speech, nomination_result, context_data = self.process_speech(player_number, agent)
-            
-            # Emit speech event with context
-            if self.event_emitter:
-                self.event_emitter.emit_speech(player_number, speech, self.game_state.day_number, context_data)
-            
-            # Display speech first
-            self.judge.player_speaks(player_number, speech)
-            
-            # Then announce nomination result
-            if nomination_result and (nomination_result.success or nomination_result.target is not None):
-                # Emit nomination event (no context needed - nomination is parsed from speech which already has context)
-                if self.event_emitter and nomination_result.target:
-                    self.event_emitter.emit_nomination(
-                        player_number,
-                        nomination_result.target,
-                        nomination_result.success,
-                        self.game_state.day_number
-                    )
+        if self.judge.config.speculative_speeches:
+            await self.run_speeches_speculative(speaking_order, agents)
+        else:
+            for player_number in speaking_order:
+                if player_number not in agents:
+                    continue
+                
+                agent = agents[player_number]
+                player = self.game_state.get_player(player_number)
+                
+                if not player or not player.is_alive:
+                    continue
                 
-                # Announce the nomination result
-                if nomination_result.success and nomination_result.target:
-                    self.judge.announce(f"Accepted. Player {nomination_result.target} has been nominated by Player {player_number}.")
-                elif nomination_result.target and nomination_result.first_nominator:
-                    self.judge.announce(f"Rejected. Player {nomination_result.target} is already nominated by Player {nomination_result.first_nominator}.")
+                speech, nomination_result, context_data = await self.process_speech_async(player_number, agent)
+                self._announce_speech(player_number, speech, nomination_result, context_data)
         
         # Check if voting can proceed
         nominations = self.judge.get_nominated_players()
@@ -180,7 +350,7 @@ class DayPhaseHandler:
         if len(nominations) == 1 and self.game_state.day_number > 1:
             # Subsequent days: single nomination = automatic elimination
             target = nominations[0]
-            self.judge.announce(f"Only one player nominated. Player {target} is automatically eliminated.")
+            self.judge.announce("Only one player nominated. Player %s is automatically eliminated.", target)
             # All alive players voted (unanimous)
             voters = [p.player_number for p in self.game_state.get_alive_players() if p.player_number != target]
             self.game_state.eliminate_player(
@@ -192,13 +362,13 @@ class DayPhaseHandler:
             # Collect final speech from eliminated player
             player = self.game_state.get_player(target)
             if player and target in agents:
-                self.judge.announce(f"Player {target} has been eliminated. This is your final speech.")
+                self.judge.announce("Player %s has been eliminated. This is your final speech.", target)
                 agent = agents[target]
                 context = agent.build_context(self.game_state)
-                final_speech = agent.get_final_speech(context)
+                final_speech = await agent.get_final_speech_async(context)
                 
-                # Add to player history
-                player.add_speech(final_speech)
+                # Add to player history and public history
+                self.game_state.record_speech(target, final_speech, is_final=True)
                 
                 # Emit final speech event
                 if self.event_emitter:
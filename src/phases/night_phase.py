@@ -2,27 +2,108 @@
 Night phase handler for mafia kills and role checks.
 """
 
-from typing import List, Dict, Optional, Any, TYPE_CHECKING
-from ..core import GameState, GamePhase, Judge, RoleType
-from ..agents import BaseAgent
+import asyncio
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Any, Tuple, TYPE_CHECKING
+from ..core import GameState, GamePhase, Judge, Player, RoleType
+from ..agents import AgentContext, BaseAgent, SimpleLLMAgent
 
 if TYPE_CHECKING:
     from ..web.event_emitter import EventEmitter
 
 
+@dataclass
+class NightDecision:
+    """A night action an agent has decided on, before the handler applies it."""
+    action: Dict[str, Any]
+    context_data: Dict[str, Any]
+    events: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)  # Emitted while deciding, replayed on apply
+
+
 class NightPhaseHandler:
-    """Handles night phase operations: mafia kills, Don checks, Sheriff checks."""
+    """
+    Handles night phase operations: mafia kills, Don checks, Sheriff checks.
+    
+    With GameConfig.concurrent_night_actions the Sheriff check and all mafia kill
+    claims are requested in parallel (they don't depend on each other), then applied
+    in the sequential order, so events and outcomes match the sequential night.
+    """
     
     def __init__(self, game_state: GameState, judge: Judge, event_emitter: Optional['EventEmitter'] = None):
         self.game_state = game_state
         self.judge = judge
         self.event_emitter = event_emitter
     
-    def process_mafia_kill(self, agents: dict[int, BaseAgent]) -> Optional[int]:
+    def _capture_context_data(self, agent: BaseAgent, context: AgentContext, action_type: str) -> Optional[Dict[str, Any]]:
+        """Capture the prompt an LLM agent sees for this action (None for other agents)."""
+        if hasattr(agent, 'build_strategic_prompt'):
+            try:
+                prompt = agent.build_strategic_prompt(context, action_type)
+                return {
+                    "prompt": prompt,
+                    "player_role": agent.player.role.role_type.value,
+                    "player_team": agent.player.role.team.value
+                }
+            except:
+                pass
+        return None
+    
+    def _add_reasoning(self, agent: BaseAgent, context_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add the agent's reasoning to context_data (after the LLM call)."""
+        # Always create context_data for LLM agents to show reasoning section in UI
+        if context_data is None:
+            context_data = {}
+        if hasattr(agent, 'last_reasoning') and agent.last_reasoning:
+            context_data["reasoning"] = agent.last_reasoning
+        elif "reasoning" not in context_data:
+            context_data["reasoning"] = None  # Explicitly set to None so UI knows to show message
+        return context_data
+    
+    async def _decide(self, agent: BaseAgent, context: AgentContext, action_type: str) -> NightDecision:
+        """Ask an agent for its night action."""
+        context_data = self._capture_context_data(agent, context, action_type)
+        action = await agent.get_night_action_async(context)
+        return NightDecision(action, self._add_reasoning(agent, context_data))
+    
+    async def _decide_concurrently(self, agent: BaseAgent, context: AgentContext, action_type: str) -> NightDecision:
+        """
+        Ask an agent for its night action while other agents are being asked.
+        
+        Events emitted during the call are captured into the decision and recorded
+        when it is applied, so their order doesn't depend on which call finishes first.
+        """
+        context_data = self._capture_context_data(agent, context, action_type)
+        if self.event_emitter:
+            with self.event_emitter.capture_events() as events:
+                action = await agent.get_night_action_async(context)
+        else:
+            events = []
+            action = await agent.get_night_action_async(context)
+        return NightDecision(action, self._add_reasoning(agent, context_data), events)
+    
+    def _replay(self, decision: NightDecision) -> None:
+        """Record the events captured while a decision was made."""
+        if self.event_emitter and decision.events:
+            self.event_emitter.replay(decision.events)
+    
+    def process_mafia_kill(self, agents: dict[int, BaseAgent],
+                           claim_decisions: Optional[Dict[int, NightDecision]] = None) -> Optional[int]:
+        """
+        Process mafia kill phase (synchronous wrapper; not for use inside a running event loop).
+        Returns killed player number or None.
+        """
+        return asyncio.run(self.process_mafia_kill_async(agents, claim_decisions))
+    
+    async def process_mafia_kill_async(self, agents: dict[int, BaseAgent],
+                                       claim_decisions: Optional[Dict[int, NightDecision]] = None) -> Optional[int]:
         """
         Process mafia kill phase.
         All mafia make claims, Don makes final decision.
         Returns killed player number or None.
+        
+        Args:
+            agents: Agents by player number
+            claim_decisions: Kill claims already decided (concurrently), by player number
         """
         self.judge.announce("The mafia goes hunting.")
         
@@ -30,36 +111,36 @@ class NightPhaseHandler:
         if not mafia_players:
             return None
         
-        # Collect kill claims from all mafia
+        kill_claims = await self._collect_kill_claims(mafia_players, agents, claim_decisions)
+        
+        decision_maker = self._get_kill_decision_maker(mafia_players, agents)
+        if decision_maker is None:
+            self.judge.announce("The mafia leaves.")
+            return None
+        
+        decision_agent = agents[decision_maker[0].player_number]
+        context = self._build_kill_decision_context(decision_agent, kill_claims)
+        decision = await self._decide(decision_agent, context, "kill_decision")
+        return self._apply_kill_decision(decision_maker, decision)
+    
+    async def _collect_kill_claims(self, mafia_players: List[Player], agents: dict[int, BaseAgent],
+                                   claim_decisions: Optional[Dict[int, NightDecision]] = None) -> Dict[int, int]:
+        """
+        Collect (or apply already decided) kill claims from all mafia.
+        
+        Returns:
+            Valid kill claims {player_number: target}
+        """
         kill_claims = {}
         for player in mafia_players:
             if player.player_number in agents:
-                agent = agents[player.player_number]
-                context = agent.build_context(self.game_state)
-                
-                # Capture context for LLM agents
-                context_data = None
-                if hasattr(agent, 'build_strategic_prompt'):
-                    try:
-                        prompt = agent.build_strategic_prompt(context, "kill_claim")
-                        context_data = {
-                            "prompt": prompt,
-                            "player_role": agent.player.role.role_type.value,
-                            "player_team": agent.player.role.team.value
-                        }
-                    except:
-                        pass
-                
-                action = agent.get_night_action(context)
-                
-                # Add reasoning to context_data (after LLM call)
-                # Always create context_data for LLM agents to show reasoning section in UI
-                if context_data is None:
-                    context_data = {}
-                if hasattr(agent, 'last_reasoning') and agent.last_reasoning:
-                    context_data["reasoning"] = agent.last_reasoning
-                elif "reasoning" not in context_data:
-                    context_data["reasoning"] = None  # Explicitly set to None so UI knows to show message
+                if claim_decisions is not None and player.player_number in claim_decisions:
+                    decision = claim_decisions[player.player_number]
+                    self._replay(decision)
+                else:
+                    agent = agents[player.player_number]
+                    decision = await self._decide(agent, agent.build_context(self.game_state), "kill_claim")
+                action, context_data = decision.action, decision.context_data
                 
                 if action.get("type") == "kill_claim":
                     target = action.get("target")
@@ -67,7 +148,7 @@ class NightPhaseHandler:
                         kill_claims[player.player_number] = target
                         player.add_mafia_kill_claim(self.game_state.night_number, target)
                         # Log kill claim
-                        print(f"[MAFIA] Player {player.player_number} claims kill on Player {target}.")
+                        self.judge.log.info("night", "[MAFIA] Player %s claims kill on Player %s.", player.player_number, target)
                         # Emit kill claim event
                         if self.event_emitter:
                             self.event_emitter.emit_night_kill_claim(
@@ -76,8 +157,16 @@ class NightPhaseHandler:
                                 self.game_state.night_number,
                                 context_data
                             )
+        return kill_claims
+    
+    def _get_kill_decision_maker(self, mafia_players: List[Player],
+                                 agents: dict[int, BaseAgent]) -> Optional[Tuple[Player, bool]]:
+        """
+        Get who makes the kill decision: the Don, or another mafia if the Don is eliminated.
         
-        # Don makes final decision (or another mafia if Don is eliminated)
+        Returns:
+            (decision maker, is_don), or None if no mafia can decide
+        """
         don = next((p for p in mafia_players if p.role.role_type == RoleType.DON and p.is_alive), None)
         
         # If Don is eliminated, select first alive mafia to make decision
@@ -85,47 +174,24 @@ class NightPhaseHandler:
             # Find first alive mafia player
             alive_mafia = [p for p in mafia_players if p.is_alive and p.player_number in agents]
             if not alive_mafia:
-                self.judge.announce("The mafia leaves.")
                 return None
-            
-            decision_maker = alive_mafia[0]
-            is_don = False
-        else:
-            decision_maker = don
-            is_don = True
-        
-        # Decision maker sees all claims and decides
-        decision_agent = agents[decision_maker.player_number]
+            return alive_mafia[0], False
+        return don, True
+    
+    def _build_kill_decision_context(self, decision_agent: BaseAgent, kill_claims: Dict[int, int]) -> AgentContext:
+        """Build the decision maker's context, which sees all claims."""
         context = decision_agent.build_context(self.game_state)
         
         # Add claims to context for decision maker
         # Mark this as a kill decision call (even if kill_claims is empty)
         context.private_info["mafia_kill_claims"] = kill_claims
         context.private_info["_kill_decision_context"] = True
-        
-        # Capture context for LLM agents
-        context_data = None
-        if hasattr(decision_agent, 'build_strategic_prompt'):
-            try:
-                prompt = decision_agent.build_strategic_prompt(context, "kill_decision")
-                context_data = {
-                    "prompt": prompt,
-                    "player_role": decision_agent.player.role.role_type.value,
-                    "player_team": decision_agent.player.role.team.value
-                }
-            except:
-                pass
-        
-        action = decision_agent.get_night_action(context)
-        
-        # Add reasoning to context_data (after LLM call)
-        # Always create context_data for LLM agents to show reasoning section in UI
-        if context_data is None:
-            context_data = {}
-        if hasattr(decision_agent, 'last_reasoning') and decision_agent.last_reasoning:
-            context_data["reasoning"] = decision_agent.last_reasoning
-        elif "reasoning" not in context_data:
-            context_data["reasoning"] = None  # Explicitly set to None so UI knows to show message
+        return context
+    
+    def _apply_kill_decision(self, decision_maker: Tuple[Player, bool], decision: NightDecision) -> Optional[int]:
+        """Record the kill decision. Returns the target, or None if there is no valid kill."""
+        decision_player, is_don = decision_maker
+        action, context_data = decision.action, decision.context_data
         
         if action.get("type") == "kill_decision" or "kill_decision" in action:
             target = action.get("kill_decision") or action.get("target")
@@ -133,17 +199,18 @@ class NightPhaseHandler:
             if target and self._is_valid_target(target):
                 # Log decision
                 if is_don:
-                    print(f"[DON] Decides to kill Player {target}.")
-                    decision_maker.add_mafia_kill_decision(self.game_state.night_number, target)
+                    self.judge.log.info("night", "[DON] Decides to kill Player %s.", target)
+                    decision_player.add_mafia_kill_decision(self.game_state.night_number, target)
                 else:
-                    print(f"[MAFIA] Player {decision_maker.player_number} decides to kill Player {target}.")
+                    self.judge.log.info("night", "[MAFIA] Player %s decides to kill Player %s.",
+                                        decision_player.player_number, target)
                     # Store decision (mafia player making decision when Don is eliminated)
-                    decision_maker.add_mafia_kill_decision(self.game_state.night_number, target)
+                    decision_player.add_mafia_kill_decision(self.game_state.night_number, target)
                 
                 # Emit kill decision event
                 if self.event_emitter:
                     self.event_emitter.emit_night_kill_decision(
-                        decision_maker.player_number,
+                        decision_player.player_number,
                         target,
                         is_don,
                         self.game_state.night_number,
@@ -157,52 +224,50 @@ class NightPhaseHandler:
         self.judge.announce("The mafia leaves.")
         return None
     
-    def process_don_check(self, agents: dict[int, BaseAgent]) -> Optional[Dict[str, Any]]:
+    def _get_don(self, agents: dict[int, BaseAgent]) -> Optional[Player]:
+        """Get the Don if they are alive and have an agent."""
+        don = self.game_state.get_alive_player_by_role(RoleType.DON)
+        if not don or don.player_number not in agents:
+            return None
+        return don
+    
+    def process_don_check(self, agents: dict[int, BaseAgent],
+                          decision: Optional[NightDecision] = None) -> Optional[Dict[str, Any]]:
         """
-        Process Don's check for Sheriff.
+        Process Don's check for Sheriff (synchronous wrapper; not for use inside a running event loop).
         Returns check result or None.
         """
-        don = next((p for p in self.game_state.get_mafia_players() 
-                   if p.role.role_type == RoleType.DON), None)
+        return asyncio.run(self.process_don_check_async(agents, decision))
+    
+    async def process_don_check_async(self, agents: dict[int, BaseAgent],
+                                      decision: Optional[NightDecision] = None) -> Optional[Dict[str, Any]]:
+        """
+        Process Don's check for Sheriff.
+        Returns check result or None.
         
-        if not don or don.player_number not in agents:
+        Args:
+            agents: Agents by player number
+            decision: The Don's check if already decided (concurrent night)
+        """
+        don = self._get_don(agents)
+        if not don:
             return None
         
         self.judge.announce("The Don wakes up, you have ten seconds.")
         
-        agent = agents[don.player_number]
-        context = agent.build_context(self.game_state)
-        
-        # Capture context for LLM agents
-        context_data = None
-        if hasattr(agent, 'build_strategic_prompt'):
-            try:
-                prompt = agent.build_strategic_prompt(context, "don_check")
-                context_data = {
-                    "prompt": prompt,
-                    "player_role": agent.player.role.role_type.value,
-                    "player_team": agent.player.role.team.value
-                }
-            except:
-                pass
-        
-        action = agent.get_night_action(context)
-        
-        # Add reasoning to context_data (after LLM call)
-        # Always create context_data for LLM agents to show reasoning section in UI
-        if context_data is None:
-            context_data = {}
-        if hasattr(agent, 'last_reasoning') and agent.last_reasoning:
-            context_data["reasoning"] = agent.last_reasoning
-        elif "reasoning" not in context_data:
-            context_data["reasoning"] = None  # Explicitly set to None so UI knows to show message
+        if decision is None:
+            agent = agents[don.player_number]
+            decision = await self._decide(agent, agent.build_context(self.game_state), "don_check")
+        else:
+            self._replay(decision)
+        action, context_data = decision.action, decision.context_data
         
         if action.get("type") == "don_check":
             target = action.get("target")
             
             if target and self._is_valid_target(target):
                 # Announce Don's check
-                print(f"[DON] Checking Player {target}...")
+                self.judge.log.info("night", "[DON] Checking Player %s...", target)
                 
                 # Check if target is Sheriff
                 target_player = self.game_state.get_player(target)
@@ -216,59 +281,57 @@ class NightPhaseHandler:
                     self.event_emitter.emit_don_check(target, result, self.game_state.night_number, context_data)
                 
                 # Announce result
-                self.judge.announce(f"Player {target} is {result}.")
+                self.judge.announce("Player %s is %s.", target, result)
                 self.judge.announce("The Don goes to sleep.")
                 
                 return {"target": target, "result": result}
         
         return None
     
-    def process_sheriff_check(self, agents: dict[int, BaseAgent]) -> Optional[Dict[str, Any]]:
+    def _get_sheriff(self, agents: dict[int, BaseAgent]) -> Optional[Player]:
+        """Get the Sheriff if they are alive and have an agent."""
+        sheriff = self.game_state.get_alive_player_by_role(RoleType.SHERIFF)
+        if not sheriff or sheriff.player_number not in agents:
+            return None
+        return sheriff
+    
+    def process_sheriff_check(self, agents: dict[int, BaseAgent],
+                              decision: Optional[NightDecision] = None) -> Optional[Dict[str, Any]]:
         """
-        Process Sheriff's check.
+        Process Sheriff's check (synchronous wrapper; not for use inside a running event loop).
         Returns check result or None.
         """
-        sheriff = next((p for p in self.game_state.get_civilian_players() 
-                       if p.role.role_type == RoleType.SHERIFF), None)
+        return asyncio.run(self.process_sheriff_check_async(agents, decision))
+    
+    async def process_sheriff_check_async(self, agents: dict[int, BaseAgent],
+                                          decision: Optional[NightDecision] = None) -> Optional[Dict[str, Any]]:
+        """
+        Process Sheriff's check.
+        Returns check result or None.
         
-        if not sheriff or sheriff.player_number not in agents:
+        Args:
+            agents: Agents by player number
+            decision: The Sheriff's check if already decided (concurrent night)
+        """
+        sheriff = self._get_sheriff(agents)
+        if not sheriff:
             return None
         
         self.judge.announce("The Sheriff wakes up, you have ten seconds.")
         
-        agent = agents[sheriff.player_number]
-        context = agent.build_context(self.game_state)
-        
-        # Capture context for LLM agents
-        context_data = None
-        if hasattr(agent, 'build_strategic_prompt'):
-            try:
-                prompt = agent.build_strategic_prompt(context, "sheriff_check")
-                context_data = {
-                    "prompt": prompt,
-                    "player_role": agent.player.role.role_type.value,
-                    "player_team": agent.player.role.team.value
-                }
-            except:
-                pass
-        
-        action = agent.get_night_action(context)
-        
-        # Add reasoning to context_data (after LLM call)
-        # Always create context_data for LLM agents to show reasoning section in UI
-        if context_data is None:
-            context_data = {}
-        if hasattr(agent, 'last_reasoning') and agent.last_reasoning:
-            context_data["reasoning"] = agent.last_reasoning
-        elif "reasoning" not in context_data:
-            context_data["reasoning"] = None  # Explicitly set to None so UI knows to show message
+        if decision is None:
+            agent = agents[sheriff.player_number]
+            decision = await self._decide(agent, agent.build_context(self.game_state), "sheriff_check")
+        else:
+            self._replay(decision)
+        action, context_data = decision.action, decision.context_data
         
         if action.get("type") == "sheriff_check":
             target = action.get("target")
             
             if target and self._is_valid_target(target):
                 # Announce Sheriff's check
-                print(f"[SHERIFF] Checking Player {target}...")
+                self.judge.log.info("night", "[SHERIFF] Checking Player %s...", target)
                 
                 # Check if target is mafia
                 target_player = self.game_state.get_player(target)
@@ -282,7 +345,7 @@ class NightPhaseHandler:
                     self.event_emitter.emit_sheriff_check(target, result, self.game_state.night_number, context_data)
                 
                 # Announce result
-                self.judge.announce(f"Player {target} is {result}.")
+                self.judge.announce("Player %s is %s.", target, result)
                 self.judge.announce("The Sheriff goes to sleep.")
                 
                 return {"target": target, "result": result}
@@ -298,106 +361,184 @@ class NightPhaseHandler:
         return player is not None and player.is_alive
     
     def run_night_phase(self, agents: dict[int, BaseAgent]) -> None:
+        """
+        Run complete night phase (synchronous wrapper; not for use inside a running event loop).
+        """
+        asyncio.run(self.run_night_phase_async(agents))
+    
+    async def run_night_phase_async(self, agents: dict[int, BaseAgent]) -> None:
         """
         Run complete night phase.
         Sequence: Sheriff Check -> Mafia Kill -> Don Check
         Validates that all required actions are performed.
         """
-        # Only start night if we're transitioning from another phase
-        # (night is already started by day_phase or main loop)
-        if self.game_state.phase != GamePhase.NIGHT:
-            self.judge.start_night()
-        else:
-            # Already in NIGHT phase, just announce
-            self.judge.announce("Night falls.")
+        if self.judge.config.concurrent_night_actions:
+            await self._run_night_phase_concurrently(agents)
+            return
+        
+        self._start_night()
+        
+        # Check who should be alive BEFORE processing actions (to know what's required)
+        don_before, sheriff_before = self._get_night_roles()
         
         # Track which actions were performed
         mafia_kill_performed = False
         don_check_performed = False
         sheriff_check_performed = False
         
-        # Check who should be alive BEFORE processing actions (to know what's required)
-        mafia_players_before = self.game_state.get_mafia_players()
-        don_before = next((p for p in mafia_players_before if p.role.role_type == RoleType.DON and p.is_alive), None)
-        sheriff_before = next((p for p in self.game_state.get_civilian_players() 
-                              if p.role.role_type == RoleType.SHERIFF and p.is_alive), None)
-        
-        # Track if don/sheriff were alive at start (for validation)
-        don_was_alive = don_before is not None and don_before.is_alive and don_before.player_number in agents
-        sheriff_was_alive = sheriff_before is not None and sheriff_before.is_alive and sheriff_before.player_number in agents
-        mafia_was_alive = len([p for p in mafia_players_before if p.is_alive and p.player_number in agents]) > 0
-        
         # 1. Sheriff Check (first, so sheriff can check even if killed this night)
         if self.game_state.phase == GamePhase.NIGHT:
-            sheriff_check_result = self.process_sheriff_check(agents)
+            sheriff_check_result = await self.process_sheriff_check_async(agents)
             if sheriff_check_result is not None:
                 sheriff_check_performed = True
             
             # Check win condition after Sheriff check
-            if self.game_state.phase == GamePhase.GAME_OVER or self.game_state.phase == GamePhase.FAILED:
+            if self._is_game_finished():
                 return
         
         # 2. Mafia Kill
-        killed = self.process_mafia_kill(agents)
+        killed = await self.process_mafia_kill_async(agents)
         if killed:
             mafia_kill_performed = True
-            self.game_state.eliminate_player(
-                killed, 
-                "night kill",
-                night_number=self.game_state.night_number
-            )
-            player = self.game_state.get_player(killed)
-            if player and killed in agents:
-                self.judge.announce(f"Player {killed} has been killed.")
-                # Collect final speech from eliminated player
-                agent = agents[killed]
-                context = agent.build_context(self.game_state)
-                final_speech = agent.get_final_speech(context)
-                
-                # Add to player history
-                player.add_speech(final_speech)
-                
-                # Emit final speech event
-                if self.event_emitter:
-                    # Capture context for LLM agents
-                    from ..agents.llm_agent import SimpleLLMAgent
-                    context_data = None
-                    if isinstance(agent, SimpleLLMAgent):
-                        try:
-                            prompt = agent.build_strategic_prompt(context, "final_speech")
-                            context_data = {
-                                "prompt": prompt,
-                                "player_role": agent.player.role.role_type.value,
-                                "player_team": agent.player.role.team.value
-                            }
-                        except:
-                            pass
-                    
-                    # Add reasoning to context_data (after LLM call)
-                    # Always create context_data for LLM agents to show reasoning section in UI
-                    if context_data is None:
-                        context_data = {}
-                    if hasattr(agent, 'last_reasoning') and agent.last_reasoning:
-                        context_data["reasoning"] = agent.last_reasoning
-                    elif "reasoning" not in context_data:
-                        context_data["reasoning"] = None  # Explicitly set to None so UI knows to show message
-                    
-                    self.event_emitter.emit_speech(killed, final_speech, self.game_state.day_number, context_data)
+            await self._apply_night_kill(killed, agents)
         
         # Check win condition after kill - if game ended, skip remaining night actions
-        if self.game_state.phase == GamePhase.GAME_OVER or self.game_state.phase == GamePhase.FAILED:
+        if self._is_game_finished():
             return
         
         # 3. Don Check (every night) - only if game hasn't ended
         if self.game_state.phase == GamePhase.NIGHT:
-            don_check_result = self.process_don_check(agents)
+            don_check_result = await self.process_don_check_async(agents)
             if don_check_result is not None:
                 don_check_performed = True
             
             # Check win condition again after Don check
-            if self.game_state.phase == GamePhase.GAME_OVER or self.game_state.phase == GamePhase.FAILED:
+            if self._is_game_finished():
                 return
         
+        self._validate_night_actions(agents, don_before, sheriff_before, mafia_kill_performed,
+                                     don_check_performed, sheriff_check_performed)
+    
+    async def _run_night_phase_concurrently(self, agents: dict[int, BaseAgent]) -> None:
+        """
+        Run complete night phase with independent agent calls in parallel.
+        
+        The Sheriff check and every mafia kill claim are requested together; the kill
+        decision needs the claims, and the Don check needs the kill and the victim's
+        final speech, so those follow. Decisions are applied in the same order as
+        the sequential night, so announcements, events and outcomes are identical.
+        """
+        self._start_night()
+        
+        # Check who should be alive BEFORE processing actions (to know what's required)
+        don_before, sheriff_before = self._get_night_roles()
+        
+        # Track which actions were performed
+        mafia_kill_performed = False
+        don_check_performed = False
+        sheriff_check_performed = False
+        
+        # Sheriff check and kill claims in parallel (they don't see each other's results)
+        sheriff = self._get_sheriff(agents) if self.game_state.phase == GamePhase.NIGHT else None
+        claimers = [p for p in self.game_state.get_mafia_players() if p.player_number in agents]
+        tasks = []
+        if sheriff:
+            agent = agents[sheriff.player_number]
+            tasks.append(self._decide_concurrently(agent, agent.build_context(self.game_state), "sheriff_check"))
+        for player in claimers:
+            agent = agents[player.player_number]
+            tasks.append(self._decide_concurrently(agent, agent.build_context(self.game_state), "kill_claim"))
+        decisions = list(await asyncio.gather(*tasks))
+        sheriff_decision = decisions.pop(0) if sheriff else None
+        claim_decisions = {p.player_number: d for p, d in zip(claimers, decisions)}
+        
+        # 1. Sheriff Check
+        if self.game_state.phase == GamePhase.NIGHT:
+            sheriff_check_result = await self.process_sheriff_check_async(agents, sheriff_decision)
+            if sheriff_check_result is not None:
+                sheriff_check_performed = True
+            
+            if self._is_game_finished():
+                return
+        
+        # 2. Mafia Kill
+        killed = await self.process_mafia_kill_async(agents, claim_decisions)
+        if killed:
+            mafia_kill_performed = True
+            await self._apply_night_kill(killed, agents)
+        
+        if self._is_game_finished():
+            return
+        
+        # 3. Don Check
+        if self.game_state.phase == GamePhase.NIGHT:
+            don = self._get_don(agents)
+            don_decision = None
+            if don:
+                agent = agents[don.player_number]
+                don_decision = await self._decide_concurrently(agent, agent.build_context(self.game_state), "don_check")
+            don_check_result = await self.process_don_check_async(agents, don_decision)
+            if don_check_result is not None:
+                don_check_performed = True
+            
+            if self._is_game_finished():
+                return
+        
+        self._validate_night_actions(agents, don_before, sheriff_before, mafia_kill_performed,
+                                     don_check_performed, sheriff_check_performed)
+    
+    def _start_night(self) -> None:
+        """Start the night, or announce it if it was already started."""
+        # Only start night if we're transitioning from another phase
+        # (night is already started by day_phase or main loop)
+        if self.game_state.phase != GamePhase.NIGHT:
+            self.judge.start_night()
+        else:
+            # Already in NIGHT phase, just announce
+            self.judge.announce("Night falls.")
+    
+    def _get_night_roles(self) -> Tuple[Optional[Player], Optional[Player]]:
+        """Get the Don and Sheriff alive at the start of the night (to know what's required)."""
+        don_before = self.game_state.get_alive_player_by_role(RoleType.DON)
+        sheriff_before = self.game_state.get_alive_player_by_role(RoleType.SHERIFF)
+        return don_before, sheriff_before
+    
+    def _is_game_finished(self) -> bool:
+        """Check whether the game ended (win condition or failure)."""
+        return self.game_state.phase == GamePhase.GAME_OVER or self.game_state.phase == GamePhase.FAILED
+    
+    async def _apply_night_kill(self, killed: int, agents: dict[int, BaseAgent]) -> None:
+        """Eliminate the mafia's victim and collect their final speech."""
+        self.game_state.eliminate_player(
+            killed, 
+            "night kill",
+            night_number=self.game_state.night_number
+        )
+        player = self.game_state.get_player(killed)
+        if player and killed in agents:
+            self.judge.announce("Player %s has been killed.", killed)
+            # Collect final speech from eliminated player
+            agent = agents[killed]
+            context = agent.build_context(self.game_state)
+            final_speech = await agent.get_final_speech_async(context)
+            
+            # Add to player history and public history
+            self.game_state.record_speech(killed, final_speech, is_final=True)
+            
+            # Emit final speech event
+            if self.event_emitter:
+                # Capture context for LLM agents
+                context_data = None
+                if isinstance(agent, SimpleLLMAgent):
+                    context_data = self._capture_context_data(agent, context, "final_speech")
+                context_data = self._add_reasoning(agent, context_data)
+                
+                self.event_emitter.emit_speech(killed, final_speech, self.game_state.day_number, context_data)
+    
+    def _validate_night_actions(self, agents: dict[int, BaseAgent], don_before: Optional[Player],
+                                sheriff_before: Optional[Player], mafia_kill_performed: bool,
+                                don_check_performed: bool, sheriff_check_performed: bool) -> None:
+        """Fail the game if a required night action was not performed."""
         # Validate required actions - only if game is still ongoing
         if self.game_state.phase == GamePhase.NIGHT:
             errors = []
@@ -422,7 +563,6 @@ class NightPhaseHandler:
             # If any validation errors, fail the game
             if errors:
                 for error in errors:
-                    print(f"\n❌ {error}")
+                    self.judge.log.error("game", "\n❌ %s", error)
                 self.game_state.end_game(reason="failed")
                 return
-
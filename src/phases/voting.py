@@ -34,7 +34,7 @@ class VotingHandler:
         if self.event_emitter:
             self.event_emitter.emit_voting_start(nominations, self.game_state.day_number)
         
-        self.judge.announce(f"Players {nominations} have been nominated. I repeat, {nominations}, in this order.")
+        self.judge.announce("Players %s have been nominated. I repeat, %s, in this order.", nominations, nominations)
         self.judge.announce("You must vote. If you don't vote, your vote will count for the last person nominated.")
         
         # Single voting call
@@ -58,11 +58,7 @@ class VotingHandler:
                 except:
                     pass
             
-            # Use async version if available (SimpleLLMAgent), otherwise fallback to sync
-            if isinstance(agent, SimpleLLMAgent):
-                vote_choice = await agent.get_vote_choice_async(context)
-            else:
-                vote_choice = agent.get_vote_choice(context)
+            vote_choice = await agent.get_vote_choice_async(context)
             
             # Add reasoning to context_data (after LLM call)
             # Always create context_data for LLM agents to show reasoning section in UI
@@ -106,16 +102,35 @@ class VotingHandler:
     
     def collect_votes(self, agents: dict[int, BaseAgent]) -> None:
         """
-        Collect votes from all alive players (synchronous version, uses async internally).
+        Collect votes from all alive players (synchronous wrapper;
+        not for use inside a running event loop).
         """
-        # Run async version in sync context
         asyncio.run(self.collect_votes_async(agents))
     
     def process_voting(self, agents: dict[int, BaseAgent]) -> Optional[int]:
+        """
+        Process voting and return eliminated player number, or None if tie needs resolution
+        (synchronous wrapper; not for use inside a running event loop).
+        """
+        return asyncio.run(self.process_voting_async(agents))
+    
+    async def process_voting_async(self, agents: dict[int, BaseAgent]) -> Optional[int]:
         """
         Process voting and return eliminated player number, or None if tie needs resolution.
         """
-        self.collect_votes(agents)
+        await self.collect_votes_async(agents)
+        
+        # Votes become public once the round closes
+        day = self.game_state.day_number
+        round_votes = self.game_state.votes.get(day, {})
+        if round_votes:
+            self.game_state._log_action("vote_round", {
+                "day": day,
+                "round": self.tie_break_round + 1,
+                "votes": round_votes.copy(),
+                "is_tie_break": self.tie_break_round > 0,
+                "nominations": self.judge.get_nominated_players().copy()  # Include nominations for this round
+            })
         
         # Get vote counts
         counts = self.judge.get_vote_counts()
@@ -124,12 +139,11 @@ class VotingHandler:
             return None
         
         # Get who voted for whom
-        day = self.game_state.day_number
-        votes = self.game_state.votes.get(day, {})
+        votes = round_votes
         
         # Find non-voters (they get default vote for last nominated)
         nominations = self.judge.get_nominated_players()
-        alive_players = [p.player_number for p in self.game_state.get_alive_players()]
+        alive_players = self.game_state.get_alive_numbers()
         voters_set = set(votes.keys())
         non_voters = [p for p in alive_players if p not in voters_set]
         last_nominated = nominations[-1] if nominations else None
@@ -145,7 +159,7 @@ class VotingHandler:
                 voters.extend(non_voters)
             
             voters_dict[player] = voters
-            self.judge.announce(f"{vote_count} votes for player {player}, voted: {voters}")
+            self.judge.announce("%s votes for player %s, voted: %s", vote_count, player, voters)
         
         # Emit vote results event
         if self.event_emitter:
@@ -170,13 +184,20 @@ class VotingHandler:
         if nominations:
             last_nominated = nominations[-1]
             if target == last_nominated:
-                alive_players = [p.player_number for p in self.game_state.get_alive_players()]
+                alive_players = self.game_state.get_alive_numbers()
                 voters_set = set(votes.keys())
                 non_voters = [p for p in alive_players if p not in voters_set]
                 voters.extend(non_voters)
         return voters
     
     def handle_tie(self, tied_players: List[int], agents: dict[int, BaseAgent]) -> Optional[List[int]]:
+        """
+        Handle tie-breaking procedure (synchronous wrapper; not for use inside a running event loop).
+        Returns eliminated players or None if all remain.
+        """
+        return asyncio.run(self.handle_tie_async(tied_players, agents))
+    
+    async def handle_tie_async(self, tied_players: List[int], agents: dict[int, BaseAgent]) -> Optional[List[int]]:
         """
         Handle tie-breaking procedure.
         Returns eliminated players or None if all remain.
@@ -188,7 +209,7 @@ class VotingHandler:
         if self.event_emitter:
             self.event_emitter.emit_tie(tied_players, self.game_state.day_number)
         
-        self.judge.announce(f"Tie detected between players {tied_players}.")
+        self.judge.announce("Tie detected between players %s.", tied_players)
         self.judge.announce("Tied players will each get an additional speech, then we will revote.")
         
         # Tied players get additional speeches (shorter limit)
@@ -200,10 +221,33 @@ class VotingHandler:
                 if not player or not player.is_alive:
                     continue
                 
-                self.judge.announce(f"Player {player_number}, you have 30 seconds (reduced word limit) to speak.")
+                self.judge.announce("Player %s, you have 30 seconds (reduced word limit) to speak.", player_number)
                 
                 context = agent.build_context(self.game_state)
-                speech = agent.get_day_speech(context)
+                
+                # Capture context for LLM agents
+                context_data = None
+                if hasattr(agent, 'build_strategic_prompt'):
+                    try:
+                        prompt = agent.build_strategic_prompt(context, "speech")
+                        context_data = {
+                            "prompt": prompt,
+                            "player_role": agent.player.role.role_type.value,
+                            "player_team": agent.player.role.team.value
+                        }
+                    except:
+                        pass
+                
+                speech = await agent.get_day_speech_async(context)
+                
+                # Add reasoning to context_data (after LLM call), as for day speeches
+                if hasattr(agent, 'build_strategic_prompt'):
+                    if context_data is None:
+                        context_data = {}
+                    if hasattr(agent, 'last_reasoning') and agent.last_reasoning:
+                        context_data["reasoning"] = agent.last_reasoning
+                    else:
+                        context_data["reasoning"] = None  # Explicitly set to None so UI knows to show message
                 
                 # Token limits are handled by LLM configuration (unlimited by default)
                 # No word-based truncation needed
@@ -211,7 +255,10 @@ class VotingHandler:
                 if not self.judge.validate_speech_ending(speech):
                     speech += " PASS"
                 
-                player.add_speech(speech)
+                self.game_state.record_speech(player_number, speech)
+                # Recorded between the tie event and the revote's voting_start
+                if self.event_emitter:
+                    self.event_emitter.emit_speech(player_number, speech, self.game_state.day_number, context_data)
                 self.judge.player_speaks(player_number, speech)
         
         # Restrict nominations to only tied players for the revote
@@ -234,20 +281,9 @@ class VotingHandler:
             self.game_state.votes[day] = {}
         
         # Revote - now only between tied players (all players must still vote)
-        self.judge.announce(f"Revote: You must vote between players {tied_players} only.")
+        self.judge.announce("Revote: You must vote between players %s only.", tied_players)
         self.judge.start_voting()
-        target = self.process_voting(agents)
-        
-        # Store tie-break votes for history (after revote completes)
-        tie_break_votes = self.game_state.votes.get(day, {}).copy()
-        if tie_break_votes:
-            self.game_state._log_action("vote_round", {
-                "day": day,
-                "round": 2,
-                "votes": tie_break_votes,
-                "is_tie_break": True,
-                "nominations": tied_players.copy()  # Include nominations for this round
-            })
+        target = await self.process_voting_async(agents)
         
         if target:
             return [target]
@@ -257,10 +293,10 @@ class VotingHandler:
         
         if set(new_tied) == set(tied_players):
             # Same tie - vote to eliminate all or keep all
-            return self._vote_eliminate_all(tied_players, agents)
+            return await self._vote_eliminate_all_async(tied_players, agents)
         elif len(new_tied) < len(tied_players):
             # Fewer players tied - continue tie-breaking
-            return self.handle_tie(new_tied, agents)
+            return await self.handle_tie_async(new_tied, agents)
         
         return None
     
@@ -269,7 +305,7 @@ class VotingHandler:
         Vote to eliminate all tied players or keep all (async version).
         Returns eliminated players or None.
         """
-        self.judge.announce(f"Same tie persists. Vote: Who is in favour of all nominated players ({tied_players}) leaving the game?")
+        self.judge.announce("Same tie persists. Vote: Who is in favour of all nominated players (%s) leaving the game?", tied_players)
         
         # Collect votes in parallel
         async def get_vote_for_player(player_num: int, agent: BaseAgent) -> tuple[int, int, Optional[Dict[str, Any]]]:
@@ -289,11 +325,7 @@ class VotingHandler:
                 except:
                     pass
             
-            # Use async version if available (SimpleLLMAgent), otherwise fallback to sync
-            if isinstance(agent, SimpleLLMAgent):
-                vote = await agent.get_vote_choice_async(context)
-            else:
-                vote = agent.get_vote_choice(context)
+            vote = await agent.get_vote_choice_async(context)
             
             # Add reasoning to context_data (after LLM call)
             # Always create context_data for LLM agents to show reasoning section in UI
@@ -334,7 +366,7 @@ class VotingHandler:
         
         if votes_for_elimination > majority:
             # All tied players eliminated
-            self.judge.announce(f"Majority votes to eliminate all. Players {tied_players} are eliminated.")
+            self.judge.announce("Majority votes to eliminate all. Players %s are eliminated.", tied_players)
             self.last_tie_break_voters = voters_for_elimination
             return tied_players
         elif votes_for_elimination == votes_against:
@@ -346,41 +378,31 @@ class VotingHandler:
             self.judge.announce("Majority votes to keep all. All tied players remain in the game.")
             return None
     
-    def _vote_eliminate_all(self, tied_players: List[int], agents: dict[int, BaseAgent]) -> Optional[List[int]]:
+    def run_voting_phase(self, agents: dict[int, BaseAgent]) -> None:
         """
-        Vote to eliminate all tied players or keep all (synchronous wrapper).
-        Returns eliminated players or None.
+        Run complete voting phase with tie-breaking if needed (synchronous wrapper; not for use inside a running event loop).
         """
-        return asyncio.run(self._vote_eliminate_all_async(tied_players, agents))
+        asyncio.run(self.run_voting_phase_async(agents))
     
-    def run_voting_phase(self, agents: dict[int, BaseAgent]) -> None:
+    async def run_voting_phase_async(self, agents: dict[int, BaseAgent]) -> None:
         """
         Run complete voting phase with tie-breaking if needed.
         """
-        target = self.process_voting(agents)
+        self.tie_break_round = 0
+        target = await self.process_voting_async(agents)
         
-        # If no target (tie), log the original vote round and nominations before tie-breaking
+        # If no target (tie), log the original nominations before tie-breaking
+        # (the vote round itself is logged by process_voting)
         if not target:
             day = self.game_state.day_number
-            original_votes = self.game_state.votes.get(day, {}).copy()
             original_nominations = self.game_state.nominations.get(day, []).copy()
             
-            # Log original nominations
             if original_nominations:
                 self.game_state._log_action("nomination_round", {
                     "day": day,
                     "round": 1,
                     "nominations": original_nominations
                 })
-            
-            # Log original vote round
-            if original_votes:
-                self.game_state._log_action("vote_round", {
-                    "day": day,
-                    "round": 1,
-                    "votes": original_votes,
-                    "nominations": original_nominations  # Include nominations for this round
-                })
         
         if target:
             voters = self._get_voters_for_target(target)
@@ -393,14 +415,14 @@ class VotingHandler:
             )
             player = self.game_state.get_player(target)
             if player and target in agents:
-                self.judge.announce(f"Player {target} has been eliminated. This is your final speech.")
+                self.judge.announce("Player %s has been eliminated. This is your final speech.", target)
                 # Collect final speech from eliminated player
                 agent = agents[target]
                 context = agent.build_context(self.game_state)
-                final_speech = agent.get_final_speech(context)
+                final_speech = await agent.get_final_speech_async(context)
                 
-                # Add to player history
-                player.add_speech(final_speech)
+                # Add to player history and public history
+                self.game_state.record_speech(target, final_speech, is_final=True)
                 
                 # Emit final speech event
                 if self.event_emitter:
@@ -425,13 +447,13 @@ class VotingHandler:
                             context_data["reasoning"] = agent.last_reasoning
                         elif "reasoning" not in context_data:
                             context_data["reasoning"] = None  # Explicitly set to None so UI knows to show message
-                        
-                        self.event_emitter.emit_speech(target, final_speech, self.game_state.day_number, context_data)
+
+                    self.event_emitter.emit_speech(target, final_speech, self.game_state.day_number, context_data)
         else:
             # Tie - handle tie-breaking
             tied_players = self.judge.get_tied_players()
             if tied_players:
-                result = self.handle_tie(tied_players, agents)
+                result = await self.handle_tie_async(tied_players, agents)
                 if result:
                     eliminated_players = result
                     voters = self.last_tie_break_voters
@@ -447,11 +469,11 @@ class VotingHandler:
                         )
                         player = self.game_state.get_player(eliminated_player)
                         if player and eliminated_player in agents:
-                            self.judge.announce(f"Player {eliminated_player} has been eliminated. This is your final speech.")
+                            self.judge.announce("Player %s has been eliminated. This is your final speech.", eliminated_player)
                             agent = agents[eliminated_player]
                             context = agent.build_context(self.game_state)
-                            final_speech = agent.get_final_speech(context)
-                            player.add_speech(final_speech)
+                            final_speech = await agent.get_final_speech_async(context)
+                            self.game_state.record_speech(eliminated_player, final_speech, is_final=True)
                             if self.event_emitter:
                                 context_data = None
                                 if isinstance(agent, SimpleLLMAgent):
@@ -0,0 +1,7 @@
+"""
+Batch simulation of games without the object engine (requires NumPy).
+"""
+
+from .vectorized import BatchResult, OutcomeComparison, compare_outcomes, simulate_dummy_games
+
+__all__ = ['BatchResult', 'OutcomeComparison', 'compare_outcomes', 'simulate_dummy_games']
@@ -0,0 +1,429 @@
+"""
+Vectorized simulator for games played entirely by DummyAgents.
+
+The object engine plays one game at a time through GameState, the Judge and the
+phase handlers, so a win-rate study of the baseline policy costs several
+milliseconds per game. simulate_dummy_games() plays N games at once as NumPy
+arrays (roles, alive masks, nominations, Sheriff/Don check histories), with one
+array operation per speaking slot, vote or night action across all unfinished games.
+
+It models the policies as DummyAgent actually plays them through the engine:
+
+- Day: every alive player, in speaking order, nominates a uniformly random other
+  alive player; the Judge accepts a nomination unless that player is already nominated
+- Votes: each player votes for their own nomination if it is on the ballot, otherwise
+  for the first nominee (a self-vote moves to the first other nominee). Nobody abstains,
+  so the default vote for the last nominee never applies
+- Ties: tied players speak again (drawing a new nomination) and everyone revotes
+  between them; the same tie again goes to the lift-all vote, a smaller tie revotes again
+- Night: the Sheriff checks an unchecked alive player. No kill claim is ever recorded
+  (the Don's claim call is spent on a Don check, other mafia see an empty claim list),
+  so the kill is a uniformly random alive civilian. The Don then checks an unchecked civilian
+
+The engine's per-agent random.Random streams can't be reproduced, so a seed gives
+different individual games than the object engine; compare_outcomes() checks that
+the outcome distributions agree instead (python tournament.py --cross-check).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ..core.roles import RoleType, get_role_distribution
+
+
+# Role codes in BatchResult.roles
+CIVILIAN, SHERIFF, MAFIA, DON = 0, 1, 2, 3
+_ROLE_CODES = {RoleType.CIVILIAN: CIVILIAN, RoleType.SHERIFF: SHERIFF, RoleType.MAFIA: MAFIA, RoleType.DON: DON}
+
+# Winner codes in BatchResult.winner
+NO_WINNER, RED, BLACK = 0, 1, 2
+_WINNER_NAMES = {NO_WINNER: None, RED: "red", BLACK: "black"}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("NumPy is required for the vectorized simulator. Install with: pip install numpy")
+
+
+def _choose(rng: "np.random.Generator", mask: "np.ndarray") -> "np.ndarray":
+    """
+    Pick a uniformly random True column in each row.
+
+    Returns:
+        Column index per row, -1 for rows without a True column
+    """
+    keys = np.where(mask, rng.random(mask.shape), -1.0)
+    return np.where(mask.any(axis=1), keys.argmax(axis=1), -1)
+
+
+@dataclass
+class BatchResult:
+    """Final state of a batch of simulated games (players are 0-based column indices)."""
+
+    roles: "np.ndarray"  # (games, players) role codes
+    alive: "np.ndarray"  # (games, players) alive at game end
+    winner: "np.ndarray"  # (games,) RED or BLACK
+    days: "np.ndarray"  # (games,) day number at game end
+    nights: "np.ndarray"  # (games,) nights played
+    max_rounds_reached: "np.ndarray"  # (games,) ended by the max_rounds limit
+    sheriff_checks: "np.ndarray"  # (games, nights) player checked by the Sheriff each night, -1 if none
+    don_checks: "np.ndarray"  # (games, nights) player checked by the Don each night, -1 if none
+
+    @property
+    def games(self) -> int:
+        return len(self.winner)
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate win counts and average game length (same keys as tournament.summarize_results)."""
+        games = self.games
+        red_wins = int((self.winner == RED).sum())
+        black_wins = int((self.winner == BLACK).sum())
+        return {
+            "games": games,
+            "red_wins": red_wins,
+            "black_wins": black_wins,
+            "failed": 0,
+            "red_win_rate": red_wins / games if games else 0.0,
+            "black_win_rate": black_wins / games if games else 0.0,
+            "avg_days": float(self.days.mean()) if games else 0.0,
+        }
+
+    def outcome_counts(self) -> Dict[Tuple[Optional[str], int], int]:
+        """Count games by (winner, days)."""
+        keys, counts = np.unique(np.stack([self.winner, self.days], axis=1), axis=0, return_counts=True)
+        return {(_WINNER_NAMES[int(w)], int(d)): int(c) for (w, d), c in zip(keys, counts)}
+
+
+class _Games:
+    """Array state of a batch of games, advanced phase by phase for all unfinished games."""
+
+    def __init__(self, games: int, rng: "np.random.Generator", max_rounds: Optional[int]):
+        self.rng = rng
+        self.max_rounds = max_rounds
+        codes = np.array([_ROLE_CODES[role] for role in get_role_distribution()], dtype=np.int8)
+        self.players = len(codes)
+        # Role assignment is a uniform shuffle of the standard distribution, as in GameState.setup_game
+        self.role = rng.permuted(np.tile(codes, (games, 1)), axis=1)
+        self.mafia = self.role >= MAFIA
+        self.alive = np.ones((games, self.players), dtype=bool)
+        self.day = np.ones(games, dtype=np.int16)
+        self.night = np.zeros(games, dtype=np.int16)
+        self.last_starter = np.zeros(games, dtype=np.intp)
+        self.winner = np.full(games, NO_WINNER, dtype=np.int8)
+        self.max_rounds_reached = np.zeros(games, dtype=bool)
+        # Each player's nomination today (DummyAgent.current_day_nomination), used for votes
+        self.pick = np.full((games, self.players), -1, dtype=np.intp)
+        # Players each checker has already picked (DummyAgent.checked_players)
+        self.sheriff_checked = np.zeros((games, self.players), dtype=bool)
+        self.don_checked = np.zeros((games, self.players), dtype=bool)
+        # Every night kills a player, so there are fewer nights than players
+        self.sheriff_checks = np.full((games, self.players), -1, dtype=np.int8)
+        self.don_checks = np.full((games, self.players), -1, dtype=np.int8)
+
+    def run(self) -> None:
+        """Play every game to the end (MafiaGame.run_game's loop)."""
+        active = np.arange(len(self.winner))
+        while active.size:
+            self._day(active)
+            active = active[self.winner[active] == NO_WINNER]
+            self._night(active)
+            active = active[self.winner[active] == NO_WINNER]
+
+            self.day[active] += 1
+            result = self._check_win(active)
+            ended = result != NO_WINNER
+            self.winner[active[ended]] = result[ended]
+            self.max_rounds_reached[active[ended]] = self._at_max_rounds(active[ended])
+            active = active[~ended]
+
+    def _at_max_rounds(self, rows: "np.ndarray") -> "np.ndarray":
+        if self.max_rounds is None:
+            return np.zeros(len(rows), dtype=bool)
+        return self.day[rows] >= self.max_rounds
+
+    def _check_win(self, rows: "np.ndarray") -> "np.ndarray":
+        """GameState.check_win_condition for each game in rows."""
+        alive = self.alive[rows]
+        mafia = (alive & self.mafia[rows]).sum(axis=1)
+        civilians = (alive & ~self.mafia[rows]).sum(axis=1)
+        result = np.where(mafia == 0, RED, np.where(mafia >= civilians, BLACK, NO_WINNER))
+        return np.where(self._at_max_rounds(rows), np.where(mafia >= civilians, BLACK, RED), result).astype(np.int8)
+
+    def _eliminate(self, rows: "np.ndarray", players: "np.ndarray") -> None:
+        """Eliminate one player per game, ending games the win check decides (GameState.eliminate_player)."""
+        if not rows.size:
+            return
+        self.alive[rows, players] = False
+        result = self._check_win(rows)
+        # end_game overwrites the winner whenever the check returns one
+        decided = result != NO_WINNER
+        self.winner[rows[decided]] = result[decided]
+
+    def _day(self, rows: "np.ndarray") -> None:
+        """Speeches with nominations, then the Judge's decision on voting."""
+        count = len(rows)
+        index = np.arange(self.players)
+        local = np.arange(count)
+        alive = self.alive[rows]
+        alive_count = alive.sum(axis=1)
+
+        # Speaking order: day 1 starts at player 1, later days at the alive player after
+        # the previous starter (or the first alive player if the starter has died)
+        first_alive = alive.argmax(axis=1)
+        previous = self.last_starter[rows]
+        next_alive = np.where(alive, (index - previous[:, None] - 1) % self.players, self.players).argmin(axis=1)
+        start = np.where(alive[local, previous], next_alive, first_alive)
+        start = np.where(self.day[rows] == 1, np.where(alive[:, 0], 0, first_alive), start)
+        order = np.argsort(np.where(alive, (index - start[:, None]) % self.players, self.players),
+                           axis=1, kind="stable")
+        self.last_starter[rows] = start
+
+        nominated = np.zeros((count, self.players), dtype=bool)
+        ballot = np.full((count, self.players), -1, dtype=np.intp)  # Nominees in nomination order
+        nominees = np.zeros(count, dtype=np.intp)
+        for slot in range(self.players):
+            speaking = slot < alive_count
+            if not speaking.any():
+                break
+            speaker = order[:, slot]
+            others = alive.copy()
+            others[local, speaker] = False
+            target = _choose(self.rng, others)
+            self.pick[rows[speaking], speaker[speaking]] = target[speaking]
+            accepted = speaking & (target >= 0)
+            accepted[accepted] &= ~nominated[local[accepted], target[accepted]]
+            nominated[local[accepted], target[accepted]] = True
+            ballot[local[accepted], nominees[accepted]] = target[accepted]
+            nominees[accepted] += 1
+
+        # One nominee: no vote on day 1, automatic elimination later
+        automatic = (nominees == 1) & (self.day[rows] > 1)
+        self._eliminate(rows[automatic], ballot[automatic, 0])
+        voting = nominees >= 2
+        self._vote(rows[voting], ballot[voting], nominees[voting])
+
+    def _count_votes(self, rows: "np.ndarray", ballot: "np.ndarray") -> "np.ndarray":
+        """
+        Collect every alive player's vote.
+
+        Returns:
+            (games, ballot positions) votes for each nominee, -1 past the end of the ballot
+        """
+        count = len(rows)
+        index = np.arange(self.players)
+        local = np.arange(count)[:, None]
+        on_ballot = np.zeros((count, self.players), dtype=bool)
+        listed = ballot >= 0
+        on_ballot[np.broadcast_to(local, ballot.shape)[listed], ballot[listed]] = True
+
+        pick = self.pick[rows]
+        own = (pick >= 0) & on_ballot[local, pick.clip(0)]
+        choice = np.where(own, pick, ballot[:, :1])
+        # A self-vote is moved to the first other nominee
+        first_other = np.where(ballot[:, :1] == index, ballot[:, 1:2], ballot[:, :1])
+        choice = np.where(choice == index, first_other, choice)
+
+        votes = np.zeros((count, self.players), dtype=np.intp)
+        voters = self.alive[rows]
+        np.add.at(votes, (np.broadcast_to(local, choice.shape)[voters], choice[voters]), 1)
+        return np.where(listed, np.take_along_axis(votes, ballot.clip(0), axis=1), -1)
+
+    def _vote(self, rows: "np.ndarray", ballot: "np.ndarray", nominees: "np.ndarray") -> None:
+        """Voting with the tie procedure (VotingHandler.run_voting_phase and handle_tie)."""
+        tie_break = False
+        while rows.size:
+            if tie_break:
+                # Tied players speak again, drawing a new nomination
+                for position in range(int(nominees.max())):
+                    speaking = position < nominees
+                    speaker = ballot[speaking, position]
+                    others = self.alive[rows[speaking]].copy()
+                    others[np.arange(len(speaker)), speaker] = False
+                    self.pick[rows[speaking], speaker] = _choose(self.rng, others)
+
+            votes = self._count_votes(rows, ballot)
+            most = votes.max(axis=1, keepdims=True)
+            tied = votes == most
+            tied_count = tied.sum(axis=1)
+            unique = tied_count == 1
+            self._eliminate(rows[unique], ballot[unique, tied[unique].argmax(axis=1)])
+
+            if tie_break:
+                # The same players tied again: vote on eliminating all of them
+                repeated = ~unique & (tied_count == nominees)
+                self._lift_all(rows[repeated], ballot[repeated], nominees[repeated])
+                remaining = ~unique & ~repeated
+            else:
+                remaining = ~unique
+
+            # Revote between the tied players, keeping nomination order
+            rows, tied, tied_count = rows[remaining], tied[remaining], tied_count[remaining]
+            order = np.argsort(~tied, axis=1, kind="stable")
+            ballot = np.take_along_axis(ballot[remaining], order, axis=1)
+            ballot[np.arange(ballot.shape[1]) >= tied_count[:, None]] = -1
+            nominees = tied_count
+            tie_break = True
+
+    def _lift_all(self, rows: "np.ndarray", ballot: "np.ndarray", nominees: "np.ndarray") -> None:
+        """Eliminate all tied players if a majority votes for any of them."""
+        if not rows.size:
+            return
+        local = np.arange(len(rows))[:, None]
+        listed = ballot >= 0
+        on_ballot = np.zeros((len(rows), self.players), dtype=bool)
+        on_ballot[np.broadcast_to(local, ballot.shape)[listed], ballot[listed]] = True
+        # A vote for any tied player counts as a vote to eliminate all (no self-vote redirect here)
+        pick = self.pick[rows]
+        choice = np.where((pick >= 0) & on_ballot[local, pick.clip(0)], pick, ballot[:, :1])
+        alive = self.alive[rows]
+        votes_for = (alive & on_ballot[local, choice]).sum(axis=1)
+        eliminate = votes_for > alive.sum(axis=1) / 2
+
+        rows, ballot, nominees = rows[eliminate], ballot[eliminate], nominees[eliminate]
+        # Eliminated one at a time, with a win check after each
+        for position in range(int(nominees.max(initial=0))):
+            present = position < nominees
+            self._eliminate(rows[present], ballot[present, position])
+
+    def _night(self, rows: "np.ndarray") -> None:
+        """Sheriff check, mafia kill, Don check (NightPhaseHandler.run_night_phase)."""
+        self.night[rows] += 1
+        night = self.night[rows] - 1
+        alive = self.alive[rows]
+        role = self.role[rows]
+
+        # Sheriff: an unchecked alive player other than themselves (any one once all are checked)
+        candidates = alive & (role != SHERIFF)
+        fresh = candidates & ~self.sheriff_checked[rows]
+        target = _choose(self.rng, np.where(fresh.any(axis=1, keepdims=True), fresh, candidates))
+        checking = (alive & (role == SHERIFF)).any(axis=1) & (target >= 0)
+        self.sheriff_checked[rows[checking], target[checking]] = True
+        self.sheriff_checks[rows[checking], night[checking]] = target[checking]
+
+        # The Don's kill-claim call picks a check target too; the engine ignores it, but the
+        # Don remembers the player as checked
+        self._don_check(rows, night, record=False)
+
+        # Kill: no claims are ever made, so the decision maker picks a random alive civilian
+        self._eliminate(rows, _choose(self.rng, alive & ~self.mafia[rows]))
+
+        running = self.winner[rows] == NO_WINNER
+        self._don_check(rows[running], night[running], record=True)
+
+    def _don_check(self, rows: "np.ndarray", night: "np.ndarray", record: bool) -> None:
+        """The Don checks an alive civilian they haven't checked (any one once all are checked)."""
+        alive = self.alive[rows]
+        civilians = alive & ~self.mafia[rows]
+        fresh = civilians & ~self.don_checked[rows]
+        target = _choose(self.rng, np.where(fresh.any(axis=1, keepdims=True), fresh, civilians))
+        checking = (alive & (self.role[rows] == DON)).any(axis=1) & (target >= 0)
+        self.don_checked[rows[checking], target[checking]] = True
+        if record:
+            self.don_checks[rows[checking], night[checking]] = target[checking]
+
+
+def simulate_dummy_games(games: int, seed: Optional[int] = None, max_rounds: Optional[int] = 10) -> BatchResult:
+    """
+    Simulate a batch of DummyAgent games.
+
+    Args:
+        games: Number of games
+        seed: Seed for the batch's random generator (None for fresh entropy)
+        max_rounds: Day limit, as GameConfig.max_rounds (None for no limit)
+
+    Returns:
+        Final state of every game
+
+    Raises:
+        ImportError: If NumPy isn't installed
+    """
+    _require_numpy()
+    state = _Games(games, np.random.default_rng(seed), max_rounds)
+    state.run()
+    nights = int(state.night.max(initial=0))
+    return BatchResult(
+        roles=state.role,
+        alive=state.alive,
+        winner=state.winner,
+        days=state.day.astype(np.int64),
+        nights=state.night.astype(np.int64),
+        max_rounds_reached=state.max_rounds_reached,
+        sheriff_checks=state.sheriff_checks[:, :nights],
+        don_checks=state.don_checks[:, :nights],
+    )
+
+
+def _chi2_sf(statistic: float, dof: int) -> float:
+    """Upper tail probability of the chi-square distribution (Wilson-Hilferty approximation)."""
+    if dof <= 0:
+        return 1.0
+    scale = 2 / (9 * dof)
+    z = ((statistic / dof) ** (1 / 3) - (1 - scale)) / math.sqrt(scale)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class OutcomeComparison:
+    """Chi-square homogeneity test between engine and vectorized outcome counts."""
+
+    engine_counts: Dict[Tuple[Optional[str], int], int]
+    batch_counts: Dict[Tuple[Optional[str], int], int]
+    statistic: float
+    dof: int
+    p_value: float
+
+    def consistent(self, alpha: float = 0.001) -> bool:
+        """Whether the test fails to reject that both come from the same distribution."""
+        return self.p_value >= alpha
+
+
+def compare_outcomes(engine_results: Iterable[Dict[str, Any]], batch: BatchResult,
+                     min_expected: float = 5.0) -> OutcomeComparison:
+    """
+    Test whether object-engine games and simulated games share an outcome distribution.
+
+    Outcomes are (winner, days) pairs. Outcomes too rare for the chi-square test
+    (expected count below min_expected in either sample) are pooled into one category.
+
+    Args:
+        engine_results: Per-game results from tournament.run_tournament
+        batch: Simulated games
+        min_expected: Smallest expected count for an outcome to be tested on its own
+
+    Returns:
+        Comparison with both samples' counts and the test result
+    """
+    engine_counts: Dict[Tuple[Optional[str], int], int] = {}
+    for result in engine_results:
+        key = (result["winner"], result["days"])
+        engine_counts[key] = engine_counts.get(key, 0) + 1
+    batch_counts = batch.outcome_counts()
+
+    engine_total = sum(engine_counts.values())
+    batch_total = sum(batch_counts.values())
+    total = engine_total + batch_total
+    columns: List[Tuple[int, int]] = []
+    pooled = [0, 0]
+    for key in sorted(set(engine_counts) | set(batch_counts), key=str):
+        observed = (engine_counts.get(key, 0), batch_counts.get(key, 0))
+        if min(engine_total, batch_total) * sum(observed) / total < min_expected:
+            pooled = [pooled[0] + observed[0], pooled[1] + observed[1]]
+        else:
+            columns.append(observed)
+    if sum(pooled):
+        columns.append((pooled[0], pooled[1]))
+
+    statistic = 0.0
+    for observed in columns:
+        column_total = sum(observed)
+        for count, sample_total in zip(observed, (engine_total, batch_total)):
+            expected = sample_total * column_total / total
+            statistic += (count - expected) ** 2 / expected
+    dof = len(columns) - 1
+    return OutcomeComparison(engine_counts, batch_counts, statistic, dof, _chi2_sf(statistic, dof))
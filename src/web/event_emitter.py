@@ -2,10 +2,19 @@
 Event emitter for recording game events to files.
 """
 
-from typing import Dict, Any, Optional, List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from threading import Lock
 
 from .run_recorder import RunRecorder
+from ..core.profiler import record_llm_call
+
+
+# Set by capture_events(); per asyncio task, so concurrent tasks capture separately
+_captured_events: ContextVar[Optional[List[Tuple[str, Dict[str, Any]]]]] = ContextVar(
+    "captured_events", default=None
+)
 
 
 class EventEmitter:
@@ -15,8 +24,52 @@ class EventEmitter:
         self.run_recorder = run_recorder or RunRecorder()
         self._lock = Lock()
     
+    @property
+    def recording(self) -> bool:
+        """Whether emitted events go anywhere (a run is being recorded or events are being captured)."""
+        if _captured_events.get() is not None:
+            return True
+        return bool(self.run_recorder and self.run_recorder.recording)
+    
+    @contextmanager
+    def capture_events(self) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Collect events emitted in the current context instead of recording them.
+        
+        Lets phase handlers run agent calls concurrently and still record the
+        events those calls emit (e.g. llm_metadata) in a deterministic order:
+        capture inside each task, then replay() them in the sequential order.
+        
+        Yields:
+            List that receives (event_type, data) tuples
+        """
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        token = _captured_events.set(events)
+        try:
+            yield events
+        finally:
+            _captured_events.reset(token)
+    
+    def replay(self, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Record events previously collected by capture_events()."""
+        for event_type, data in events:
+            self._emit(event_type, data)
+    
+    def update_metadata(self, updates: Dict[str, Any]) -> None:
+        """Merge keys into the run's metadata (no-op without a run)."""
+        if self.run_recorder:
+            try:
+                self.run_recorder.update_metadata(updates)
+            except Exception as e:
+                # Don't let recording errors break the game
+                print(f"Error updating metadata: {e}")
+    
     def _emit(self, event_type: str, data: Dict[str, Any]) -> None:
         """Emit an event by recording it to file."""
+        captured = _captured_events.get()
+        if captured is not None:
+            captured.append((event_type, data))
+            return
         if self.run_recorder:
             try:
                 self.run_recorder.record_event(event_type, data)
@@ -50,6 +103,22 @@ class EventEmitter:
             "context": context  # Include LLM context/prompt if available
         })
     
+    def emit_speech_delta(self, player_number: int, delta: str, day_number: int,
+                          is_final: bool = False, reset: bool = False) -> None:
+        """
+        Emit a chunk of a speech that is still being generated (streaming mode).
+        
+        The complete speech follows as a regular speech event; reset=True means an
+        earlier attempt was retried and the text streamed so far should be discarded.
+        """
+        self._emit("speech_delta", {
+            "player_number": player_number,
+            "delta": delta,
+            "day_number": day_number,
+            "is_final": is_final,
+            "reset": reset
+        })
+    
     def emit_nomination(self, nominator: int, target: int, success: bool, day_number: int, context: Optional[Dict[str, Any]] = None) -> None:
         """Emit nomination event."""
         self._emit("nomination", {
@@ -171,11 +240,32 @@ class EventEmitter:
             "action_type": action_type
         })
     
+    def emit_game_resumed(self, phase: str, day_number: int, night_number: int, discarded_events: int) -> None:
+        """Emit game resumed event (the game continues from a checkpoint at the start of `phase`)."""
+        self._emit("game_resumed", {
+            "phase": phase,
+            "day_number": day_number,
+            "night_number": night_number,
+            "discarded_events": discarded_events
+        })
+    
     def emit_llm_metadata(self, player_number: int, action_type: str, prompt_tokens: int, 
                          completion_tokens: int, total_tokens: int, latency_ms: float, 
-                         model: str, reasoning_tokens: int = 0, reasoning_effort: Optional[str] = None) -> None:
-        """Emit LLM API call metadata (tokens, latency, reasoning effort)."""
-        self._emit("llm_metadata", {
+                         model: str, reasoning_tokens: int = 0, reasoning_effort: Optional[str] = None,
+                         cached_tokens: Optional[int] = None, cache_hit: Optional[bool] = None, cache_hits: Optional[int] = None,
+                         cache_misses: Optional[int] = None, time_to_first_token_ms: Optional[float] = None) -> None:
+        """
+        Emit LLM API call metadata (tokens, latency, reasoning effort).
+        
+        When the response cache is enabled, cache_hit marks whether this call was
+        served from it (token counts are those of the original call) and
+        cache_hits/cache_misses are the process-wide running totals. Streamed calls
+        also report time_to_first_token_ms (perceived latency) next to latency_ms.
+        cached_tokens is the part of prompt_tokens the provider served from its
+        prompt cache. The call is also added to the game's profile (see core.profiler).
+        """
+        record_llm_call(player_number, latency_ms, prompt_tokens, completion_tokens, reasoning_tokens, cache_hit)
+        data = {
             "player_number": player_number,
             "action_type": action_type,
             "prompt_tokens": prompt_tokens,
@@ -185,5 +275,14 @@ class EventEmitter:
             "model": model,
             "reasoning_tokens": reasoning_tokens,
             "reasoning_effort": reasoning_effort
-        })
+        }
+        if cached_tokens is not None:
+            data["cached_tokens"] = cached_tokens
+        if time_to_first_token_ms is not None:
+            data["time_to_first_token_ms"] = time_to_first_token_ms
+        if cache_hit is not None:
+            data["cache_hit"] = cache_hit
+            data["cache_hits"] = cache_hits
+            data["cache_misses"] = cache_misses
+        self._emit("llm_metadata", data)
 
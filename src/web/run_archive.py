@@ -0,0 +1,256 @@
+"""
+Compressed archive format for finished runs.
+
+events.jsonl dominates the runs directory: every LLM action event carries the full
+prompt in data.context.prompt, and each prompt repeats the rules and the whole game
+history so far, so a run's size grows quadratically with its length. archive_run()
+converts a finished run into runs/<run>/events.archive.zip with two columns:
+
+- events.jsonl: the events, with each prompt replaced by its row number in prompts.jsonl
+- prompts.jsonl: one row per prompt, stored as a line delta against the previous prompt
+  of the same player: [base row, operations], where an operation either copies a range
+  of the base prompt's lines or inserts new text
+
+plus index.json (event count and size statistics). Prompts recorded as segment keys
+(see segment_table) are rebuilt before they are encoded, so the archive holds the
+run on its own and segments.jsonl is removed along with events.jsonl. Members are
+deflate-compressed
+(the algorithm gzip uses) and can be read independently, so summarizing a run reads
+only the events column and never rebuilds prompts.
+"""
+
+import difflib
+import json
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .segment_table import SEGMENTS_FILE, SegmentReader
+
+
+ARCHIVE_FILE = "events.archive.zip"
+ARCHIVE_VERSION = 1
+
+# Event fields naming the player whose prompt an event carries
+_PROMPT_OWNER_FIELDS = ("player_number", "nominator", "voter", "decision_maker")
+
+
+def _prompt_owner(event: Dict[str, Any]) -> Any:
+    """Key that groups an event's prompt with the same player's previous prompts."""
+    data = event.get("data") or {}
+    for field in _PROMPT_OWNER_FIELDS:
+        if data.get(field) is not None:
+            return data[field]
+    # Don and sheriff checks don't name the player, but there is only one of each
+    return event.get("event_type")
+
+
+def _line_delta(previous: List[str], lines: List[str]) -> List[Any]:
+    """
+    Encode lines as copies from the previous prompt's lines plus inserted text.
+
+    Returns:
+        Operations: [start, end] copies previous[start:end], a string is inserted as is
+    """
+    operations: List[Any] = []
+    matcher = difflib.SequenceMatcher(None, previous, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            operations.append([i1, i2])
+        elif j2 > j1:
+            operations.append("".join(lines[j1:j2]))
+    return operations
+
+
+class PromptDeltaEncoder:
+    """Encodes prompts as line deltas against the previous prompt of the same player."""
+
+    def __init__(self):
+        self.rows: List[List[Any]] = []
+        self._latest: Dict[Any, Tuple[int, List[str]]] = {}  # Owner -> (row, prompt lines)
+
+    def encode(self, owner: Any, prompt: str) -> int:
+        """
+        Add a prompt.
+
+        Args:
+            owner: Player (or other key) the prompt belongs to
+            prompt: Full prompt text
+
+        Returns:
+            Row number of the prompt
+        """
+        row = len(self.rows)
+        lines = prompt.splitlines(keepends=True)
+        if owner in self._latest:
+            base, previous = self._latest[owner]
+            self.rows.append([base, _line_delta(previous, lines)])
+        else:
+            self.rows.append([-1, [prompt]])
+        self._latest[owner] = (row, lines)
+        return row
+
+
+def decode_prompts(rows: List[List[Any]]) -> List[str]:
+    """
+    Rebuild full prompts from delta rows.
+
+    Args:
+        rows: Rows as written by PromptDeltaEncoder
+
+    Returns:
+        Full prompt text for each row
+    """
+    prompts: List[str] = []
+    lines: List[List[str]] = []
+    for base, operations in rows:
+        previous = lines[base] if base >= 0 else []
+        parts = [op if isinstance(op, str) else "".join(previous[op[0]:op[1]]) for op in operations]
+        prompts.append("".join(parts))
+        lines.append(prompts[-1].splitlines(keepends=True))
+    return prompts
+
+
+def archive_path(run_dir: Path) -> Path:
+    """Path of a run's archive file."""
+    return Path(run_dir) / ARCHIVE_FILE
+
+
+def is_archived(run_dir: Path) -> bool:
+    """Whether a run has been archived (and its events.jsonl removed)."""
+    run_dir = Path(run_dir)
+    return archive_path(run_dir).exists() and not (run_dir / "events.jsonl").exists()
+
+
+def archive_run(run_dir: Path, keep_events: bool = False, compresslevel: int = 9) -> Dict[str, Any]:
+    """
+    Convert a run's events.jsonl into an archive.
+
+    The archive is written to a temporary file and renamed into place before
+    events.jsonl is removed, so an interrupted archive never loses events.
+
+    Args:
+        run_dir: Run directory containing events.jsonl
+        keep_events: Keep events.jsonl after archiving
+        compresslevel: Deflate level (1-9)
+
+    Returns:
+        Archive statistics (also stored in the archive index and in metadata.json)
+
+    Raises:
+        FileNotFoundError: If the run has no events.jsonl
+    """
+    run_dir = Path(run_dir)
+    events_file = run_dir / "events.jsonl"
+    if not events_file.exists():
+        raise FileNotFoundError(f"No events.jsonl in {run_dir}")
+    segments_file = run_dir / SEGMENTS_FILE
+    segments = SegmentReader(run_dir)
+
+    encoder = PromptDeltaEncoder()
+    event_count = 0
+    prompt_bytes = 0
+    target = archive_path(run_dir)
+    partial = target.with_name(target.name + ".tmp")
+    with zipfile.ZipFile(partial, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as archive:
+        with open(events_file, 'r') as source, archive.open("events.jsonl", 'w') as events_out:
+            for line in source:
+                if not line.strip():
+                    continue
+                [event] = segments.resolve_prompts([json.loads(line)])
+                context = (event.get("data") or {}).get("context")
+                if isinstance(context, dict) and isinstance(context.get("prompt"), str):
+                    context.pop("segments", None)
+                    prompt_bytes += len(context["prompt"].encode())
+                    # Prompts are always strings, so an int unambiguously marks a reference
+                    context["prompt"] = encoder.encode(_prompt_owner(event), context["prompt"])
+                events_out.write((json.dumps(event) + "\n").encode())
+                event_count += 1
+        archive.writestr("prompts.jsonl", "".join(json.dumps(row) + "\n" for row in encoder.rows))
+
+        delta_bytes = sum(len(op.encode()) for _, operations in encoder.rows
+                          for op in operations if isinstance(op, str))
+        index = {
+            "version": ARCHIVE_VERSION,
+            "event_count": event_count,
+            "prompt_count": len(encoder.rows),
+            "original_bytes": sum(f.stat().st_size for f in (events_file, segments_file) if f.exists()),
+            "prompt_bytes": prompt_bytes,
+            "prompt_delta_bytes": delta_bytes,
+        }
+        archive.writestr("index.json", json.dumps(index))
+    partial.replace(target)
+
+    stats = dict(index)
+    stats["archived_bytes"] = target.stat().st_size
+    stats["compression_ratio"] = round(stats["original_bytes"] / max(1, stats["archived_bytes"]), 2)
+    _record_stats(run_dir, stats)
+    if not keep_events:
+        events_file.unlink()
+        if segments_file.exists():
+            segments_file.unlink()
+    return stats
+
+
+def _record_stats(run_dir: Path, stats: Dict[str, Any]) -> None:
+    """Add archive statistics to the run's metadata.json."""
+    metadata_file = run_dir / "metadata.json"
+    metadata: Dict[str, Any] = {}
+    if metadata_file.exists():
+        try:
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+    metadata["archive"] = {key: stats[key] for key in ("original_bytes", "archived_bytes", "compression_ratio")}
+    with open(metadata_file, 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+
+class RunArchive:
+    """Reader for an archived run."""
+
+    def __init__(self, run_dir: Path):
+        """
+        Args:
+            run_dir: Run directory containing the archive
+        """
+        self.path = archive_path(run_dir)
+        self._index: Optional[Dict[str, Any]] = None
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        """Archive index (event count and size statistics); reads only that member."""
+        if self._index is None:
+            with zipfile.ZipFile(self.path) as archive:
+                self._index = json.loads(archive.read("index.json"))
+        return self._index
+
+    def iter_events(self, with_prompts: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the run's events in order.
+
+        Args:
+            with_prompts: Restore full prompts; if False, prompts are left as row
+                numbers and the prompts column isn't read at all
+
+        Yields:
+            Events as originally recorded
+        """
+        with zipfile.ZipFile(self.path) as archive:
+            prompts: List[str] = []
+            if with_prompts:
+                with archive.open("prompts.jsonl") as f:
+                    prompts = decode_prompts([json.loads(line) for line in f])
+            with archive.open("events.jsonl") as f:
+                for line in f:
+                    event = json.loads(line)
+                    if with_prompts:
+                        context = (event.get("data") or {}).get("context")
+                        if isinstance(context, dict) and isinstance(context.get("prompt"), int):
+                            context["prompt"] = prompts[context["prompt"]]
+                    yield event
+
+    def read_events(self) -> List[Dict[str, Any]]:
+        """Get all events with full prompts."""
+        return list(self.iter_events())
@@ -0,0 +1,348 @@
+"""
+Catalog index of finished runs.
+
+Listing runs used to parse every line of every events.jsonl. Instead, RunRecorder
+keeps a RunSummary up to date as events are recorded and writes it to a SQLite
+catalog (runs/catalog.sqlite) when the run finishes, so the run list is a single
+indexed query. Runs recorded before the catalog existed are added with backfill(),
+and finished runs can be compressed with archive_finished() (see run_archive).
+"""
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .run_archive import RunArchive, archive_run, is_archived
+
+
+CATALOG_FILE = "catalog.sqlite"
+
+_COLUMNS = (
+    "name", "outcome", "winner", "failed", "event_count", "seed", "agent_type", "agent_mix",
+    "llm_model", "prompt_tokens", "completion_tokens", "total_tokens", "cached_tokens", "llm_calls", "days",
+    "started_at", "finished_at", "duration_ms", "metadata",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    name TEXT PRIMARY KEY,
+    outcome TEXT,
+    winner TEXT,
+    failed INTEGER NOT NULL DEFAULT 0,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    seed INTEGER,
+    agent_type TEXT,
+    agent_mix TEXT,
+    llm_model TEXT,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    llm_calls INTEGER NOT NULL DEFAULT 0,
+    days INTEGER,
+    started_at TEXT,
+    finished_at TEXT,
+    duration_ms REAL,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_outcome ON runs (outcome);
+CREATE INDEX IF NOT EXISTS runs_model ON runs (llm_model);
+CREATE INDEX IF NOT EXISTS runs_seed ON runs (seed);
+"""
+
+# Columns added after the catalog was first released: name -> definition for ALTER TABLE
+_ADDED_COLUMNS = {
+    "cached_tokens": "INTEGER NOT NULL DEFAULT 0",
+}
+
+# Outcome labels shown by the viewer
+_OUTCOMES = {"red": "Civilians Win", "black": "Mafia Win"}
+
+
+class RunSummary:
+    """Catalog row for one run, built up event by event."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.outcome: Optional[str] = None
+        self.winner: Optional[str] = None
+        self.failed = False
+        self.event_count = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.cached_tokens = 0  # Prompt tokens served from the provider's prompt cache
+        self.llm_calls = 0
+        self.days: Optional[int] = None
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.metadata: Dict[str, Any] = {}
+
+    @property
+    def finished(self) -> bool:
+        """Whether the game has reached game over or a fatal error."""
+        return self.outcome is not None
+
+    def observe(self, event: Dict[str, Any]) -> None:
+        """
+        Update the summary with one recorded event.
+
+        Args:
+            event: Event as written to events.jsonl
+        """
+        self.event_count += 1
+        timestamp = event.get("timestamp")
+        if timestamp:
+            self.started_at = self.started_at or timestamp
+            self.finished_at = timestamp
+
+        event_type = event.get("event_type")
+        data = event.get("data") or {}
+        if event_type == "llm_metadata":
+            self.llm_calls += 1
+            # Cached responses cost nothing, so they don't count toward token totals
+            if not data.get("cache_hit"):
+                self.prompt_tokens += data.get("prompt_tokens") or 0
+                self.completion_tokens += data.get("completion_tokens") or 0
+                self.total_tokens += data.get("total_tokens") or 0
+                self.cached_tokens += data.get("cached_tokens") or 0
+        elif event_type == "game_over":
+            self.days = data.get("day_number")
+            if not self.failed:
+                self.winner = data.get("winner")
+                self.outcome = _OUTCOMES.get(self.winner, "Draw")
+        elif event_type == "fatal_error":
+            self.failed = True
+            self.outcome = "Failed"
+        elif event_type == "game_state_update":
+            # Older runs may end without a game_over event
+            game_state = data.get("game_state") or {}
+            if game_state.get("phase") == "game_over" and game_state.get("winner") in _OUTCOMES:
+                self.winner = game_state["winner"]
+                self.outcome = _OUTCOMES[self.winner]
+            elif game_state.get("phase") == "failed":
+                self.failed = True
+                self.outcome = "Failed"
+
+    def to_row(self) -> Dict[str, Any]:
+        """Get the catalog row for this run."""
+        config = self.metadata.get("config") or {}
+        agent_types = self.metadata.get("agent_types") or {}
+        if agent_types:
+            agent_mix: Dict[str, int] = {}
+            for agent_type in agent_types.values():
+                agent_mix[agent_type] = agent_mix.get(agent_type, 0) + 1
+        elif config.get("agent_type"):
+            agent_mix = {config["agent_type"]: config.get("total_players") or len(self.metadata.get("players", []))}
+        else:
+            agent_mix = {}
+
+        duration_ms = None
+        if self.started_at and self.finished_at:
+            try:
+                delta = datetime.fromisoformat(self.finished_at) - datetime.fromisoformat(self.started_at)
+                duration_ms = delta.total_seconds() * 1000
+            except ValueError:
+                pass
+
+        return {
+            "name": self.name,
+            "outcome": self.outcome,
+            "winner": self.winner,
+            "failed": int(self.failed),
+            "event_count": self.event_count,
+            "seed": config.get("random_seed"),
+            "agent_type": config.get("agent_type"),
+            "agent_mix": json.dumps(agent_mix, sort_keys=True),
+            "llm_model": config.get("llm_model"),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "cached_tokens": self.cached_tokens,
+            "llm_calls": self.llm_calls,
+            "days": self.days,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_ms": duration_ms,
+            "metadata": json.dumps(self.metadata),
+        }
+
+
+def summarize_run(run_dir: Path) -> RunSummary:
+    """
+    Build a summary by reading a run directory (used for backfill).
+
+    Args:
+        run_dir: Run directory containing metadata.json and events.jsonl (or an archive)
+
+    Returns:
+        Summary of the run as recorded so far
+    """
+    summary = RunSummary(run_dir.name)
+    metadata_file = run_dir / "metadata.json"
+    if metadata_file.exists():
+        try:
+            with open(metadata_file, 'r') as f:
+                summary.metadata = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    events_file = run_dir / "events.jsonl"
+    if is_archived(run_dir):
+        # Summaries don't need prompts, so the prompts column is never decoded
+        for event in RunArchive(run_dir).iter_events(with_prompts=False):
+            summary.observe(event)
+    elif events_file.exists():
+        with open(events_file, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    summary.observe(json.loads(line))
+                except json.JSONDecodeError:
+                    summary.event_count += 1
+    return summary
+
+
+class RunCatalog:
+    """SQLite index of runs in a runs directory."""
+
+    def __init__(self, runs_dir: str = "runs"):
+        """
+        Args:
+            runs_dir: Directory that holds run directories (the catalog file lives there too)
+        """
+        self.runs_dir = Path(runs_dir)
+        self.path = self.runs_dir / CATALOG_FILE
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the catalog (short-lived connections are safe across threads and processes)."""
+        self.runs_dir.mkdir(exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        if not self._schema_ready:
+            connection.executescript(_SCHEMA)
+            # Catalogs created by older versions lack newer columns
+            existing = {row[1] for row in connection.execute("PRAGMA table_info(runs)")}
+            for column, definition in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE runs ADD COLUMN {column} {definition}")
+            connection.commit()
+            self._schema_ready = True
+        return connection
+
+    def record(self, summary: RunSummary) -> None:
+        """
+        Insert or replace a run's catalog row.
+
+        Args:
+            summary: Run summary
+        """
+        row = summary.to_row()
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._connect() as connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                [row[column] for column in _COLUMNS]
+            )
+        connection.close()
+
+    def names(self) -> set:
+        """Get the names of all catalogued runs."""
+        with self._connect() as connection:
+            names = {name for (name,) in connection.execute("SELECT name FROM runs")}
+        connection.close()
+        return names
+
+    def query(self, limit: Optional[int] = None, offset: int = 0, outcome: Optional[str] = None,
+              model: Optional[str] = None, agent_type: Optional[str] = None,
+              seed: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Query catalogued runs, newest first.
+
+        Args:
+            limit: Maximum rows to return (all if None)
+            offset: Rows to skip
+            outcome: Filter by outcome ("Civilians Win", "Mafia Win", "Draw", "Failed")
+            model: Filter by LLM model
+            agent_type: Filter by configured agent type
+            seed: Filter by random seed
+
+        Returns:
+            Tuple of (rows as dictionaries, total rows matching the filters)
+        """
+        clauses, params = [], []
+        for column, value in (("outcome", outcome), ("llm_model", model),
+                              ("agent_type", agent_type), ("seed", seed)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._connect() as connection:
+            connection.row_factory = sqlite3.Row
+            total = connection.execute(f"SELECT COUNT(*) FROM runs{where}", params).fetchone()[0]
+            sql = f"SELECT * FROM runs{where} ORDER BY name DESC LIMIT ? OFFSET ?"
+            rows = connection.execute(sql, params + [-1 if limit is None else limit, offset]).fetchall()
+        connection.close()
+        return [dict(row) for row in rows], total
+
+    def backfill(self, stale_after: float = 3600) -> int:
+        """
+        Catalog every run directory that isn't catalogued yet.
+
+        Unfinished runs are skipped while they may still be in progress (written to
+        within stale_after seconds); older ones are catalogued without an outcome.
+
+        Args:
+            stale_after: Seconds without writes after which an unfinished run is treated as abandoned
+
+        Returns:
+            Number of runs added
+        """
+        known = self.names()
+        added = 0
+        now = time.time()
+        for run_dir in sorted(self.runs_dir.iterdir()):
+            if not run_dir.is_dir() or run_dir.name in known:
+                continue
+            summary = summarize_run(run_dir)
+            if not summary.finished:
+                events_file = run_dir / "events.jsonl"
+                last_write = events_file.stat().st_mtime if events_file.exists() else run_dir.stat().st_mtime
+                if now - last_write < stale_after:
+                    continue
+            self.record(summary)
+            added += 1
+        return added
+
+    def archive_finished(self, keep_events: bool = False) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Archive every catalogued run that has finished and isn't archived yet.
+
+        Catalog rows are rewritten afterwards, since archiving adds compression
+        statistics to the run's metadata.
+
+        Args:
+            keep_events: Keep events.jsonl next to the archive
+
+        Returns:
+            List of (run name, archive statistics)
+        """
+        with self._connect() as connection:
+            names = [name for (name,) in connection.execute(
+                "SELECT name FROM runs WHERE outcome IS NOT NULL ORDER BY name")]
+        connection.close()
+
+        archived = []
+        for name in names:
+            run_dir = self.runs_dir / name
+            if not (run_dir / "events.jsonl").exists():
+                continue  # Already archived or removed
+            stats = archive_run(run_dir, keep_events=keep_events)
+            self.record(summarize_run(run_dir))
+            archived.append((name, stats))
+        return archived
@@ -2,18 +2,58 @@
 Run recorder that saves game events to files.
 """
 
+import atexit
 import json
 import os
+import queue
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
-from threading import Lock
+from typing import Dict, Any, List, Optional, TextIO, Tuple
+from threading import Event, Lock, Thread
+
+from ..core.checkpoint import GameCheckpoint, write_checkpoint
+from .run_archive import RunArchive, is_archived
+from .run_catalog import RunCatalog, RunSummary
+from .segment_table import SegmentTable
+from ..agents.prompt_segments import SegmentedPrompt
+
+
+# Event types that are written out immediately in buffered mode
+FORCE_FLUSH_EVENTS = ("game_over", "fatal_error")
 
 
 class RunRecorder:
-    """Records game events to files in a run directory."""
+    """
+    Records game events to files in a run directory.
+    
+    By default every event is appended to events.jsonl as it is recorded. In buffered
+    mode events are serialized onto an in-memory queue instead, and a background
+    writer thread appends them in batches through one long-lived file handle (new
+    segment table rows go through the same queue, ahead of their events). A batch
+    is written once it holds `flush_every` events or its oldest event is
+    `flush_interval` seconds old, so live viewers see events within that delay.
+    game_over and fatal_error events are flushed before record_event returns.
+    
+    A summary of the run (outcome, event count, tokens, ...) is kept up to date as
+    events are recorded and written to the run catalog when the game ends, so
+    listing runs doesn't have to read every events file.
+    
+    Prompts in event contexts are stored as segments: each distinct segment is
+    written once to the run's segments.jsonl and events reference it by key (see
+    segment_table). How much of the run's prompt tokens are static is saved in
+    the metadata under prompt_segments when the game ends.
+    """
     
-    def __init__(self, runs_dir: str = "runs"):
+    def __init__(self, runs_dir: str = "runs", buffered: bool = False,
+                 flush_every: int = 64, flush_interval: float = 0.5):
+        """
+        Args:
+            runs_dir: Directory that holds run directories
+            buffered: Write events from a background thread in batches
+            flush_every: Buffered mode: write a batch once it has this many events
+            flush_interval: Buffered mode: maximum seconds an event waits before being written
+        """
         self.runs_dir = Path(runs_dir)
         self.runs_dir.mkdir(exist_ok=True)
         self.current_run_dir: Optional[Path] = None
@@ -21,6 +61,18 @@ class RunRecorder:
         self.metadata_file: Optional[Path] = None
         self._lock = Lock()
         self._event_count = 0
+        self.catalog = RunCatalog(runs_dir)
+        self._summary: Optional[RunSummary] = None
+        self._summary_dirty = False  # Events recorded since the catalog row was last written
+        self._segments: Optional[SegmentTable] = None
+        
+        # Buffered mode
+        self.buffered = buffered
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[Thread] = None
+        self._atexit_registered = False
     
     def create_run(self, run_name: Optional[str] = None) -> str:
         """
@@ -32,6 +84,9 @@ class RunRecorder:
         Returns:
             The run name (directory name)
         """
+        # Finish writing the previous run before switching files
+        self.close()
+        
         if run_name is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
             base_name = f"run_{timestamp}"
@@ -55,9 +110,99 @@ class RunRecorder:
         self.events_file = self.current_run_dir / "events.jsonl"
         self.metadata_file = self.current_run_dir / "metadata.json"
         self._event_count = 0
+        self._summary = RunSummary(run_name)
+        self._summary_dirty = False
+        self._segments = SegmentTable(self.current_run_dir)
         
         return run_name
     
+    def resume_run(self, run_name: str, event_count: int) -> int:
+        """
+        Continue recording an existing run after its first `event_count` events.
+        
+        Later events (from a phase that is about to be replayed) are removed from
+        events.jsonl, so the resumed game's events follow on without duplicates.
+        
+        Args:
+            run_name: Name of the run directory
+            event_count: Number of events to keep
+            
+        Returns:
+            Number of events removed
+            
+        Raises:
+            FileNotFoundError: If the run doesn't exist
+            ValueError: If the run is archived (its events are no longer in events.jsonl)
+        """
+        self.close()
+        
+        run_dir = self.runs_dir / run_name
+        if not run_dir.is_dir():
+            raise FileNotFoundError(f"Run not found: {run_dir}")
+        if is_archived(run_dir) and not (run_dir / "events.jsonl").exists():
+            raise ValueError(f"Run {run_name} is archived and can't be resumed")
+        
+        self.current_run_dir = run_dir
+        self.events_file = run_dir / "events.jsonl"
+        self.metadata_file = run_dir / "metadata.json"
+        self._summary = RunSummary(run_name)
+        self._segments = SegmentTable(run_dir)
+        if self.metadata_file.exists():
+            try:
+                with open(self.metadata_file, 'r') as f:
+                    self._summary.metadata = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                pass
+        
+        kept: List[str] = []
+        removed = 0
+        if self.events_file.exists():
+            with open(self.events_file, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    if len(kept) < event_count:
+                        kept.append(line if line.endswith('\n') else line + '\n')
+                        event = json.loads(line)
+                        self._summary.observe(event)
+                        context = event.get("data", {}).get("context")
+                        if isinstance(context, dict) and isinstance(context.get("segments"), list):
+                            self._segments.observe(context["segments"])
+                    else:
+                        removed += 1
+            # Rewrite through a temporary file so a crash can't lose the kept events
+            temp_file = self.events_file.with_suffix(".jsonl.tmp")
+            with open(temp_file, 'w') as f:
+                f.writelines(kept)
+            os.replace(temp_file, self.events_file)
+        
+        self._event_count = len(kept)
+        self._summary_dirty = True
+        return removed
+    
+    def save_checkpoint(self, checkpoint: GameCheckpoint) -> None:
+        """
+        Save a game checkpoint in the run directory, replacing the previous one.
+        
+        Args:
+            checkpoint: Checkpoint whose event_count is the number of events recorded so far
+        """
+        if not self.current_run_dir:
+            return
+        # Buffered events must be on disk before the checkpoint counts them
+        self.flush()
+        write_checkpoint(self.current_run_dir, checkpoint)
+    
+    @property
+    def event_count(self) -> int:
+        """Number of events recorded in the current run (the next event's sequence number)."""
+        return self._event_count
+    
+    @property
+    def recording(self) -> bool:
+        """Whether a run has been created, so recorded events are written."""
+        return self.events_file is not None
+    
     def record_event(self, event_type: str, data: Dict[str, Any]) -> None:
         """
         Record an event to the events file (JSONL format).
@@ -70,6 +215,11 @@ class RunRecorder:
             return
         
         with self._lock:
+            if self.buffered and self._writer is None:
+                self._start_writer()
+            context = data.get("context")
+            if isinstance(context, dict) and isinstance(context.get("prompt"), SegmentedPrompt):
+                data = dict(data, context=self._segments.reference(context))
             event = {
                 "timestamp": datetime.now().isoformat(),
                 "event_type": event_type,
@@ -77,9 +227,143 @@ class RunRecorder:
                 "sequence": self._event_count
             }
             self._event_count += 1
+            self._summary.observe(event)
+            self._summary_dirty = True
             
-            with open(self.events_file, 'a') as f:
-                f.write(json.dumps(event) + '\n')
+            if not self.buffered:
+                with open(self.events_file, 'a') as f:
+                    f.write(json.dumps(event) + '\n')
+            else:
+                # Serialize now: event data may be mutated by the game after this returns
+                self._queue.put(json.dumps(event) + '\n')
+        
+        if event_type in FORCE_FLUSH_EVENTS:
+            self.flush()
+            if self._segments.prompts:
+                self.update_metadata({"prompt_segments": self._segments.stats()})
+            self._write_catalog()
+    
+    def flush(self) -> None:
+        """Block until every event recorded so far is written (no-op when not buffered)."""
+        writer, writer_queue = self._writer, self._queue
+        if writer is None or not writer.is_alive():
+            return
+        done = Event()
+        writer_queue.put(done)
+        # Don't hang if the writer thread died (e.g. on a write error)
+        while not done.wait(0.1):
+            if not writer.is_alive():
+                return
+    
+    def close(self) -> None:
+        """Flush pending events, stop the background writer and bring the catalog row up to date."""
+        with self._lock:
+            writer, writer_queue = self._writer, self._queue
+            self._writer = None
+            self._queue = None
+        if writer is not None:
+            writer_queue.put(None)
+            writer.join()
+        if self._atexit_registered:
+            # The exit hook would keep a closed recorder (and its run summary) alive
+            atexit.unregister(self.close)
+            self._atexit_registered = False
+        self._write_catalog()
+    
+    def _write_catalog(self) -> None:
+        """Write the current run's summary to the catalog if it changed."""
+        with self._lock:
+            if self._summary is None or not self._summary_dirty:
+                return
+            self._summary_dirty = False
+            summary = self._summary
+            try:
+                self.catalog.record(summary)
+            except Exception as e:
+                # The catalog is an index; losing a row must not break the game
+                print(f"Warning: could not update run catalog: {e}")
+    
+    def _start_writer(self) -> None:
+        """Start the background writer for the current events file (called with the lock held)."""
+        self._queue = writer_queue = queue.Queue()
+        # Open here so the events file exists as soon as the first event is recorded
+        events_handle = open(self.events_file, 'a')
+        # Segment rows are queued as lists of lines, so they are written before the events that follow them
+        self._segments.write_rows = lambda lines: writer_queue.put(list(lines))
+        self._writer = Thread(
+            target=self._write_loop,
+            args=(self._queue, events_handle, self._segments.path),
+            name="RunRecorderWriter",
+            daemon=True
+        )
+        self._writer.start()
+        if not self._atexit_registered:
+            # Don't lose the tail of the run if the process exits without close()
+            atexit.register(self.close)
+            self._atexit_registered = True
+    
+    def _write_loop(self, writer_queue: queue.Queue, f: TextIO, segments_path: Path) -> None:
+        """
+        Drain the queue into the events file in batches.
+        
+        Queue items are serialized event lines, lists of segment table lines, an
+        Event to signal once everything before it is written (flush), or None to
+        write the rest and stop (close). Segment lines are written before the
+        events batched with them, since readers resolve an event's keys when they
+        read it.
+        """
+        segments_handle: Optional[TextIO] = None
+        try:
+            with f:
+                segment_lines: List[str] = []
+                batch: List[str] = []
+                deadline = None
+                running = True
+                while running:
+                    timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    try:
+                        items = [writer_queue.get(timeout=timeout)]
+                    except queue.Empty:
+                        items = []  # Flush interval elapsed
+                    
+                    # Pick up whatever else is already queued without waiting
+                    while items and items[-1] is not None and len(batch) + len(items) < self.flush_every:
+                        try:
+                            items.append(writer_queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    
+                    flush_waiters = []
+                    for item in items:
+                        if item is None:
+                            running = False
+                        elif isinstance(item, Event):
+                            flush_waiters.append(item)
+                        elif isinstance(item, list):
+                            segment_lines.extend(item)
+                        else:
+                            batch.append(item)
+                    
+                    if batch and deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    if batch and (not running or flush_waiters or len(batch) >= self.flush_every
+                                  or time.monotonic() >= deadline):
+                        if segment_lines:
+                            if segments_handle is None:
+                                segments_handle = open(segments_path, 'a')
+                            segments_handle.write("".join(segment_lines))
+                            segments_handle.flush()
+                            segment_lines = []
+                        f.write("".join(batch))
+                        f.flush()
+                        batch = []
+                        deadline = None
+                    
+                    for waiter in flush_waiters:
+                        waiter.set()
+        finally:
+            if segments_handle is not None:
+                segments_handle.close()
     
     def save_metadata(self, metadata: Dict[str, Any]) -> None:
         """
@@ -94,90 +378,148 @@ class RunRecorder:
         with self._lock:
             with open(self.metadata_file, 'w') as f:
                 json.dump(metadata, f, indent=2)
+            self._summary.metadata = dict(metadata)
+            self._summary_dirty = True
+    
+    def update_metadata(self, updates: Dict[str, Any]) -> None:
+        """
+        Merge keys into metadata.json (e.g. stats that are only known during or after the game).
+        
+        Args:
+            updates: Keys to add or replace
+        """
+        if not self.metadata_file:
+            return
+        
+        with self._lock:
+            metadata = {}
+            if self.metadata_file.exists():
+                try:
+                    with open(self.metadata_file, 'r') as f:
+                        metadata = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    pass
+            metadata.update(updates)
+            with open(self.metadata_file, 'w') as f:
+                json.dump(metadata, f, indent=2)
+            self._summary.metadata = metadata
+            self._summary_dirty = True
     
     def get_run_path(self) -> Optional[Path]:
         """Get the current run directory path."""
         return self.current_run_dir
     
-    def list_runs(self) -> list[Dict[str, Any]]:
+    def list_runs(self, limit: Optional[int] = None, offset: int = 0, **filters: Any) -> List[Dict[str, Any]]:
         """
-        List all available runs.
+        List runs, newest first.
         
+        Args:
+            limit: Maximum runs to return (all if None)
+            offset: Runs to skip
+            **filters: outcome, model, agent_type and/or seed (see query_runs)
+            
         Returns:
             List of run info dictionaries
         """
-        runs = []
-        if not self.runs_dir.exists():
-            return runs
+        return self.query_runs(limit, offset, **filters)[0]
+    
+    def query_runs(self, limit: Optional[int] = None, offset: int = 0, outcome: Optional[str] = None,
+                   model: Optional[str] = None, agent_type: Optional[str] = None,
+                   seed: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Query runs from the catalog, with pagination and filters.
         
-        for run_dir in sorted(self.runs_dir.iterdir(), reverse=True):
-            if not run_dir.is_dir():
-                continue
-            
-            metadata_file = run_dir / "metadata.json"
-            events_file = run_dir / "events.jsonl"
-            
-            run_info = {
-                "name": run_dir.name,
-                "path": str(run_dir),
-                "has_metadata": metadata_file.exists(),
-                "has_events": events_file.exists(),
-            }
-            
-            # Try to load metadata
-            if metadata_file.exists():
-                try:
-                    with open(metadata_file, 'r') as f:
-                        run_info["metadata"] = json.load(f)
-                except:
-                    pass
-            
-            # Count events and extract game outcome
-            if events_file.exists():
-                try:
-                    with open(events_file, 'r') as f:
-                        event_count = 0
-                        game_outcome = None
-                        game_failed = False
-                        
-                        for line in f:
-                            if line.strip():
-                                event_count += 1
-                                try:
-                                    event = json.loads(line)
-                                    if event.get("event_type") == "game_over":
-                                        winner = event.get("data", {}).get("winner")
-                                        if winner == "red":
-                                            game_outcome = "Civilians Win"
-                                        elif winner == "black":
-                                            game_outcome = "Mafia Win"
-                                        else:
-                                            game_outcome = "Draw"
-                                    elif event.get("event_type") == "fatal_error":
-                                        game_failed = True
-                                        game_outcome = "Failed"
-                                    elif event.get("event_type") == "game_state_update":
-                                        # Check if game is over from state
-                                        game_state = event.get("data", {}).get("game_state", {})
-                                        if game_state.get("phase") == "game_over":
-                                            winner = game_state.get("winner")
-                                            if winner == "red":
-                                                game_outcome = "Civilians Win"
-                                            elif winner == "black":
-                                                game_outcome = "Mafia Win"
-                                        elif game_state.get("phase") == "failed":
-                                            game_failed = True
-                                            game_outcome = "Failed"
-                                except:
-                                    pass
-                        
-                        run_info["event_count"] = event_count
-                        if game_outcome:
-                            run_info["game_outcome"] = game_outcome
-                            run_info["game_failed"] = game_failed
-                except:
-                    run_info["event_count"] = 0
+        Runs that aren't catalogued yet (games in progress, or runs recorded before
+        the catalog existed and not backfilled) are listed first, without outcome;
+        they are left out whenever a filter is given.
+        
+        Args:
+            limit: Maximum runs to return (all if None)
+            offset: Runs to skip
+            outcome: Filter by outcome ("Civilians Win", "Mafia Win", "Draw", "Failed")
+            model: Filter by LLM model
+            agent_type: Filter by configured agent type
+            seed: Filter by random seed
             
-            runs.append(run_info)
+        Returns:
+            Tuple of (run info dictionaries, total number of matching runs)
+        """
+        if not self.runs_dir.exists():
+            return [], 0
+        
+        filtered = any(value is not None for value in (outcome, model, agent_type, seed))
+        uncatalogued: List[Path] = []
+        if not filtered:
+            known = self.catalog.names()
+            uncatalogued = sorted(
+                (d for d in self.runs_dir.iterdir() if d.is_dir() and d.name not in known),
+                reverse=True
+            )
         
-        return runs
+        # Page through uncatalogued runs first, then the catalog
+        runs = [self._uncatalogued_run_info(d) for d in uncatalogued[offset:None if limit is None else offset + limit]]
+        catalog_offset = max(0, offset - len(uncatalogued))
+        catalog_limit = None if limit is None else limit - len(runs)
+        rows, total = self.catalog.query(catalog_limit, catalog_offset, outcome, model, agent_type, seed)
+        runs.extend(self._catalog_run_info(row) for row in rows)
+        return runs, total + len(uncatalogued)
+    
+    def _catalog_run_info(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a catalog row into a run info dictionary."""
+        metadata = json.loads(row["metadata"]) if row["metadata"] else {}
+        run_info = {
+            "name": row["name"],
+            "path": str(self.runs_dir / row["name"]),
+            "has_metadata": bool(metadata),
+            "has_events": row["event_count"] > 0,
+            "event_count": row["event_count"],
+            "seed": row["seed"],
+            "agent_mix": json.loads(row["agent_mix"]) if row["agent_mix"] else {},
+            "llm_model": row["llm_model"],
+            "prompt_tokens": row["prompt_tokens"],
+            "completion_tokens": row["completion_tokens"],
+            "total_tokens": row["total_tokens"],
+            "cached_tokens": row["cached_tokens"],
+            "llm_calls": row["llm_calls"],
+            "days": row["days"],
+            "duration_ms": row["duration_ms"],
+        }
+        if metadata:
+            run_info["metadata"] = metadata
+        if row["outcome"]:
+            run_info["game_outcome"] = row["outcome"]
+            run_info["game_failed"] = bool(row["failed"])
+        return run_info
+    
+    def _uncatalogued_run_info(self, run_dir: Path) -> Dict[str, Any]:
+        """Describe a run that isn't in the catalog (counting lines, not parsing events)."""
+        metadata_file = run_dir / "metadata.json"
+        events_file = run_dir / "events.jsonl"
+        run_info = {
+            "name": run_dir.name,
+            "path": str(run_dir),
+            "has_metadata": metadata_file.exists(),
+            "has_events": events_file.exists(),
+            "in_progress": True,
+            "event_count": 0,
+        }
+        if metadata_file.exists():
+            try:
+                with open(metadata_file, 'r') as f:
+                    run_info["metadata"] = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                pass
+        if is_archived(run_dir):
+            # The archive index has the count; no need to decompress anything
+            run_info["has_events"] = True
+            try:
+                run_info["event_count"] = RunArchive(run_dir).index["event_count"]
+            except (OSError, KeyError, ValueError):
+                pass
+        elif events_file.exists():
+            try:
+                with open(events_file, 'rb') as f:
+                    run_info["event_count"] = sum(1 for line in f if line.strip())
+            except OSError:
+                pass
+        return run_info
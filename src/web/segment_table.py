@@ -0,0 +1,153 @@
+"""
+Per-run table of prompt segments.
+
+Every LLM action event records the prompt the player saw in data.context, and
+each prompt repeats the rules, the role and day guides and the whole public
+history so far (which is the same for all players). The recorder stores each
+distinct segment of those prompts (see agents.prompt_segments) once, in
+runs/<run>/segments.jsonl, and events carry the segment keys in
+data.context.segments instead of the prompt text. Readers rebuild the prompt
+with SegmentReader.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..agents.prompt_segments import SegmentedPrompt, estimate_tokens
+
+
+SEGMENTS_FILE = "segments.jsonl"
+
+
+def _read_rows(path: Path, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Read the complete rows of a segments file from a byte offset; returns (rows, next offset)."""
+    if not path.exists():
+        return [], offset
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    # A trailing line without a newline is still being written
+    end = data.rfind(b'\n') + 1
+    rows = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+    return rows, offset + end
+
+
+class SegmentTable:
+    """
+    Writes a run's segment table and tracks how much of its prompts is static.
+
+    Tokens are estimated from characters, the same way the rate limiter does.
+    """
+
+    def __init__(self, run_dir: Path):
+        """
+        Args:
+            run_dir: Run directory; segments already in its table are loaded
+        """
+        self.path = Path(run_dir) / SEGMENTS_FILE
+        self.rows: Dict[str, Dict[str, Any]] = {row["key"]: row for row in _read_rows(self.path)[0]}
+        # Where new rows go (a buffered RunRecorder hands them to its writer thread)
+        self.write_rows: Callable[[List[str]], None] = self._append_rows
+        self.prompts = 0
+        self.static_tokens = 0
+        self.dynamic_tokens = 0
+        self.prompt_bytes = 0
+
+    def reference(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store the segments of a context's prompt and replace the prompt with their keys.
+
+        Args:
+            context: Event context whose "prompt" is a SegmentedPrompt
+
+        Returns:
+            Copy of the context with "segments" (keys) in place of "prompt"
+        """
+        prompt: SegmentedPrompt = context["prompt"]
+        new_rows = []
+        for segment in prompt.segments:
+            if segment.key not in self.rows:
+                row = segment.to_dict()
+                self.rows[segment.key] = row
+                new_rows.append(json.dumps(row) + '\n')
+        if new_rows:
+            self.write_rows(new_rows)
+        keys = [segment.key for segment in prompt.segments]
+        self.observe(keys)
+        referenced = {key: value for key, value in context.items() if key != "prompt"}
+        referenced["segments"] = keys
+        return referenced
+
+    def _append_rows(self, lines: List[str]) -> None:
+        """Append serialized rows to the table file."""
+        with open(self.path, 'a') as f:
+            f.writelines(lines)
+
+    def observe(self, keys: List[str]) -> None:
+        """Count a recorded prompt, given its segment keys."""
+        texts = []
+        for key in keys:
+            row = self.rows.get(key)
+            if row is None:
+                continue
+            texts.append(row["text"])
+            if row["static"]:
+                self.static_tokens += estimate_tokens(row["text"])
+            else:
+                self.dynamic_tokens += estimate_tokens(row["text"])
+        self.prompts += 1
+        self.prompt_bytes += len("\n".join(texts).encode())
+
+    def stats(self) -> Dict[str, Any]:
+        """Prompt statistics for the run's metadata (under "prompt_segments")."""
+        total = self.static_tokens + self.dynamic_tokens
+        return {
+            "prompts": self.prompts,
+            "static_tokens": self.static_tokens,
+            "dynamic_tokens": self.dynamic_tokens,
+            "static_share": round(self.static_tokens / total, 3) if total else 0.0,
+            "segments": len(self.rows),
+            "prompt_bytes": self.prompt_bytes,
+            "segment_bytes": sum(len(row["text"].encode()) for row in self.rows.values()),
+        }
+
+
+class SegmentReader:
+    """Resolves segment keys of a run's events, reading the table incrementally."""
+
+    def __init__(self, run_dir: Path):
+        """
+        Args:
+            run_dir: Run directory
+        """
+        self.path = Path(run_dir) / SEGMENTS_FILE
+        self.texts: Dict[str, str] = {}
+        self._offset = 0
+
+    def text(self, key: str) -> Optional[str]:
+        """Text of a segment (None if it isn't in the table)."""
+        if key not in self.texts:
+            # Segments are appended before the events that reference them
+            rows, self._offset = _read_rows(self.path, self._offset)
+            self.texts.update((row["key"], row["text"]) for row in rows)
+        return self.texts.get(key)
+
+    def resolve_prompts(self, events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Put the full prompt back into events that reference segments (in place).
+
+        Args:
+            events: Events as recorded
+
+        Returns:
+            The events, with data.context.prompt restored
+        """
+        events = list(events)
+        for event in events:
+            context = (event.get("data") or {}).get("context")
+            if isinstance(context, dict) and "prompt" not in context and isinstance(context.get("segments"), list):
+                texts = [self.text(key) for key in context["segments"]]
+                if None not in texts:
+                    context["prompt"] = "\n".join(texts)
+        return events
@@ -6,10 +6,59 @@ import os
 import json
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from flask import Flask, render_template, jsonify
+from typing import Optional, Dict, Any, List, Tuple
+from flask import Flask, Response, render_template, jsonify, stream_with_context
 
-from .run_recorder import RunRecorder
+from .run_archive import RunArchive, is_archived
+from .run_recorder import RunRecorder, FORCE_FLUSH_EVENTS
+from .segment_table import SegmentReader
+
+
+# Server-sent events: how often to check the events file for growth, keep-alive
+# interval, and how long to keep tailing after the game ends (trailing state updates)
+SSE_POLL_INTERVAL = 0.25
+SSE_KEEPALIVE_INTERVAL = 15.0
+SSE_END_GRACE = 2.0
+
+
+def read_new_lines(events_file: Path, offset: int) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Read the events appended to an events file since a byte offset.
+    
+    Seeks straight to the offset, so the cost is proportional to the new data only.
+    A trailing line without a newline (still being written) is left for the next read.
+    
+    Args:
+        events_file: Path to events.jsonl
+        offset: Byte offset returned by the previous read (0 for the start)
+        
+    Returns:
+        List of (event, byte offset just past its line)
+    """
+    with open(events_file, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    lines = []
+    start = 0
+    while True:
+        end = data.find(b'\n', start) + 1
+        if end == 0:
+            break
+        if data[start:end].strip():
+            lines.append((json.loads(data[start:end]), offset + end))
+        start = end
+    return lines
+
+
+def read_new_events(events_file: Path, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Read the events appended since a byte offset (see read_new_lines).
+    
+    Returns:
+        Tuple of (new events, byte offset to resume from)
+    """
+    lines = read_new_lines(events_file, offset)
+    return [event for event, _ in lines], (lines[-1][1] if lines else offset)
 
 
 class ViewerServer:
@@ -20,6 +69,7 @@ class ViewerServer:
         self.host = host
         self.runs_dir = Path(runs_dir)
         self.run_recorder = RunRecorder(runs_dir=runs_dir)
+        self._segment_readers: Dict[str, SegmentReader] = {}  # Run name -> reader kept for live polling
         
         # Get the directory where this module is located
         base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -33,6 +83,13 @@ class ViewerServer:
         # Setup routes
         self._setup_routes()
     
+    def _segment_reader(self, run_name: str) -> SegmentReader:
+        """Segment reader for a run, kept so polling reads only new segments."""
+        reader = self._segment_readers.get(run_name)
+        if reader is None:
+            reader = self._segment_readers[run_name] = SegmentReader(self.runs_dir / run_name)
+        return reader
+    
     def _setup_routes(self):
         """Setup Flask routes."""
         @self.app.route('/')
@@ -41,9 +98,31 @@ class ViewerServer:
         
         @self.app.route('/api/runs')
         def list_runs():
-            """List all available runs."""
-            runs = self.run_recorder.list_runs()
-            return jsonify(runs)
+            """
+            List runs from the run catalog, newest first.
+            
+            Query params: limit, offset, outcome, model, agent_type, seed. The total
+            number of matching runs is returned in the X-Total-Count header.
+            """
+            from flask import request
+            
+            try:
+                limit = request.args.get('limit', type=int)
+                offset = request.args.get('offset', 0, type=int)
+                runs, total = self.run_recorder.query_runs(
+                    limit=limit,
+                    offset=offset,
+                    outcome=request.args.get('outcome'),
+                    model=request.args.get('model'),
+                    agent_type=request.args.get('agent_type'),
+                    seed=request.args.get('seed', type=int)
+                )
+            except Exception as e:
+                return jsonify({"error": str(e)}), 500
+            
+            response = jsonify(runs)
+            response.headers['X-Total-Count'] = str(total)
+            return response
         
         @self.app.route('/api/runs/<run_name>/events')
         def get_events(run_name: str):
@@ -51,19 +130,23 @@ class ViewerServer:
             run_dir = self.runs_dir / run_name
             events_file = run_dir / "events.jsonl"
             
+            if is_archived(run_dir):
+                try:
+                    return jsonify(RunArchive(run_dir).read_events())
+                except Exception as e:
+                    return jsonify({"error": str(e)}), 500
             if not events_file.exists():
                 return jsonify({"error": "Run not found"}), 404
             
-            events = []
             try:
-                with open(events_file, 'r') as f:
-                    for line in f:
-                        if line.strip():
-                            events.append(json.loads(line))
+                events, offset = read_new_events(events_file, 0)
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
             
-            return jsonify(events)
+            # Live viewers resume tailing from this byte offset
+            response = jsonify(self._segment_reader(run_name).resolve_prompts(events))
+            response.headers['X-Events-Offset'] = str(offset)
+            return response
         
         @self.app.route('/api/runs/<run_name>/metadata')
         def get_metadata(run_name: str):
@@ -83,34 +166,93 @@ class ViewerServer:
         
         @self.app.route('/api/runs/<run_name>/events/stream')
         def stream_events(run_name: str):
-            """Stream events for a specific run (for live updates)."""
+            """
+            Get events appended since a cursor (for live updates by polling).
+            
+            Query params: offset, the byte offset returned by the previous call (or by
+            the X-Events-Offset header of /events). The legacy last_position line
+            count is still accepted, but it re-reads the file from the start.
+            """
             from flask import request
             
             run_dir = self.runs_dir / run_name
             events_file = run_dir / "events.jsonl"
             
+            if is_archived(run_dir):
+                # Archived runs are finished; nothing new will be appended
+                return jsonify({"events": [], "offset": request.args.get('offset', 0, type=int),
+                                "position": request.args.get('last_position', 0, type=int), "has_more": False})
             if not events_file.exists():
                 return jsonify({"error": "Run not found"}), 404
             
-            # Read last position from query param
-            last_position = int(request.args.get('last_position', 0))
-            
-            events = []
-            current_position = 0
+            offset = request.args.get('offset', type=int)
+            last_position = request.args.get('last_position', 0, type=int)
             try:
-                with open(events_file, 'r') as f:
-                    for line in f:
-                        current_position += 1
-                        if current_position > last_position and line.strip():
-                            events.append(json.loads(line))
+                if offset is None:
+                    # Legacy cursor: skip the first last_position lines
+                    events, offset = read_new_events(events_file, 0)
+                    events = events[last_position:]
+                else:
+                    events, offset = read_new_events(events_file, offset)
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
             
             return jsonify({
-                "events": events,
-                "position": current_position,
-                "has_more": False  # For now, always return all remaining events
+                "events": self._segment_reader(run_name).resolve_prompts(events),
+                "offset": offset,
+                "position": last_position + len(events),
+                "has_more": False
             })
+        
+        @self.app.route('/api/runs/<run_name>/events/sse')
+        def sse_events(run_name: str):
+            """
+            Push events to the browser as the recorder appends them (server-sent events).
+            
+            Starts from the offset query param (or the Last-Event-ID header when the
+            browser reconnects). Each message's id is the byte offset after it, and an
+            "end" event is sent once the game is over.
+            """
+            from flask import request
+            
+            events_file = self.runs_dir / run_name / "events.jsonl"
+            if not (self.runs_dir / run_name).is_dir():
+                return jsonify({"error": "Run not found"}), 404
+            
+            offset = request.headers.get('Last-Event-ID', type=int)
+            if offset is None:
+                offset = request.args.get('offset', 0, type=int)
+            
+            def generate():
+                if is_archived(events_file.parent):
+                    yield "event: end\ndata: {}\n\n"
+                    return
+                position = offset
+                segments = SegmentReader(events_file.parent)
+                last_sent = time.monotonic()
+                end_at = None  # Set once the game is over
+                while end_at is None or time.monotonic() < end_at:
+                    # A stat is O(1); only read when the file has grown
+                    if events_file.exists() and events_file.stat().st_size > position:
+                        for event, position in read_new_lines(events_file, position):
+                            segments.resolve_prompts([event])
+                            # The id is the resume offset if the browser reconnects
+                            yield f"id: {position}\ndata: {json.dumps(event)}\n\n"
+                            last_sent = time.monotonic()
+                            if event.get("event_type") in FORCE_FLUSH_EVENTS and end_at is None:
+                                end_at = time.monotonic() + SSE_END_GRACE
+                    if time.monotonic() - last_sent >= SSE_KEEPALIVE_INTERVAL:
+                        # Comment line: keeps proxies from closing an idle stream
+                        yield ": keep-alive\n\n"
+                        last_sent = time.monotonic()
+                    time.sleep(SSE_POLL_INTERVAL)
+                yield "event: end\ndata: {}\n\n"
+            
+            return Response(
+                stream_with_context(generate()),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
     
     def start(self) -> None:
         """Start the web server."""
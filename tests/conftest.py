@@ -3,7 +3,7 @@ Pytest fixtures for Mafia game tests.
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import AsyncMock, Mock, MagicMock, patch
 from typing import Dict
 
 from src.core import (
@@ -16,7 +16,7 @@ from src.web import EventEmitter, RunRecorder
 
 
 @pytest.fixture(autouse=True)
-def mock_llm_calls():
+def mock_llm_calls(request):
     """
     Automatically mock all LLM API calls for all tests.
     
@@ -26,8 +26,17 @@ def mock_llm_calls():
     
     All tests should still mock the high-level methods for proper behavior,
     but this provides an extra safety layer to prevent any real API calls.
+    
+    Tests marked fake_llm_client exercise the real call paths against a fake
+    client (SimpleLLMAgent.client / async_client) and are left unpatched.
     """
-    with patch.object(SimpleLLMAgent, '_call_llm', return_value=""):
+    if request.node.get_closest_marker("fake_llm_client"):
+        yield
+        return
+    with patch.object(SimpleLLMAgent, '_call_llm', return_value=""), \
+         patch.object(SimpleLLMAgent, '_call_llm_async', new_callable=AsyncMock, return_value=""), \
+         patch.object(SimpleLLMAgent, '_call_llm_streaming', return_value=""), \
+         patch.object(SimpleLLMAgent, '_call_llm_streaming_async', new_callable=AsyncMock, return_value=""):
         yield
 
 
@@ -0,0 +1,130 @@
+"""
+Tests for phase-boundary checkpoints and resuming recorded games.
+"""
+
+import contextlib
+import io
+import json
+
+import pytest
+
+from main import MafiaGame
+from src.agents import DummyAgent
+from src.config import load_config
+from src.core import GameState
+from src.core.checkpoint import CHECKPOINT_FILE, decode_value, encode_value, load_checkpoint
+from src.web import EventEmitter, RunRecorder
+
+
+SEED = 4
+
+
+def _play(runs_dir, run_name, crash_on_night=None):
+    """Play a recorded dummy game, optionally dying at the start of a night's actions."""
+    config = load_config("configs/dummy_agent.yaml")
+    config.random_seed = SEED
+    recorder = RunRecorder(str(runs_dir))
+    recorder.create_run(run_name)
+    game = MafiaGame(config=config, event_emitter=EventEmitter(recorder))
+
+    if crash_on_night is not None:
+        get_night_action = DummyAgent.get_night_action
+
+        def flaky_night_action(agent, context):
+            if context.game_state.night_number == crash_on_night:
+                raise ConnectionError("API unavailable")
+            return get_night_action(agent, context)
+
+        for agent in game.agents.values():
+            agent.get_night_action = flaky_night_action.__get__(agent)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            game.run_game()
+        finally:
+            recorder.close()
+    return game
+
+
+def _events(run_dir):
+    with open(run_dir / "events.jsonl") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_checkpoint_values_round_trip():
+    """Test that player-keyed dicts, tuples and sets survive JSON encoding unchanged."""
+    value = {
+        "votes": {3: 5, 4: 5},
+        "random": (3, (1, 2, 3), None),
+        "checked": {7, 2},
+        "nested": [{"__tuple__": "a plain key"}],
+    }
+    assert decode_value(json.loads(json.dumps(encode_value(value)))) == value
+
+    with pytest.raises(TypeError):
+        encode_value({"player": object()})
+
+    game_state = GameState(random_seed=3)
+    game_state.eliminate_player(game_state.get_civilian_players()[0].player_number, "night kill", night_number=1)
+    restored = GameState.from_checkpoint_state(
+        decode_value(json.loads(json.dumps(encode_value(game_state.checkpoint_state())))))
+    assert restored.players == game_state.players
+    assert restored.action_log == game_state.action_log
+    assert list(restored.public_history.snapshot()) == list(game_state.public_history.snapshot())
+    assert restored.alive_mask == game_state.alive_mask
+
+
+def test_resumed_game_finishes_like_an_uninterrupted_one(tmp_path):
+    """Test that a game that dies on night 2 resumes from the checkpoint and plays out identically."""
+    reference = _play(tmp_path, "reference")
+    assert reference.game_state.night_number >= 2
+
+    with pytest.raises(ConnectionError):
+        _play(tmp_path, "crashed", crash_on_night=2)
+    checkpoint = load_checkpoint(tmp_path / "crashed")
+    assert (checkpoint.phase, checkpoint.night_number) == ("night", 2)
+    assert len(_events(tmp_path / "crashed")) > checkpoint.event_count
+
+    resumed = MafiaGame.resume("crashed", runs_dir=str(tmp_path))
+    assert resumed.discarded_events > 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        resumed.run_game()
+    resumed.run_recorder.close()
+
+    assert resumed.game_state.winner == reference.game_state.winner
+    assert resumed.game_state.action_log == reference.game_state.action_log
+    assert resumed.judge.announcements == reference.judge.announcements
+
+    # The run's log continues without gaps or events from the interrupted phase
+    events = _events(tmp_path / "crashed")
+    assert [e["sequence"] for e in events] == list(range(len(events)))
+    resumed_at = checkpoint.event_count
+    assert events[resumed_at]["event_type"] == "game_resumed"
+    reference_types = [e["event_type"] for e in _events(tmp_path / "reference")]
+    assert [e["event_type"] for e in events[:resumed_at] + events[resumed_at + 1:]] == reference_types
+
+    # The profile carries on from the checkpoint without the interrupted phase's partial profile
+    with open(tmp_path / "crashed" / "metadata.json") as f:
+        profiled_phases = [(p["phase"], p["day_number"], p["night_number"]) for p in json.load(f)["profile"]["phases"]]
+    assert profiled_phases == [(e["data"]["phase"], e["data"]["day_number"], e["data"]["night_number"])
+                               for e in events if e["event_type"] == "phase_change"]
+
+    # A finished run can't be resumed
+    with pytest.raises(ValueError):
+        MafiaGame.resume("crashed", runs_dir=str(tmp_path))
+
+
+def test_runs_without_checkpoints(tmp_path):
+    """Test that checkpoint_phases=False writes no checkpoint and resume reports it."""
+    config = load_config("configs/dummy_agent.yaml")
+    config.random_seed = SEED
+    config.checkpoint_phases = False
+    recorder = RunRecorder(str(tmp_path))
+    recorder.create_run("plain")
+    with contextlib.redirect_stdout(io.StringIO()):
+        MafiaGame(config=config, event_emitter=EventEmitter(recorder)).run_game()
+    recorder.close()
+
+    assert not (tmp_path / "plain" / CHECKPOINT_FILE).exists()
+    with pytest.raises(FileNotFoundError):
+        MafiaGame.resume("plain", runs_dir=str(tmp_path))
@@ -2,11 +2,13 @@
 Tests for day phase handler.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import Mock, patch
 from src.core import GameState, GamePhase, Judge
 from src.phases import DayPhaseHandler
-from src.agents import SimpleLLMAgent
+from src.agents import LLMEmptyResponseError, SimpleLLMAgent
 from src.config.game_config import GameConfig
 
 
@@ -39,7 +41,7 @@ def test_speaking_order_rotation(game_state, judge, game_config):
     assert order1[0] != order2[0] or len(order1) != len(order2)
 
 
-@patch.object(SimpleLLMAgent, 'get_day_speech')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
 def test_process_speech(mock_speech, game_state, judge, game_config, mock_agents):
     """Test processing a player's speech."""
     handler = DayPhaseHandler(game_state, judge)
@@ -55,7 +57,7 @@ def test_process_speech(mock_speech, game_state, judge, game_config, mock_agents
     assert 3 in judge.get_nominated_players()
 
 
-@patch.object(SimpleLLMAgent, 'get_day_speech')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
 def test_speech_auto_adds_pass(mock_speech, game_state, judge, game_config, mock_agents):
     """Test that PASS is auto-added if missing."""
     handler = DayPhaseHandler(game_state, judge)
@@ -69,7 +71,7 @@ def test_speech_auto_adds_pass(mock_speech, game_state, judge, game_config, mock
     assert speech.endswith("PASS")
 
 
-@patch.object(SimpleLLMAgent, 'get_day_speech')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
 def test_speech_truncation(mock_speech, game_state, judge, game_config, mock_agents):
     """Test that long speeches are truncated."""
     handler = DayPhaseHandler(game_state, judge)
@@ -88,7 +90,7 @@ def test_speech_truncation(mock_speech, game_state, judge, game_config, mock_age
     assert len(words) > 0
 
 
-@patch.object(SimpleLLMAgent, 'get_day_speech')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
 def test_first_day_single_nomination_no_vote(mock_speech, game_state, judge, game_config, mock_agents):
     """Test that first day with single nomination doesn't vote."""
     handler = DayPhaseHandler(game_state, judge)
@@ -104,7 +106,7 @@ def test_first_day_single_nomination_no_vote(mock_speech, game_state, judge, gam
     assert game_state.phase != GamePhase.VOTING
 
 
-@patch.object(SimpleLLMAgent, 'get_day_speech')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
 def test_subsequent_day_single_nomination_auto_eliminate(mock_speech, game_state, judge, game_config, mock_agents):
     """Test that subsequent day with single nomination auto-eliminates."""
     handler = DayPhaseHandler(game_state, judge)
@@ -124,3 +126,91 @@ def test_subsequent_day_single_nomination_auto_eliminate(mock_speech, game_state
     assert target_player.status.value == "eliminated"
     assert len(game_state.get_alive_players()) == initial_alive - 1
 
+
+
+def test_speculative_speeches(game_state, game_config, mock_agents, no_record_event_emitter):
+    """Test that drafts are used after plain speeches and regenerated after nominations."""
+    game_config.speculative_speeches = True
+    judge = Judge(game_state, game_config)
+    handler = DayPhaseHandler(game_state, judge, event_emitter=no_record_event_emitter)
+    async def fake_speech(self, context):
+        history_size = len(context.public_history)
+        await asyncio.sleep(0)
+        if self.player.player_number == 4:
+            return "I nominate player number 7. PASS"
+        return f"Speech after {history_size} events. PASS"
+    
+    with patch.object(SimpleLLMAgent, 'get_day_speech_async', fake_speech):
+        handler.run_day_phase(mock_agents)
+    
+    speeches = [e for e in game_state.public_history.snapshot() if e["type"] == "speech"]
+    assert [e["player"] for e in speeches] == list(range(1, 11))
+    assert 7 in judge.get_nominated_players()
+    
+    # Player 5's draft was made before player 4 nominated, so it was regenerated
+    stats = handler.speculation_stats
+    assert stats.drafts == 9
+    assert stats.rejected == 1
+    assert stats.accepted == 8
+    # Accepted drafts were generated before the previous speech was recorded
+    assert speeches[2]["speech"] == "Speech after 1 events. PASS"
+    assert speeches[4]["speech"] == "Speech after 5 events. PASS"
+    no_record_event_emitter.run_recorder.update_metadata.assert_called_with(
+        {"speculative_speeches": stats.to_dict()}
+    )
+
+
+def test_speculative_drafts_are_cleaned_up_on_errors(game_state, game_config, mock_agents, no_record_event_emitter):
+    """Test that a failed turn cancels the pending draft and a failed discarded draft doesn't end the day."""
+    game_config.speculative_speeches = True
+    judge = Judge(game_state, game_config)
+    handler = DayPhaseHandler(game_state, judge, event_emitter=no_record_event_emitter)
+    cancelled = []
+    
+    async def failing_turn(self, context):
+        if self.player.player_number == 2:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(2)
+                raise
+        raise LLMEmptyResponseError(self.player.player_number, "speech")
+    
+    async def run_day():
+        with pytest.raises(LLMEmptyResponseError):
+            await handler.run_day_phase_async(mock_agents)
+        # Cancelled by the handler, not by the event loop shutting down
+        assert cancelled == [2]
+    
+    with patch.object(SimpleLLMAgent, 'get_day_speech_async', failing_turn):
+        asyncio.run(run_day())
+    
+    calls = []
+    
+    async def failing_draft(self, context):
+        calls.append(self.player.player_number)
+        await asyncio.sleep(0)
+        if self.player.player_number == 4:
+            return "I nominate player number 7. PASS"
+        if calls.count(self.player.player_number) == 1 and self.player.player_number == 5:
+            raise LLMEmptyResponseError(5, "speech")
+        return "Nothing to add. PASS"
+    
+    game_state.day_number += 1
+    with patch.object(SimpleLLMAgent, 'get_day_speech_async', failing_draft):
+        handler.run_day_phase(mock_agents)
+    # Player 5's failed draft was discarded after the nomination and the speech was regenerated
+    assert calls.count(5) == 2
+    assert handler.speculation_stats.rejected >= 1
+
+
+def test_only_mentions_of_the_next_speaker_invalidate_a_draft(game_state, judge, no_record_event_emitter):
+    """Test that a speech invalidates the next speaker's draft when it names them, not when it has their number."""
+    handler = DayPhaseHandler(game_state, judge, event_emitter=no_record_event_emitter)
+    
+    assert handler._invalidates_draft("I suspect Player 2. PASS", None, 2)
+    assert handler._invalidates_draft("player number 2 was quiet. PASS", None, 2)
+    assert handler._invalidates_draft("What about player #2? PASS", None, 2)
+    assert not handler._invalidates_draft("It is Day 2 and nobody has spoken. PASS", None, 2)
+    assert not handler._invalidates_draft("2 votes were enough yesterday. PASS", None, 2)
+    assert not handler._invalidates_draft("Player 12 is suspicious. PASS", None, 2)
@@ -2,16 +2,20 @@
 Integration tests for full game flow.
 """
 
+import asyncio
+import zlib
+
 import pytest
 from unittest.mock import Mock, patch
 from src.core import GameState, GamePhase, Team
 from src.agents import SimpleLLMAgent
 from main import MafiaGame
 from src.config.game_config import GameConfig
+from src.web import EventEmitter, RunRecorder
 
 
-@patch.object(SimpleLLMAgent, 'get_day_speech')
-@patch.object(SimpleLLMAgent, 'get_night_action')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
 @patch.object(SimpleLLMAgent, 'get_vote_choice_async')
 def test_full_game_flow(mock_vote_async, mock_night, mock_speech, game_config, no_record_event_emitter):
     """Test a complete game flow."""
@@ -100,9 +104,9 @@ def test_full_game_flow(mock_vote_async, mock_night, mock_speech, game_config, n
         assert winner in ["Civilians (Red Team)", "Mafia (Black Team)", "Draw"]
 
 
-@patch.object(SimpleLLMAgent, 'get_day_speech')
-@patch.object(SimpleLLMAgent, 'get_night_action')
-@patch.object(SimpleLLMAgent, 'get_vote_choice')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
+@patch.object(SimpleLLMAgent, 'get_vote_choice_async')
 def test_mafia_win_scenario(mock_vote, mock_night, mock_speech, game_config, no_record_event_emitter):
     """Test a scenario where mafia wins."""
     game = MafiaGame(game_config, event_emitter=no_record_event_emitter)
@@ -176,3 +180,43 @@ def test_game_state_persistence(game_state):
     assert game_state.phase == GamePhase.NIGHT
     assert game_state.night_number == 2
 
+
+
+def test_games_share_one_event_loop():
+    """Test that LLM games interleaved on one event loop play exactly as they do alone."""
+    calls_in_flight = {"now": 0, "max": 0}
+
+    async def fake_call_llm_async(self, prompt, max_tokens=None, temperature=None):
+        # Yield a prompt-dependent number of times so the games' calls interleave
+        calls_in_flight["now"] += 1
+        calls_in_flight["max"] = max(calls_in_flight["max"], calls_in_flight["now"])
+        for _ in range(zlib.crc32(prompt.encode()) % 4 + 1):
+            await asyncio.sleep(0)
+        calls_in_flight["now"] -= 1
+        return f"I nominate player number {zlib.crc32(prompt.encode()) % 10 + 1}. PASS"
+
+    def new_game(seed):
+        config = GameConfig(agent_type="simple_llm_agent", random_seed=seed, max_rounds=4, headless=True)
+        recorder = Mock(spec=RunRecorder)
+        return MafiaGame(config, event_emitter=EventEmitter(recorder)), recorder
+
+    def recorded_events(recorder):
+        return [c.args for c in recorder.record_event.call_args_list]
+
+    seeds = [1, 2, 3, 4]
+    with patch.object(SimpleLLMAgent, "_call_llm_async", fake_call_llm_async):
+        alone = []
+        for seed in seeds:
+            game, recorder = new_game(seed)
+            alone.append((game.run_game(), recorded_events(recorder)))
+        assert calls_in_flight["max"] <= 10  # A single game only overlaps its own players' calls
+
+        games = [new_game(seed) for seed in seeds]
+
+        async def play_all():
+            return await asyncio.gather(*(game.run_game_async() for game, _ in games))
+
+        winners = asyncio.run(play_all())
+
+    assert calls_in_flight["max"] > 10
+    assert [(winner, recorded_events(recorder)) for winner, (_, recorder) in zip(winners, games)] == alone
@@ -3,7 +3,14 @@ Tests for game engine and state management.
 """
 
 import pytest
+from unittest.mock import patch
+
+from main import MafiaGame
+from src.config.game_config import GameConfig
 from src.core import GameState, GamePhase, Team, RoleType, PlayerStatus
+from src.agents import DummyAgent, SimpleLLMAgent
+from src.agents.xml_formatter import format_game_history_xml, _caches
+from src.web import EventEmitter, RunRecorder
 
 
 def test_game_setup(game_state):
@@ -119,6 +126,45 @@ def test_get_player(game_state):
     assert player is None
 
 
+def test_player_index_tracks_status_changes(game_state):
+    """Test that the alive mask and team queries follow status changes made through any path."""
+    don = game_state.get_alive_player_by_role(RoleType.DON)
+    sheriff = game_state.get_alive_player_by_role(RoleType.SHERIFF)
+    assert don.role.role_type == RoleType.DON and sheriff.role.role_type == RoleType.SHERIFF
+    assert game_state.alive_mask == sum(1 << n for n in range(1, 11))
+
+    don.eliminate()
+    sheriff.status = PlayerStatus.DISQUALIFIED
+    assert game_state.get_alive_player_by_role(RoleType.DON) is None
+    assert game_state.get_alive_numbers() == [p.player_number for p in game_state.players if p.is_alive]
+    assert game_state.count_alive() == (2, 6)
+    assert don not in game_state.get_mafia_players()
+    assert sheriff not in game_state.get_civilian_players()
+
+    sheriff.status = PlayerStatus.ALIVE
+    assert game_state.get_alive_player_by_role(RoleType.SHERIFF) is sheriff
+    # Returned lists are copies, so callers may modify them
+    game_state.get_alive_players().clear()
+    assert len(game_state.get_alive_players()) == 9
+
+
+def test_player_index_follows_replaced_roster(game_state):
+    """Test that assigning a new player list re-indexes lookups."""
+    other = GameState(random_seed=1)
+    game_state.players = other.players[:5]
+    assert game_state.get_player(3) is other.players[2]
+    assert game_state.get_player(8) is None
+    assert len(game_state.get_alive_players()) == 5
+
+
+def test_players_are_slotted(game_state):
+    """Test that players carry no per-instance dictionary."""
+    player = game_state.get_player(1)
+    assert not hasattr(player, "__dict__")
+    with pytest.raises(AttributeError):
+        player.nickname = "x"
+
+
 def test_max_rounds_limit(game_state):
     """Test that game ends when max_rounds is reached."""
     # Set a low max_rounds limit
@@ -155,3 +201,114 @@ def test_max_rounds_none(game_state):
     winner = game_state.check_win_condition()
     # Winner might be None or a team depending on eliminations, but not forced by max_rounds
 
+
+
+def test_public_history_index(game_state, judge):
+    """Test that public events are indexed as they are logged."""
+    game_state.record_speech(1, "I nominate player number 3. PASS")
+    judge.process_nomination(1, "I nominate player number 3. PASS", announce=False)
+    game_state.record_speech(2, "No nomination. PASS")
+    game_state.eliminate_player(3, "voting", day_number=1, voters=[1, 2])
+    game_state.record_speech(3, "Final words. THANK YOU", is_final=True)
+    
+    history = list(game_state.public_history.snapshot())
+    assert [e["type"] for e in history] == ["speech", "nomination", "speech", "elimination", "speech"]
+    assert history[0]["timestamp"] == "Day 1, Speech #1"
+    assert history[2]["timestamp"] == "Day 1, Speech #2"
+    assert history[1]["target"] == 3 and history[1]["day"] == 1
+    assert history[3]["voters"] == [1, 2]
+    assert history[4]["is_final"] and history[4]["timestamp"] == "Day 1, Final Speech"
+    
+    # Private and bookkeeping actions are not public history
+    game_state.start_night()
+    assert len(game_state.public_history) == 5
+
+
+def test_public_history_snapshot_is_frozen(game_state):
+    """Test that a snapshot does not see events recorded after it was taken."""
+    game_state.record_speech(1, "First. PASS")
+    snapshot = game_state.public_history.snapshot()
+    game_state.record_speech(2, "Second. PASS")
+    
+    assert len(snapshot) == 1
+    assert [e["player"] for e in snapshot] == [1]
+    assert snapshot[-1]["player"] == 1
+    assert len(game_state.public_history.snapshot()) == 2
+
+
+def test_agent_context_is_lazy_and_pinned(game_state):
+    """Test that context fields are computed on first access, as of the game state the context was built at."""
+    game_state.start_night()
+    mafia = next(p for p in game_state.get_mafia_players() if p.role.role_type == RoleType.MAFIA)
+    don = game_state.get_alive_player_by_role(RoleType.DON)
+    agent = DummyAgent(mafia)
+
+    context = agent.build_context(game_state)
+    game_state.record_speech(1, "After the context was built. PASS")
+    game_state.eliminate_player(don.player_number, "night kill", night_number=1)
+    assert game_state.public_history._observed == 0  # Nothing read yet, nothing indexed
+
+    # The Don was alive and nothing public had happened when the context was built
+    assert context.available_actions == ["claim_kill_target"]
+    assert len(context.public_history) == 0
+    later = agent.build_context(game_state)
+    assert later.available_actions == ["claim_kill_target", "decide_kill"]
+    assert [e["type"] for e in later.public_history] == ["speech", "elimination"]
+    assert context.private_info["known_mafia"] == mafia.known_mafia
+
+
+def test_dummy_game_never_indexes_history():
+    """Test that a pure-dummy game never builds the public history its agents don't read."""
+    game = MafiaGame(config=GameConfig(agent_type="dummy_agent", random_seed=5, headless=True),
+                     event_emitter=EventEmitter(RunRecorder()))
+    game.run_game()
+
+    assert game.game_state.version > 50
+    assert game.game_state.public_history._observed == 0
+    # Reading it indexes the whole log at once
+    assert any(e["type"] == "elimination" for e in game.game_state.public_history.snapshot())
+    assert game.game_state.public_history._observed == game.game_state.version
+
+
+def test_prompt_is_built_once_per_context(game_state):
+    """Test that a handler capturing the prompt and the agent acting on it share one build."""
+    agent = SimpleLLMAgent(game_state.get_player(1))
+    context = agent.build_context(game_state)
+    with patch.object(SimpleLLMAgent, "_build_strategic_prompt", autospec=True,
+                      side_effect=SimpleLLMAgent._build_strategic_prompt) as build:
+        prompt = agent.build_strategic_prompt(context, "speech")
+        assert agent.build_strategic_prompt(context, "speech") is prompt
+        assert build.call_count == 1
+        agent.build_strategic_prompt(context, "vote")
+        assert build.call_count == 2
+        # Overriding a field invalidates the prompts built from it
+        context.public_history = []
+        agent.build_strategic_prompt(context, "speech")
+        assert build.call_count == 3
+
+
+def test_history_xml_reuses_closed_day_fragments(game_state, judge):
+    """Test that cached XML history matches a full render and past days are not re-rendered."""
+    agent = DummyAgent(game_state.get_player(1))
+    game_state.record_speech(1, "I nominate player number 3. PASS")
+    judge.process_nomination(1, "I nominate player number 3. PASS", announce=False)
+    game_state.eliminate_player(3, "voting", day_number=1, voters=[1, 2])
+    game_state.start_night()
+    game_state.night_kills[1] = 5
+    game_state.eliminate_player(5, "night kill", night_number=1)
+    game_state.start_day()
+    game_state.record_speech(2, "Day two. PASS")
+    
+    context = agent.build_context(game_state)
+    xml = format_game_history_xml(context)
+    day_1_fragment = _caches[id(game_state)].fragments[("day", 1)]
+    
+    game_state.record_speech(4, "Another day two speech. PASS")
+    context = agent.build_context(game_state)
+    xml = format_game_history_xml(context)
+    
+    # A plain list is never cached, so it gives a from-scratch render to compare against
+    context.public_history = list(context.public_history)
+    assert xml == format_game_history_xml(context)
+    assert _caches[id(game_state)].fragments[("day", 1)] is day_1_fragment
+    assert '<night number="1">' in xml and xml.count("<speech") == 3
@@ -0,0 +1,103 @@
+"""
+Tests for leveled engine output and headless mode.
+"""
+
+import contextlib
+import io
+
+import pytest
+
+from main import MafiaGame
+from src.config import load_config
+from src.core import GameState, Judge
+from src.core.game_log import ERROR, INFO, GameLog, parse_level
+from src.config.game_config import GameConfig
+from src.web import EventEmitter, RunRecorder
+
+
+class CountingArg:
+    """Template argument that counts how often it is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "arg"
+
+
+def test_levels_filter_records_before_formatting():
+    """Test that records below the level or in headless mode never reach sinks or get formatted."""
+    records = []
+    log = GameLog("WARNING", sinks=[records.append])
+    arg = CountingArg()
+
+    log.info("game", "dropped %s", arg)
+    log.error("game", "kept %s", arg, player=3)
+
+    assert [record.message for record in records] == ["kept arg"]
+    assert records[0].level == ERROR and records[0].fields == {"player": 3}
+    assert arg.formatted == 1
+    assert not log.enabled_for(INFO) and log.enabled_for(ERROR)
+
+    headless = GameLog("DEBUG", headless=True, sinks=[records.append])
+    headless.error("game", "dropped %s", arg)
+    assert len(records) == 1 and arg.formatted == 1
+    assert not headless.enabled_for(ERROR)
+
+    assert parse_level("debug") == 10
+    with pytest.raises(ValueError):
+        parse_level("LOUD")
+
+
+def test_headless_judge_skips_formatting_unless_recording():
+    """Test that a headless judge neither keeps nor formats announcements, but still records events."""
+    game_state = GameState()
+    game_state.setup_game()
+    emitter = EventEmitter(RunRecorder())  # No run created: nothing is recorded
+    judge = Judge(game_state, GameConfig(headless=True), event_emitter=emitter)
+    arg = CountingArg()
+
+    judge.announce("Player %s is eliminated.", arg)
+    judge.player_speaks(1, "I nominate player 2")
+    assert judge.announcements == []
+    assert arg.formatted == 0
+
+    with emitter.capture_events() as events:
+        judge.announce("Player %s is eliminated.", arg)
+    assert [event_type for event_type, _ in events] == ["announcement"]
+    assert events[0][1]["message"] == "Player arg is eliminated."
+    assert judge.announcements == []
+
+
+def test_judge_keeps_and_prints_announcements_by_default():
+    """Test that announcements are formatted, kept and printed at the default level."""
+    game_state = GameState()
+    game_state.setup_game()
+    judge = Judge(game_state, GameConfig())
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        judge.announce("Day %s begins.", 2)
+        judge.player_speaks(4, "Hello")
+
+    assert judge.announcements == ["Day 2 begins.", "Player 4: Hello"]
+    assert output.getvalue() == "[JUDGE] Day 2 begins.\n[Player 4] Hello\n"
+
+
+def test_headless_game_prints_nothing_and_plays_the_same(no_record_event_emitter):
+    """Test that a headless game is silent and reaches the same outcome as a printed one."""
+    outcomes = {}
+    for headless in (False, True):
+        config = load_config("configs/dummy_agent.yaml")
+        config.random_seed = 11
+        config.headless = headless
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            game = MafiaGame(config=config, event_emitter=no_record_event_emitter)
+            game.run_game()
+        outcomes[headless] = (game.game_state.winner, game.game_state.day_number)
+        assert bool(output.getvalue()) is not headless
+        assert bool(game.judge.announcements) is not headless
+
+    assert outcomes[True] == outcomes[False]
@@ -0,0 +1,159 @@
+"""
+Tests for offline batch execution of LLM requests.
+"""
+
+import asyncio
+import json
+import zlib
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from scheduler import GameJob, GameScheduler, run_batch_tournament
+from src.agents import SimpleLLMAgent
+from src.agents.llm_batch import BatchSession, LocalBatchServer
+from src.config.game_config import GameConfig
+
+
+CONFIG = GameConfig(agent_type="simple_llm_agent", max_rounds=3, headless=True)
+
+
+def _answer(api_params):
+    """Deterministic answer to a request: nominates a player picked from the input hash."""
+    digest = zlib.crc32(json.dumps(api_params["input"]).encode())
+    return json.dumps({"response": f"I nominate player number {digest % 10 + 1}. PASS", "reasoning": "hunch"})
+
+
+def respond(body):
+    """Responses API body answering a batch request line."""
+    return {
+        "id": "resp", "object": "response", "status": "completed",
+        "output": [{"type": "message", "role": "assistant",
+                    "content": [{"type": "output_text", "text": _answer(body), "annotations": []}]}],
+        "usage": {"input_tokens": 100, "output_tokens": 20, "total_tokens": 120},
+    }
+
+
+class FakeAsyncClient:
+    """Interactive client stand-in giving the same answers as respond()."""
+
+    def __init__(self):
+        self.responses = SimpleNamespace(create=self.create)
+
+    async def create(self, **api_params):
+        return SimpleNamespace(output=[SimpleNamespace(content=_answer(api_params))],
+                               usage=SimpleNamespace(input_tokens=100, output_tokens=20, total_tokens=120))
+
+
+def _outcomes(results):
+    return sorted(((r["seed"], r["winner"], r["days"], str(r["eliminations"])) for r in results))
+
+
+@pytest.mark.fake_llm_client
+def test_batch_tournament_runs_games_in_lockstep(tmp_path):
+    """Test that each step batches the requests of every game and games end as they do when played live."""
+    server = LocalBatchServer(respond, polls_to_complete=2)
+    results, scheduler = run_batch_tournament(CONFIG, range(4), str(tmp_path / "batch"),
+                                              runs_dir=str(tmp_path / "runs"), client=server, poll_interval=0)
+
+    assert sorted(r["seed"] for r in results) == [0, 1, 2, 3]
+    assert all(r["phase"] == "game_over" for r in results)
+    session = scheduler.batch
+    assert session.steps == len(server.jobs) > 1
+    # A speech step holds one request per game; the votes of all 4 games go out as one job
+    assert all(job.request_count <= 4 for job in server.jobs[:10])
+    assert max(job.request_count for job in server.jobs) == 40
+    assert scheduler.stats().requests == session.requests == sum(job.request_count for job in server.jobs)
+    assert session.tokens == 120 * session.requests
+
+    with patch.object(SimpleLLMAgent, "async_client", FakeAsyncClient()):
+        live = GameScheduler(max_games=4, runs_dir=None).run(GameJob(CONFIG, seed) for seed in range(4))
+    assert _outcomes(results) == _outcomes(live)
+
+
+@pytest.mark.fake_llm_client
+def test_batch_tournament_resumes_failed_games(tmp_path):
+    """Test that a rerun on the same state directory resumes failed games and doesn't resend answered requests."""
+    answered = []
+
+    def failing_respond(body):
+        if len(answered) >= 25:
+            raise ConnectionError("provider outage")
+        answered.append(body)
+        return respond(body)
+
+    state_dir, runs_dir = str(tmp_path / "batch"), str(tmp_path / "runs")
+    interrupted, _ = run_batch_tournament(CONFIG, range(3), state_dir, runs_dir=runs_dir,
+                                          client=LocalBatchServer(failing_respond), poll_interval=0)
+    assert all(r["phase"] == "failed" for r in interrupted)
+
+    server = LocalBatchServer(respond)
+    results, scheduler = run_batch_tournament(CONFIG, range(3), state_dir, runs_dir=runs_dir,
+                                              client=server, poll_interval=0)
+    assert all(r["phase"] == "game_over" for r in results)
+    # Phases interrupted by the outage are replayed from their checkpoints, their answered requests from disk
+    assert scheduler.batch.reused > 0
+    resent = {json.dumps(line["body"], sort_keys=True) for job in server.jobs for line in job.lines}
+    assert not resent & {json.dumps(body, sort_keys=True) for body in answered}
+
+    uninterrupted, _ = run_batch_tournament(CONFIG, range(3), str(tmp_path / "again"), runs_dir=runs_dir,
+                                            client=LocalBatchServer(respond), poll_interval=0)
+    assert _outcomes(results) == _outcomes(uninterrupted)
+    # Finished games are not played again
+    rerun, scheduler = run_batch_tournament(CONFIG, range(3), state_dir, runs_dir=runs_dir,
+                                            client=LocalBatchServer(respond), poll_interval=0)
+    assert _outcomes(rerun) == _outcomes(results) and scheduler.batch.requests == 0
+
+
+def test_uncollected_job_is_collected_by_next_session(tmp_path):
+    """Test that a job submitted before an interruption is collected instead of submitted again."""
+    server = LocalBatchServer(respond, polls_to_complete=3)
+    api_params = {"model": "gpt-5-mini", "input": [{"role": "user", "content": "Who is the Sheriff?"}]}
+
+    async def interrupt():
+        session = BatchSession(str(tmp_path), client=server, poll_interval=0)
+        serving = asyncio.ensure_future(session.serve())
+        request = asyncio.ensure_future(session.request(api_params))
+        while not server.jobs:
+            await asyncio.sleep(0)
+        serving.cancel()
+        request.cancel()
+
+    async def resume():
+        session = BatchSession(str(tmp_path), client=server, poll_interval=0)
+        serving = asyncio.ensure_future(session.serve())
+        await asyncio.sleep(0)
+        response = await session.request(api_params)
+        serving.cancel()
+        return session, response
+
+    asyncio.run(interrupt())
+    assert json.loads((tmp_path / "state.json").read_text())["uncollected"]
+    session, response = asyncio.run(resume())
+
+    assert len(server.jobs) == 1 and session.requests == 0 and session.reused == 1
+    assert json.loads(response.output_text)["response"] == json.loads(_answer(api_params))["response"]
+    assert json.loads((tmp_path / "state.json").read_text())["uncollected"] == []
+
+
+@pytest.mark.fake_llm_client
+def test_batch_tournament_counts_finished_runs_without_a_result(tmp_path):
+    """Test that a game that ended before its result was written is done, not resumed, on a rerun."""
+    state_dir, runs_dir = tmp_path / "batch", str(tmp_path / "runs")
+    results, _ = run_batch_tournament(CONFIG, range(2), str(state_dir), runs_dir=runs_dir,
+                                      client=LocalBatchServer(respond), poll_interval=0)
+    # The session was interrupted between the end of seed 0's game and writing its result
+    results_file = state_dir / "results.jsonl"
+    lines = [line for line in results_file.read_text().splitlines() if json.loads(line)["seed"] != 0]
+    results_file.write_text("\n".join(lines) + "\n")
+
+    rerun, scheduler = run_batch_tournament(CONFIG, range(2), str(state_dir), runs_dir=runs_dir,
+                                            client=LocalBatchServer(respond), poll_interval=0)
+    assert scheduler.games_finished == 0 and scheduler.batch.requests == 0
+
+    def without_timing(result):
+        return {key: value for key, value in result.items() if key != "duration_ms"}
+
+    assert sorted(map(without_timing, rerun), key=lambda r: r["seed"]) == \
+        sorted(map(without_timing, results), key=lambda r: r["seed"])
@@ -0,0 +1,69 @@
+"""
+Tests for the shared LLM client registry and rate limiter.
+"""
+
+import asyncio
+
+from src.agents import SimpleLLMAgent
+from src.agents.llm_clients import RateLimiter
+from src.config.game_config import GameConfig
+from src.core import GameState
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_request_budget():
+    """Test that requests beyond the per-minute budget wait for the bucket to refill."""
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=60, clock=clock)
+    for _ in range(60):
+        assert limiter.try_acquire(0) == 0
+    assert limiter.try_acquire(0) == 1.0
+
+    clock.now = 1.0
+    assert limiter.try_acquire(0) == 0
+
+
+def test_token_budget_is_settled_against_usage():
+    """Test that token reservations are corrected by the usage the API reports."""
+    clock = FakeClock()
+    limiter = RateLimiter(tokens_per_minute=6000, clock=clock)
+    assert limiter.try_acquire(4000) == 0
+    assert limiter.try_acquire(4000) > 0
+
+    # The first call only used 1000 tokens, so the rest is refunded
+    limiter.settle(4000, 1000)
+    assert limiter.try_acquire(4000) == 0
+    # Oversized requests wait for a full bucket instead of forever
+    clock.now = 600
+    assert limiter.try_acquire(10 ** 6) == 0
+
+
+def test_agents_share_clients(monkeypatch):
+    """Test that agents for the same model share one sync and one async client per loop."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    state = GameState()
+    state.setup_game()
+    config = GameConfig(llm_model="gpt-5-mini", llm_requests_per_minute=100)
+    first = SimpleLLMAgent(state.players[0], config)
+    second = SimpleLLMAgent(state.players[1], config)
+
+    assert first.client is second.client
+    assert first.rate_limiter is second.rate_limiter
+
+    async def async_clients():
+        return first.async_client, second.async_client
+
+    a, b = asyncio.run(async_clients())
+    assert a is b
+    # A new event loop gets its own async client
+    c, _ = asyncio.run(async_clients())
+    assert c is not a
@@ -38,18 +38,19 @@ def test_llm_context_examples():
     game_state = GameState(random_seed=42, event_emitter=None)
     game_state.setup_game()
     
-    # Set up Day 1 history
-    game_state.day_number = 2
-    game_state.night_number = 1
+    # Set up Day 1 history (recorded through GameState so it reaches the public history index)
+    game_state.day_number = 1
     game_state.phase = GamePhase.DAY
     
     # Add some Day 1 speeches to players
     for i, player in enumerate(game_state.players[:5]):
         speech = f"Day 1 speech from Player {player.player_number}: I think we should gather information first. No nomination yet. PASS"
-        player.add_speech(speech)
+        game_state.record_speech(player.player_number, speech)
     
     # Add Day 1 nominations
     game_state.nominations[1] = [3, 5]
+    for nominator, target in ((1, 3), (2, 5)):
+        game_state._log_action("nomination", {"day": 1, "target": target, "nominator": nominator})
     
     # Find specific players BEFORE eliminations
     sheriff = next((p for p in game_state.players if p.role.role_type == RoleType.SHERIFF), None)
@@ -75,6 +76,7 @@ def test_llm_context_examples():
         4: elimination_target,  # Player 4 voted for target
         6: elimination_target,  # Player 6 voted for target
     }
+    game_state._log_action("vote_round", {"day": 1, "round": 1, "votes": game_state.votes[1].copy()})
     
     # Add an elimination (target was eliminated on Day 1)
     game_state.eliminate_player(elimination_target, "voting", day_number=1, voters=[1, 2, 4, 6])
@@ -87,17 +89,23 @@ def test_llm_context_examples():
         game_state.night_kills[1] = night_kill_target
         game_state.eliminate_player(night_kill_target, "night kill", night_number=1)
     
+    # Move to Day 2 (current day)
+    game_state.day_number = 2
+    game_state.night_number = 1
+    game_state.phase = GamePhase.DAY
+    
     # Add Day 2 speeches (current day) - only for alive players
     alive_players = game_state.get_alive_players()
     for i, player in enumerate(alive_players[:3]):
         speech = f"Day 2 speech from Player {player.player_number}: Based on yesterday's events, I think we need to investigate further. PASS"
-        player.add_speech(speech)
+        game_state.record_speech(player.player_number, speech)
     
     # Add Day 2 nominations (use a non-test player)
     nomination_target = next((p.player_number for p in game_state.get_alive_players() 
                               if p.player_number not in test_player_nums), None)
     if nomination_target:
         game_state.nominations[2] = [nomination_target]
+        game_state._log_action("nomination", {"day": 2, "target": nomination_target, "nominator": alive_players[0].player_number})
     
     # Store captured prompts
     captured_prompts = {}
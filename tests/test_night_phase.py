@@ -2,16 +2,23 @@
 Tests for night phase handler.
 """
 
+import asyncio
+import contextlib
+import io
+import zlib
+
 import pytest
 from unittest.mock import Mock, patch
+from main import MafiaGame
 from src.core import GameState, GamePhase, Judge
 from src.phases import NightPhaseHandler
 from src.agents import SimpleLLMAgent
 from src.core import RoleType
 from src.config.game_config import GameConfig
+from src.web import EventEmitter, RunRecorder
 
 
-@patch.object(SimpleLLMAgent, 'get_night_action')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
 def test_mafia_kill_claim(mock_action, game_state, judge, game_config, mock_agents, don_player):
     """Test mafia kill claims."""
     handler = NightPhaseHandler(game_state, judge)
@@ -36,7 +43,7 @@ def test_mafia_kill_claim(mock_action, game_state, judge, game_config, mock_agen
     assert killed == 5 or killed is None
 
 
-@patch.object(SimpleLLMAgent, 'get_night_action')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
 def test_mafia_kill_elimination(mock_action, game_state, judge, game_config, mock_agents):
     """Test that mafia kill eliminates player."""
     handler = NightPhaseHandler(game_state, judge)
@@ -75,7 +82,7 @@ def test_mafia_kill_elimination(mock_action, game_state, judge, game_config, moc
     assert len(game_state.get_alive_players()) == initial_alive - 1
 
 
-@patch.object(SimpleLLMAgent, 'get_night_action')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
 def test_don_check(mock_action, game_state, judge, game_config, mock_agents, don_player, sheriff_player):
     """Test Don's check for Sheriff."""
     handler = NightPhaseHandler(game_state, judge)
@@ -103,7 +110,7 @@ def test_don_check(mock_action, game_state, judge, game_config, mock_agents, don
     assert don_player.don_checks[game_state.night_number]["result"] == "Sheriff"
 
 
-@patch.object(SimpleLLMAgent, 'get_night_action')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
 def test_don_check_not_sheriff(mock_action, game_state, judge, game_config, mock_agents, don_player):
     """Test Don checking a non-Sheriff player."""
     handler = NightPhaseHandler(game_state, judge)
@@ -133,7 +140,7 @@ def test_don_check_not_sheriff(mock_action, game_state, judge, game_config, mock
     assert don_player.don_checks[game_state.night_number]["result"] == "Not the Sheriff"
 
 
-@patch.object(SimpleLLMAgent, 'get_night_action')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
 def test_sheriff_check_mafia(mock_action, game_state, judge, game_config, mock_agents, sheriff_player):
     """Test Sheriff checking a mafia player."""
     handler = NightPhaseHandler(game_state, judge)
@@ -161,7 +168,7 @@ def test_sheriff_check_mafia(mock_action, game_state, judge, game_config, mock_a
     assert sheriff_player.sheriff_checks[game_state.night_number]["result"] == "Black"
 
 
-@patch.object(SimpleLLMAgent, 'get_night_action')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
 def test_sheriff_check_civilian(mock_action, game_state, judge, game_config, mock_agents, sheriff_player):
     """Test Sheriff checking a civilian player."""
     handler = NightPhaseHandler(game_state, judge)
@@ -184,7 +191,7 @@ def test_sheriff_check_civilian(mock_action, game_state, judge, game_config, moc
     assert result["result"] == "Red"
 
 
-@patch.object(SimpleLLMAgent, 'get_night_action')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
 def test_checks_first_night(mock_action, game_state, judge, game_config, mock_agents, don_player, sheriff_player):
     """Test that Don and Sheriff can check on first night (checks happen every night)."""
     handler = NightPhaseHandler(game_state, judge)
@@ -211,7 +218,7 @@ def test_checks_first_night(mock_action, game_state, judge, game_config, mock_ag
     assert sheriff_result["target"] == 3
 
 
-@patch.object(SimpleLLMAgent, 'get_night_action')
+@patch.object(SimpleLLMAgent, 'get_night_action_async')
 def test_mafia_kill_when_don_eliminated(mock_action, game_state, judge, game_config, mock_agents):
     """Test that mafia can make kill decision when Don is eliminated."""
     handler = NightPhaseHandler(game_state, judge)
@@ -253,3 +260,44 @@ def test_mafia_kill_when_don_eliminated(mock_action, game_state, judge, game_con
     # Should have killed someone (or None if no valid target)
     assert killed is None or (killed >= 1 and killed <= 10)
 
+
+
+def _fake_llm_response(agent, prompt):
+    """Deterministic stand-in for an LLM call: picks a player from the prompt hash."""
+    digest = zlib.crc32(prompt.encode())
+    agent.event_emitter.emit_llm_metadata(agent.player.player_number, "llm_api_call",
+                                          len(prompt), 1, len(prompt) + 1, 0.0, agent.model)
+    return f"I nominate player number {digest % 10 + 1}. PASS"
+
+
+def _play_recorded_game(concurrent: bool):
+    """Play a seeded LLM-agent game with a fake LLM and return the recorded events."""
+    def fake_call_llm(self, prompt, max_tokens=None, temperature=None):
+        return _fake_llm_response(self, prompt)
+    
+    async def fake_call_llm_async(self, prompt, max_tokens=None, temperature=None):
+        # Finish in a prompt-dependent order, unlike the order calls were made in
+        # (yielding rather than sleeping keeps that order the same on every run)
+        for _ in range(zlib.crc32(prompt.encode()) % 5):
+            await asyncio.sleep(0)
+        return _fake_llm_response(self, prompt)
+    
+    recorder = Mock(spec=RunRecorder)
+    config = GameConfig(agent_type="simple_llm_agent", random_seed=11, max_rounds=4,
+                        concurrent_night_actions=concurrent)
+    with patch.object(SimpleLLMAgent, "_call_llm", fake_call_llm), \
+         patch.object(SimpleLLMAgent, "_call_llm_async", fake_call_llm_async), \
+         contextlib.redirect_stdout(io.StringIO()):
+        game = MafiaGame(config, event_emitter=EventEmitter(recorder))
+        game.run_game()
+    return [c.args for c in recorder.record_event.call_args_list]
+
+
+def test_concurrent_night_matches_sequential():
+    """Test that a concurrent night records the same events, in the same order, as a sequential one."""
+    sequential_events = _play_recorded_game(concurrent=False)
+    concurrent_events = _play_recorded_game(concurrent=True)
+    
+    assert any(event_type == "night_kill_claim" for event_type, _ in sequential_events)
+    assert [e[0] for e in concurrent_events] == [e[0] for e in sequential_events]
+    assert concurrent_events == sequential_events
@@ -0,0 +1,107 @@
+"""
+Tests for the per-phase game profiler.
+"""
+
+import contextlib
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from main import MafiaGame
+from src.agents import SimpleLLMAgent
+from src.config.game_config import GameConfig
+from src.core.profiler import GameProfiler, active_profiler, profiled, record_llm_call
+from src.web import EventEmitter, RunRecorder
+from tests.test_night_phase import _fake_llm_response
+
+
+class FakeAgent:
+    """Stand-in with the .player.player_number that profiled() attributes time to."""
+
+    class player:
+        player_number = 4
+
+    @profiled("outer")
+    def outer(self):
+        return self.inner() + 1
+
+    @profiled("inner")
+    def inner(self):
+        return 1
+
+
+def test_sections_nest_and_attribute_to_players():
+    """Test that sections are timed per phase, nested spans aren't double counted, and LLM tokens add up."""
+    agent = FakeAgent()
+    profiler = GameProfiler()
+    assert agent.outer() == 2  # No active profiler: plain call
+    assert active_profiler() is None
+
+    with profiler.phase("day", 1, 0):
+        assert active_profiler() is profiler
+        assert agent.outer() == 2
+        record_llm_call(4, 12.5, 100, 20, reasoning_tokens=5)
+        record_llm_call(4, 0.1, 100, 20, cache_hit=True)
+    with profiler.phase("night", 1, 1):
+        agent.inner()
+    assert active_profiler() is None
+
+    profile = profiler.to_dict()
+    day, night = profile["phases"]
+    assert (day["phase"], night["phase"], night["night_number"]) == ("day", "night", 1)
+    assert day["sections"]["outer"]["calls"] == day["sections"]["inner"]["calls"] == 1
+    assert day["sections"]["llm_call"]["calls"] == 2
+    assert profile["sections"]["inner"]["calls"] == 2
+
+    player = day["players"][4]
+    assert player["wall_ms"] == pytest.approx(day["sections"]["outer"]["wall_ms"] + 12.6, abs=0.01)
+    assert (player["llm_calls"], player["cache_hits"]) == (2, 1)
+    assert profile["tokens"] == {"prompt_tokens": 100, "completion_tokens": 20, "reasoning_tokens": 5}
+
+    # Timeline: phase spans on the top row, sections below in nesting order
+    depths = {(span[0], span[4]) for span in profile["timeline"]}
+    assert depths == {("day", 0), ("night", 0), ("outer", 1), ("inner", 2), ("llm_call", 1), ("inner", 1)}
+
+
+def test_recorded_game_writes_profile_to_metadata(tmp_path):
+    """Test that a recorded LLM game's metadata profiles every phase and all LLM tokens."""
+    def fake_call_llm(self, prompt, max_tokens=None, temperature=None):
+        return _fake_llm_response(self, prompt)
+
+    async def fake_call_llm_async(self, prompt, max_tokens=None, temperature=None):
+        return _fake_llm_response(self, prompt)
+
+    for profile_phases in (True, False):
+        run_name = f"profile_{profile_phases}"
+        recorder = RunRecorder(str(tmp_path))
+        recorder.create_run(run_name)
+        config = GameConfig(agent_type="simple_llm_agent", random_seed=11, max_rounds=3,
+                            profile_phases=profile_phases)
+        with patch.object(SimpleLLMAgent, "_call_llm", fake_call_llm), \
+                patch.object(SimpleLLMAgent, "_call_llm_async", fake_call_llm_async), \
+                contextlib.redirect_stdout(io.StringIO()):
+            MafiaGame(config, event_emitter=EventEmitter(recorder)).run_game()
+        recorder.close()
+
+        with open(tmp_path / run_name / "metadata.json") as f:
+            metadata = json.load(f)
+        if not profile_phases:
+            assert "profile" not in metadata
+            continue
+
+        with open(tmp_path / run_name / "events.jsonl") as f:
+            events = [json.loads(line) for line in f]
+        profile = metadata["profile"]
+        phase_changes = [e["data"] for e in events if e["event_type"] == "phase_change"]
+        assert [(p["phase"], p["day_number"], p["night_number"]) for p in profile["phases"]] == \
+            [(p["phase"], p["day_number"], p["night_number"]) for p in phase_changes]
+        assert set(profile["sections"]) == {"build_context", "build_prompt", "format_history_xml", "llm_call"}
+
+        llm_calls = [e["data"] for e in events if e["event_type"] == "llm_metadata"]
+        assert profile["sections"]["llm_call"]["calls"] == len(llm_calls)
+        assert profile["tokens"]["prompt_tokens"] == sum(call["prompt_tokens"] for call in llm_calls)
+        assert set(profile["players"]) == {str(call["player_number"]) for call in llm_calls}
+        assert profile["wall_ms"] >= sum(phase["sections"].get("build_context", {}).get("wall_ms", 0)
+                                         for phase in profile["phases"])
@@ -0,0 +1,90 @@
+"""
+Tests for the cache-friendly prompt layout and cached token reporting.
+"""
+
+import os
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from src.agents import SimpleLLMAgent
+from src.config.game_config import GameConfig
+from src.core import GameState, GamePhase, RoleType
+from src.web.run_catalog import RunCatalog, RunSummary
+
+
+def make_game():
+    """Create a day-2 game with some public history."""
+    game_state = GameState(random_seed=42)
+    game_state.setup_game()
+    game_state.day_number = 1
+    game_state.phase = GamePhase.DAY
+    for player in game_state.players[:4]:
+        game_state.record_speech(player.player_number, f"Player {player.player_number} here. PASS")
+    game_state.day_number = 2
+    return game_state
+
+
+def common_prefix(a, b):
+    """Length of the common prefix of two strings."""
+    return len(os.path.commonprefix([a, b]))
+
+
+def test_cache_friendly_layout_shares_prefix_across_players():
+    """Test that prompts for different players share everything up to the private sections."""
+    game_state = make_game()
+    sheriff = next(p for p in game_state.players if p.role.role_type == RoleType.SHERIFF)
+    don = next(p for p in game_state.players if p.role.role_type == RoleType.DON)
+
+    def prompts(layout):
+        config = GameConfig(prompt_layout=layout)
+        result = []
+        for player in (sheriff, don):
+            agent = SimpleLLMAgent(player, config)
+            result.append(agent.build_strategic_prompt(agent.build_context(game_state), "speech"))
+        return result
+
+    classic = prompts("classic")
+    friendly = prompts("cache_friendly")
+
+    # The same content, reordered
+    assert sorted(classic[0].split("\n")) == sorted(friendly[0].split("\n"))
+    # Classic prompts diverge on the first line; cache-friendly ones only after the shared state
+    assert common_prefix(*classic) < 20
+    shared = common_prefix(*friendly)
+    assert "</game_history>" in friendly[0][:shared]
+    assert "GAME STRUCTURE - DAY 2" in friendly[0][:shared]
+    # Identity is the first private line
+    assert friendly[0].index("You are Player") + len("You are Player ") == shared
+
+
+def test_cached_tokens_are_recorded():
+    """Test that cached prompt tokens are read from the usage, emitted and totalled per run."""
+    game_state = make_game()
+    agent = SimpleLLMAgent(game_state.players[0], GameConfig(llm_model="gpt-5-mini"), event_emitter=Mock())
+    usage = SimpleNamespace(input_tokens=2000, output_tokens=50, total_tokens=2050,
+                            input_tokens_details=SimpleNamespace(cached_tokens=1536))
+
+    agent._emit_usage(agent._get_usage(SimpleNamespace(usage=usage)), 120.0)
+
+    assert agent.event_emitter.emit_llm_metadata.call_args.kwargs["cached_tokens"] == 1536
+    summary = RunSummary("run")
+    for cached in (1536, 0):
+        summary.observe({"event_type": "llm_metadata", "data": {"prompt_tokens": 2000, "cached_tokens": cached}})
+    assert summary.cached_tokens == 1536
+
+
+def test_catalog_adds_new_columns_to_old_catalogs(tmp_path):
+    """Test that a catalog created before cached_tokens existed is migrated in place."""
+    with sqlite3.connect(tmp_path / "catalog.sqlite") as connection:
+        connection.execute("CREATE TABLE runs (name TEXT PRIMARY KEY, outcome TEXT, winner TEXT, failed INTEGER, "
+                           "event_count INTEGER, seed INTEGER, agent_type TEXT, agent_mix TEXT, llm_model TEXT, "
+                           "prompt_tokens INTEGER, completion_tokens INTEGER, total_tokens INTEGER, "
+                           "llm_calls INTEGER, days INTEGER, started_at TEXT, finished_at TEXT, "
+                           "duration_ms REAL, metadata TEXT)")
+    connection.close()
+
+    catalog = RunCatalog(str(tmp_path))
+    catalog.record(RunSummary("run_a"))
+    [row], total = catalog.query()
+    assert row["cached_tokens"] == 0
@@ -0,0 +1,79 @@
+"""
+Tests for prompt segments and the per-run segment table.
+"""
+
+import json
+import zlib
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from scheduler import GameJob, GameScheduler
+from src.agents import SimpleLLMAgent
+from src.config.game_config import GameConfig
+from src.web.run_archive import RunArchive, archive_run
+from src.web.viewer_server import ViewerServer
+
+
+class FakeAsyncClient:
+    """Async client stand-in that answers from the prompt hash and keeps every prompt it was sent."""
+
+    def __init__(self):
+        self.prompts = set()
+        self.responses = SimpleNamespace(create=self.create)
+
+    async def create(self, **api_params):
+        self.prompts.update(message["content"] for message in api_params["input"])
+        digest = zlib.crc32(json.dumps(api_params["input"]).encode())
+        content = json.dumps({"response": f"I nominate player number {digest % 10 + 1}. PASS"})
+        usage = SimpleNamespace(input_tokens=100, output_tokens=20, total_tokens=120)
+        return SimpleNamespace(output=[SimpleNamespace(content=content)], usage=usage)
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.fake_llm_client
+def test_runs_store_each_segment_once_and_viewer_rebuilds_prompts(tmp_path):
+    """Test that events reference prompt segments by key and readers get the prompts that were sent."""
+    client = FakeAsyncClient()
+    config = GameConfig(agent_type="simple_llm_agent", max_rounds=3, headless=True)
+    with patch.object(SimpleLLMAgent, "async_client", client):
+        results = GameScheduler(max_games=2, runs_dir=str(tmp_path)).run(GameJob(config, seed) for seed in (1, 2))
+
+    tables = {}
+    for result in results:
+        run_dir = tmp_path / result["run_name"]
+        rows = read_jsonl(run_dir / "segments.jsonl")
+        assert len({row["key"] for row in rows}) == len(rows)
+        tables[result["run_name"]] = {row["key"]: row for row in rows}
+        contexts = [e["data"]["context"] for e in read_jsonl(run_dir / "events.jsonl") if e["data"].get("context")]
+        referenced = [c for c in contexts if "segments" in c]
+        assert referenced and not any("prompt" in c for c in contexts)
+        # The rules are stored once however many prompts repeat them
+        assert sum(row["name"] == "rules" for row in rows) == 1
+
+        stats = json.loads((run_dir / "metadata.json").read_text())["prompt_segments"]
+        assert stats["prompts"] == len(referenced)
+        assert stats["static_tokens"] > 0 and stats["dynamic_tokens"] > 0
+        assert 0 < stats["static_share"] < 1
+        assert stats["segment_bytes"] < stats["prompt_bytes"]
+
+    # Static segments have the same keys in every game
+    first, second = tables.values()
+    shared = set(first) & set(second)
+    assert {first[key]["name"] for key in shared} >= {"rules", "response_format", "role_guide", "day_guide"}
+
+    run_name = results[0]["run_name"]
+    viewer = ViewerServer(runs_dir=str(tmp_path)).app.test_client()
+    served = [e for e in viewer.get(f"/api/runs/{run_name}/events").get_json() if e["data"].get("context")]
+    prompts = [e["data"]["context"]["prompt"] for e in served]
+    assert prompts and set(prompts) <= client.prompts
+
+    archive_run(tmp_path / run_name)
+    assert not (tmp_path / run_name / "segments.jsonl").exists()
+    archived = [e for e in RunArchive(tmp_path / run_name).read_events() if e["data"].get("context")]
+    assert [e["data"]["context"]["prompt"] for e in archived] == prompts
@@ -0,0 +1,133 @@
+"""
+Tests for replaying recorded runs through the engine.
+"""
+
+import contextlib
+import io
+import zlib
+from unittest.mock import patch
+
+from main import MafiaGame
+from replay import replay_run
+from src.agents import RecordedRun, ReplayAgent, SimpleLLMAgent
+from src.agents.exceptions import LLMEmptyResponseError
+from src.config.game_config import GameConfig
+from src.core import GamePhase, Judge, RoleType
+from src.web import EventEmitter, RunRecorder
+
+
+def _fake_call_llm(self, prompt, max_tokens=None, temperature=None):
+    """Deterministic stand-in for an LLM call: nominates a player picked from the prompt hash."""
+    return f"I nominate player number {zlib.crc32(prompt.encode()) % 10 + 1}. PASS"
+
+
+async def _fake_call_llm_async(self, prompt, max_tokens=None, temperature=None):
+    return _fake_call_llm(self, prompt, max_tokens, temperature)
+
+
+def _record(runs_dir, run_name, agent_type="dummy_agent", seed=3, fail_on_night=None):
+    """Record a seeded game, optionally failing with an empty LLM response at a night's actions."""
+    recorder = RunRecorder(str(runs_dir))
+    recorder.create_run(run_name)
+    config = GameConfig(agent_type=agent_type, random_seed=seed, max_rounds=6)
+    with patch.object(SimpleLLMAgent, "_call_llm", _fake_call_llm), \
+            patch.object(SimpleLLMAgent, "_call_llm_async", _fake_call_llm_async), \
+            contextlib.redirect_stdout(io.StringIO()):
+        game = MafiaGame(config=config, event_emitter=EventEmitter(recorder))
+        if fail_on_night is not None:
+            for agent in game.agents.values():
+                get_night_action = agent.get_night_action
+
+                def failing_night_action(context, agent=agent, get_night_action=get_night_action):
+                    if context.game_state.night_number == fail_on_night:
+                        raise LLMEmptyResponseError(agent.player.player_number, "night_action")
+                    return get_night_action(context)
+
+                agent.get_night_action = failing_night_action
+        game.run_game()
+    recorder.close()
+    return game
+
+
+def test_recorded_games_replay_without_divergence(tmp_path):
+    """Test that dummy and LLM games replay to the recorded events, winner included."""
+    for agent_type, seed in [("dummy_agent", 3), ("simple_llm_agent", 3), ("simple_llm_agent", 136)]:
+        run_name = f"{agent_type}_{seed}"
+        game = _record(tmp_path, run_name, agent_type, seed)
+
+        result = replay_run(tmp_path / run_name)
+
+        assert result.matches, result.divergence.describe()
+        assert result.recording_finished
+        assert result.events_compared > 100
+        # Every speech is recorded, tie-break speeches included
+        assert result.missing_outputs == []
+        assert game.game_state.winner is not None
+
+
+def test_engine_change_is_reported_at_first_divergence(tmp_path):
+    """Test that an engine change is reported at the first event it alters."""
+    _record(tmp_path, "run")
+    announce = Judge.announce
+
+    def reworded_announce(judge, message, *args):
+        announce(judge, message.replace("eliminated", "voted out"), *args)
+
+    with patch.object(Judge, "announce", reworded_announce):
+        result = replay_run(tmp_path / "run")
+
+    assert not result.matches
+    divergence = result.divergence
+    assert divergence.recorded["event_type"] == divergence.replayed["event_type"] == "announcement"
+    assert "eliminated" in divergence.recorded["data"]["message"]
+    assert "voted out" in divergence.replayed["data"]["message"]
+    assert f"recorded event #{divergence.recorded['sequence']}" in divergence.describe()
+
+
+def test_failed_game_replays_its_fatal_error(tmp_path):
+    """Test that a run that failed on an empty LLM response fails the same way on replay."""
+    game = _record(tmp_path, "failed", fail_on_night=2)
+    assert game.game_state.winner is None
+
+    result = replay_run(tmp_path / "failed")
+
+    # The replay stops at the recorded fatal error; playing on would diverge
+    assert result.matches, result.divergence.describe()
+    assert not result.recording_finished
+
+
+def test_replay_agent_answers_from_recording():
+    """Test that replay agents hand back tie-break speeches, votes per round and the Don's claim before his check."""
+    game = MafiaGame(config=GameConfig(agent_type="dummy_agent", random_seed=1), event_emitter=EventEmitter(RunRecorder()))
+    game_state = game.game_state
+    don = game_state.get_alive_player_by_role(RoleType.DON)
+    events = [
+        {"event_type": "phase_change", "data": {"phase": "voting", "day_number": 1, "night_number": 0}},
+        {"event_type": "voting_start", "data": {"nominations": [2, 5], "day_number": 1}},
+        {"event_type": "vote", "data": {"voter": don.player_number, "target": 2, "day_number": 1}},
+        {"event_type": "tie", "data": {"tied_players": [2, 5], "day_number": 1}},
+        {"event_type": "speech", "data": {"player_number": don.player_number, "speech": "Tie-break. PASS", "day_number": 1}},
+        {"event_type": "voting_start", "data": {"nominations": [2, 5], "day_number": 1}},
+        {"event_type": "vote", "data": {"voter": don.player_number, "target": 5, "day_number": 1}},
+        {"event_type": "phase_change", "data": {"phase": "night", "day_number": 1, "night_number": 1}},
+        {"event_type": "night_kill_claim", "data": {"player_number": don.player_number, "target": 4, "night_number": 1}},
+        {"event_type": "don_check", "data": {"target": 6, "result": "not sheriff", "night_number": 1}},
+    ]
+    recording = RecordedRun(events)
+    agent = ReplayAgent(don, recording, game.config)
+
+    game_state.day_number = 1
+    game_state.phase = GamePhase.VOTING
+    context = agent.build_context(game_state)
+    assert agent.get_day_speech(context) == "Tie-break. PASS"
+    assert (don.player_number, 1) not in recording.day_speeches
+    assert agent.get_vote_choice(context) == 2
+    assert agent.get_vote_choice(context) == 5
+    # No third round was recorded and no tie-break eliminated anyone: no vote
+    assert agent.get_vote_choice(context) == 0
+
+    game_state.night_number = 1
+    context = agent.build_context(game_state)
+    assert agent.get_night_action(context) == {"type": "kill_claim", "target": 4}
+    assert agent.get_night_action(context) == {"type": "don_check", "target": 6}
+    assert recording.missing == []
@@ -0,0 +1,88 @@
+"""
+Tests for the LLM response cache.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.agents import SimpleLLMAgent
+from src.agents.response_cache import CachedResponse, ResponseCache
+from src.config.game_config import GameConfig
+from src.core import GameState
+
+
+def make_response(text: str):
+    """Build a minimal Responses API response object."""
+    content = json.dumps({"response": text, "reasoning": f"because {text}"})
+    usage = SimpleNamespace(input_tokens=100, output_tokens=20, total_tokens=120, reasoning_tokens=5)
+    return SimpleNamespace(output=[SimpleNamespace(content=content)], usage=usage)
+
+
+class FakeAsyncClient:
+    """Async client stand-in that counts requests."""
+
+    def __init__(self):
+        self.calls = 0
+        self.responses = SimpleNamespace(create=self.create)
+
+    async def create(self, **api_params):
+        self.calls += 1
+        return make_response(f"answer {self.calls}")
+
+
+def test_memory_tier_is_lru():
+    """Test that the memory tier evicts the least recently used entry."""
+    cache = ResponseCache(memory_entries=2)
+    cache.put("a", CachedResponse("A"))
+    cache.put("b", CachedResponse("B"))
+    assert cache.get("a").content == "A"  # "b" is now least recently used
+    cache.put("c", CachedResponse("C"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").content == "A"
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_persists_and_is_capped(tmp_path):
+    """Test that responses survive a new cache instance and old ones are evicted past the cap."""
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(path, memory_entries=1, max_disk_bytes=2000)
+    for i in range(40):
+        cache.put(f"k{i}", CachedResponse("x" * 50, usage={"total_tokens": i}))
+    assert cache.stats()["disk_bytes"] <= 2000
+    cache.close()
+
+    reopened = ResponseCache(path)
+    assert reopened.get("k0") is None
+    assert reopened.get("k39").usage == {"total_tokens": 39}
+    reopened.close()
+
+
+@pytest.mark.fake_llm_client
+def test_agent_replays_from_cache(tmp_path):
+    """Test that a repeated request makes no API call and re-emits usage as a cache hit."""
+    config = GameConfig(llm_model="gpt-5-mini", llm_cache=True, llm_cache_path=str(tmp_path / "cache.sqlite"))
+    state = GameState()
+    state.setup_game()
+    emitter = Mock()
+    agent = SimpleLLMAgent(state.players[0], config, event_emitter=emitter)
+    agent.async_client = FakeAsyncClient()
+
+    first = asyncio.run(agent._call_llm_async("Who do you suspect?"))
+    second = asyncio.run(agent._call_llm_async("Who do you suspect?"))
+    other = asyncio.run(agent._call_llm_async("Who do you vote for?"))
+
+    assert first == second == "answer 1"
+    assert other == "answer 2"
+    assert agent.async_client.calls == 2
+    assert agent.last_reasoning == "because answer 2"
+
+    hits = [call.kwargs["cache_hit"] for call in emitter.emit_llm_metadata.call_args_list]
+    assert hits == [False, True, False]
+    # The cache hit reports the tokens of the original call
+    assert emitter.emit_llm_metadata.call_args_list[1].args[2:5] == (100, 20, 120)
@@ -0,0 +1,117 @@
+"""
+Tests for the LLM retry and hedging policy.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.agents import LLMEmptyResponseError, SimpleLLMAgent
+from src.agents.retry import LatencyTracker, RetryPolicy, is_retryable
+from src.config.game_config import GameConfig
+from src.core import GameState
+
+
+class StatusError(Exception):
+    """API error carrying an HTTP status, like openai.APIStatusError."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_error_classification():
+    """Test that rate limits, server errors and timeouts are retryable and client errors are not."""
+    assert is_retryable(StatusError(429))
+    assert is_retryable(StatusError(503))
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(StatusError(400))
+    assert not is_retryable(ValueError("bad prompt"))
+
+
+def test_retries_with_bounded_backoff():
+    """Test that transient errors are retried with jittered, capped exponential backoff."""
+    delays = []
+    policy = RetryPolicy(max_retries=3, base_delay=1.0, max_delay=3.0, sleep=delays.append)
+    outcomes = [StatusError(429), StatusError(500), StatusError(502), "ok"]
+
+    def request():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert policy.call(request) == "ok"
+    assert policy.retries == 3
+    assert [0 <= d <= cap for d, cap in zip(delays, (1.0, 2.0, 3.0))] == [True] * 3
+
+
+def test_permanent_and_exhausted_errors_raise():
+    """Test that permanent errors fail at once and transient ones fail after max_retries."""
+    calls = []
+
+    def failing(error):
+        def request():
+            calls.append(error)
+            raise error
+        return request
+
+    policy = RetryPolicy(max_retries=2, sleep=lambda _: None)
+    with pytest.raises(StatusError):
+        policy.call(failing(StatusError(401)))
+    assert len(calls) == 1
+
+    calls.clear()
+    with pytest.raises(StatusError):
+        policy.call(failing(StatusError(503)))
+    assert len(calls) == 3
+
+
+def test_slow_attempt_is_hedged():
+    """Test that an attempt slower than the latency percentile is raced by a duplicate."""
+    latency = LatencyTracker()
+    for _ in range(20):
+        latency.record(0.01)
+    policy = RetryPolicy(hedge_percentile=95, latency=latency)
+    delays = [1.0, 0.0]
+
+    async def request():
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return delay
+
+    start = time.monotonic()
+    assert asyncio.run(policy.call_async(request)) == 0.0
+    assert time.monotonic() - start < 0.5
+    assert policy.hedges == 1
+
+
+@pytest.mark.fake_llm_client
+def test_agent_call_paths_raise_the_same_api_error():
+    """Test that every LLM call path reports a failed request as the same LLMEmptyResponseError."""
+    def fail(**api_params):
+        raise StatusError(400)
+
+    async def fail_async(**api_params):
+        raise StatusError(400)
+
+    game_state = GameState()
+    game_state.setup_game()
+    agent = SimpleLLMAgent(game_state.players[0], GameConfig(llm_cache=False))
+    agent.client = SimpleNamespace(responses=SimpleNamespace(create=fail))
+    async_client = SimpleNamespace(responses=SimpleNamespace(create=fail_async))
+    calls = [
+        lambda: agent._call_llm("prompt"),
+        lambda: agent._call_llm_streaming("prompt", day_number=1),
+        lambda: asyncio.run(agent._call_llm_async("prompt")),
+        lambda: asyncio.run(agent._call_llm_streaming_async("prompt", day_number=1)),
+    ]
+    with patch.object(SimpleLLMAgent, "async_client", async_client):
+        for call in calls:
+            with pytest.raises(LLMEmptyResponseError) as error:
+                call()
+            assert error.value.action_type == "llm_api_call"
+            assert error.value.message == "LLM API call failed for Player 1: HTTP 400"
@@ -0,0 +1,78 @@
+"""
+Tests for the compressed run archive.
+"""
+
+import json
+
+from src.web import RunRecorder
+from src.web.run_archive import RunArchive, archive_run
+from src.web.run_catalog import RunCatalog
+from src.web.viewer_server import ViewerServer
+
+
+RULES = "".join(f"Rule {i}: play fair and argue well.\n" for i in range(50))
+
+
+def prompt(day, history, action):
+    """Build a prompt shaped like the agents' (rules, state header, history, action)."""
+    return f"{RULES}PHASE: day\nDAY: {day}\n" + "".join(f"{line}\n" for line in history) + f"ACTION: {action}"
+
+
+def record_llm_game(recorder, name):
+    """Record a finished game whose events carry growing prompts."""
+    recorder.create_run(name)
+    recorder.save_metadata({"config": {"agent_type": "simple_llm_agent", "random_seed": 1}})
+    history = []
+    for day in (1, 2, 3):
+        for player in (1, 2, 3):
+            context = {"prompt": prompt(day, history, "speech"), "player_role": "civilian"}
+            recorder.record_event("speech", {"player_number": player, "speech": "Hi", "context": context})
+            history.append(f"Player {player} (day {day}): Hi")
+        context = {"prompt": prompt(day, history, "check"), "player_role": "sheriff"}
+        recorder.record_event("sheriff_check", {"target": 2, "result": "red", "context": context})
+    recorder.record_event("game_over", {"winner": "red", "reason": "win_condition", "day_number": 3})
+
+
+def test_archive_round_trip(tmp_path):
+    """Test that an archived run reads back exactly, with prompts stored as small deltas."""
+    recorder = RunRecorder(runs_dir=str(tmp_path))
+    record_llm_game(recorder, "run_a")
+    run_dir = tmp_path / "run_a"
+    with open(run_dir / "events.jsonl") as f:
+        original = [json.loads(line) for line in f]
+
+    stats = archive_run(run_dir)
+
+    assert not (run_dir / "events.jsonl").exists()
+    assert RunArchive(run_dir).read_events() == original
+    assert stats["event_count"] == len(original) and stats["prompt_count"] == 12
+    # Only the first prompt per player carries the rules; later ones copy them
+    assert stats["prompt_delta_bytes"] < stats["prompt_bytes"] / 2
+    assert stats["compression_ratio"] > 5
+    with open(run_dir / "metadata.json") as f:
+        assert json.load(f)["archive"]["compression_ratio"] == stats["compression_ratio"]
+
+
+def test_archived_runs_are_listed_and_viewable(tmp_path):
+    """Test that the catalog, list_runs and the viewer read archived runs."""
+    recorder = RunRecorder(runs_dir=str(tmp_path))
+    record_llm_game(recorder, "run_a")
+    recorder.create_run("run_b")
+    recorder.record_event("phase_change", {"phase": "day"})
+
+    catalog = RunCatalog(str(tmp_path))
+    [(name, stats)] = catalog.archive_finished()
+    assert name == "run_a"
+    # Unfinished runs are left alone
+    assert (tmp_path / "run_b" / "events.jsonl").exists()
+
+    runs = {run["name"]: run for run in recorder.list_runs()}
+    assert runs["run_a"]["game_outcome"] == "Civilians Win"
+    assert runs["run_a"]["event_count"] == 13
+    assert runs["run_a"]["metadata"]["archive"]["archived_bytes"] == stats["archived_bytes"]
+
+    client = ViewerServer(runs_dir=str(tmp_path)).app.test_client()
+    events = client.get("/api/runs/run_a/events").get_json()
+    assert events[0]["data"]["context"]["prompt"].startswith(RULES)
+    assert client.get("/api/runs/run_a/events/stream?offset=0").get_json()["events"] == []
+    assert client.get("/api/runs/run_a/events/sse").get_data(as_text=True).startswith("event: end")
@@ -0,0 +1,163 @@
+"""
+Tests for the run recorder.
+"""
+
+import gc
+import json
+import time
+import weakref
+
+from src.agents.prompt_segments import PromptSegment, SegmentedPrompt
+from src.web import RunRecorder
+from src.web.run_catalog import RunCatalog
+from src.web.segment_table import SegmentReader
+
+
+def read_events(recorder):
+    """Read the current run's events file."""
+    with open(recorder.events_file) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_unbuffered_events_are_written_immediately(tmp_path):
+    """Test that the default mode appends each event as it is recorded."""
+    recorder = RunRecorder(runs_dir=str(tmp_path))
+    recorder.create_run("run")
+    recorder.record_event("speech", {"player_number": 1})
+
+    assert [e["event_type"] for e in read_events(recorder)] == ["speech"]
+
+
+def test_buffered_events_flush_on_game_over(tmp_path):
+    """Test that buffered events are batched and forced out by game_over."""
+    recorder = RunRecorder(runs_dir=str(tmp_path), buffered=True, flush_every=1000, flush_interval=60)
+    recorder.create_run("run")
+    data = {"votes": {1: 2}}
+    for i in range(10):
+        recorder.record_event("vote", data)
+    # Events are serialized when recorded, so later mutation doesn't leak into the file
+    data["votes"][1] = 3
+
+    recorder.record_event("game_over", {"winner": "red"})
+    events = read_events(recorder)
+    assert [e["sequence"] for e in events] == list(range(11))
+    assert events[0]["data"]["votes"] == {"1": 2}
+    assert events[-1]["event_type"] == "game_over"
+    recorder.close()
+
+
+def test_buffered_events_flush_within_interval(tmp_path):
+    """Test that live viewers see buffered events within the flush interval."""
+    recorder = RunRecorder(runs_dir=str(tmp_path), buffered=True, flush_every=1000, flush_interval=0.05)
+    recorder.create_run("run")
+    recorder.record_event("speech", {"player_number": 1})
+
+    deadline = time.monotonic() + 2
+    while not read_events(recorder) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(read_events(recorder)) == 1
+
+    # close() writes whatever is still pending
+    recorder.record_event("speech", {"player_number": 2})
+    recorder.close()
+    assert len(read_events(recorder)) == 2
+
+
+def test_closed_recorder_is_not_kept_alive_by_its_exit_hook(tmp_path):
+    """Test that close() drops the exit hook a buffered recorder registers."""
+    recorder = RunRecorder(runs_dir=str(tmp_path), buffered=True)
+    recorder.create_run("run")
+    recorder.record_event("speech", {"player_number": 1})
+    recorder.close()
+
+    ref = weakref.ref(recorder)
+    del recorder
+    gc.collect()
+    assert ref() is None
+
+
+def test_buffered_segment_rows_go_through_the_writer(tmp_path):
+    """Test that buffered mode writes segment rows from the writer thread, ahead of their events."""
+    recorder = RunRecorder(runs_dir=str(tmp_path), buffered=True, flush_every=1000, flush_interval=60)
+    recorder.create_run("run")
+    prompt = SegmentedPrompt([PromptSegment("rules", "Rules."), PromptSegment("action", "Vote.")])
+    recorder.record_event("vote", {"voter": 1, "target": 2, "context": {"prompt": prompt}})
+    # Nothing is written on the recording thread
+    assert not recorder._segments.path.exists()
+
+    recorder.flush()
+    events = SegmentReader(recorder.current_run_dir).resolve_prompts(read_events(recorder))
+    assert events[0]["data"]["context"]["prompt"] == prompt
+    recorder.close()
+
+
+def record_game(recorder, name, winner, seed, model="gpt-5-mini"):
+    """Record a minimal finished game."""
+    recorder.create_run(name)
+    recorder.save_metadata({
+        "players": list(range(1, 11)),
+        "agent_types": {},
+        "config": {"agent_type": "simple_llm_agent", "total_players": 10, "random_seed": seed, "llm_model": model},
+    })
+    recorder.record_event("llm_metadata", {"prompt_tokens": 100, "completion_tokens": 10, "total_tokens": 110})
+    # Cache hits repeat the original usage but cost nothing
+    recorder.record_event("llm_metadata", {"prompt_tokens": 100, "completion_tokens": 10, "total_tokens": 110,
+                                           "cache_hit": True})
+    recorder.record_event("game_over", {"winner": winner, "reason": "win_condition", "day_number": 3})
+
+
+def test_catalog_is_written_when_a_run_finishes(tmp_path):
+    """Test that a finished run is listed from the catalog with its summary."""
+    recorder = RunRecorder(runs_dir=str(tmp_path))
+    record_game(recorder, "run_a", "black", seed=7)
+
+    [run] = recorder.list_runs()
+    assert run["name"] == "run_a"
+    assert run["game_outcome"] == "Mafia Win"
+    assert run["game_failed"] is False
+    assert run["event_count"] == 3
+    assert run["seed"] == 7
+    assert run["agent_mix"] == {"simple_llm_agent": 10}
+    assert run["llm_calls"] == 2
+    assert run["total_tokens"] == 110
+    assert run["days"] == 3
+    assert run["metadata"]["config"]["llm_model"] == "gpt-5-mini"
+    assert "in_progress" not in run
+
+
+def test_list_runs_pagination_and_filters(tmp_path):
+    """Test paging through in-progress and catalogued runs, and filtering the catalog."""
+    recorder = RunRecorder(runs_dir=str(tmp_path))
+    for i, winner in enumerate(["red", "black", "red"]):
+        record_game(recorder, f"run_{i}", winner, seed=i, model="gpt-5-nano" if i == 2 else "gpt-5-mini")
+    recorder.create_run("run_9")
+    recorder.record_event("phase_change", {"phase": "day"})
+
+    runs, total = recorder.query_runs(limit=2)
+    assert total == 4
+    assert [r["name"] for r in runs] == ["run_9", "run_2"]
+    assert runs[0]["in_progress"] and runs[0]["event_count"] == 1
+    assert [r["name"] for r in recorder.list_runs(limit=2, offset=2)] == ["run_1", "run_0"]
+
+    runs, total = recorder.query_runs(outcome="Civilians Win")
+    assert (total, [r["name"] for r in runs]) == (2, ["run_2", "run_0"])
+    assert [r["name"] for r in recorder.list_runs(model="gpt-5-nano")] == ["run_2"]
+    assert [r["name"] for r in recorder.list_runs(seed=1)] == ["run_1"]
+
+
+def test_backfill_catalogs_existing_runs(tmp_path):
+    """Test that runs recorded before the catalog existed are added by the backfill."""
+    run_dir = tmp_path / "run_old"
+    run_dir.mkdir()
+    with open(run_dir / "events.jsonl", "w") as f:
+        f.write(json.dumps({"timestamp": "2025-01-01T10:00:00", "event_type": "phase_change", "data": {}}) + "\n")
+        f.write(json.dumps({"timestamp": "2025-01-01T10:00:02", "event_type": "fatal_error",
+                            "data": {"error_message": "boom"}}) + "\n")
+
+    recorder = RunRecorder(runs_dir=str(tmp_path))
+    assert recorder.list_runs()[0]["in_progress"]
+    assert RunCatalog(str(tmp_path)).backfill() == 1
+
+    [run] = recorder.list_runs()
+    assert run["game_outcome"] == "Failed" and run["game_failed"]
+    assert run["duration_ms"] == 2000
@@ -0,0 +1,124 @@
+"""
+Tests for the multi-game scheduler.
+"""
+
+import asyncio
+import json
+import zlib
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from scheduler import GameJob, GameScheduler, game_progress
+from src.agents import SimpleLLMAgent
+from src.agents.llm_clients import RequestGate, bind_request_gate, request_slot, unbind_request_gate
+from src.config.game_config import GameConfig
+from src.core import GameState
+
+
+class FakeAsyncClient:
+    """Async client stand-in that answers from the prompt hash and tracks requests in flight."""
+
+    def __init__(self):
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.responses = SimpleNamespace(create=self.create)
+
+    async def create(self, **api_params):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        digest = zlib.crc32(json.dumps(api_params["input"]).encode())
+        # Finish in a prompt-dependent order (yielding rather than sleeping keeps it the same on every run)
+        for _ in range(digest % 5 + 1):
+            await asyncio.sleep(0)
+        self.in_flight -= 1
+        content = json.dumps({"response": f"I nominate player number {digest % 10 + 1}. PASS"})
+        usage = SimpleNamespace(input_tokens=100, output_tokens=20, total_tokens=120, reasoning_tokens=0)
+        return SimpleNamespace(output=[SimpleNamespace(content=content)], usage=usage)
+
+
+def _llm_jobs(seeds):
+    config = GameConfig(agent_type="simple_llm_agent", max_rounds=3, headless=True)
+    return [GameJob(config, seed) for seed in seeds]
+
+
+def _without_timing(results):
+    return sorted(({k: v for k, v in r.items() if k not in ("duration_ms", "run_name")} for r in results),
+                  key=lambda r: r["seed"])
+
+
+@pytest.mark.fake_llm_client
+def test_scheduler_caps_requests_across_games(tmp_path):
+    """Test that LLM requests in flight never exceed the cap and each game is recorded to its own run."""
+    client = FakeAsyncClient()
+    reports = []
+    scheduler = GameScheduler(max_games=4, max_llm_requests=3, runs_dir=str(tmp_path),
+                              on_progress=reports.append)
+    with patch.object(SimpleLLMAgent, "async_client", client):
+        results = scheduler.run(_llm_jobs(range(6)))
+
+    assert sorted(r["seed"] for r in results) == list(range(6))
+    assert client.max_in_flight == scheduler.gate.peak_in_flight == 3
+    assert scheduler.gate.waited_seconds >= 0 and scheduler.gate.in_flight == 0
+
+    stats = scheduler.stats()
+    assert stats.games_finished == 6 and stats.games_in_flight == 0
+    assert stats.requests == client.calls and stats.tokens == 120 * client.calls
+    assert stats.requests_per_second > 0 and stats.games_per_hour > 0
+    assert reports[-1].games_finished == 6
+    for result in results:
+        assert (tmp_path / result["run_name"] / "events.jsonl").stat().st_size > 0
+
+    # Sharing the loop and the cap doesn't change any game's outcome
+    with patch.object(SimpleLLMAgent, "async_client", FakeAsyncClient()):
+        alone = GameScheduler(max_games=1, runs_dir=None).run((job.config, job.seed) for job in _llm_jobs(range(6)))
+    assert _without_timing(results) == _without_timing(alone)
+
+
+def test_requests_of_games_near_their_end_go_first():
+    """Test that a freed slot goes to the waiting request of the game furthest along."""
+    early, late = GameState(max_rounds=10), GameState(max_rounds=10)
+    late.day_number = 4
+    late.eliminate_player(1, "voting", day_number=1)
+    late.eliminate_player(2, "night kill", night_number=1)
+    assert game_progress(early) == 0.1 < game_progress(late) == 0.4
+
+    gate = RequestGate(max_in_flight=1)
+    admitted = []
+
+    async def request(name, game_state):
+        token = bind_request_gate(gate, lambda: game_progress(game_state))
+        try:
+            async with request_slot():
+                admitted.append(name)
+                await asyncio.sleep(0)
+        finally:
+            unbind_request_gate(token)
+
+    async def play():
+        await gate.acquire()  # Hold the only slot while both requests queue
+        tasks = [asyncio.ensure_future(request("early", early)),
+                 asyncio.ensure_future(request("late", late))]
+        await asyncio.sleep(0)
+        assert gate.waiting == 2
+        gate.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(play())
+    assert admitted == ["late", "early"]
+    assert gate.requests == 3 and gate.peak_in_flight == 1
+
+
+def test_job_that_cannot_be_set_up_fails_alone(tmp_path):
+    """Test that a job whose game can't be set up is a failed result and the other games still finish."""
+    config = GameConfig(agent_type="dummy_agent", headless=True)
+    scheduler = GameScheduler(max_games=2, runs_dir=str(tmp_path))
+    results = scheduler.run([GameJob(config, 0, run_name="missing", resume=True), GameJob(config, 1)])
+
+    failed, played = sorted(results, key=lambda r: r["seed"])
+    assert failed["phase"] == "failed" and failed["run_name"] == "missing" and "missing" in failed["error"]
+    assert played["phase"] == "game_over"
+    assert scheduler.games_finished == 2 and scheduler.games_failed == 1
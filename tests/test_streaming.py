@@ -0,0 +1,103 @@
+"""
+Tests for streamed speeches (speech_delta events and time-to-first-token).
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.agents import SimpleLLMAgent
+from src.agents.streaming import partial_response_text
+from src.config.game_config import GameConfig
+from src.core import GameState
+
+
+SPEECH = 'I think Player 3 is "suspicious".\nI nominate player number 3. PASS'
+
+
+def stream_events(fail_after=None):
+    """Build stream events for SPEECH, in 7-character deltas."""
+    raw = json.dumps({"reasoning": "Player 3 dodged.", "response": SPEECH})
+    events = []
+    for i in range(0, len(raw), 7):
+        if fail_after is not None and i >= fail_after:
+            events.append(SimpleNamespace(type="error", message="connection reset"))
+            return events
+        events.append(SimpleNamespace(type="response.output_text.delta", delta=raw[i:i + 7]))
+    usage = SimpleNamespace(input_tokens=50, output_tokens=30, total_tokens=80, reasoning_tokens=0)
+    response = SimpleNamespace(output=[SimpleNamespace(content=raw)], usage=usage)
+    events.append(SimpleNamespace(type="response.completed", response=response))
+    return events
+
+
+def make_agent(client_attr, client):
+    """Create a streaming agent for player 1 with a mock event emitter."""
+    config = GameConfig(llm_model="gpt-5-mini", stream_speeches=True, llm_retry_base_delay=0)
+    state = GameState()
+    state.setup_game()
+    agent = SimpleLLMAgent(state.players[0], config, event_emitter=Mock())
+    setattr(agent, client_attr, client)
+    return agent, state
+
+
+def streamed_text(emitter):
+    """Reassemble the speech from speech_delta calls, honoring resets."""
+    text = ""
+    for call in emitter.emit_speech_delta.call_args_list:
+        if call.kwargs["reset"]:
+            text = ""
+        text += call.args[1]
+    return text
+
+
+def test_partial_response_text():
+    """Test decoding the response field from incomplete JSON."""
+    assert partial_response_text('{"reasoning": "x", "resp') is None
+    assert partial_response_text('{"reasoning": "x", "response": "Hi \\"the') == 'Hi "the'
+    # An escape split across deltas waits for its second half
+    assert partial_response_text('{"response": "a\\') == "a"
+    assert partial_response_text('{"response": "a\\nb", "reasoning": "') == "a\nb"
+    assert partial_response_text("Plain text answer") == "Plain text answer"
+
+
+@pytest.mark.fake_llm_client
+def test_streamed_day_speech():
+    """Test that a streamed speech emits deltas adding up to the speech, plus time-to-first-token."""
+    client = SimpleNamespace(responses=SimpleNamespace(create=lambda **params: iter(stream_events())))
+    agent, state = make_agent("client", client)
+
+    speech = agent.get_day_speech(agent.build_context(state))
+
+    assert speech == SPEECH
+    emitter = agent.event_emitter
+    # Deltas are coalesced rather than sent one per token
+    assert 1 < emitter.emit_speech_delta.call_count < len(SPEECH) // 7
+    assert streamed_text(emitter) == SPEECH
+    metadata = emitter.emit_llm_metadata.call_args
+    assert metadata.kwargs["time_to_first_token_ms"] <= metadata.args[5]
+
+
+@pytest.mark.fake_llm_client
+def test_streamed_speech_retry_resets_deltas():
+    """Test that a stream failing midway is retried and viewers are told to discard the partial text."""
+    attempts = []
+
+    async def create(**params):
+        attempts.append(params["stream"])
+
+        async def events():
+            for event in stream_events(fail_after=100 if len(attempts) == 1 else None):
+                yield event
+        return events()
+
+    agent, state = make_agent("async_client", SimpleNamespace(responses=SimpleNamespace(create=create)))
+
+    speech = asyncio.run(agent.get_day_speech_async(agent.build_context(state)))
+
+    assert speech == SPEECH
+    assert attempts == [True, True]
+    assert any(call.kwargs["reset"] for call in agent.event_emitter.emit_speech_delta.call_args_list)
+    assert streamed_text(agent.event_emitter) == SPEECH
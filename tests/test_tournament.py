@@ -0,0 +1,46 @@
+"""
+Tests for the batch tournament runner.
+"""
+
+import dataclasses
+import io
+import contextlib
+
+import pytest
+
+from main import MafiaGame
+from src.config.config_loader import load_config
+from tournament import parse_seed_range, run_tournament, summarize_results
+
+
+DUMMY_CONFIG = "configs/dummy_agent.yaml"
+
+
+def test_parse_seed_range():
+    """Test seed range parsing."""
+    assert parse_seed_range("5") == range(0, 5)
+    assert parse_seed_range("10:20") == range(10, 20)
+
+
+def test_tournament_results(no_record_event_emitter):
+    """Test that every seed produces one result and reused agents match fresh games."""
+    seeds = range(3, 9)
+    results = sorted(run_tournament(DUMMY_CONFIG, seeds, workers=1), key=lambda r: r["seed"])
+
+    assert [r["seed"] for r in results] == list(seeds)
+    for result in results:
+        assert result["winner"] in ("red", "black")
+        assert result["days"] >= 1
+        assert all("player" in e and "reason" in e for e in result["eliminations"])
+
+    # A game with freshly constructed agents must match the tournament result for the same seed
+    config = dataclasses.replace(load_config(DUMMY_CONFIG), random_seed=seeds[-1])
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MafiaGame(config, event_emitter=no_record_event_emitter)
+        game.run_game()
+    assert game.game_state.winner.value == results[-1]["winner"]
+    assert game.game_state.day_number == results[-1]["days"]
+
+    summary = summarize_results(results)
+    assert summary["games"] == len(seeds)
+    assert summary["red_wins"] + summary["black_wins"] + summary["failed"] == len(seeds)
@@ -0,0 +1,69 @@
+"""
+Tests for the NumPy batch simulator of dummy-agent games.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.simulation import compare_outcomes, simulate_dummy_games
+from src.simulation.vectorized import BLACK, DON, MAFIA, RED, SHERIFF
+from tournament import run_tournament
+
+
+DUMMY_CONFIG = "configs/dummy_agent.yaml"
+
+
+def test_batch_games_follow_the_rules():
+    """Test role setup, win conditions and check histories across a batch."""
+    batch = simulate_dummy_games(5000, seed=7)
+
+    assert ((batch.roles == MAFIA).sum(axis=1) == 2).all()
+    assert ((batch.roles == DON).sum(axis=1) == 1).all()
+    assert ((batch.roles == SHERIFF).sum(axis=1) == 1).all()
+
+    mafia_team = batch.roles >= MAFIA
+    alive_mafia = (batch.alive & mafia_team).sum(axis=1)
+    alive_civilians = (batch.alive & ~mafia_team).sum(axis=1)
+    assert np.isin(batch.winner, (RED, BLACK)).all()
+    assert (alive_mafia[batch.winner == RED] == 0).all()
+    assert (alive_mafia[batch.winner == BLACK] >= alive_civilians[batch.winner == BLACK]).all()
+    assert ((batch.days >= 1) & (batch.days <= 10)).all()
+
+    for game in range(200):
+        sheriff = int(np.flatnonzero(batch.roles[game] == SHERIFF)[0])
+        sheriff_checks = batch.sheriff_checks[game][batch.sheriff_checks[game] >= 0].tolist()
+        assert sheriff not in sheriff_checks
+        assert len(sheriff_checks) <= batch.nights[game]
+        don_checks = batch.don_checks[game][batch.don_checks[game] >= 0]
+        assert not mafia_team[game, don_checks].any()
+
+
+def test_batch_is_reproducible_and_respects_max_rounds():
+    """Test that a seed reproduces the batch and that max_rounds ends games by counts."""
+    first = simulate_dummy_games(500, seed=3)
+    second = simulate_dummy_games(500, seed=3)
+    assert (first.winner == second.winner).all()
+    assert (first.days == second.days).all()
+
+    capped = simulate_dummy_games(2000, seed=3, max_rounds=2)
+    assert (capped.days <= 2).all()
+    assert capped.max_rounds_reached.any()
+    assert (capped.days[capped.max_rounds_reached] == 2).all()
+
+
+def test_cross_check_matches_object_engine(no_record_event_emitter):
+    """Test that the batch simulator's (winner, days) distribution matches the game engine's."""
+    engine_results = list(run_tournament(DUMMY_CONFIG, range(400), workers=1))
+    batch = simulate_dummy_games(50000, seed=0)
+
+    comparison = compare_outcomes(engine_results, batch)
+
+    assert sum(comparison.engine_counts.values()) == 400
+    assert sum(comparison.batch_counts.values()) == 50000
+    assert comparison.dof >= 2
+    assert comparison.consistent()
+
+    # A biased sample is rejected: engine games where the mafia always wins
+    biased = [dict(result, winner="black") for result in engine_results]
+    assert not compare_outcomes(biased, batch).consistent()
@@ -0,0 +1,67 @@
+"""
+Tests for the viewer's live event endpoints (byte-offset polling and server-sent events).
+"""
+
+import json
+
+from src.web import viewer_server
+from src.web.viewer_server import ViewerServer
+
+
+def write_events(path, event_types, partial=False):
+    """Append events to an events file, optionally ending with a half-written line."""
+    with open(path, 'a') as f:
+        for event_type in event_types:
+            f.write(json.dumps({"event_type": event_type, "data": {}}) + "\n")
+        if partial:
+            f.write('{"event_type": "game_st')
+
+
+def make_client(tmp_path):
+    """Create a viewer test client with one run directory."""
+    run_dir = tmp_path / "run_1"
+    run_dir.mkdir()
+    server = ViewerServer(runs_dir=str(tmp_path))
+    return server.app.test_client(), run_dir / "events.jsonl"
+
+
+def test_stream_by_byte_offset(tmp_path):
+    """Test that the offset cursor returns only new complete lines, and last_position still works."""
+    client, events_file = make_client(tmp_path)
+    write_events(events_file, ["game_start", "phase_change"], partial=True)
+
+    response = client.get("/api/runs/run_1/events")
+    offset = int(response.headers["X-Events-Offset"])
+    assert [e["event_type"] for e in response.get_json()] == ["game_start", "phase_change"]
+
+    # The half-written line is held back until it is complete
+    assert client.get(f"/api/runs/run_1/events/stream?offset={offset}").get_json()["events"] == []
+    with open(events_file, 'a') as f:
+        f.write('ate_update", "data": {}}\n')
+    write_events(events_file, ["game_over"])
+
+    data = client.get(f"/api/runs/run_1/events/stream?offset={offset}").get_json()
+    assert [e["event_type"] for e in data["events"]] == ["game_state_update", "game_over"]
+    assert data["offset"] == events_file.stat().st_size
+
+    legacy = client.get("/api/runs/run_1/events/stream?last_position=3").get_json()
+    assert [e["event_type"] for e in legacy["events"]] == ["game_over"]
+    assert legacy["position"] == 4
+
+
+def test_sse_pushes_events_until_game_over(tmp_path, monkeypatch):
+    """Test that the SSE stream sends each event with its resume offset and ends after game over."""
+    monkeypatch.setattr(viewer_server, "SSE_POLL_INTERVAL", 0)
+    monkeypatch.setattr(viewer_server, "SSE_END_GRACE", 0)
+    client, events_file = make_client(tmp_path)
+    write_events(events_file, ["game_start"])
+    skip = events_file.stat().st_size
+    write_events(events_file, ["phase_change", "game_over"])
+
+    # Reconnecting browsers resume from Last-Event-ID
+    body = client.get("/api/runs/run_1/events/sse", headers={"Last-Event-ID": str(skip)}).get_data(as_text=True)
+    messages = [m for m in body.split("\n\n") if m]
+
+    assert [json.loads(m.split("data: ")[1])["event_type"] for m in messages[:2]] == ["phase_change", "game_over"]
+    assert messages[1].startswith(f"id: {events_file.stat().st_size}\n")
+    assert messages[2].startswith("event: end")
@@ -60,7 +60,7 @@ def test_process_voting_elimination(mock_vote_async, game_state, judge, game_con
 
 
 @patch.object(SimpleLLMAgent, 'get_vote_choice_async')
-@patch.object(SimpleLLMAgent, 'get_day_speech')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
 def test_tie_breaking(mock_speech, mock_vote_async, game_state, judge, game_config, mock_agents):
     """Test tie-breaking procedure."""
     handler = VotingHandler(game_state, judge)
@@ -98,7 +98,7 @@ def test_tie_breaking(mock_speech, mock_vote_async, game_state, judge, game_conf
 
 
 @patch.object(SimpleLLMAgent, 'get_vote_choice_async')
-@patch.object(SimpleLLMAgent, 'get_day_speech')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
 def test_eliminate_all_on_persistent_tie(mock_speech, mock_vote_async, game_state, judge, game_config, mock_agents):
     """Test eliminating all tied players after persistent tie."""
     handler = VotingHandler(game_state, judge)
@@ -162,7 +162,7 @@ def test_non_voters_included_in_elimination_voters(mock_vote_async, game_state,
 
 
 @patch.object(SimpleLLMAgent, 'get_vote_choice_async')
-@patch.object(SimpleLLMAgent, 'get_day_speech')
+@patch.object(SimpleLLMAgent, 'get_day_speech_async')
 def test_tie_break_revote_single_elimination(mock_speech, mock_vote_async, game_state, judge, game_config, mock_agents):
     """Test tie-break revote resolves to a single eliminated player."""
     handler = VotingHandler(game_state, judge)
@@ -196,3 +196,27 @@ def test_tie_break_revote_single_elimination(mock_speech, mock_vote_async, game_
     result = handler.handle_tie(tied, mock_agents)
     
     assert result == [5]
+
+
+def test_sync_only_overrides_are_used(game_state, judge, game_config):
+    """Test that agents overriding only the sync methods are still asked through the async phases."""
+    class SyncVoter(SimpleLLMAgent):
+        def get_vote_choice(self, context):
+            return 5
+    
+    agents = {p.player_number: SyncVoter(p, game_config) for p in game_state.players}
+    # A test double that patches only the sync method of one agent
+    agents[5].get_vote_choice = Mock(return_value=7)
+    
+    handler = VotingHandler(game_state, judge)
+    game_state.start_day()
+    game_state.day_number = 2
+    judge.process_nomination(1, "I nominate player number 5")
+    judge.process_nomination(2, "I nominate player number 7")
+    game_state.start_voting()
+    handler.collect_votes(agents)
+    
+    votes = game_state.votes[game_state.day_number]
+    assert votes[5] == 7
+    assert all(target == 5 for voter, target in votes.items() if voter != 5)
+    assert not SimpleLLMAgent._call_llm_async.called
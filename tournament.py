@@ -0,0 +1,353 @@
+"""
+Tournament runner: plays many Mafia games across a process pool.
+
+Each worker loads the config once and reuses its agents between games, so a
+win-rate study pays interpreter startup, YAML parsing and client construction
+once per worker instead of once per game. Per-game results are streamed into a
+single JSON Lines file as they complete.
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Try to load from .env file if it exists
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass  # python-dotenv not installed, that's okay
+
+from main import MafiaGame
+from src.agents import BaseAgent
+from src.config.game_config import GameConfig
+from src.config.config_loader import load_config
+from src.simulation import OutcomeComparison, compare_outcomes, simulate_dummy_games
+from src.web import EventEmitter, RunRecorder
+
+
+# Per-worker state, populated by _init_worker (or _init_worker_state for inline runs)
+_worker_config: Optional[GameConfig] = None
+_worker_agents: Dict[int, BaseAgent] = {}
+_worker_emitter: Optional[EventEmitter] = None
+
+
+def parse_seed_range(value: str) -> range:
+    """
+    Parse a seed range of the form "START:END" (END exclusive) or a single count "N" (0..N-1).
+    """
+    if ":" in value:
+        start_str, end_str = value.split(":", 1)
+        start, end = int(start_str), int(end_str)
+    else:
+        start, end = 0, int(value)
+    if end <= start:
+        raise argparse.ArgumentTypeError(f"Empty seed range: {value}")
+    return range(start, end)
+
+
+def _init_worker_state(config_path: Optional[str], model: Optional[str], workers: int = 1) -> None:
+    """Load the config and create a no-op event emitter for this process."""
+    global _worker_config, _worker_agents, _worker_emitter
+
+    # Copy so per-game seeds never mutate the shared default config
+    config = dataclasses.replace(load_config(config_path) if config_path else GameConfig())
+    if model is not None:
+        config.llm_model = model
+    # Rate limits are per process, so each worker gets its share of the quota
+    if config.llm_requests_per_minute:
+        config.llm_requests_per_minute = max(1, config.llm_requests_per_minute // workers)
+    if config.llm_tokens_per_minute:
+        config.llm_tokens_per_minute = max(1, config.llm_tokens_per_minute // workers)
+
+    # Game output is discarded anyway, so skip formatting it
+    config.headless = True
+
+    _worker_config = config
+    _worker_agents = {}
+    # A recorder without a created run discards events, so no run directory is written per game
+    _worker_emitter = EventEmitter(RunRecorder())
+
+
+def _init_worker(config_path: Optional[str], model: Optional[str], workers: int) -> None:
+    """Pool initializer: silence game output and set up per-worker state."""
+    sys.stdout = open(os.devnull, "w")
+    _init_worker_state(config_path, model, workers)
+
+
+def play_game(seed: int) -> Dict[str, Any]:
+    """
+    Play a single game with the worker's config and the given seed.
+
+    Args:
+        seed: Random seed for role assignment and dummy agent behavior
+
+    Returns:
+        Per-game result dictionary (seed, winner, days, nights, eliminations, ...)
+    """
+    global _worker_agents
+
+    config = dataclasses.replace(_worker_config, random_seed=seed)
+    start_time = time.perf_counter()
+    game = MafiaGame(config=config, event_emitter=_worker_emitter, agents=_worker_agents)
+    result = game.run_game()
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    _worker_agents = game.agents
+    return game_result(game, seed, result, duration_ms)
+
+
+def game_result(game: MafiaGame, seed: int, result: str, duration_ms: float) -> Dict[str, Any]:
+    """
+    Per-game result dictionary of a finished game.
+
+    Args:
+        game: The finished game
+        seed: Seed it was played with
+        result: What run_game() returned
+        duration_ms: Wall time the game took
+
+    Returns:
+        Result dictionary (seed, winner, days, nights, eliminations, ...)
+    """
+    game_state = game.game_state
+    roles = {p.player_number: p.role.role_type.value for p in game_state.players}
+    eliminations = []
+    for action in game_state.action_log:
+        if action["type"] == "player_eliminated":
+            data = action["data"]
+            eliminations.append({
+                "player": data["player"],
+                "role": roles[data["player"]],
+                "reason": data["reason"],
+                "day_number": data.get("day_number"),
+                "night_number": data.get("night_number"),
+            })
+
+    return {
+        "seed": seed,
+        "result": result,
+        "winner": game_state.winner.value if game_state.winner else None,
+        "phase": game_state.phase.value,
+        "days": game_state.day_number,
+        "nights": game_state.night_number,
+        "eliminations": eliminations,
+        "mafia": [p.player_number for p in game_state.players if p.is_mafia],
+        "duration_ms": round(duration_ms, 3),
+    }
+
+
+def _play_game_quietly(seed: int) -> Dict[str, Any]:
+    """Play a game in the current process with game output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return play_game(seed)
+
+
+def run_tournament(config_path: Optional[str], seeds: range, workers: int = 1,
+                   model: Optional[str] = None, chunksize: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Play one game per seed and yield results as they complete (in completion order).
+
+    Args:
+        config_path: Path to YAML config (default config if None)
+        seeds: Seeds to play
+        workers: Number of worker processes (1 runs inline in this process)
+        model: Optional LLM model override
+        chunksize: Seeds handed to a worker at a time (default: derived from seed count)
+
+    Yields:
+        Per-game result dictionaries
+    """
+    if workers <= 1:
+        _init_worker_state(config_path, model)
+        for seed in seeds:
+            yield _play_game_quietly(seed)
+        return
+
+    if chunksize is None:
+        # Large chunks amortize IPC, but keep enough of them to balance load across workers
+        chunksize = max(1, min(64, len(seeds) // (workers * 8)))
+
+    with multiprocessing.Pool(processes=workers, initializer=_init_worker,
+                              initargs=(config_path, model, workers)) as pool:
+        for result in pool.imap_unordered(play_game, seeds, chunksize=chunksize):
+            yield result
+
+
+def summarize_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate win counts and average game length."""
+    total = len(results)
+    red_wins = sum(1 for r in results if r["winner"] == "red")
+    black_wins = sum(1 for r in results if r["winner"] == "black")
+    failed = sum(1 for r in results if r["phase"] == "failed")
+    return {
+        "games": total,
+        "red_wins": red_wins,
+        "black_wins": black_wins,
+        "failed": failed,
+        "red_win_rate": red_wins / total if total else 0.0,
+        "black_win_rate": black_wins / total if total else 0.0,
+        "avg_days": sum(r["days"] for r in results) / total if total else 0.0,
+    }
+
+
+def run_vectorized(seeds: range, max_rounds: Optional[int]) -> None:
+    """Simulate one dummy-agent game per seed with the batch simulator and print the summary."""
+    print(f"Vectorized simulation: {len(seeds)} dummy-agent games (seed {seeds.start})")
+    start_time = time.perf_counter()
+    summary = simulate_dummy_games(len(seeds), seed=seeds.start, max_rounds=max_rounds).summary()
+    elapsed = time.perf_counter() - start_time
+    print("=" * 60)
+    print(f"Games simulated: {summary['games']} in {elapsed:.1f}s "
+          f"({summary['games'] / elapsed * 60:.0f} games/minute)")
+    print(f"Civilians (Red) wins: {summary['red_wins']} ({summary['red_win_rate']:.1%})")
+    print(f"Mafia (Black) wins: {summary['black_wins']} ({summary['black_win_rate']:.1%})")
+    print(f"Average days: {summary['avg_days']:.2f}")
+    print("=" * 60)
+
+
+def print_comparison(comparison: OutcomeComparison) -> None:
+    """Print engine and batch simulator outcome frequencies side by side, then the test result."""
+    engine_total = sum(comparison.engine_counts.values())
+    batch_total = sum(comparison.batch_counts.values())
+    print("Cross-check: game engine vs. batch simulator")
+    print(f"{'Outcome':<16}{'Engine':>10}{'Batch':>10}")
+    for key in sorted(set(comparison.engine_counts) | set(comparison.batch_counts), key=str):
+        winner, days = key
+        engine_share = comparison.engine_counts.get(key, 0) / engine_total
+        batch_share = comparison.batch_counts.get(key, 0) / batch_total
+        print(f"{f'{winner} day {days}':<16}{engine_share:>10.2%}{batch_share:>10.2%}")
+    verdict = "consistent" if comparison.consistent() else "MISMATCH"
+    print(f"Chi-square {comparison.statistic:.2f} ({comparison.dof} dof), p = {comparison.p_value:.3g}: {verdict}")
+
+
+def main():
+    """Entry point for running a tournament."""
+    parser = argparse.ArgumentParser(
+        description="Play many Mafia games across a process pool and aggregate the results",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python tournament.py --config configs/dummy_agent.yaml --seeds 0:5000
+  python tournament.py --config configs/dummy_agent.yaml --seeds 10000 --workers 8
+  python tournament.py --config configs/simple_llm_agent.yaml --seeds 0:50 --workers 4 --output results.jsonl
+  python tournament.py --config configs/dummy_agent.yaml --seeds 1000000 --vectorized
+  python tournament.py --config configs/dummy_agent.yaml --seeds 0:2000 --cross-check
+        """
+    )
+    parser.add_argument(
+        "--config",
+        "-c",
+        type=str,
+        default=None,
+        help="Path to YAML configuration file (default: use default config)"
+    )
+    parser.add_argument(
+        "--seeds",
+        "-s",
+        type=parse_seed_range,
+        default=parse_seed_range("100"),
+        help="Seed range 'START:END' (END exclusive) or a game count 'N' for seeds 0..N-1 (default: 100)"
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--model",
+        "-m",
+        type=str,
+        default=None,
+        help="LLM model to use. Overrides config file setting."
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="Aggregate results file (JSON Lines, default: tournaments/tournament_<timestamp>.jsonl)"
+    )
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="Simulate dummy-agent games with the NumPy batch simulator instead of the game engine "
+             "(one game per seed, all drawn from the first seed; no per-game results file)"
+    )
+    parser.add_argument(
+        "--cross-check",
+        action="store_true",
+        help="Play the seeds with the game engine, then check that the batch simulator's outcome "
+             "distribution matches (exit status 1 if it doesn't)"
+    )
+    parser.add_argument(
+        "--batch-games",
+        type=int,
+        default=100000,
+        help="Games simulated by the batch simulator for --cross-check (default: 100000)"
+    )
+
+    args = parser.parse_args()
+
+    if args.vectorized or args.cross_check:
+        config = load_config(args.config) if args.config else GameConfig()
+        if config.agent_type != "dummy_agent" or config.agent_types:
+            parser.error("--vectorized and --cross-check simulate dummy agents only; use a dummy_agent config")
+        try:
+            if args.vectorized:
+                run_vectorized(args.seeds, config.max_rounds)
+                return
+            batch = simulate_dummy_games(args.batch_games, seed=args.seeds.start, max_rounds=config.max_rounds)
+        except ImportError as e:
+            parser.error(str(e))
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = Path("tournaments") / f"tournament_{timestamp}.jsonl"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    seeds: range = args.seeds
+    print(f"Tournament: {len(seeds)} games (seeds {seeds.start}..{seeds.stop - 1}), {args.workers} workers")
+    if args.config:
+        print(f"Using config: {args.config}")
+    print(f"Writing results to: {output_path}")
+
+    results = []
+    start_time = time.perf_counter()
+    with open(output_path, "w") as f:
+        for result in run_tournament(args.config, seeds, args.workers, args.model):
+            f.write(json.dumps(result) + "\n")
+            results.append(result)
+    elapsed = time.perf_counter() - start_time
+
+    summary = summarize_results(results)
+    print("=" * 60)
+    print(f"Games played: {summary['games']} in {elapsed:.1f}s "
+          f"({summary['games'] / elapsed * 60:.0f} games/minute)")
+    print(f"Civilians (Red) wins: {summary['red_wins']} ({summary['red_win_rate']:.1%})")
+    print(f"Mafia (Black) wins: {summary['black_wins']} ({summary['black_win_rate']:.1%})")
+    print(f"Failed: {summary['failed']}")
+    print(f"Average days: {summary['avg_days']:.2f}")
+    print("=" * 60)
+
+    if args.cross_check:
+        comparison = compare_outcomes(results, batch)
+        print_comparison(comparison)
+        if not comparison.consistent():
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Run this separately from main.py to view games in the browser.
 
 import argparse
 from src.web.viewer_server import ViewerServer
+from src.web.run_catalog import RunCatalog
 
 
 def main():
@@ -17,6 +18,8 @@ Examples:
   python viewer.py                    # Start server on default port 5000
   python viewer.py --port 8080       # Start server on port 8080
   python viewer.py --runs-dir custom_runs  # Use custom runs directory
+  python viewer.py --backfill-catalog  # Index runs recorded before the run catalog existed
+  python viewer.py --archive-runs     # Compress finished runs
         """
     )
     parser.add_argument(
@@ -39,8 +42,33 @@ Examples:
         help="Directory containing game runs (default: runs)"
     )
     
+    parser.add_argument(
+        "--backfill-catalog",
+        action="store_true",
+        help="Add runs recorded before the run catalog existed to it, then exit"
+    )
+    
+    parser.add_argument(
+        "--archive-runs",
+        action="store_true",
+        help="Compress the events of finished, catalogued runs into archives, then exit"
+    )
+    
     args = parser.parse_args()
     
+    if args.backfill_catalog or args.archive_runs:
+        catalog = RunCatalog(args.runs_dir)
+        if args.backfill_catalog:
+            added = catalog.backfill()
+            print(f"Added {added} runs to {catalog.path}")
+        if args.archive_runs:
+            archived = catalog.archive_finished()
+            for name, stats in archived:
+                print(f"{name}: {stats['original_bytes']:,} -> {stats['archived_bytes']:,} bytes "
+                      f"({stats['compression_ratio']}x)")
+            print(f"Archived {len(archived)} runs")
+        return
+    
     server = ViewerServer(port=args.port, host=args.host, runs_dir=args.runs_dir)
     server.start()
 